@@ -1,20 +1,31 @@
-"""Evaluation engine (Phase 1 — Claude rubric scorer)."""
+"""Evaluation engine — rubric scoring as background jobs.
+
+``POST /evaluation/submit`` stores the submission and returns its job at
+once; workers (``app.services.job_queue``) score it.  Poll
+``GET /evaluation/jobs/{id}`` or stream ``GET /evaluation/jobs/{id}/events``
+(SSE) until the job is ``done`` or ``failed``.
+"""
 
 from __future__ import annotations
 
+import json
+import uuid
+
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sse_starlette.sse import EventSourceResponse
 
 from app.api.deps import get_current_user, get_db
 from app.api.v1.schemas import EvaluationRequest
-from app.models import Evaluation, Project, Submission, User
-from app.services.llm.provider import LLMProvider
+from app.models import Project, User
+from app.services.evaluation_service import TERMINAL, EvaluationService
+from app.services.job_queue import get_job_queue
 
 router = APIRouter(prefix="/evaluation", tags=["evaluation"])
 
 
-@router.post("/submit")
+@router.post("/submit", status_code=202)
 async def evaluate_submission(
     body: EvaluationRequest,
     user: User = Depends(get_current_user),
@@ -25,59 +36,52 @@ async def evaluate_submission(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
 
-    submission = Submission(
-        user_id=user.id,
-        project_id=project.id,
-        artifact=body.artifact,
-        notes=body.submission_notes,
-    )
-    db.add(submission)
-    await db.flush()
-
-    llm = LLMProvider()
-    rubric = project.rubric or {
-        "correctness": 25,
-        "architecture": 25,
-        "code_quality": 20,
-        "performance": 15,
-        "deployment_readiness": 15,
-    }
-    scores = await llm.structured_json(
-        [
-            {
-                "role": "system",
-                "content": "You are an AI engineering evaluator. Score fairly using the rubric.",
-            },
-            {
-                "role": "user",
-                "content": (
-                    f"Project: {project.title}\n"
-                    f"Summary: {project.summary}\n"
-                    f"Rubric weights: {rubric}\n"
-                    f"Submission notes: {body.submission_notes}\n"
-                    f"Artifact: {body.artifact}"
-                ),
-            },
-        ],
-        schema_hint='{"scores":{"correctness":0-25,...},"overall_score":0-100,"feedback":"string","improvement_plan":["string"]}',
-    )
-
-    overall = int(scores.get("overall_score", 70))
-    evaluation = Evaluation(
-        submission_id=submission.id,
-        scores=scores.get("scores", scores),
-        feedback=scores.get("feedback", "Good start — keep iterating."),
-        improvement_plan=scores.get("improvement_plan", []),
-        overall_score=overall,
-    )
-    db.add(evaluation)
-    await db.commit()
-
-    return {
-        "submission_id": str(submission.id),
-        "evaluation_id": str(evaluation.id),
-        "overall_score": overall,
-        "feedback": evaluation.feedback,
-        "improvement_plan": evaluation.improvement_plan,
-        "scores": evaluation.scores,
-    }
+    service = EvaluationService(db)
+    job = await service.submit(user.id, project, body.artifact, body.submission_notes)
+    if job.status not in TERMINAL:
+        await (await get_job_queue()).enqueue(job.id)
+    return await service.view(job)
+
+
+@router.get("/jobs/{job_id}")
+async def get_job(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+) -> dict:
+    service = EvaluationService(db)
+    job = await service.get_job(job_id, user.id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return await service.view(job)
+
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(
+    job_id: uuid.UUID,
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    service = EvaluationService(db)
+    if not await service.get_job(job_id, user.id):
+        raise HTTPException(status_code=404, detail="Job not found")
+    queue = await get_job_queue()
+
+    async def event_generator():
+        async with queue.subscribe(job_id) as events:
+            # Subscribed first, so no event is lost between this snapshot and the stream.
+            view = await service.view(await service.get_job(job_id))
+            yield _event(view)
+            if view["status"] in TERMINAL:
+                return
+            async for view in events:
+                yield _event(view)
+                if view["status"] in TERMINAL:
+                    return
+
+    return EventSourceResponse(event_generator())
+
+
+def _event(view: dict) -> dict:
+    name = view["status"] if view["status"] in TERMINAL else "progress"
+    return {"event": name, "data": json.dumps(view)}
@@ -25,6 +25,13 @@ class Settings(BaseSettings):
     database_url: str = "sqlite+aiosqlite:///./data/aiforge.db"
     redis_url: str = "redis://localhost:6380/0"
     qdrant_url: str = "http://localhost:6333"
+    # "local": embedded NumPy store under vector_store_path; "qdrant": qdrant_url.
+    vector_store: str = "local"
+    vector_store_path: str = "./data/vectors"
+    # IVF search on large local collections: faster, but lower recall (see rag/vector_store.py).
+    vector_store_approximate: bool = False
+    # "hashing" (local, deterministic) or a LiteLLM embedding model name.
+    embedding_model: str = "hashing"
 
     anthropic_api_key: str = ""
     openai_api_key: str = ""
@@ -34,6 +41,9 @@ class Settings(BaseSettings):
     default_llm_provider: str = "anthropic"
     default_llm_model: str = "claude-sonnet-4-20250514"
 
+    # In-process workers draining the evaluation job queue (0: run them separately).
+    evaluation_workers: int = 2
+
     @property
     def cors_origin_list(self) -> list[str]:
         return [o.strip() for o in self.cors_origins.split(",") if o.strip()]
@@ -10,6 +10,7 @@ from app.api.v1.router import api_router
 from app.core.config import get_settings
 from app.core.database import init_db
 from app.scripts.seed import seed_if_empty
+from app.services.job_queue import start_workers, stop_workers
 
 
 @asynccontextmanager
@@ -17,7 +18,9 @@ async def lifespan(app: FastAPI):
     if os.getenv("TESTING") != "1":
         await init_db()
         await seed_if_empty()
+        await start_workers(settings.evaluation_workers)
     yield
+    await stop_workers()
 
 
 settings = get_settings()
@@ -1,6 +1,6 @@
 from app.models.conversation import Conversation, Message
 from app.models.project import Checkpoint, LearningPath, Lesson, Project
-from app.models.submission import Evaluation, Submission
+from app.models.submission import Evaluation, EvaluationJob, Submission
 from app.models.user import User, UserProgress
 
 __all__ = [
@@ -14,4 +14,5 @@ __all__ = [
     "Message",
     "Submission",
     "Evaluation",
+    "EvaluationJob",
 ]
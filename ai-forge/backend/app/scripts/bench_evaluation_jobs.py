@@ -0,0 +1,133 @@
+"""Evaluation latency: scoring inside the request vs. the background job queue.
+
+Scores a small and a large artifact in a throwaway SQLite file against a fake
+model whose latency grows with prompt size and reply length
+(``--base-ms`` + ``--prefill-us-per-char`` per prompt character +
+``--decode-ms-per-token`` per reply token; rubric replies are ~400 tokens for
+all dimensions at once, ~120 for one):
+
+- before: one ``structured_json`` call with the whole artifact inlined, as
+  the old ``/evaluation/submit`` made while holding the request open;
+- after: ``EvaluationService.submit`` (what the request now waits for), then
+  the job run by a worker, then an identical resubmission.
+
+    python -m app.scripts.bench_evaluation_jobs
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Project, User
+from app.services import evaluation_service as es
+from app.services.llm.provider import LLMProvider
+
+
+class SlowLLM(LLMProvider):
+    def __init__(self, args):
+        super().__init__(provider="anthropic", model="bench")
+        self.args = args
+        self.calls = 0
+        self.prompt_chars = 0
+
+    async def structured_json(self, messages, *, schema_hint, max_tokens=1500):
+        prompt = messages[-1]["content"]
+        self.calls += 1
+        self.prompt_chars += len(prompt)
+        reply_tokens = 400 if "overall_score" in schema_hint else 120
+        await asyncio.sleep(
+            (
+                self.args.base_ms
+                + len(prompt) * self.args.prefill_us_per_char / 1000
+                + reply_tokens * self.args.decode_ms_per_token
+            )
+            / 1000
+        )
+        if "findings" in schema_hint:
+            return {"findings": {dim: ["finding"] for dim in es.DEFAULT_RUBRIC}}
+        return {"score": 10, "feedback": "ok", "improvements": ["iterate"]}
+
+
+def _artifact(files: int, lines: int) -> dict:
+    body = "".join(f"def handler_{i}(request):\n    return route(request, {i})\n" for i in range(lines // 2))
+    return {"files": {f"app/module_{n}.py": body for n in range(files)}}
+
+
+async def _before(llm: SlowLLM, project: Project, artifact: dict) -> float:
+    start = time.perf_counter()
+    await llm.structured_json(
+        [
+            {"role": "system", "content": es.SYSTEM_PROMPT},
+            {
+                "role": "user",
+                "content": f"Project: {project.title}\nRubric weights: {es.DEFAULT_RUBRIC}\nArtifact: {artifact}",
+            },
+        ],
+        schema_hint='{"scores":{},"overall_score":0-100,"feedback":"string","improvement_plan":["string"]}',
+    )
+    return time.perf_counter() - start
+
+
+async def _after(factory, llm: SlowLLM, user: User, project: Project, artifact: dict) -> tuple[float, float, float]:
+    async with factory() as db:
+        service = es.EvaluationService(db, llm=llm)
+        start = time.perf_counter()
+        job = await service.submit(user.id, project, artifact)
+        submitted = time.perf_counter() - start
+
+        async def publish(job_id, view):
+            pass
+
+        await service.run(job.id, publish)
+        finished = time.perf_counter() - start
+        start = time.perf_counter()
+        again = await service.submit(user.id, project, artifact)
+        assert again.deduplicated
+        return submitted, finished, time.perf_counter() - start
+
+
+async def _run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / 'bench.db'}")
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+        async with factory() as db:
+            user = User(email="bench@example.com", display_name="Bench")
+            project = Project(slug="bench", title="Bench", summary="Bench project", stack=[])
+            db.add_all([user, project])
+            await db.commit()
+
+        for name, artifact in (("small", _artifact(1, 200)), ("large", _artifact(args.files, 600))):
+            chars = sum(len(c) for c in es.artifact_chunks(artifact))
+            llm = SlowLLM(args)
+            before = await _before(llm, project, artifact)
+            llm = SlowLLM(args)
+            submitted, finished, resubmitted = await _after(factory, llm, user, project, artifact)
+            print(
+                f"{name:>5} ({chars / 1000:5.0f}k chars): before — request held {before:5.2f} s | "
+                f"after — submit returns in {submitted * 1000:4.0f} ms, scored in {finished:5.2f} s "
+                f"({llm.calls} calls, largest prompt ≤ {es.CHUNK_CHARS // 1000}k chars), "
+                f"resubmit {resubmitted * 1000:4.0f} ms / 0 calls"
+            )
+        await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=12, help="files in the large artifact")
+    parser.add_argument("--base-ms", type=float, default=400)
+    parser.add_argument("--prefill-us-per-char", type=float, default=5)
+    parser.add_argument("--decode-ms-per-token", type=float, default=12)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
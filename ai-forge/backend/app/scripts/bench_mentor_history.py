@@ -0,0 +1,204 @@
+"""Per-turn mentor cost on a long conversation: full history load vs. keyset window.
+
+Seeds a 500-message conversation in a throwaway SQLite file, then plays
+``--turns`` more turns two ways:
+
+- before: load every message through ``list_messages`` and keep the last 12
+  (the old ``stream_reply``), system prompt sent uncached;
+- after: ``MentorService.build_prompt`` (summary + keyset window) with cache
+  breakpoints, rolling the summary whenever ``stream_reply`` would.
+
+Reports time to first token with an instant fake model (so it measures the
+database and prompt assembly in front of the model call) and input tokens
+per turn, split into uncached and cache-read tokens using Anthropic's rules:
+a prefix is read from cache when an earlier turn marked the same prefix
+(at a breakpoint or up to 20 messages before one), and only prefixes of at
+least ``--min-cacheable`` tokens are cached.
+
+    python -m app.scripts.bench_mentor_history
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import statistics
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import litellm
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Conversation, Message, User
+from app.services import mentor_service as ms
+from app.services.llm.provider import LLMProvider
+
+MODEL = "anthropic/claude-sonnet-4-20250514"
+WORDS = "model latency eval retrieval chunk embedding index prompt token cache vector trace".split()
+
+
+def _text(words: int) -> str:
+    return " ".join(random.choice(WORDS) for _ in range(words))
+
+
+class InstantLLM(LLMProvider):
+    """Streams a canned reply at once; summaries are ~150 words."""
+
+    def __init__(self):
+        super().__init__(provider="anthropic", model="bench")
+
+    @property
+    def demo_mode(self) -> bool:
+        return False
+
+    async def chat(self, messages, **kwargs) -> str:
+        return _text(150)
+
+    async def chat_stream(self, messages, **kwargs):
+        yield "ok"
+
+
+def _tokens(messages: list[dict]) -> int:
+    return litellm.token_counter(model=MODEL, messages=messages)
+
+
+def _prefix_key(messages: list[dict]) -> str:
+    return hashlib.sha256(json.dumps(messages).encode()).hexdigest()
+
+
+def _account(messages: list[dict], breakpoints: list[int], cache: set[str], min_cacheable: int) -> tuple[int, int]:
+    """(uncached, cache-read) input tokens for one request; writes its breakpoint prefixes.
+
+    Like Anthropic, a breakpoint also hits a prefix cached at any of the 20
+    message boundaries before it, which is what lets an append-only history
+    reuse the previous turn's cache entry.
+    """
+    total = _tokens(messages)
+    read = 0
+    for bp in sorted(breakpoints):
+        for end in range(bp, max(bp - 20, -1), -1):
+            if _prefix_key(messages[: end + 1]) in cache:
+                read = max(read, _tokens(messages[: end + 1]))
+                break
+        if _tokens(messages[: bp + 1]) >= min_cacheable:
+            cache.add(_prefix_key(messages[: bp + 1]))
+    return total - read, read
+
+
+async def _seed(session: AsyncSession, n: int) -> Conversation:
+    user = User(email="bench@example.com", display_name="Bench")
+    session.add(user)
+    await session.flush()
+    conv = Conversation(user_id=user.id, mentor_personality="architect")
+    session.add(conv)
+    await session.flush()
+    start = datetime(2026, 1, 1)
+    for i in range(n):
+        session.add(
+            Message(
+                conversation_id=conv.id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=_text(40 if i % 2 == 0 else 220),
+                created_at=start + timedelta(seconds=i),
+            )
+        )
+    await session.commit()
+    return conv
+
+
+async def _turn_before(service: ms.MentorService, conv: Conversation, user_text: str):
+    history = await service.list_messages(conv.id)
+    messages = [
+        {
+            "role": "system",
+            "content": ms.PERSONALITY_PROMPTS[conv.mentor_personality] + ms.BASE_RULES,
+        }
+    ]
+    messages += [{"role": m.role, "content": m.content} for m in history[-12:]]
+    messages.append({"role": "user", "content": user_text})
+    return messages, []
+
+
+async def _play(session_factory, conv_id, *, turns: int, mode: str, min_cacheable: int) -> dict:
+    random.seed(1)
+    cache: set[str] = set()
+    ttft, uncached, read = [], [], []
+    llm = InstantLLM()
+    for _ in range(turns):
+        user_text = _text(40)
+        async with session_factory() as session:
+            service = ms.MentorService(session, llm=llm)
+            conv = await session.get(Conversation, conv_id)
+            start = time.perf_counter()
+            if mode == "before":
+                messages, breakpoints = await _turn_before(service, conv, user_text)
+                history_len = 12
+            else:
+                messages, breakpoints, history_len = await service.build_prompt(conv, user_text)
+            async for _token in llm.chat_stream(messages):
+                ttft.append((time.perf_counter() - start) * 1000)
+                break
+            u, r = _account(messages, breakpoints, cache, min_cacheable)
+            uncached.append(u)
+            read.append(r)
+            session.add(Message(conversation_id=conv.id, role="user", content=user_text))
+            session.add(Message(conversation_id=conv.id, role="assistant", content=_text(220)))
+            await session.commit()
+            if mode == "after" and history_len + 2 >= ms.HISTORY_WINDOW + ms.SUMMARY_BATCH:
+                await service.roll_summary(conv.id)
+    return {
+        "ttft_ms_p50": statistics.median(ttft),
+        "input_tokens": statistics.mean(u + r for u, r in zip(uncached, read)),
+        "uncached_tokens": statistics.mean(uncached),
+        "cache_read_tokens": statistics.mean(read),
+        # Anthropic bills cache reads at 0.1x the input price (writes at 1.25x are ignored here).
+        "billed_input_equiv": statistics.mean(u + 0.1 * r for u, r in zip(uncached, read)),
+    }
+
+
+async def _run(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode in ("before", "after"):
+            engine = create_async_engine(f"sqlite+aiosqlite:///{Path(tmp) / mode}.db")
+            async with engine.begin() as conn:
+                await conn.run_sync(Base.metadata.create_all)
+            factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+            random.seed(0)
+            async with factory() as session:
+                conv = await _seed(session, args.messages)
+            if mode == "after":
+                async with factory() as session:
+                    plan = await session.execute(
+                        text(
+                            "EXPLAIN QUERY PLAN SELECT * FROM messages WHERE conversation_id = :c "
+                            "ORDER BY created_at DESC, id DESC LIMIT 24"
+                        ),
+                        {"c": conv.id.hex},
+                    )
+                    print("query plan:", "; ".join(row[-1] for row in plan))
+            stats = await _play(factory, conv.id, turns=args.turns, mode=mode, min_cacheable=args.min_cacheable)
+            print(
+                f"{mode:>6}: TTFT p50 {stats['ttft_ms_p50']:6.2f} ms | input tokens/turn "
+                f"{stats['input_tokens']:6.0f} = {stats['uncached_tokens']:6.0f} uncached + "
+                f"{stats['cache_read_tokens']:6.0f} cache read | billed as {stats['billed_input_equiv']:6.0f}"
+            )
+            await engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--min-cacheable", type=int, default=1024)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
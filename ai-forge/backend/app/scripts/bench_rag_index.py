@@ -0,0 +1,135 @@
+"""Ingestion throughput and query latency of the local RAG index on 100k chunks.
+
+Builds a synthetic corpus (``--docs`` documents over ``--topics`` topics,
+~10 chunks each), ingests it through ``pipeline.ingest`` with the hashing
+embedder into a memmap-backed ``LocalVectorStore`` in a temp directory,
+then runs ``--queries`` queries (``--query-words`` consecutive words from a
+random chunk) exactly and through the IVF index at 1x, 2x and 4x the
+default ``nprobe``, reporting p50/p95 latency, IVF recall@10 against exact
+search and how often the source chunk is in the top 10.
+
+Hashed bag-of-words vectors have little cluster structure, which is the
+hard case for IVF: recall at the default ``nprobe`` is well below what
+model embeddings get, so the sweep shows what a higher ``hnsw_ef`` costs.
+(That is why the store searches exactly unless approximate search is
+enabled; the IVF rows here request it per query.)
+
+    python -m app.scripts.bench_rag_index
+    python -m app.scripts.bench_rag_index --docs 2000 --queries 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import tempfile
+import time
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.services.rag import vector_store as vs
+from app.services.rag.embeddings import HashingEmbedder
+from app.services.rag.pipeline import Document, ingest, point_id
+
+COLLECTION = "bench"
+
+
+def _corpus(docs: int, topics: int, words_per_doc: int, rng: np.random.Generator) -> list[Document]:
+    """Documents mixing stop words, Zipf-distributed general vocabulary and per-topic terms."""
+    stop = np.array("the a of and to in is for with on by as at from that this".split())
+    vocab = np.array([f"w{i}" for i in range(50_000)])
+    zipf = 1.0 / np.arange(1, len(vocab) + 1)
+    zipf /= zipf.sum()
+    topic_terms = [vocab[rng.choice(len(vocab), 300, replace=False)] for _ in range(topics)]
+    out = []
+    for d in range(docs):
+        topic = d % topics
+        kind = rng.random(words_per_doc)
+        words = np.where(
+            kind < 0.25,
+            stop[rng.integers(0, len(stop), words_per_doc)],
+            np.where(
+                kind < 0.6,
+                topic_terms[topic][rng.integers(0, 300, words_per_doc)],
+                vocab[rng.choice(len(vocab), words_per_doc, p=zipf)],
+            ),
+        )
+        sentences = [" ".join(words[i : i + 15]) + "." for i in range(0, words_per_doc, 15)]
+        out.append(Document(f"doc-{d}", [" ".join(sentences)], {"topic": int(topic)}))
+    return out
+
+
+def _pct(samples: list[float], q: float) -> float:
+    return float(np.percentile(samples, q)) * 1000
+
+
+async def _run(args) -> None:
+    rng = np.random.default_rng(0)
+    documents = _corpus(args.docs, args.topics, args.words, rng)
+    embedder = HashingEmbedder(dim=args.dim)
+    with tempfile.TemporaryDirectory() as tmp:
+        store = vs.LocalVectorStore(tmp)
+        stats = await ingest(store, embedder, COLLECTION, documents, batch_size=args.batch_size)
+        print(
+            f"ingest: {stats.chunks} chunks from {stats.documents} docs in {stats.seconds:.1f} s "
+            f"= {stats.chunks_per_second:,.0f} chunks/s ({stats.batches} batches of {args.batch_size})"
+        )
+        start = time.perf_counter()
+        store = vs.LocalVectorStore(tmp)
+        print(f"reopen: {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        picks = [
+            point_id(f"doc-{d}", int(k))
+            for d, k in zip(rng.integers(0, args.docs, args.queries), rng.integers(0, 5, args.queries))
+        ]
+        sources = store.retrieve(COLLECTION, picks)
+        texts = []
+        for point in sources:
+            words = point.payload["text"].split()
+            i = int(rng.integers(0, max(len(words) - args.query_words, 1)))
+            texts.append(" ".join(words[i : i + args.query_words]))
+        queries = embedder.embed_sync(texts)
+
+        start = time.perf_counter()
+        store.search(COLLECTION, queries[0], limit=10, search_params=models.SearchParams(exact=False))
+        nlist = int(stats.chunks**0.5)
+        nprobe = max(1, round(nlist * vs.IVF_PROBE_FRACTION))
+        print(f"IVF index: trained on first query in {(time.perf_counter() - start) * 1000:.0f} ms ({nlist} lists)")
+
+        def run(params: models.SearchParams | None) -> tuple[list[float], list[set]]:
+            timings, results = [], []
+            for query in queries:
+                start = time.perf_counter()
+                hits = store.search(COLLECTION, query, limit=10, search_params=params)
+                timings.append(time.perf_counter() - start)
+                results.append({p.id for p in hits})
+            return timings, results
+
+        timings, truth = run(models.SearchParams(exact=True))
+        rows = [("exact", timings, truth, None)]
+        for probes in (nprobe, 2 * nprobe, 4 * nprobe):
+            timings, results = run(models.SearchParams(hnsw_ef=probes))
+            rows.append((f"ivf/{probes}", timings, results, np.mean([len(t & r) / len(t) for t, r in zip(truth, results)])))
+        for name, timings, results, recall in rows:
+            print(
+                f"{name:>8}: p50 {_pct(timings, 50):6.2f} ms | p95 {_pct(timings, 95):6.2f} ms | "
+                f"source chunk in top 10: {np.mean([s.id in r for s, r in zip(sources, results)]):6.1%}"
+                + ("" if recall is None else f" | recall@10 {recall:.3f}")
+            )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--docs", type=int, default=11_000)
+    parser.add_argument("--topics", type=int, default=200)
+    parser.add_argument("--words", type=int, default=1_400, help="words per document (~10 chunks)")
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--query-words", type=int, default=12)
+    asyncio.run(_run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
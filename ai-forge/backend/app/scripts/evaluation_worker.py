@@ -0,0 +1,47 @@
+"""Run evaluation workers outside the API process (Redis queue only).
+
+Set ``EVALUATION_WORKERS=0`` on the API to leave scoring entirely to these.
+
+    python -m app.scripts.evaluation_worker --workers 4
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import sys
+
+from app.core.database import init_db
+from app.services import job_queue
+
+
+async def _run(workers: int) -> int:
+    queue = await job_queue.get_job_queue()
+    if not queue.shared:
+        print("Redis is unreachable; the local queue only serves workers inside the API process.")
+        return 1
+    await init_db()
+    await job_queue.start_workers(workers)
+    print(f"{workers} evaluation workers on {job_queue.QUEUE_KEY}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await job_queue.stop_workers()
+        await queue.close()
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    try:
+        return asyncio.run(_run(args.workers))
+    except KeyboardInterrupt:
+        return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,400 @@
+"""Rubric scorer behind the evaluation job queue.
+
+A submission is scored off the request path (see ``job_queue``):
+
+- large artifacts are split into chunks of at most ``CHUNK_CHARS`` and each
+  chunk is reviewed once for findings per rubric dimension (map);
+- every rubric dimension is then scored by its own call — on the artifact
+  itself when it fits in one chunk, otherwise on that dimension's findings —
+  with up to ``LLM_CONCURRENCY`` calls in flight (reduce);
+- scores are combined in code, so no single prompt carries the whole artifact.
+
+Progress is reported after each call.  Jobs are deduplicated by
+``artifact_hash`` (project, rubric, artifact and ``SCORER_VERSION`` — not the
+free-text notes): resubmitting identical code reuses the stored scores
+without calling the model.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Evaluation, EvaluationJob, Project, Submission
+from app.services.llm.provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RUBRIC = {
+    "correctness": 25,
+    "architecture": 25,
+    "code_quality": 20,
+    "performance": 15,
+    "deployment_readiness": 15,
+}
+# Roughly 6k tokens of artifact per prompt.
+CHUNK_CHARS = 24_000
+LLM_CONCURRENCY = 8
+# Bump when prompts or scoring change, so older results are not reused.
+SCORER_VERSION = 1
+# Improvement items kept in the combined plan, weakest dimensions first.
+PLAN_ITEMS = 8
+
+TERMINAL = ("done", "failed")
+
+SYSTEM_PROMPT = "You are an AI engineering evaluator. Score fairly using the rubric."
+
+Publish = Callable[[uuid.UUID, dict], Awaitable[None]]
+
+# Per-process: identical submissions queued together are scored once.
+# artifact_hash -> (lock, jobs holding or waiting for it)
+_hash_locks: dict[str, tuple[asyncio.Lock, int]] = {}
+
+
+def artifact_hash(project_id: uuid.UUID, rubric: dict, artifact: Any) -> str:
+    canonical = json.dumps(
+        {"v": SCORER_VERSION, "project": str(project_id), "rubric": rubric, "artifact": artifact},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@asynccontextmanager
+async def _scoring(digest: str) -> AsyncIterator[None]:
+    lock, users = _hash_locks.get(digest, (asyncio.Lock(), 0))
+    _hash_locks[digest] = (lock, users + 1)
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _hash_locks[digest]
+        if users == 1:
+            del _hash_locks[digest]
+        else:
+            _hash_locks[digest] = (lock, users - 1)
+
+
+def _sections(value: Any, path: str = "") -> Iterator[tuple[str, str]]:
+    """(path, text) leaves of an artifact: file maps flatten to ``dir/name`` paths."""
+    if isinstance(value, dict):
+        for key, item in value.items():
+            yield from _sections(item, f"{path}/{key}" if path else str(key))
+    elif isinstance(value, str):
+        yield path, value
+    else:
+        yield path, json.dumps(value, default=str, indent=1)
+
+
+def artifact_chunks(artifact: Any, limit: int = CHUNK_CHARS) -> list[str]:
+    """The artifact as text in chunks of at most ``limit`` characters.
+
+    Whole sections are packed together; a section larger than ``limit`` is
+    split on line boundaries (and an overlong line wherever it must).
+    """
+    pieces: list[str] = []
+    for path, text in _sections(artifact):
+        header = f"### {path or 'artifact'}\n"
+        if len(header) + len(text) + 1 <= limit:
+            pieces.append(f"{header}{text}\n")
+            continue
+        part = ""
+        for line in f"{text}\n".splitlines(keepends=True):
+            while line:
+                room = limit - len(header) - len(part)
+                if len(line) <= room:
+                    part += line
+                    break
+                if part:
+                    pieces.append(header + part)
+                    part = ""
+                    continue
+                pieces.append(header + line[:room])
+                line = line[room:]
+        if part:
+            pieces.append(header + part)
+
+    chunks: list[str] = []
+    for piece in pieces:
+        if chunks and len(chunks[-1]) + len(piece) <= limit:
+            chunks[-1] += piece
+        else:
+            chunks.append(piece)
+    return chunks or [""]
+
+
+def _bounded_score(value: Any, weight: int) -> int:
+    try:
+        return max(0, min(weight, int(round(float(value)))))
+    except (TypeError, ValueError):
+        return round(weight * 0.7)
+
+
+def combine(rubric: dict[str, int], results: dict[str, dict]) -> dict:
+    """Overall score, feedback and improvement plan from per-dimension results."""
+    scores = {dim: _bounded_score(results[dim].get("score"), weight) for dim, weight in rubric.items()}
+    total = sum(rubric.values()) or 1
+    weakest = sorted(rubric, key=lambda dim: scores[dim] / (rubric[dim] or 1))
+    plan: list[str] = []
+    for dim in weakest:
+        items = results[dim].get("improvements") or []
+        plan.extend(str(item) for item in items if isinstance(item, str) and item.strip())
+    feedback = "\n".join(
+        f"{dim.replace('_', ' ').title()}: {results[dim]['feedback']}"
+        for dim in rubric
+        if isinstance(results[dim].get("feedback"), str) and results[dim]["feedback"].strip()
+    )
+    return {
+        "scores": scores,
+        "overall_score": round(100 * sum(scores.values()) / total),
+        "feedback": feedback or "Good start — keep iterating.",
+        "improvement_plan": plan[:PLAN_ITEMS],
+    }
+
+
+class EvaluationService:
+    def __init__(self, db: AsyncSession, llm: LLMProvider | None = None):
+        self.db = db
+        self.llm = llm or LLMProvider()
+
+    async def submit(
+        self,
+        user_id: uuid.UUID,
+        project: Project,
+        artifact: dict,
+        notes: str = "",
+    ) -> EvaluationJob:
+        """Store the submission and its job; already done if the artifact was scored before."""
+        submission = Submission(user_id=user_id, project_id=project.id, artifact=artifact, notes=notes)
+        self.db.add(submission)
+        await self.db.flush()
+        digest = artifact_hash(project.id, project.rubric or DEFAULT_RUBRIC, artifact)
+        job = EvaluationJob(submission_id=submission.id, artifact_hash=digest, status="queued", progress={})
+        self.db.add(job)
+        previous = await self._finished_evaluation(digest)
+        if previous is not None:
+            await self._reuse(job, previous)
+        await self.db.commit()
+        return job
+
+    async def get_job(self, job_id: uuid.UUID, user_id: uuid.UUID | None = None) -> EvaluationJob | None:
+        stmt = select(EvaluationJob).where(EvaluationJob.id == job_id)
+        if user_id is not None:
+            stmt = stmt.join(Submission, Submission.id == EvaluationJob.submission_id).where(
+                Submission.user_id == user_id
+            )
+        return (await self.db.execute(stmt.execution_options(populate_existing=True))).scalar_one_or_none()
+
+    async def pending_job_ids(self, idle_for: timedelta | None = None) -> list[uuid.UUID]:
+        """Jobs left queued or running, oldest first (to requeue after a restart).
+
+        With ``idle_for``, only those whose row hasn't changed for that long.
+        """
+        stmt = select(EvaluationJob.id).where(EvaluationJob.status.not_in(TERMINAL))
+        if idle_for is not None:
+            stmt = stmt.where(EvaluationJob.updated_at < datetime.utcnow() - idle_for)
+        result = await self.db.execute(stmt.order_by(EvaluationJob.created_at))
+        return list(result.scalars())
+
+    async def view(self, job: EvaluationJob) -> dict:
+        """What the API and progress events report for a job."""
+        out = {
+            "job_id": str(job.id),
+            "submission_id": str(job.submission_id),
+            "status": job.status,
+            "progress": job.progress or {},
+            "deduplicated": job.deduplicated,
+        }
+        if job.status == "failed":
+            out["error"] = job.error
+        if job.status == "done" and job.evaluation_id is not None:
+            evaluation = await self.db.get(Evaluation, job.evaluation_id)
+            out["result"] = {
+                "evaluation_id": str(evaluation.id),
+                "overall_score": evaluation.overall_score,
+                "feedback": evaluation.feedback,
+                "improvement_plan": evaluation.improvement_plan,
+                "scores": evaluation.scores,
+            }
+        return out
+
+    async def run(self, job_id: uuid.UUID, publish: Publish) -> None:
+        """Score a queued job, publishing its view after every step."""
+        job = await self.get_job(job_id)
+        if job is None or job.status in TERMINAL:
+            return
+        try:
+            async with _scoring(job.artifact_hash):
+                previous = await self._finished_evaluation(job.artifact_hash)
+                if previous is not None:
+                    await self._reuse(job, previous)
+                    await self.db.commit()
+                else:
+                    await self._score(job, publish)
+        except Exception as exc:
+            logger.exception("evaluation job %s failed", job_id)
+            await self.db.rollback()
+            job = await self.get_job(job_id)
+            job.status = "failed"
+            job.error = f"{type(exc).__name__}: {exc}"
+            await self.db.commit()
+        await publish(job.id, await self.view(job))
+
+    async def _score(self, job: EvaluationJob, publish: Publish) -> None:
+        submission = await self.db.get(Submission, job.submission_id)
+        project = await self.db.get(Project, submission.project_id)
+        rubric = project.rubric or DEFAULT_RUBRIC
+        chunks = artifact_chunks(submission.artifact, CHUNK_CHARS)
+        mapped = len(chunks) > 1
+        total = (len(chunks) if mapped else 0) + len(rubric)
+        done = 0
+        gate = asyncio.Semaphore(LLM_CONCURRENCY)
+        # The session is shared by the concurrent calls: one progress write at a time.
+        writing = asyncio.Lock()
+
+        async def step(stage: str, call: Awaitable[dict]) -> dict:
+            nonlocal done
+            async with gate:
+                result = await call
+            async with writing:
+                done += 1
+                job.progress = {"done": done, "total": total, "stage": stage}
+                await self.db.commit()
+                await publish(job.id, await self.view(job))
+            return result
+
+        async def all_of(steps: list[Awaitable[dict]]) -> list[dict]:
+            # A failed call cancels the rest instead of leaving them writing to the session.
+            tasks = [asyncio.ensure_future(s) for s in steps]
+            try:
+                return await asyncio.gather(*tasks)
+            except BaseException:
+                for task in tasks:
+                    task.cancel()
+                await asyncio.gather(*tasks, return_exceptions=True)
+                raise
+
+        job.status = "running"
+        job.progress = {"done": 0, "total": total, "stage": "queued"}
+        await self.db.commit()
+        await publish(job.id, await self.view(job))
+
+        context = (
+            f"Project: {project.title}\n"
+            f"Summary: {project.summary}\n"
+            f"Submission notes: {submission.notes or ''}\n"
+        )
+        findings: dict[str, list[str]] = {dim: [] for dim in rubric}
+        if mapped:
+            reviews = await all_of(
+                [
+                    step(f"chunk {i}/{len(chunks)}", self._review_chunk(context, rubric, chunk, i, len(chunks)))
+                    for i, chunk in enumerate(chunks, 1)
+                ]
+            )
+            for review in reviews:
+                per_dim = review.get("findings")
+                for dim in rubric:
+                    notes = per_dim.get(dim) if isinstance(per_dim, dict) else [review.get("raw", "")]
+                    findings[dim].extend(str(n) for n in notes or () if str(n).strip())
+
+        results = await all_of(
+            [
+                step(
+                    dim,
+                    self._score_dimension(
+                        context,
+                        dim,
+                        weight,
+                        evidence=(
+                            "Reviewer findings from each part of the artifact:\n"
+                            + "\n".join(f"- {n}" for n in findings[dim] or ["(none)"])
+                            if mapped
+                            else f"Artifact:\n{chunks[0]}"
+                        ),
+                    ),
+                )
+                for dim, weight in rubric.items()
+            ]
+        )
+        combined = combine(rubric, dict(zip(rubric, results)))
+        evaluation = Evaluation(submission_id=submission.id, **combined)
+        self.db.add(evaluation)
+        await self.db.flush()
+        job.evaluation_id = evaluation.id
+        job.status = "done"
+        await self.db.commit()
+
+    async def _structured(self, messages: list[dict[str, str]], **kwargs) -> dict:
+        """``structured_json``, with a malformed reply counted as an empty one."""
+        try:
+            return await self.llm.structured_json(messages, **kwargs)
+        except ValueError:
+            logger.warning("evaluator returned malformed JSON; using defaults")
+            return {}
+
+    async def _review_chunk(self, context: str, rubric: dict, chunk: str, index: int, count: int) -> dict:
+        return await self._structured(
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": (
+                        f"{context}"
+                        f"Rubric dimensions: {', '.join(rubric)}\n"
+                        f"This is part {index} of {count} of the artifact. List concrete, "
+                        f"specific findings (strengths and problems) for each dimension.\n\n{chunk}"
+                    ),
+                },
+            ],
+            schema_hint='{"findings":{"<dimension>":["string"]}}',
+        )
+
+    async def _score_dimension(self, context: str, dim: str, weight: int, *, evidence: str) -> dict:
+        return await self._structured(
+            [
+                {"role": "system", "content": SYSTEM_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"{context}Score only the rubric dimension '{dim}' from 0 to {weight}.\n\n{evidence}",
+                },
+            ],
+            schema_hint=f'{{"score":0-{weight},"feedback":"string","improvements":["string"]}}',
+            max_tokens=600,
+        )
+
+    async def _finished_evaluation(self, digest: str) -> Evaluation | None:
+        result = await self.db.execute(
+            select(Evaluation)
+            .join(EvaluationJob, EvaluationJob.evaluation_id == Evaluation.id)
+            .where(EvaluationJob.artifact_hash == digest, EvaluationJob.status == "done")
+            .order_by(EvaluationJob.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def _reuse(self, job: EvaluationJob, previous: Evaluation) -> None:
+        evaluation = Evaluation(
+            submission_id=job.submission_id,
+            scores=previous.scores,
+            feedback=previous.feedback,
+            improvement_plan=previous.improvement_plan,
+            overall_score=previous.overall_score,
+        )
+        self.db.add(evaluation)
+        await self.db.flush()
+        job.evaluation_id = evaluation.id
+        job.status = "done"
+        job.deduplicated = True
+        job.progress = {"done": 1, "total": 1, "stage": "deduplicated"}
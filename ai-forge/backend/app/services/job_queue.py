@@ -0,0 +1,244 @@
+"""Evaluation job queue: Redis when reachable, in-process otherwise.
+
+Job state (status, progress, result) always lives in the ``evaluation_jobs``
+table; the queue only moves job ids to workers and progress events to SSE
+subscribers:
+
+- ``RedisJobQueue``: a Redis list as the queue and a pub/sub channel per job,
+  so API processes and separate workers (``python -m app.scripts.evaluation_worker``)
+  share one queue.  A worker moves the id it takes onto a processing list
+  and removes it once the job's outcome is stored; on startup, jobs that
+  have sat queued or running for ``STALE_AFTER`` without being in the queue
+  (their worker died) go back on it;
+- ``LocalJobQueue``: an ``asyncio.Queue`` and in-memory subscribers for local
+  runs (SQLite, no Redis).  Jobs still queued or running when the process
+  stopped are requeued from the table on startup.
+
+``get_job_queue()`` picks the backend once per process.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import uuid
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import get_settings
+from app.services.evaluation_service import EvaluationService
+from app.services.llm.provider import LLMProvider
+
+logger = logging.getLogger(__name__)
+
+QUEUE_KEY = "aiforge:evaluation:queue"
+# Ids taken by a worker and not yet acknowledged.
+PROCESSING_KEY = "aiforge:evaluation:processing"
+# Held by the process recovering lost jobs, so two starting processes don't both requeue them.
+RECOVER_LOCK_KEY = "aiforge:evaluation:recover"
+CHANNEL_PREFIX = "aiforge:evaluation:job:"
+# How long startup waits for Redis before falling back to the local queue.
+CONNECT_TIMEOUT = 0.5
+# A queued or running job whose row hasn't changed for this long has lost its
+# worker (a running job commits progress after every LLM call).
+STALE_AFTER = timedelta(minutes=10)
+
+_queue: LocalJobQueue | RedisJobQueue | None = None
+_workers: list[asyncio.Task] = []
+
+
+class LocalJobQueue:
+    """In-process queue; only workers in this process see the jobs."""
+
+    shared = False
+
+    def __init__(self):
+        self._jobs: asyncio.Queue[uuid.UUID] = asyncio.Queue()
+        self._subscribers: dict[uuid.UUID, set[asyncio.Queue]] = {}
+
+    async def enqueue(self, job_id: uuid.UUID) -> None:
+        await self._jobs.put(job_id)
+
+    async def dequeue(self) -> uuid.UUID:
+        return await self._jobs.get()
+
+    async def ack(self, job_id: uuid.UUID) -> None:
+        pass
+
+    async def requeue(self, pending: list[uuid.UUID], stale: list[uuid.UUID]) -> int:
+        """Requeue every unfinished job: no other process can be working on them."""
+        for job_id in pending:
+            await self.enqueue(job_id)
+        return len(pending)
+
+    async def publish(self, job_id: uuid.UUID, event: dict) -> None:
+        for inbox in self._subscribers.get(job_id, ()):
+            inbox.put_nowait(event)
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: uuid.UUID) -> AsyncIterator[AsyncIterator[dict]]:
+        inbox: asyncio.Queue[dict] = asyncio.Queue()
+        self._subscribers.setdefault(job_id, set()).add(inbox)
+
+        async def events() -> AsyncIterator[dict]:
+            while True:
+                yield await inbox.get()
+
+        try:
+            yield events()
+        finally:
+            subscribers = self._subscribers.get(job_id, set())
+            subscribers.discard(inbox)
+            if not subscribers:
+                self._subscribers.pop(job_id, None)
+
+    async def close(self) -> None:
+        pass
+
+
+class RedisJobQueue:
+    """Queue shared by every process pointed at the same Redis."""
+
+    shared = True
+
+    def __init__(self, client):
+        self._redis = client
+
+    @classmethod
+    async def connect(cls, url: str) -> RedisJobQueue:
+        from redis import asyncio as aioredis
+
+        client = aioredis.from_url(url, decode_responses=True, socket_connect_timeout=CONNECT_TIMEOUT)
+        try:
+            await client.ping()
+        except Exception:
+            await client.aclose()
+            raise
+        return cls(client)
+
+    async def enqueue(self, job_id: uuid.UUID) -> None:
+        await self._redis.lpush(QUEUE_KEY, str(job_id))
+
+    async def dequeue(self) -> uuid.UUID:
+        while True:
+            item = await self._redis.blmove(QUEUE_KEY, PROCESSING_KEY, 5, "RIGHT", "LEFT")
+            if item is not None:
+                return uuid.UUID(item)
+
+    async def ack(self, job_id: uuid.UUID) -> None:
+        """The job's outcome is stored: drop it from the processing list."""
+        await self._redis.lrem(PROCESSING_KEY, 1, str(job_id))
+
+    async def requeue(self, pending: list[uuid.UUID], stale: list[uuid.UUID]) -> int:
+        """Requeue ``stale`` jobs that aren't already queued; returns how many.
+
+        Fresh unfinished jobs are left alone: a live worker in another
+        process may own them.  Processing entries for jobs no longer pending
+        (finished, but the worker died before acknowledging) are dropped.
+        """
+        if not await self._redis.set(RECOVER_LOCK_KEY, "1", nx=True, ex=60):
+            return 0
+        try:
+            queued = set(await self._redis.lrange(QUEUE_KEY, 0, -1))
+            unfinished = {str(job_id) for job_id in pending}
+            for item in set(await self._redis.lrange(PROCESSING_KEY, 0, -1)) - unfinished:
+                await self._redis.lrem(PROCESSING_KEY, 0, item)
+            requeued = 0
+            for job_id in map(str, stale):
+                if job_id in queued:
+                    continue
+                await self._redis.lrem(PROCESSING_KEY, 0, job_id)
+                await self._redis.lpush(QUEUE_KEY, job_id)
+                requeued += 1
+            return requeued
+        finally:
+            await self._redis.delete(RECOVER_LOCK_KEY)
+
+    async def publish(self, job_id: uuid.UUID, event: dict) -> None:
+        await self._redis.publish(f"{CHANNEL_PREFIX}{job_id}", json.dumps(event))
+
+    @asynccontextmanager
+    async def subscribe(self, job_id: uuid.UUID) -> AsyncIterator[AsyncIterator[dict]]:
+        pubsub = self._redis.pubsub()
+        await pubsub.subscribe(f"{CHANNEL_PREFIX}{job_id}")
+
+        async def events() -> AsyncIterator[dict]:
+            async for message in pubsub.listen():
+                if message["type"] == "message":
+                    yield json.loads(message["data"])
+
+        try:
+            yield events()
+        finally:
+            await pubsub.unsubscribe()
+            await pubsub.aclose()
+
+    async def close(self) -> None:
+        await self._redis.aclose()
+
+
+async def get_job_queue() -> LocalJobQueue | RedisJobQueue:
+    """Redis at ``settings.redis_url`` if it answers, else the local queue."""
+    global _queue
+    if _queue is None:
+        url = get_settings().redis_url
+        try:
+            _queue = await RedisJobQueue.connect(url)
+        except Exception as exc:
+            logger.info("evaluation queue: Redis at %s unavailable (%s); using the local queue", url, exc)
+            _queue = LocalJobQueue()
+    return _queue
+
+
+def set_job_queue(queue: LocalJobQueue | RedisJobQueue | None) -> None:
+    """Use ``queue`` for this process (tests); ``None`` picks again on next use."""
+    global _queue
+    _queue = queue
+
+
+async def start_workers(
+    count: int,
+    *,
+    session_factory: async_sessionmaker[AsyncSession] | None = None,
+    llm: LLMProvider | None = None,
+) -> None:
+    """Start ``count`` workers on this event loop (no-op for ``count <= 0``)."""
+    if count <= 0:
+        return
+    if session_factory is None:
+        from app.core.database import SessionLocal
+
+        session_factory = SessionLocal
+    queue = await get_job_queue()
+    async with session_factory() as db:
+        service = EvaluationService(db)
+        pending = await service.pending_job_ids()
+        stale = await service.pending_job_ids(idle_for=STALE_AFTER)
+    if requeued := await queue.requeue(pending, stale):
+        logger.info("evaluation queue: requeued %d unfinished jobs", requeued)
+    for _ in range(count):
+        _workers.append(asyncio.create_task(_work(queue, session_factory, llm)))
+
+
+async def stop_workers() -> None:
+    """Cancel the workers; an interrupted job stays unacknowledged and is requeued on a later start."""
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+async def _work(queue, session_factory: async_sessionmaker[AsyncSession], llm: LLMProvider | None) -> None:
+    while True:
+        job_id = await queue.dequeue()
+        try:
+            async with session_factory() as db:
+                await EvaluationService(db, llm=llm).run(job_id, queue.publish)
+        except Exception:
+            logger.exception("evaluation worker crashed on job %s", job_id)
+        # Not reached on cancellation: the job stays on the processing list for recovery.
+        await queue.ack(job_id)
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 import json
-from collections.abc import AsyncIterator
+from collections.abc import AsyncIterator, Sequence
 from typing import Any
 
 from app.core.config import get_settings
@@ -11,6 +11,15 @@ from app.core.config import get_settings
 settings = get_settings()
 
 
+# Usage fields kept from the final stream chunk (cache fields are Anthropic's).
+_USAGE_FIELDS = (
+    "prompt_tokens",
+    "completion_tokens",
+    "cache_creation_input_tokens",
+    "cache_read_input_tokens",
+)
+
+
 class LLMProvider:
     """Unified chat + structured completion interface."""
 
@@ -21,6 +30,12 @@ class LLMProvider:
     ):
         self.provider = provider or settings.default_llm_provider
         self.model = model or settings.default_llm_model
+        self.last_usage: dict[str, int] = {}
+
+    @property
+    def demo_mode(self) -> bool:
+        """Anthropic without an API key: canned replies instead of live calls."""
+        return self.provider == "anthropic" and not self._api_key()
 
     def _litellm_model(self) -> str:
         if self.provider == "anthropic":
@@ -40,7 +55,7 @@ class LLMProvider:
         temperature: float = 0.4,
         max_tokens: int = 2048,
     ) -> str:
-        if self.provider == "anthropic" and not self._api_key():
+        if self.demo_mode:
             user_msg = messages[-1]["content"] if messages else ""
             return (
                 "**Demo mode** (set `ANTHROPIC_API_KEY` in `ai-forge/.env` for live Claude replies)\n\n"
@@ -63,24 +78,57 @@ class LLMProvider:
         )
         return response.choices[0].message.content or ""
 
+    def with_cache_breakpoints(
+        self,
+        messages: list[dict[str, Any]],
+        breakpoints: Sequence[int],
+    ) -> list[dict[str, Any]]:
+        """Mark ``messages[i]`` for each breakpoint as the end of a cacheable prefix.
+
+        Anthropic caches the prompt up to each marked block (at most four) and
+        bills re-reads at a tenth of the input price; other providers get the
+        messages unchanged (OpenAI caches long prefixes automatically).
+        """
+        if self.provider != "anthropic" or not breakpoints:
+            return messages
+        out = list(messages)
+        for i in sorted(set(breakpoints))[-4:]:
+            msg = out[i]
+            out[i] = {
+                **msg,
+                "content": [
+                    {"type": "text", "text": msg["content"], "cache_control": {"type": "ephemeral"}}
+                ],
+            }
+        return out
+
     async def chat_stream(
         self,
         messages: list[dict[str, str]],
         *,
         temperature: float = 0.4,
         max_tokens: int = 2048,
+        cache_breakpoints: Sequence[int] = (),
     ) -> AsyncIterator[str]:
+        """Stream reply tokens; token usage of the call is left in ``last_usage``."""
         import litellm
 
+        self.last_usage = {}
         stream = await litellm.acompletion(
             model=self._litellm_model(),
-            messages=messages,
+            messages=self.with_cache_breakpoints(messages, cache_breakpoints),
             temperature=temperature,
             max_tokens=max_tokens,
             stream=True,
+            stream_options={"include_usage": True},
             api_key=self._api_key(),
         )
         async for chunk in stream:
+            usage = getattr(chunk, "usage", None)
+            if usage:
+                self.last_usage = {f: int(getattr(usage, f, 0) or 0) for f in _USAGE_FIELDS}
+            if not chunk.choices:
+                continue
             delta = chunk.choices[0].delta.content
             if delta:
                 yield delta
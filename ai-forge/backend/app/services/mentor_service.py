@@ -2,15 +2,43 @@
 
 from __future__ import annotations
 
+import asyncio
+import logging
 import uuid
 from collections.abc import AsyncIterator
+from datetime import datetime
 
-from sqlalchemy import select
+from sqlalchemy import and_, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models import Conversation, Message, Project
 from app.services.llm.provider import LLMProvider
 
+logger = logging.getLogger(__name__)
+
+# Verbatim history: the messages after the latest summary, between
+# HISTORY_WINDOW and HISTORY_WINDOW + SUMMARY_BATCH of them.  Older turns are
+# folded into a rolling summary SUMMARY_BATCH messages at a time, so between
+# folds the prompt only grows at the end and its prefix stays cacheable.
+HISTORY_WINDOW = 12
+SUMMARY_BATCH = 12
+# Most older messages folded in one run (a long conversation's first summary);
+# a longer backlog carries on from the new summary's cursor on the next run.
+SUMMARY_MAX_MESSAGES = 200
+SUMMARY_ROLE = "summary"
+
+SUMMARY_PROMPT = (
+    "You maintain the running summary of a mentoring conversation. Merge the previous "
+    "summary with the new turns into at most 200 words: the learner's goal, what they "
+    "have tried, decisions made, open questions and hints already given. "
+    "Reply with the summary only."
+)
+
+# Keyset position of a message: ordered by (created_at, id).
+Cursor = tuple[datetime, uuid.UUID]
+
+_background: set[asyncio.Task] = set()
+
 PERSONALITY_PROMPTS = {
     "teacher": (
         "You are a patient AI engineering teacher. Use questions and hints. "
@@ -41,9 +69,9 @@ Rules:
 
 
 class MentorService:
-    def __init__(self, db: AsyncSession):
+    def __init__(self, db: AsyncSession, llm: LLMProvider | None = None):
         self.db = db
-        self.llm = LLMProvider()
+        self.llm = llm or LLMProvider()
 
     async def get_or_create_conversation(
         self,
@@ -70,23 +98,103 @@ class MentorService:
     async def list_messages(self, conversation_id: uuid.UUID) -> list[Message]:
         result = await self.db.execute(
             select(Message)
-            .where(Message.conversation_id == conversation_id)
-            .order_by(Message.created_at)
+            .where(Message.conversation_id == conversation_id, Message.role != SUMMARY_ROLE)
+            .order_by(Message.created_at, Message.id)
         )
         return list(result.scalars().all())
 
-    async def stream_reply(
+    async def recent_messages(
+        self,
+        conversation_id: uuid.UUID,
+        *,
+        limit: int,
+        after: Cursor | None = None,
+        before: Cursor | None = None,
+    ) -> list[Message]:
+        """The latest ``limit`` chat messages strictly between the cursors, oldest first.
+
+        Reads backwards along ``ix_messages_conversation_created`` and stops
+        after ``limit`` rows, so the cost does not grow with the conversation.
+        """
+        stmt = self._between(conversation_id, after, before)
+        stmt = stmt.order_by(Message.created_at.desc(), Message.id.desc()).limit(limit)
+        rows = list((await self.db.execute(stmt)).scalars().all())
+        rows.reverse()
+        return rows
+
+    async def oldest_messages(
+        self,
+        conversation_id: uuid.UUID,
+        *,
+        limit: int,
+        after: Cursor | None = None,
+        before: Cursor | None = None,
+    ) -> list[Message]:
+        """The first ``limit`` chat messages strictly between the cursors, oldest first."""
+        stmt = self._between(conversation_id, after, before)
+        stmt = stmt.order_by(Message.created_at, Message.id).limit(limit)
+        return list((await self.db.execute(stmt)).scalars().all())
+
+    @staticmethod
+    def _between(conversation_id: uuid.UUID, after: Cursor | None, before: Cursor | None):
+        stmt = select(Message).where(
+            Message.conversation_id == conversation_id, Message.role != SUMMARY_ROLE
+        )
+        if after is not None:
+            stmt = stmt.where(
+                or_(
+                    Message.created_at > after[0],
+                    and_(Message.created_at == after[0], Message.id > after[1]),
+                )
+            )
+        if before is not None:
+            stmt = stmt.where(
+                or_(
+                    Message.created_at < before[0],
+                    and_(Message.created_at == before[0], Message.id < before[1]),
+                )
+            )
+        return stmt
+
+    async def latest_summary(self, conversation_id: uuid.UUID) -> Message | None:
+        result = await self.db.execute(
+            select(Message)
+            .where(Message.conversation_id == conversation_id, Message.role == SUMMARY_ROLE)
+            .order_by(Message.created_at.desc(), Message.id.desc())
+            .limit(1)
+        )
+        return result.scalars().first()
+
+    @staticmethod
+    def _summary_cursor(summary: Message | None) -> Cursor | None:
+        through = (summary.meta or {}).get("through") if summary else None
+        if not through:
+            return None
+        return datetime.fromisoformat(through[0]), uuid.UUID(through[1])
+
+    async def build_prompt(
         self,
         conversation: Conversation,
         user_text: str,
-    ) -> AsyncIterator[str]:
+    ) -> tuple[list[dict[str, str]], list[int], int]:
+        """Messages for the next turn, their cache breakpoints, and the history length.
+
+        Layout: the stable system prefix (personality, rules, project), the
+        rolling summary, the verbatim history since it, then the new user
+        message.  The first three each end a cacheable prefix.
+        """
         project_ctx = ""
         if conversation.project_id:
             project = await self.db.get(Project, conversation.project_id)
             if project:
                 project_ctx = f"\nActive project: {project.title}\n{project.summary}"
 
-        history = await self.list_messages(conversation.id)
+        summary = await self.latest_summary(conversation.id)
+        history = await self.recent_messages(
+            conversation.id,
+            limit=HISTORY_WINDOW + SUMMARY_BATCH,
+            after=self._summary_cursor(summary),
+        )
         messages = [
             {
                 "role": "system",
@@ -95,9 +203,25 @@ class MentorService:
                 + project_ctx,
             },
         ]
-        for msg in history[-12:]:
+        breakpoints = [0]
+        if summary:
+            messages.append(
+                {"role": "system", "content": f"Summary of the earlier conversation:\n{summary.content}"}
+            )
+            breakpoints.append(len(messages) - 1)
+        for msg in history:
             messages.append({"role": msg.role, "content": msg.content})
+        if history:
+            breakpoints.append(len(messages) - 1)
         messages.append({"role": "user", "content": user_text})
+        return messages, breakpoints, len(history)
+
+    async def stream_reply(
+        self,
+        conversation: Conversation,
+        user_text: str,
+    ) -> AsyncIterator[str]:
+        messages, breakpoints, history_len = await self.build_prompt(conversation, user_text)
 
         self.db.add(
             Message(conversation_id=conversation.id, role="user", content=user_text)
@@ -105,7 +229,7 @@ class MentorService:
         await self.db.flush()
 
         full: list[str] = []
-        async for token in self.llm.chat_stream(messages):
+        async for token in self.llm.chat_stream(messages, cache_breakpoints=breakpoints):
             full.append(token)
             yield token
 
@@ -115,6 +239,86 @@ class MentorService:
                 conversation_id=conversation.id,
                 role="assistant",
                 content=assistant_text,
+                meta={"usage": self.llm.last_usage} if self.llm.last_usage else {},
+            )
+        )
+        await self.db.commit()
+        if history_len + 2 >= HISTORY_WINDOW + SUMMARY_BATCH:
+            self._schedule_summary(conversation.id)
+
+    async def roll_summary(self, conversation_id: uuid.UUID) -> Message | None:
+        """Fold messages older than the last HISTORY_WINDOW into the rolling summary.
+
+        Walks forward from the oldest unsummarized message in SUMMARY_BATCH
+        pages, one summary message per page, until it reaches the window (or
+        has folded SUMMARY_MAX_MESSAGES).  Does nothing until SUMMARY_BATCH
+        messages have aged out of the window, or in demo mode, where there
+        is no model to summarize with.  Returns the newest summary written.
+        """
+        if self.llm.demo_mode:
+            return None
+        previous = await self.latest_summary(conversation_id)
+        cursor = self._summary_cursor(previous)
+        window = await self.recent_messages(conversation_id, limit=HISTORY_WINDOW, after=cursor)
+        if len(window) < HISTORY_WINDOW:
+            return None
+        boundary: Cursor = (window[0].created_at, window[0].id)
+        page = await self.oldest_messages(conversation_id, limit=SUMMARY_BATCH, after=cursor, before=boundary)
+        if len(page) < SUMMARY_BATCH:
+            return None
+        folded = 0
+        summary = previous
+        while page and folded < SUMMARY_MAX_MESSAGES:
+            summary = await self._fold(conversation_id, summary, page)
+            folded += len(page)
+            last = page[-1]
+            page = await self.oldest_messages(
+                conversation_id, limit=SUMMARY_BATCH, after=(last.created_at, last.id), before=boundary
             )
+        return summary
+
+    async def _fold(self, conversation_id: uuid.UUID, previous: Message | None, page: list[Message]) -> Message:
+        """Merge ``page`` into ``previous`` as a new summary message, committed."""
+        transcript = "\n\n".join(f"{m.role}: {m.content[:2000]}" for m in page)
+        text = await self.llm.chat(
+            [
+                {"role": "system", "content": SUMMARY_PROMPT},
+                {
+                    "role": "user",
+                    "content": f"Previous summary:\n{previous.content if previous else '(none)'}"
+                    f"\n\nNew turns:\n{transcript}",
+                },
+            ],
+            temperature=0.2,
+            max_tokens=400,
         )
+        last = page[-1]
+        summary = Message(
+            conversation_id=conversation_id,
+            role=SUMMARY_ROLE,
+            content=text.strip(),
+            meta={
+                "through": [last.created_at.isoformat(), str(last.id)],
+                "folded": len(page) + ((previous.meta or {}).get("folded", 0) if previous else 0),
+            },
+        )
+        self.db.add(summary)
         await self.db.commit()
+        return summary
+
+    def _schedule_summary(self, conversation_id: uuid.UUID) -> None:
+        """Roll the summary after the reply, on its own session, off the request path."""
+        from app.core.database import SessionLocal
+
+        llm = self.llm
+
+        async def run() -> None:
+            try:
+                async with SessionLocal() as db:
+                    await MentorService(db, llm=llm).roll_summary(conversation_id)
+            except Exception:
+                logger.exception("mentor summary failed for conversation %s", conversation_id)
+
+        task = asyncio.create_task(run())
+        _background.add(task)
+        task.add_done_callback(_background.discard)
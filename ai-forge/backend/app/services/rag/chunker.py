@@ -0,0 +1,108 @@
+"""Streaming document chunker: text pieces in, overlapping chunks out.
+
+Documents are consumed as an iterable of text pieces (file blocks, lines,
+API pages), so a large file is never held in memory whole.  Chunks end at
+the last paragraph break, else line or sentence end, else space in the
+second half of the window, and the next chunk starts ``overlap`` characters
+earlier (moved forward to a word start).
+"""
+
+from __future__ import annotations
+
+import re
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 150
+READ_BLOCK = 64 * 1024
+
+_PARAGRAPH = re.compile(r"\n\s*\n")
+_SENTENCE = re.compile(r"[.!?]\s")
+_SPACE = re.compile(r"\s")
+
+
+@dataclass(frozen=True)
+class Chunk:
+    doc_id: str
+    index: int
+    text: str
+    start: int  # character offset of ``text`` in the document
+
+
+def _last_end(pattern: re.Pattern, text: str, pos: int) -> int:
+    end = -1
+    for match in pattern.finditer(text, pos):
+        end = match.end()
+    return end
+
+
+def _cut(buffer: str, size: int) -> int:
+    """End of the next chunk in ``buffer`` (which holds more than ``size`` chars).
+
+    Preferred cut points, best first: paragraph, line, sentence, word.
+    """
+    window = buffer[:size]
+    half = size // 2
+    for end in (
+        _last_end(_PARAGRAPH, window, half),
+        window.rfind("\n", half) + 1,
+        _last_end(_SENTENCE, window, half),
+        max(window.rfind(" ", half), window.rfind("\t", half)) + 1,
+    ):
+        if end > half:
+            return end
+    return size
+
+
+def _next_start(buffer: str, cut: int, overlap: int) -> int:
+    start = max(cut - overlap, 0)
+    if start == 0 or buffer[start - 1].isspace():
+        return start
+    space = _SPACE.search(buffer, start, cut)
+    return space.end() if space else cut
+
+
+def chunk_stream(
+    pieces: Iterable[str],
+    *,
+    doc_id: str,
+    size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> Iterator[Chunk]:
+    """Chunks of at most ``size`` characters from a document given as text pieces."""
+    if not 0 <= overlap < size // 2:
+        raise ValueError("overlap must be less than half the chunk size")
+    buffer = ""
+    offset = 0  # document offset of buffer[0]
+    index = 0
+
+    def emit(end: int) -> Iterator[Chunk]:
+        nonlocal index
+        text = buffer[:end]
+        stripped = text.strip()
+        if stripped:
+            yield Chunk(doc_id, index, stripped, offset + len(text) - len(text.lstrip()))
+            index += 1
+
+    for piece in pieces:
+        buffer += piece
+        while len(buffer) > size:
+            cut = _cut(buffer, size)
+            yield from emit(cut)
+            start = _next_start(buffer, cut, overlap)
+            buffer = buffer[start:]
+            offset += start
+    yield from emit(len(buffer))
+
+
+def read_blocks(path: str | Path, block: int = READ_BLOCK) -> Iterator[str]:
+    """A text file in blocks of ``block`` characters."""
+    with open(path, encoding="utf-8", errors="replace") as f:
+        while data := f.read(block):
+            yield data
+
+
+def chunk_file(path: str | Path, *, doc_id: str | None = None, **kwargs) -> Iterator[Chunk]:
+    return chunk_stream(read_blocks(path), doc_id=doc_id or str(path), **kwargs)
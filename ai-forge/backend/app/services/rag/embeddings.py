@@ -0,0 +1,93 @@
+"""Embedders: text batches -> L2-normalized float32 matrices.
+
+- ``HashingEmbedder``: local and deterministic (feature hashing of words and
+  word bigrams).  No model, no network — for tests, benchmarks and offline
+  dev, where it gives lexical rather than semantic similarity.
+- ``LiteLLMEmbedder``: any LiteLLM embedding model
+  (``openai/text-embedding-3-small``, ``ollama/nomic-embed-text``, ...).
+
+``get_embedder()`` picks one from ``settings.embedding_model``
+(``"hashing"`` or a LiteLLM model name).
+"""
+
+from __future__ import annotations
+
+import re
+import zlib
+from functools import lru_cache
+from typing import Protocol
+
+import numpy as np
+
+from app.core.config import get_settings
+
+_TOKEN = re.compile(r"\w+")
+
+
+class Embedder(Protocol):
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        """One L2-normalized float32 row per text."""
+        ...
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class HashingEmbedder:
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+        self._hashes: dict[str, int] = {}
+
+    def _hash_words(self, words: list[str]) -> np.ndarray:
+        hashes = list(map(self._hashes.get, words))
+        if None in hashes:
+            for i, h in enumerate(hashes):
+                if h is None:
+                    h = hashes[i] = zlib.crc32(words[i].encode("utf-8"))
+                    if len(self._hashes) < 1_000_000:
+                        self._hashes[words[i]] = h
+        return np.fromiter(hashes, dtype=np.uint64, count=len(hashes))
+
+    def embed_sync(self, texts: list[str]) -> np.ndarray:
+        words = [_TOKEN.findall(text.lower()) for text in texts]
+        lengths = np.fromiter(map(len, words), dtype=np.intp, count=len(texts))
+        hashes = self._hash_words([word for text_words in words for word in text_words])
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        # Bigrams: mix the hashes of neighbouring words of the same text.
+        same_text = rows[:-1] == rows[1:]
+        bigrams = ((hashes[:-1] * np.uint64(0x9E3779B1)) ^ hashes[1:]) & np.uint64(0xFFFFFFFF)
+        hashes = np.concatenate([hashes, bigrams[same_text]])
+        rows = np.concatenate([rows, rows[:-1][same_text]])
+        cols = (hashes % np.uint64(self.dim)).astype(np.intp)
+        signs = np.where(hashes & np.uint64(0x80000000), 1.0, -1.0)
+        out = np.bincount(rows * self.dim + cols, weights=signs, minlength=len(texts) * self.dim)
+        return normalize(out.reshape(len(texts), self.dim).astype(np.float32))
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        return self.embed_sync(texts)
+
+
+class LiteLLMEmbedder:
+    def __init__(self, model: str, api_key: str | None = None):
+        self.model = model
+        self.api_key = api_key
+
+    async def embed(self, texts: list[str]) -> np.ndarray:
+        import litellm
+
+        response = await litellm.aembedding(model=self.model, input=texts, api_key=self.api_key)
+        data = sorted(response.data, key=lambda d: d["index"])
+        return normalize(np.asarray([d["embedding"] for d in data], dtype=np.float32))
+
+
+@lru_cache
+def get_embedder() -> HashingEmbedder | LiteLLMEmbedder:
+    settings = get_settings()
+    model = settings.embedding_model
+    if model == "hashing":
+        return HashingEmbedder()
+    keys = {"openai/": settings.openai_api_key, "gemini/": settings.google_api_key}
+    api_key = next((key for prefix, key in keys.items() if model.startswith(prefix)), None)
+    return LiteLLMEmbedder(model, api_key=api_key or None)
@@ -0,0 +1,169 @@
+"""Ingestion and retrieval over any ``QdrantClient``-compatible store.
+
+``ingest`` streams documents through the chunker, embeds chunks in batches
+of ``batch_size`` with up to ``concurrency`` embedding calls in flight, and
+upserts each batch as it is embedded (store calls run in a thread: the
+Qdrant client and the local store are both synchronous).  Point ids are
+derived from (doc_id, chunk index), so re-ingesting a document overwrites
+its chunks; ``delete_document`` first when the new version may be shorter.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import uuid
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from itertools import islice
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.services.rag.chunker import CHUNK_OVERLAP, CHUNK_SIZE, Chunk, chunk_stream
+from app.services.rag.embeddings import Embedder
+
+BATCH_SIZE = 128
+CONCURRENCY = 4
+
+_ID_NAMESPACE = uuid.UUID("5b0c6c1e-3f55-4d0e-9d5a-6f1b2c7e8a90")
+
+
+@dataclass
+class Document:
+    doc_id: str
+    pieces: Iterable[str]  # the text, streamed (e.g. ``chunker.read_blocks(path)``)
+    payload: dict = field(default_factory=dict)
+
+
+@dataclass
+class IngestStats:
+    documents: int = 0
+    chunks: int = 0
+    batches: int = 0
+    seconds: float = 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.seconds if self.seconds else 0.0
+
+
+def point_id(doc_id: str, index: int) -> str:
+    return str(uuid.uuid5(_ID_NAMESPACE, f"{doc_id}\x00{index}"))
+
+
+def document_filter(doc_id: str) -> models.Filter:
+    return models.Filter(must=[models.FieldCondition(key="doc_id", match=models.MatchValue(value=doc_id))])
+
+
+def _batches(chunks: Iterator[tuple[Chunk, dict]], size: int) -> Iterator[list[tuple[Chunk, dict]]]:
+    while batch := list(islice(chunks, size)):
+        yield batch
+
+
+async def _ensure_collection(store, collection: str, size: int) -> None:
+    exists = await asyncio.to_thread(store.collection_exists, collection)
+    if not exists:
+        await asyncio.to_thread(
+            store.create_collection,
+            collection,
+            vectors_config=models.VectorParams(size=size, distance=models.Distance.COSINE),
+        )
+
+
+async def ingest(
+    store,
+    embedder: Embedder,
+    collection: str,
+    documents: Iterable[Document],
+    *,
+    batch_size: int = BATCH_SIZE,
+    concurrency: int = CONCURRENCY,
+    chunk_size: int = CHUNK_SIZE,
+    overlap: int = CHUNK_OVERLAP,
+) -> IngestStats:
+    """Chunk, embed and upsert ``documents`` into ``collection`` (created on first batch)."""
+    stats = IngestStats()
+    start = time.perf_counter()
+
+    def chunks() -> Iterator[tuple[Chunk, dict]]:
+        for doc in documents:
+            stats.documents += 1
+            for chunk in chunk_stream(doc.pieces, doc_id=doc.doc_id, size=chunk_size, overlap=overlap):
+                yield chunk, doc.payload
+
+    created = asyncio.Lock()
+    ready = False
+    gate = asyncio.Semaphore(concurrency)
+    pending: set[asyncio.Task] = set()
+
+    async def write(batch: list[tuple[Chunk, dict]]) -> None:
+        nonlocal ready
+        try:
+            vectors = await embedder.embed([chunk.text for chunk, _ in batch])
+            async with created:
+                if not ready:
+                    await _ensure_collection(store, collection, vectors.shape[1])
+                    ready = True
+            points = models.Batch(
+                ids=[point_id(chunk.doc_id, chunk.index) for chunk, _ in batch],
+                vectors=np.asarray(vectors, dtype=np.float32).tolist(),
+                payloads=[
+                    {**payload, "doc_id": chunk.doc_id, "chunk": chunk.index, "start": chunk.start, "text": chunk.text}
+                    for chunk, payload in batch
+                ],
+            )
+            await asyncio.to_thread(store.upsert, collection, points=points)
+            stats.chunks += len(batch)
+            stats.batches += 1
+        finally:
+            gate.release()
+
+    try:
+        for batch in _batches(chunks(), batch_size):
+            await gate.acquire()
+            # Surface a failed batch now rather than after the whole corpus.
+            for done in [t for t in pending if t.done()]:
+                pending.discard(done)
+                done.result()
+            pending.add(asyncio.create_task(write(batch)))
+        await asyncio.gather(*pending)
+    except BaseException:
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        raise
+
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+
+async def delete_document(store, collection: str, doc_id: str) -> None:
+    """Remove every chunk of ``doc_id``."""
+    await asyncio.to_thread(
+        store.delete, collection, points_selector=models.FilterSelector(filter=document_filter(doc_id))
+    )
+
+
+async def retrieve(
+    store,
+    embedder: Embedder,
+    collection: str,
+    query: str,
+    *,
+    limit: int = 5,
+    query_filter: models.Filter | None = None,
+    search_params: models.SearchParams | None = None,
+) -> list[models.ScoredPoint]:
+    """The ``limit`` chunks nearest ``query``, payloads included (``text``, ``doc_id``, ...)."""
+    vector = (await embedder.embed([query]))[0]
+    response = await asyncio.to_thread(
+        store.query_points,
+        collection,
+        query=np.asarray(vector, dtype=np.float32).tolist(),
+        query_filter=query_filter,
+        search_params=search_params,
+        limit=limit,
+        with_payload=True,
+    )
+    return response.points
@@ -0,0 +1,639 @@
+"""Embedded vector store with the ``QdrantClient`` collection and point API.
+
+``LocalVectorStore`` implements the subset of ``QdrantClient`` the RAG
+pipeline uses — ``create_collection``, ``collection_exists``,
+``delete_collection``, ``get_collections``, ``upsert``, ``delete``,
+``retrieve``, ``count``, ``search`` and ``query_points`` — taking and
+returning ``qdrant_client.models`` types, so code written against it runs
+unchanged on a Qdrant server (``VECTOR_STORE=qdrant``, see
+``get_vector_store``).
+
+Storage, per collection: vectors in a float32 memmap (``vectors.f32``,
+grown by doubling), ids and payloads in an append-only ``points.jsonl``
+replayed on open, and ``meta.json``, which is saved last and records how
+much of the log is committed; a write torn by a crash is cut off on open.  ``LocalVectorStore()`` without a path
+keeps everything in memory, like ``QdrantClient(":memory:")``.
+
+Search is exact (one matrix-vector product) by default.  Approximate
+search is opt-in: ``LocalVectorStore(approximate=True)``
+(``settings.vector_store_approximate``) or, per query,
+``SearchParams(exact=False)`` or ``SearchParams(hnsw_ef=...)``.  It applies
+only to collections of at least ``IVF_THRESHOLD`` points: an IVF index —
+k-means centroids over the vectors, each point listed under its nearest
+one — is trained on first search and probes the ``nprobe`` lists nearest
+the query (``hnsw_ef`` overrides ``nprobe``), scanning a copy of the
+vectors packed in list order.  Points written after training join
+their nearest list; the index is retrained once the collection has
+doubled, and rebuilt after a reopen.  Filtered searches are
+exact over the matching points.
+
+The tradeoff: IVF scans about ``IVF_PROBE_FRACTION`` of the vectors, so it
+is several times faster on large collections, but it misses neighbours
+that sit in unprobed lists.  On well-clustered vectors recall@10 at the
+default ``nprobe`` is above 0.9; on the default hashing embedder, whose
+vectors have little cluster structure, it is about 0.55
+(``app.scripts.bench_rag_index``), which is why exact search stays the
+default.
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import os
+import threading
+import uuid
+from collections.abc import Iterable, Sequence
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from qdrant_client.http import models
+
+from app.core.config import get_settings
+
+IVF_THRESHOLD = 20_000
+# Lists probed per query, as a fraction of the lists in the index.
+IVF_PROBE_FRACTION = 0.06
+IVF_TRAIN_POINTS_PER_LIST = 64
+IVF_ITERATIONS = 10
+_BLOCK = 8192
+
+PointId = int | str
+
+
+def _point_id(value: Any) -> PointId:
+    """Qdrant point ids are unsigned ints or UUIDs (any UUID spelling, stored canonical)."""
+    if isinstance(value, int) and value >= 0:
+        return value
+    try:
+        return str(uuid.UUID(str(value)))
+    except ValueError:
+        raise ValueError(f"Point id {value!r} is neither an unsigned integer nor a UUID") from None
+
+
+def _lookup(payload: dict, key: str) -> list:
+    values = [payload]
+    for part in key.split("."):
+        nxt = []
+        for value in values:
+            if isinstance(value, dict) and part in value:
+                item = value[part]
+                nxt.extend(item if isinstance(item, list) else [item])
+        values = nxt
+    return values
+
+
+def _condition(payload: dict, point_id: PointId, cond: Any) -> bool:
+    if isinstance(cond, models.Filter):
+        return _matches(payload, point_id, cond)
+    if isinstance(cond, models.HasIdCondition):
+        return point_id in {_point_id(i) for i in cond.has_id}
+    if isinstance(cond, models.IsEmptyCondition):
+        return not _lookup(payload, cond.is_empty.key)
+    if isinstance(cond, models.FieldCondition):
+        values = _lookup(payload, cond.key)
+        if isinstance(cond.match, models.MatchValue):
+            return cond.match.value in values
+        if isinstance(cond.match, models.MatchAny):
+            return any(v in cond.match.any for v in values)
+        if isinstance(cond.match, models.MatchExcept):
+            return any(v not in getattr(cond.match, "except_") for v in values)
+        if isinstance(cond.range, models.Range):
+            r = cond.range
+            return any(
+                isinstance(v, (int, float))
+                and (r.gt is None or v > r.gt)
+                and (r.gte is None or v >= r.gte)
+                and (r.lt is None or v < r.lt)
+                and (r.lte is None or v <= r.lte)
+                for v in values
+            )
+    raise ValueError(f"Unsupported filter condition: {cond!r}")
+
+
+def _as_list(conditions: Any) -> list:
+    if conditions is None:
+        return []
+    return conditions if isinstance(conditions, list) else [conditions]
+
+
+def _matches(payload: dict, point_id: PointId, flt: models.Filter) -> bool:
+    if not all(_condition(payload, point_id, c) for c in _as_list(flt.must)):
+        return False
+    if any(_condition(payload, point_id, c) for c in _as_list(flt.must_not)):
+        return False
+    should = _as_list(flt.should)
+    return not should or any(_condition(payload, point_id, c) for c in should)
+
+
+def _select_payload(payload: dict, with_payload: Any) -> dict | None:
+    if with_payload is True:
+        return payload
+    if not with_payload:
+        return None
+    if isinstance(with_payload, models.PayloadSelectorInclude):
+        with_payload = with_payload.include
+    if isinstance(with_payload, models.PayloadSelectorExclude):
+        return {k: v for k, v in payload.items() if k not in with_payload.exclude}
+    return {k: v for k, v in payload.items() if k in set(with_payload)}
+
+
+def _nearest(vectors: np.ndarray, centroids: np.ndarray, half_sq: np.ndarray) -> np.ndarray:
+    """Index of each vector's nearest centroid (L2): argmax of x·c - |c|²/2."""
+    out = np.empty(len(vectors), dtype=np.int32)
+    for lo in range(0, len(vectors), _BLOCK):
+        block = np.asarray(vectors[lo : lo + _BLOCK])
+        out[lo : lo + len(block)] = np.argmax(block @ centroids.T - half_sq, axis=1)
+    return out
+
+
+class _IVF:
+    def __init__(self, vectors: np.ndarray, count: int, seed: int = 0):
+        rng = np.random.default_rng(seed)
+        nlist = max(1, int(math.sqrt(count)))
+        sample_n = min(count, nlist * IVF_TRAIN_POINTS_PER_LIST)
+        sample = np.asarray(vectors[np.sort(rng.choice(count, sample_n, replace=False))])
+        centroids = sample[rng.choice(sample_n, nlist, replace=False)].copy()
+        for _ in range(IVF_ITERATIONS):
+            assign = _nearest(sample, centroids, 0.5 * np.einsum("ij,ij->i", centroids, centroids))
+            order = np.argsort(assign, kind="stable")
+            sizes = np.bincount(assign, minlength=nlist)
+            filled = np.flatnonzero(sizes)
+            starts = np.concatenate([[0], np.cumsum(sizes)[:-1]])[filled]
+            centroids[filled] = np.add.reduceat(sample[order], starts, axis=0) / sizes[filled, None]
+        self.centroids = centroids
+        self.half_sq = 0.5 * np.einsum("ij,ij->i", centroids, centroids)
+        self.trained_on = count
+        self.assign = np.empty(0, dtype=np.int32)
+        self.assign_rows(vectors, np.arange(count))
+        self._lists: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+
+    @property
+    def nlist(self) -> int:
+        return len(self.centroids)
+
+    def assign_rows(self, vectors: np.ndarray, rows: np.ndarray) -> None:
+        if len(rows) and rows.max() >= len(self.assign):
+            grown = np.full(max(rows.max() + 1, 2 * len(self.assign)), -1, dtype=np.int32)
+            grown[: len(self.assign)] = self.assign
+            self.assign = grown
+        self.assign[rows] = _nearest(np.asarray(vectors[rows]), self.centroids, self.half_sq)
+        self._lists = None
+
+    def probe(self, vectors: np.ndarray, query: np.ndarray, count: int, nprobe: int) -> tuple[np.ndarray, list]:
+        """Rows of the ``nprobe`` lists nearest ``query``, and their vectors list by list.
+
+        Vectors are scanned from a copy packed in list order: contiguous
+        slices read several times faster than the same rows gathered from
+        all over ``vectors``.  The copy is rebuilt on the first probe after
+        a write.
+        """
+        if self._lists is None:
+            order = np.argsort(self.assign[:count], kind="stable")
+            bounds = np.searchsorted(self.assign[:count][order], np.arange(self.nlist + 1))
+            self._lists = (order, bounds, np.asarray(vectors[order]))
+        order, bounds, packed = self._lists
+        nprobe = min(nprobe, self.nlist)
+        nearest = np.argpartition(-(self.centroids @ query - self.half_sq), nprobe - 1)[:nprobe]
+        spans = [slice(bounds[i], bounds[i + 1]) for i in nearest]
+        return np.concatenate([order[s] for s in spans]), [packed[s] for s in spans]
+
+
+class _Collection:
+    def __init__(self, size: int, distance: models.Distance, directory: Path | None):
+        if distance not in (models.Distance.COSINE, models.Distance.DOT, models.Distance.EUCLID):
+            raise ValueError(f"Unsupported distance: {distance}")
+        self.size = size
+        self.distance = distance
+        self.directory = directory
+        self.count = 0
+        self.vectors = np.zeros((0, size), dtype=np.float32)
+        self.ids: list[PointId] = []
+        self.payloads: list[dict] = []
+        self.rows: dict[PointId, int] = {}
+        self.live = np.zeros(0, dtype=bool)
+        self.deleted = 0
+        self.log_bytes = 0
+        self.ivf: _IVF | None = None
+
+    # ── storage ──
+
+    @classmethod
+    def open(cls, directory: Path) -> _Collection:
+        meta = json.loads((directory / "meta.json").read_text())
+        coll = cls(meta["size"], models.Distance(meta["distance"]), directory)
+        coll.count = meta["count"]
+        coll._map(max(coll.count, 1))
+        coll.live = np.zeros(len(coll.vectors), dtype=bool)
+        coll.ids = [None] * coll.count
+        coll.payloads = [{}] * coll.count
+        committed = meta.get("log_bytes")
+        with open(directory / "points.jsonl", "r+b") as f:
+            end = coll._replay(f, committed)
+            # Drop records past the last saved meta.json so their rows are not reused twice.
+            f.truncate(end)
+        coll.log_bytes = end
+        coll.deleted = int(coll.count - coll.live[: coll.count].sum())
+        return coll
+
+    def _replay(self, f, committed: int | None) -> int:
+        """Apply the log records up to ``committed`` bytes; returns the length replayed.
+
+        Logs from before ``log_bytes`` was recorded are read up to a torn line.
+        A record for a row since claimed by another point unmaps the old id.
+        """
+        end = 0
+        for line in f:
+            if committed is not None and end + len(line) > committed:
+                break
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+            end += len(line)
+            row = record["row"]
+            if row >= self.count:
+                continue  # written after the last committed count
+            if record.get("deleted"):
+                self.live[row] = False
+                self.rows.pop(self.ids[row], None)
+                continue
+            if self.ids[row] is not None and self.rows.get(self.ids[row]) == row:
+                del self.rows[self.ids[row]]
+            self.ids[row] = record["id"]
+            self.payloads[row] = record["payload"]
+            self.rows[record["id"]] = row
+            self.live[row] = True
+        return end
+
+    def _map(self, capacity: int) -> None:
+        if self.directory is None:
+            grown = np.zeros((capacity, self.size), dtype=np.float32)
+            grown[: self.count] = self.vectors[: self.count]
+            self.vectors = grown
+            return
+        path = self.directory / "vectors.f32"
+        if isinstance(self.vectors, np.memmap):
+            self.vectors.flush()
+        with open(path, "ab") as f:
+            f.truncate(max(capacity * self.size * 4, os.path.getsize(path)))
+        rows = os.path.getsize(path) // (self.size * 4)
+        self.vectors = np.memmap(path, dtype=np.float32, mode="r+", shape=(rows, self.size))
+
+    def _reserve(self, needed: int) -> None:
+        if needed > len(self.vectors):
+            self._map(max(needed, 2 * len(self.vectors), 1024))
+        if needed > len(self.live):
+            live = np.zeros(len(self.vectors), dtype=bool)
+            live[: len(self.live)] = self.live
+            self.live = live
+
+    def _commit(self, records: list[dict]) -> None:
+        if self.directory is None:
+            return
+        self.vectors.flush()
+        with open(self.directory / "points.jsonl", "ab") as f:
+            f.writelines((json.dumps(r, separators=(",", ":")) + "\n").encode() for r in records)
+            self.log_bytes = f.tell()
+        self.save_meta()
+
+    def save_meta(self) -> None:
+        meta = {"size": self.size, "distance": self.distance.value, "count": self.count, "log_bytes": self.log_bytes}
+        tmp = self.directory / "meta.json.tmp"
+        tmp.write_text(json.dumps(meta))
+        os.replace(tmp, self.directory / "meta.json")
+
+    # ── writes ──
+
+    def upsert(self, ids: list[PointId], vectors: np.ndarray, payloads: list[dict]) -> None:
+        if vectors.ndim != 2 or vectors.shape[1] != self.size:
+            raise ValueError(f"Wrong input: vector dimension error: expected dim: {self.size}, got {vectors.shape[-1]}")
+        if self.distance == models.Distance.COSINE:
+            vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+        rows = np.empty(len(ids), dtype=np.int64)
+        new = 0
+        for i, point_id in enumerate(ids):
+            row = self.rows.get(point_id)
+            if row is None:
+                row = self.count + new
+                new += 1
+            rows[i] = row
+        self._reserve(self.count + new)
+        self.vectors[rows] = vectors
+        records = []
+        for point_id, row, payload in zip(ids, rows.tolist(), payloads):
+            if row >= self.count:
+                self.ids.append(point_id)
+                self.payloads.append(payload)
+                self.rows[point_id] = row
+            else:
+                self.payloads[row] = payload
+            self.live[row] = True
+            records.append({"id": point_id, "row": row, "payload": payload})
+        self.count += new
+        self._commit(records)
+        if self.ivf is not None:
+            if self.count > 2 * self.ivf.trained_on:
+                self.ivf = None
+            else:
+                self.ivf.assign_rows(self.vectors, rows)
+
+    def delete(self, rows: list[int]) -> None:
+        records = []
+        for row in rows:
+            if self.live[row]:
+                self.live[row] = False
+                self.rows.pop(self.ids[row], None)
+                self.deleted += 1
+                records.append({"id": self.ids[row], "row": row, "deleted": True})
+        self._commit(records)
+
+    # ── reads ──
+
+    def matching_rows(self, flt: models.Filter | None) -> np.ndarray:
+        live = np.flatnonzero(self.live[: self.count])
+        if flt is None:
+            return live
+        return np.asarray([r for r in live.tolist() if _matches(self.payloads[r], self.ids[r], flt)], dtype=np.int64)
+
+    def _keys(self, vectors: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """Higher-is-better ranking keys of ``vectors``."""
+        if self.distance == models.Distance.EUCLID:
+            diff = vectors - query
+            return -np.sqrt(np.einsum("ij,ij->i", diff, diff))
+        return vectors @ query
+
+    def search(
+        self,
+        query: np.ndarray,
+        *,
+        flt: models.Filter | None,
+        params: models.SearchParams | None,
+        limit: int,
+        offset: int,
+        score_threshold: float | None,
+        approximate: bool = False,
+    ) -> list[tuple[int, float]]:
+        if query.shape != (self.size,):
+            raise ValueError(f"Wrong input: vector dimension error: expected dim: {self.size}, got {query.shape[-1]}")
+        if self.distance == models.Distance.COSINE:
+            query = query / max(float(np.linalg.norm(query)), 1e-12)
+        if params is not None and (params.hnsw_ef or "exact" in params.model_fields_set):
+            approximate = not params.exact
+        exact = not approximate or flt is not None or self.count < IVF_THRESHOLD
+        rows: np.ndarray | None
+        if flt is not None:
+            rows = self.matching_rows(flt)
+            keys = self._keys(self.vectors[rows], query)
+        elif exact:
+            rows = None if self.deleted == 0 else self.matching_rows(None)
+            keys = self._keys(self.vectors[: self.count] if rows is None else self.vectors[rows], query)
+        else:
+            if self.ivf is None:
+                self.ivf = _IVF(self.vectors, self.count)
+            nprobe = (params and params.hnsw_ef) or max(1, round(self.ivf.nlist * IVF_PROBE_FRACTION))
+            rows, blocks = self.ivf.probe(self.vectors, query, self.count, nprobe)
+            keys = np.concatenate([self._keys(block, query) for block in blocks])
+            if self.deleted:
+                keep = self.live[rows]
+                rows, keys = rows[keep], keys[keep]
+        want = min(limit + offset, len(keys))
+        if want <= 0:
+            return []
+        top = np.argpartition(-keys, want - 1)[:want]
+        top = top[np.argsort(-keys[top], kind="stable")][offset:]
+        hits = []
+        for i in top.tolist():
+            row = i if rows is None else int(rows[i])
+            score = float(-keys[i]) if self.distance == models.Distance.EUCLID else float(keys[i])
+            if score_threshold is not None and (
+                score > score_threshold if self.distance == models.Distance.EUCLID else score < score_threshold
+            ):
+                break
+            hits.append((row, score))
+        return hits
+
+
+class LocalVectorStore:
+    """``QdrantClient`` look-alike over NumPy arrays; ``path=None`` keeps it in memory."""
+
+    def __init__(self, path: str | Path | None = None, *, approximate: bool = False):
+        self.path = Path(path) if path is not None else None
+        self.approximate = approximate
+        self._collections: dict[str, _Collection] = {}
+        self._lock = threading.RLock()
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+            for meta in sorted(self.path.glob("*/meta.json")):
+                self._collections[meta.parent.name] = _Collection.open(meta.parent)
+
+    def _get(self, collection_name: str) -> _Collection:
+        coll = self._collections.get(collection_name)
+        if coll is None:
+            raise ValueError(f"Collection {collection_name} not found")
+        return coll
+
+    # ── collections ──
+
+    def collection_exists(self, collection_name: str, **kwargs: Any) -> bool:
+        return collection_name in self._collections
+
+    def get_collections(self, **kwargs: Any) -> models.CollectionsResponse:
+        return models.CollectionsResponse(
+            collections=[models.CollectionDescription(name=name) for name in sorted(self._collections)]
+        )
+
+    def create_collection(self, collection_name: str, vectors_config: models.VectorParams, **kwargs: Any) -> bool:
+        if not isinstance(vectors_config, models.VectorParams):
+            raise ValueError("Only a single unnamed vector (VectorParams) is supported")
+        with self._lock:
+            if collection_name in self._collections:
+                raise ValueError(f"Collection {collection_name} already exists")
+            directory = None
+            if self.path is not None:
+                directory = self.path / collection_name
+                directory.mkdir(parents=True)
+                (directory / "points.jsonl").touch()
+            coll = _Collection(vectors_config.size, vectors_config.distance, directory)
+            if directory is not None:
+                coll._map(1024)
+                coll.save_meta()
+            self._collections[collection_name] = coll
+        return True
+
+    def delete_collection(self, collection_name: str, **kwargs: Any) -> bool:
+        with self._lock:
+            coll = self._collections.pop(collection_name, None)
+            if coll is None:
+                return False
+            if coll.directory is not None:
+                del coll.vectors
+                for file in coll.directory.iterdir():
+                    file.unlink()
+                coll.directory.rmdir()
+        return True
+
+    # ── points ──
+
+    def upsert(
+        self,
+        collection_name: str,
+        points: models.Batch | Sequence[models.PointStruct],
+        wait: bool = True,
+        **kwargs: Any,
+    ) -> models.UpdateResult:
+        if isinstance(points, models.Batch):
+            ids = list(points.ids)
+            vectors = points.vectors
+            payloads = list(points.payloads or [{}] * len(ids))
+        else:
+            ids = [p.id for p in points]
+            vectors = [p.vector for p in points]
+            payloads = [p.payload or {} for p in points]
+        if any(isinstance(v, dict) for v in vectors):
+            raise ValueError("Named vectors are not supported")
+        ids = [_point_id(i) for i in ids]
+        # Last write wins for an id repeated in one batch, as on the server.
+        latest = {point_id: i for i, point_id in enumerate(ids)}
+        keep = sorted(latest.values())
+        matrix = np.asarray(vectors, dtype=np.float32)[keep] if ids else np.zeros((0, 0), np.float32)
+        with self._lock:
+            coll = self._get(collection_name)
+            if keep:
+                coll.upsert([ids[i] for i in keep], matrix, [dict(payloads[i]) for i in keep])
+        return models.UpdateResult(operation_id=0, status=models.UpdateStatus.COMPLETED)
+
+    def delete(
+        self,
+        collection_name: str,
+        points_selector: models.PointIdsList | models.FilterSelector | models.Filter | list,
+        wait: bool = True,
+        **kwargs: Any,
+    ) -> models.UpdateResult:
+        with self._lock:
+            coll = self._get(collection_name)
+            if isinstance(points_selector, models.FilterSelector):
+                points_selector = points_selector.filter
+            if isinstance(points_selector, models.Filter):
+                rows = coll.matching_rows(points_selector).tolist()
+            else:
+                ids = points_selector.points if isinstance(points_selector, models.PointIdsList) else points_selector
+                rows = [coll.rows[pid] for pid in map(_point_id, ids) if pid in coll.rows]
+            coll.delete(rows)
+        return models.UpdateResult(operation_id=0, status=models.UpdateStatus.COMPLETED)
+
+    def retrieve(
+        self,
+        collection_name: str,
+        ids: Iterable[PointId],
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        **kwargs: Any,
+    ) -> list[models.Record]:
+        with self._lock:
+            coll = self._get(collection_name)
+            rows = [coll.rows[pid] for pid in map(_point_id, ids) if pid in coll.rows]
+            return [self._record(coll, row, with_payload, with_vectors) for row in rows]
+
+    def count(
+        self,
+        collection_name: str,
+        count_filter: models.Filter | None = None,
+        exact: bool = True,
+        **kwargs: Any,
+    ) -> models.CountResult:
+        with self._lock:
+            coll = self._get(collection_name)
+            if count_filter is None:
+                return models.CountResult(count=coll.count - coll.deleted)
+            return models.CountResult(count=len(coll.matching_rows(count_filter)))
+
+    def search(
+        self,
+        collection_name: str,
+        query_vector: Sequence[float] | np.ndarray,
+        query_filter: models.Filter | None = None,
+        search_params: models.SearchParams | None = None,
+        limit: int = 10,
+        offset: int | None = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        **kwargs: Any,
+    ) -> list[models.ScoredPoint]:
+        with self._lock:
+            coll = self._get(collection_name)
+            hits = coll.search(
+                np.asarray(query_vector, dtype=np.float32),
+                flt=query_filter,
+                params=search_params,
+                limit=limit,
+                offset=offset or 0,
+                score_threshold=score_threshold,
+                approximate=self.approximate,
+            )
+            return [
+                models.ScoredPoint(
+                    score=score,
+                    version=0,
+                    **self._record(coll, row, with_payload, with_vectors).model_dump(),
+                )
+                for row, score in hits
+            ]
+
+    def query_points(
+        self,
+        collection_name: str,
+        query: Sequence[float] | np.ndarray | None = None,
+        query_filter: models.Filter | None = None,
+        search_params: models.SearchParams | None = None,
+        limit: int = 10,
+        offset: int | None = None,
+        with_payload: Any = True,
+        with_vectors: bool = False,
+        score_threshold: float | None = None,
+        **kwargs: Any,
+    ) -> models.QueryResponse:
+        if isinstance(query, models.NearestQuery):
+            query = query.nearest
+        if query is None:
+            raise ValueError("query_points needs a query vector")
+        points = self.search(
+            collection_name,
+            query,
+            query_filter=query_filter,
+            search_params=search_params,
+            limit=limit,
+            offset=offset,
+            with_payload=with_payload,
+            with_vectors=with_vectors,
+            score_threshold=score_threshold,
+        )
+        return models.QueryResponse(points=points)
+
+    def close(self, **kwargs: Any) -> None:
+        with self._lock:
+            for coll in self._collections.values():
+                if isinstance(coll.vectors, np.memmap):
+                    coll.vectors.flush()
+
+    @staticmethod
+    def _record(coll: _Collection, row: int, with_payload: Any, with_vectors: bool) -> models.Record:
+        return models.Record(
+            id=coll.ids[row],
+            payload=_select_payload(coll.payloads[row], with_payload),
+            vector=coll.vectors[row].tolist() if with_vectors else None,
+        )
+
+
+@lru_cache
+def get_vector_store():
+    """``LocalVectorStore`` at ``settings.vector_store_path``, or a Qdrant client."""
+    settings = get_settings()
+    if settings.vector_store == "qdrant":
+        from qdrant_client import QdrantClient
+
+        return QdrantClient(url=settings.qdrant_url)
+    return LocalVectorStore(settings.vector_store_path, approximate=settings.vector_store_approximate)
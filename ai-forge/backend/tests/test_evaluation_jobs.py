@@ -0,0 +1,192 @@
+import asyncio
+import json
+import re
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import update
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Evaluation, EvaluationJob, Project, User
+from app.services import evaluation_service as es
+from app.services import job_queue
+from app.services.llm.provider import LLMProvider
+
+
+class FakeLLM(LLMProvider):
+    def __init__(self):
+        super().__init__(provider="anthropic", model="test")
+        self.prompts: list[str] = []
+
+    async def structured_json(self, messages, *, schema_hint, max_tokens=1500):
+        prompt = messages[-1]["content"]
+        self.prompts.append(prompt)
+        await asyncio.sleep(0)
+        if "findings" in schema_hint:
+            return {"findings": {dim: [f"note on {dim}"] for dim in es.DEFAULT_RUBRIC}}
+        dim = re.search(r"dimension '(\w+)'", prompt).group(1)
+        return {"score": es.DEFAULT_RUBRIC[dim] - 5, "feedback": "ok", "improvements": [f"fix {dim}"]}
+
+
+@pytest_asyncio.fixture
+async def factory(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await job_queue.stop_workers()
+    job_queue.set_job_queue(None)
+    await engine.dispose()
+
+
+def test_artifact_chunks_split_large_files_and_keep_every_line():
+    artifact = {"files": {"app.py": "".join(f"line {i}\n" for i in range(3000)), "README.md": "hi"}}
+    chunks = es.artifact_chunks(artifact, limit=2000)
+    assert len(chunks) > 1 and all(len(c) <= 2000 for c in chunks)
+    text = "".join(chunks)
+    assert all(f"line {i}\n" in text for i in (0, 1500, 2999))
+    assert "### files/README.md\nhi\n" in text
+    assert es.artifact_chunks({"code": "print(1)"}) == ["### code\nprint(1)\n"]
+
+
+@pytest.mark.asyncio
+async def test_job_streams_progress_and_identical_resubmission_is_free(factory, monkeypatch):
+    monkeypatch.setattr(es, "CHUNK_CHARS", 2000)
+    llm = FakeLLM()
+    queue = job_queue.LocalJobQueue()
+    job_queue.set_job_queue(queue)
+    await job_queue.start_workers(2, session_factory=factory, llm=llm)
+
+    async with factory() as db:
+        user = User(email="learner@example.com", display_name="Learner")
+        project = Project(slug="rag", title="RAG", summary="Build RAG", difficulty="beginner", stack=[])
+        db.add_all([user, project])
+        await db.commit()
+        artifact = {"files": {"app.py": "x = 1\n" * 1000}}
+        chunks = len(es.artifact_chunks(artifact, 2000))
+        assert chunks > 1
+
+        service = es.EvaluationService(db, llm=llm)
+        job = await service.submit(user.id, project, artifact, "first try")
+        assert job.status == "queued"
+        async with queue.subscribe(job.id) as events:
+            await queue.enqueue(job.id)
+            seen = []
+            async for event in events:
+                seen.append(event)
+                if event["status"] in es.TERMINAL:
+                    break
+
+    done = seen[-1]
+    assert done["status"] == "done", done
+    steps = chunks + len(es.DEFAULT_RUBRIC)
+    assert [e["progress"]["done"] for e in seen[1:-1]] == list(range(1, steps + 1))
+    result = done["result"]
+    assert result["scores"]["correctness"] == 20 and result["overall_score"] == 75
+    assert result["improvement_plan"][0] == "fix performance"  # weakest dimension first
+    calls = len(llm.prompts)
+    assert calls == steps and all("x = 1" not in p for p in llm.prompts[chunks:])
+
+    async with factory() as db:
+        service = es.EvaluationService(db, llm=llm)
+        again = await service.submit(user.id, project, artifact, "same code, new notes")
+        view = await service.view(again)
+        assert view["status"] == "done" and view["deduplicated"]
+        assert view["result"]["overall_score"] == 75
+        assert await db.get(Evaluation, again.evaluation_id) is not None
+    assert len(llm.prompts) == calls
+
+
+class FakeRedis:
+    """The list/key commands ``RedisJobQueue`` uses, on one event loop."""
+
+    def __init__(self):
+        self.lists: dict[str, list[str]] = {}
+        self.keys: dict[str, str] = {}
+        self.published: list[tuple[str, dict]] = []
+
+    async def lpush(self, key, value):
+        self.lists.setdefault(key, []).insert(0, value)
+
+    async def blmove(self, src, dst, timeout, wherefrom, whereto):
+        assert (wherefrom, whereto) == ("RIGHT", "LEFT")
+        for _ in range(int(timeout * 100)):
+            if self.lists.get(src):
+                item = self.lists[src].pop()
+                self.lists.setdefault(dst, []).insert(0, item)
+                return item
+            await asyncio.sleep(0.01)
+        return None
+
+    async def lrem(self, key, count, value):
+        items = self.lists.get(key, [])
+        removed = 0
+        while value in items and (count == 0 or removed < count):
+            items.remove(value)
+            removed += 1
+        return removed
+
+    async def lrange(self, key, start, end):
+        return list(self.lists.get(key, []))
+
+    async def set(self, key, value, nx=False, ex=None):
+        if nx and key in self.keys:
+            return None
+        self.keys[key] = value
+        return True
+
+    async def delete(self, key):
+        self.keys.pop(key, None)
+
+    async def publish(self, channel, data):
+        self.published.append((channel, json.loads(data)))
+
+    async def aclose(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_redis_job_of_dead_worker_is_recovered_on_startup(factory):
+    llm = FakeLLM()
+    redis = FakeRedis()
+    queue = job_queue.RedisJobQueue(redis)
+    job_queue.set_job_queue(queue)
+
+    async with factory() as db:
+        user = User(email="learner@example.com", display_name="Learner")
+        project = Project(slug="rag", title="RAG", summary="Build RAG", difficulty="beginner", stack=[])
+        db.add_all([user, project])
+        await db.commit()
+        service = es.EvaluationService(db, llm=llm)
+        lost = await service.submit(user.id, project, {"code": "print(1)"}, "")
+        busy = await service.submit(user.id, project, {"code": "print(2)"}, "")
+        await queue.enqueue(lost.id)
+        await queue.enqueue(busy.id)
+
+        # A worker takes the first job, marks it running, then dies without acknowledging it.
+        assert await queue.dequeue() == lost.id
+        # Another worker, still alive, is scoring the second.
+        assert await queue.dequeue() == busy.id
+        past = datetime.utcnow() - job_queue.STALE_AFTER - timedelta(minutes=1)
+        await db.execute(update(EvaluationJob).where(EvaluationJob.id == lost.id).values(status="running", updated_at=past))
+        await db.execute(update(EvaluationJob).where(EvaluationJob.id == busy.id).values(status="running"))
+        await db.commit()
+    assert redis.lists[job_queue.QUEUE_KEY] == []
+    assert set(redis.lists[job_queue.PROCESSING_KEY]) == {str(lost.id), str(busy.id)}
+
+    await job_queue.start_workers(1, session_factory=factory, llm=llm)
+    for _ in range(500):
+        async with factory() as db:
+            job = await es.EvaluationService(db).get_job(lost.id)
+        # The worker acknowledges only after committing the result.
+        if job.status in es.TERMINAL and str(lost.id) not in redis.lists[job_queue.PROCESSING_KEY]:
+            break
+        await asyncio.sleep(0.01)
+    assert job.status == "done"
+    channel, event = redis.published[-1]
+    assert channel == f"{job_queue.CHANNEL_PREFIX}{lost.id}" and event["status"] == "done"
+    # Acknowledged; the live worker's job was neither requeued nor dropped.
+    assert redis.lists[job_queue.PROCESSING_KEY] == [str(busy.id)]
+    assert redis.lists[job_queue.QUEUE_KEY] == []
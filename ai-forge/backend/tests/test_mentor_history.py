@@ -0,0 +1,131 @@
+import re
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.database import Base
+from app.models import Conversation, Message, User
+from app.services import mentor_service as ms
+from app.services.llm.provider import LLMProvider
+
+
+class FakeLLM(LLMProvider):
+    def __init__(self):
+        super().__init__(provider="anthropic", model="test")
+        self.calls: list[tuple[list, list]] = []
+
+    @property
+    def demo_mode(self) -> bool:
+        return False
+
+    async def chat(self, messages, **kwargs) -> str:
+        # Carries the previous summary forward, like the real prompt asks for.
+        previous, turns = messages[-1]["content"].split("\n\nNew turns:\n")
+        carried = re.search(r"summary of (\d+) user turns from (\S+)", previous)
+        count = turns.count("user: ") + (int(carried[1]) if carried else 0)
+        first = carried[2] if carried else turns.split("\n\n")[0].split(": ", 1)[1]
+        return f"summary of {count} user turns from {first}"
+
+    async def chat_stream(self, messages, *, cache_breakpoints=(), **kwargs):
+        self.calls.append((messages, list(cache_breakpoints)))
+        self.last_usage = {"prompt_tokens": 10, "cache_read_input_tokens": 8}
+        for token in ("Try ", "this."):
+            yield token
+
+
+@pytest_asyncio.fixture
+async def db():
+    engine = create_async_engine("sqlite+aiosqlite://")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)() as session:
+        yield session
+    await engine.dispose()
+
+
+async def _conversation(db, n_messages: int) -> Conversation:
+    user = User(email="learner@example.com", display_name="Learner")
+    db.add(user)
+    await db.flush()
+    conv = Conversation(user_id=user.id)
+    db.add(conv)
+    await db.flush()
+    start = datetime(2026, 1, 1)
+    for i in range(n_messages):
+        db.add(
+            Message(
+                conversation_id=conv.id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"m{i}",
+                created_at=start + timedelta(seconds=i),
+            )
+        )
+    await db.commit()
+    return conv
+
+
+@pytest.mark.asyncio
+async def test_recent_messages_pages_backwards(db):
+    conv = await _conversation(db, 40)
+    service = ms.MentorService(db, llm=FakeLLM())
+    page = await service.recent_messages(conv.id, limit=12)
+    assert [m.content for m in page] == [f"m{i}" for i in range(28, 40)]
+    first = page[0]
+    older = await service.recent_messages(conv.id, limit=5, before=(first.created_at, first.id))
+    assert [m.content for m in older] == [f"m{i}" for i in range(23, 28)]
+    newer = await service.recent_messages(conv.id, limit=50, after=(first.created_at, first.id))
+    assert len(newer) == 11
+
+
+@pytest.mark.asyncio
+async def test_summary_rolls_and_prompt_prefix_is_cacheable(db):
+    conv = await _conversation(db, 40)
+    llm = FakeLLM()
+    service = ms.MentorService(db, llm=llm)
+
+    messages, breakpoints, history_len = await service.build_prompt(conv, "next?")
+    assert history_len == ms.HISTORY_WINDOW + ms.SUMMARY_BATCH
+    assert messages[1]["content"] == "m16" and breakpoints == [0, len(messages) - 2]
+
+    summary = await service.roll_summary(conv.id)
+    assert summary.content == "summary of 14 user turns from m0"
+    assert summary.meta["folded"] == 28
+    assert await service.roll_summary(conv.id) is None  # nothing new has aged out
+    assert len(await service.list_messages(conv.id)) == 40  # summaries are not chat messages
+
+    chunks = [t async for t in service.stream_reply(conv, "next?")]
+    assert "".join(chunks) == "Try this."
+    sent, marks = llm.calls[-1]
+    assert [m["role"] for m in sent[:2]] == ["system", "system"]
+    assert sent[1]["content"].endswith("summary of 14 user turns from m0")
+    assert [m["content"] for m in sent[2:-1]] == [f"m{i}" for i in range(28, 40)]
+    assert marks == [0, 1, len(sent) - 2]
+    reply = (await service.recent_messages(conv.id, limit=1))[0]
+    assert reply.role == "assistant" and reply.meta["usage"]["cache_read_input_tokens"] == 8
+
+    cached = llm.with_cache_breakpoints(sent, marks)
+    assert cached[1]["content"][0]["cache_control"] == {"type": "ephemeral"}
+    assert cached[-1] == sent[-1]
+    assert LLMProvider(provider="openai", model="x").with_cache_breakpoints(sent, marks) == sent
+
+
+@pytest.mark.asyncio
+async def test_long_conversation_folds_from_the_oldest_message(db):
+    conv = await _conversation(db, 250)
+    service = ms.MentorService(db, llm=FakeLLM())
+
+    summary = await service.roll_summary(conv.id)
+    assert summary.content == "summary of 102 user turns from m0"
+    assert summary.meta["folded"] == 204  # capped at SUMMARY_MAX_MESSAGES, in whole pages
+
+    summary = await service.roll_summary(conv.id)
+    assert summary.content == "summary of 119 user turns from m0"
+    assert summary.meta["folded"] == 250 - ms.HISTORY_WINDOW
+    assert await service.roll_summary(conv.id) is None
+
+    messages, _, history_len = await service.build_prompt(conv, "next?")
+    assert messages[1]["content"].endswith("summary of 119 user turns from m0")
+    assert history_len == ms.HISTORY_WINDOW
+    assert messages[2]["content"] == "m238"
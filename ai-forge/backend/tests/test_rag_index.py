@@ -0,0 +1,125 @@
+import json
+
+import numpy as np
+import pytest
+from qdrant_client.http import models
+
+from app.services.rag import vector_store as vs
+from app.services.rag.chunker import chunk_stream
+from app.services.rag.embeddings import HashingEmbedder
+from app.services.rag.pipeline import Document, delete_document, document_filter, ingest, retrieve
+
+
+def _text(words: int, seed: int = 0) -> str:
+    rng = np.random.default_rng(seed)
+    vocab = [f"word{i}" for i in range(500)]
+    sentences = []
+    for lo in range(0, words, 12):
+        sentences.append(" ".join(vocab[i] for i in rng.integers(0, len(vocab), 12)) + ".")
+        if lo % 120 == 0:
+            sentences.append("\n\n")
+    return " ".join(sentences)
+
+
+def test_chunker_streams_pieces_like_whole_text():
+    text = _text(3000)
+    whole = list(chunk_stream([text], doc_id="d", size=400, overlap=60))
+    pieces = [text[i : i + 37] for i in range(0, len(text), 37)]
+    streamed = list(chunk_stream(pieces, doc_id="d", size=400, overlap=60))
+
+    assert streamed == whole
+    assert [c.index for c in whole] == list(range(len(whole)))
+    assert all(0 < len(c.text) <= 400 for c in whole)
+    assert all(text[c.start : c.start + len(c.text)] == c.text for c in whole)
+    # Consecutive chunks overlap, and together they cover the document.
+    assert all(b.start < a.start + len(a.text) for a, b in zip(whole, whole[1:]))
+    assert whole[-1].start + len(whole[-1].text) == len(text.rstrip())
+    with pytest.raises(ValueError):
+        list(chunk_stream([text], doc_id="d", size=400, overlap=200))
+
+
+@pytest.mark.asyncio
+async def test_ingest_retrieve_and_reopen(tmp_path):
+    embedder = HashingEmbedder(dim=128)
+    assert np.array_equal(await embedder.embed(["same text"]), await embedder.embed(["same text"]))
+
+    store = vs.LocalVectorStore(tmp_path)
+    docs = [Document(f"doc-{i}", [_text(600, seed=i)], {"course": i % 2}) for i in range(6)]
+    stats = await ingest(store, embedder, "kb", docs, batch_size=8, concurrency=3, chunk_size=300, overlap=40)
+    assert stats.documents == 6
+    assert store.count("kb").count == stats.chunks > 6 * 10
+
+    [chunk] = store.retrieve("kb", [store.search("kb", np.ones(128), limit=1)[0].id])
+    hits = await retrieve(store, embedder, "kb", chunk.payload["text"], limit=3)
+    assert hits[0].id == chunk.id and hits[0].score == pytest.approx(1.0, abs=1e-5)
+
+    only_odd = models.Filter(must=[models.FieldCondition(key="course", match=models.MatchValue(value=1))])
+    hits = await retrieve(store, embedder, "kb", chunk.payload["text"], limit=20, query_filter=only_odd)
+    assert hits and all(h.payload["course"] == 1 for h in hits)
+
+    await delete_document(store, "kb", "doc-0")
+    reopened = vs.LocalVectorStore(tmp_path)
+    assert reopened.count("kb").count == store.count("kb").count
+    assert reopened.count("kb", count_filter=document_filter("doc-0")).count == 0
+    hits = reopened.query_points("kb", query=np.ones(128).tolist(), limit=5, with_payload=True).points
+    assert isinstance(hits[0], models.ScoredPoint)
+    assert [h.id for h in hits] == [h.id for h in store.search("kb", np.ones(128), limit=5)]
+
+
+def test_ivf_search_matches_exact(monkeypatch):
+    monkeypatch.setattr(vs, "IVF_THRESHOLD", 1000)
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((50, 32))
+
+    def clustered(n):
+        return centers[rng.integers(0, len(centers), n)] + 0.5 * rng.standard_normal((n, 32))
+
+    store = vs.LocalVectorStore()
+    store.create_collection("c", vectors_config=models.VectorParams(size=32, distance=models.Distance.COSINE))
+    store.upsert("c", points=models.Batch(ids=list(range(4000)), vectors=clustered(4000).tolist()))
+    store.delete("c", points_selector=models.PointIdsList(points=list(range(0, 4000, 2))))
+
+    queries = clustered(50)
+    exact = [store.search("c", query, limit=10) for query in queries]
+    assert store._get("c").ivf is None  # approximate search is opt-in
+
+    recall = []
+    for query, truth in zip(queries, exact):
+        approx = store.search("c", query, limit=10, search_params=models.SearchParams(exact=False))
+        assert all(p.id % 2 for p in approx)
+        recall.append(len({p.id for p in truth} & {p.id for p in approx}) / 10)
+    assert store._get("c").ivf is not None
+    assert np.mean(recall) > 0.9
+
+    store.approximate = True  # settings.vector_store_approximate
+    ivf_ids = [p.id for p in store.search("c", queries[0], limit=10, search_params=models.SearchParams(exact=False))]
+    assert [p.id for p in store.search("c", queries[0], limit=10)] == ivf_ids
+    exact_params = models.SearchParams(exact=True)
+    assert store.search("c", queries[0], limit=10, search_params=exact_params) == exact[0]
+
+
+@pytest.mark.parametrize("legacy_meta", [False, True])
+def test_reopen_after_torn_write_keeps_ids_and_rows_apart(tmp_path, legacy_meta):
+    def upsert(store, point_id):
+        store.upsert("c", points=[models.PointStruct(id=point_id, vector=[float(point_id), 1.0], payload={"n": point_id})])
+
+    store = vs.LocalVectorStore(tmp_path)
+    store.create_collection("c", vectors_config=models.VectorParams(size=2, distance=models.Distance.DOT))
+    upsert(store, 1)
+    meta = tmp_path / "c" / "meta.json"
+    committed = json.loads(meta.read_text())
+    if legacy_meta:
+        committed.pop("log_bytes")  # written before the log length was recorded
+    # Crash after points.jsonl is appended but before meta.json is saved.
+    upsert(store, 2)
+    meta.write_text(json.dumps(committed))
+
+    store = vs.LocalVectorStore(tmp_path)
+    assert store.count("c").count == 1 and store.retrieve("c", [2]) == []
+    upsert(store, 3)
+    store = vs.LocalVectorStore(tmp_path)
+    assert store.count("c").count == 2
+    assert store.retrieve("c", [2]) == []
+    assert [p.payload for p in store.retrieve("c", [1, 3])] == [{"n": 1}, {"n": 3}]
+    upsert(store, 2)
+    assert [p.payload for p in store.retrieve("c", [1, 2, 3])] == [{"n": 1}, {"n": 2}, {"n": 3}]
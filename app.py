@@ -13,8 +13,7 @@ import os
 import html as html_lib
 import streamlit as st
 import database as db
-from datetime import datetime, timedelta
-from collections import defaultdict
+from datetime import datetime
 import plotly.graph_objects as go
 import time
 import reading_content as rc
@@ -96,95 +95,40 @@ def _sync_sharepoint_on_startup() -> int:
 _sync_sharepoint_on_startup()
 
 
-def _flush_pending_emails() -> None:
-    """Retry queued emails in a background thread (never block UI reruns)."""
+def _start_cloud_sync_worker() -> None:
+    """Drain queued SharePoint / Google Sheets pushes (including ones left from a restart)."""
     try:
-        last = st.session_state.get("_email_flush_at", 0.0)
-        now = time.time()
-        if now - float(last) < 60:
-            return
-        st.session_state._email_flush_at = now
+        import cloud_sync_worker
 
-        def _bg_flush() -> None:
-            try:
-                from practice_email.delivery import flush_pending
+        cloud_sync_worker.ensure_started()
+    except Exception:
+        pass
+
+
+_start_cloud_sync_worker()
 
-                flush_pending(max_items=2, blocking=True)
-            except Exception:
-                pass
 
-        import threading
+def _start_question_pool_worker() -> None:
+    """Keep pre-generated practice questions topped up so session start is a pop."""
+    try:
+        import question_pool
 
-        threading.Thread(target=_bg_flush, daemon=True).start()
+        question_pool.ensure_started()
     except Exception:
         pass
 
 
-def _daily_time_calendar_fallback(user_id: int, days: int = 30) -> list:
-    """Fill calendar days when ``database.get_daily_time_spent_calendar`` is missing (older deploys)."""
-    sparse = db.get_daily_time_spent(user_id, days=days)
-    by_date = {r["log_date"]: r for r in sparse}
-    end = datetime.now().date()
-    start = end - timedelta(days=days - 1)
-    out = []
-    d = start
-    while d <= end:
-        ds = d.strftime("%Y-%m-%d")
-        if ds in by_date:
-            out.append(dict(by_date[ds]))
-        else:
-            out.append({"log_date": ds, "total_seconds": 0, "activity_count": 0})
-        d += timedelta(days=1)
-    return out
-
-
-def _daily_score_calendar_fallback(user_id: int, days: int = 30) -> list:
-    """Per-day average scores when ``database.get_daily_score_calendar`` is missing (older deploys)."""
-    hist = db.get_scores_history(user_id, days=days)
-    by_day: dict[str, list] = defaultdict(list)
-    for h in hist:
-        by_day[h["log_date"]].append(h["score"])
-    end = datetime.now().date()
-    start = end - timedelta(days=days - 1)
-    out = []
-    d = start
-    while d <= end:
-        ds = d.strftime("%Y-%m-%d")
-        if ds in by_day:
-            scores = by_day[ds]
-            out.append(
-                {
-                    "log_date": ds,
-                    "avg_score": round(sum(scores) / len(scores), 1),
-                    "best_score": max(scores),
-                    "activity_count": len(scores),
-                }
-            )
-        else:
-            out.append(
-                {
-                    "log_date": ds,
-                    "avg_score": None,
-                    "best_score": None,
-                    "activity_count": 0,
-                }
-            )
-        d += timedelta(days=1)
-    return out
-
+_start_question_pool_worker()
 
-def daily_time_calendar_for_dashboard(user_id: int, days: int = 30) -> list:
-    fn = getattr(db, "get_daily_time_spent_calendar", None)
-    if callable(fn):
-        return fn(user_id, days=days)
-    return _daily_time_calendar_fallback(user_id, days=days)
 
+def _start_email_delivery_worker() -> None:
+    """Deliver queued practice emails from one background thread per process."""
+    try:
+        from practice_email.delivery import ensure_worker_started
 
-def daily_score_calendar_for_dashboard(user_id: int, days: int = 30) -> list:
-    fn = getattr(db, "get_daily_score_calendar", None)
-    if callable(fn):
-        return fn(user_id, days=days)
-    return _daily_score_calendar_fallback(user_id, days=days)
+        ensure_worker_started()
+    except Exception:
+        pass
 
 
 # ──────────────────────────────────────────────
@@ -622,7 +566,7 @@ if "vocab_quiz_start_index" not in st.session_state:
 if "vocab_next_index_after" not in st.session_state:
     st.session_state.vocab_next_index_after = 0
 
-_flush_pending_emails()
+_start_email_delivery_worker()
 
 
 # ──────────────────────────────────────────────
@@ -1149,9 +1093,12 @@ def render_user_dashboard():
         st.error("User not found!")
         return
 
-    streak = db.get_login_streak(user["id"])
-    total_days = db.get_total_login_days(user["id"])
-    daily = db.get_user_daily_stats(user["id"])
+    _chart_days = 30
+    _cumulative_chart_days = 60  # longer window for running-total line only
+    snapshot = db.get_dashboard_snapshot(user["id"], days=_cumulative_chart_days)
+    streak = snapshot.streak
+    total_days = snapshot.total_login_days
+    daily = snapshot.today
 
     col_nav1, _ = st.columns([1, 6])
     with col_nav1:
@@ -1467,23 +1414,15 @@ def render_user_dashboard():
     st.markdown('<div class="fancy-divider"></div>', unsafe_allow_html=True)
     st.markdown("### 📊 Progress Over Time")
 
-    _chart_days = 30
-    _cumulative_chart_days = 60  # longer window for running-total line only
-    score_calendar = daily_score_calendar_for_dashboard(user["id"], days=_chart_days)
-    time_calendar = daily_time_calendar_for_dashboard(user["id"], days=_chart_days)
-    time_calendar_cumulative = daily_time_calendar_for_dashboard(
-        user["id"], days=_cumulative_chart_days
-    )
+    score_calendar = snapshot.score_calendar[-_chart_days:]
+    time_calendar = snapshot.time_calendar[-_chart_days:]
+    time_calendar_cumulative = snapshot.time_calendar
     # Recent window (charts): any logged scores or time in the last N days
     has_recent_window = any(s["activity_count"] > 0 for s in score_calendar) or any(
         t["total_seconds"] > 0 for t in time_calendar
     )
     # Lifetime: catches older activity outside the window (and helps after Cloud DB resets / new deploys)
-    has_lifetime_activity = (
-        db.get_total_time_spent(user["id"]) > 0
-        or len(db.get_scores_history(user["id"], days=365)) > 0
-        or len(db.get_reading_history(user["id"], days=365)) > 0
-    )
+    has_lifetime_activity = snapshot.has_lifetime_activity
 
     # Always show charts so the section is never blank on Streamlit Cloud; empty days render as gaps/zeros
     if not has_recent_window and not has_lifetime_activity:
@@ -1594,7 +1533,7 @@ def render_user_dashboard():
         )
         st.plotly_chart(fig_cum, width="stretch")
 
-        total_all_time = db.get_total_time_spent(user["id"])
+        total_all_time = snapshot.total_time_seconds
         total_hrs, total_rem = divmod(total_all_time, 3600)
         total_mins = total_rem // 60
         st.markdown(f"""
@@ -1803,7 +1742,7 @@ def render_reading_story():
 
         st.markdown('<div class="story-page" style="display:flex;flex-direction:column;align-items:center;">', unsafe_allow_html=True)
 
-        if os.path.exists(img_path):
+        if rc.page_image_exists(story_id, page_idx + 1):
             import base64 as _b64
             with open(img_path, "rb") as _imgf:
                 _img_b64 = _b64.b64encode(_imgf.read()).decode()
@@ -2413,7 +2352,7 @@ def render_arjun_stories_home():
         return
 
     # ── Previously read stories ──
-    generated = rc._load_generated_stories()
+    generated = rc.get_generated_stories()
     arjun_stories = {k: v for k, v in generated.items() if k.startswith("gen_arjun_")}
 
     if arjun_stories:
@@ -2673,8 +2612,14 @@ def render_gk_home():
         with st.spinner("Generating fresh questions..."):
             try:
                 past_qs = db.get_recent_gk_questions(user["id"], limit=100) if user else []
+                history = None
+                if user:
+                    import gk_similarity
+
+                    history = gk_similarity.history_index(user["id"])
                 questions = gk.generate_daily_questions(
                     _XAI_API_KEY, user_name=name, past_questions=past_qs,
+                    history_index=history,
                 )
                 db.save_daily_questions(user["id"], today, _json.dumps(questions))
             except Exception as exc:
@@ -4341,7 +4286,10 @@ def render_mental_math_practice():
                         sid = st.session_state.get("mm_sprint_id", 0)
                         cache_key = f"mm_hf_{sid}_{current}"
                         if cache_key not in st.session_state:
-                            st.session_state[cache_key] = None
+                            # Reuse an image generated earlier for the same prompt (any user).
+                            st.session_state[cache_key] = mm_hints.cached_hf_diagram_image(
+                                mm_hints.hf_prompt_for_diagram(hint_meta)
+                            )
                         if st.button("Generate AI diagram (Hugging Face)", key=f"mm_hf_{current}"):
                             prompt = mm_hints.hf_prompt_for_diagram(hint_meta)
                             img_bytes = mm_hints.generate_hf_diagram_image(prompt, api_key=hf_key)
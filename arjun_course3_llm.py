@@ -8,18 +8,18 @@ import re
 import time
 from typing import Callable
 
-from openai import APIConnectionError, APITimeoutError, OpenAI, OpenAIError
+from openai import APIConnectionError, APITimeoutError, OpenAIError
 
 import arjun_course3_content as c3
 from llm_question_format import KID_NUMERIC_FORMAT_RULES, NUMERIC_RETRY_HINT, validate_numerical_format
+from xai_client import XAIClient, get_xai_client
 
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 _MAX_RETRIES = 3
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL)
+def _get_client(xai_api_key: str) -> XAIClient:
+    return get_xai_client(xai_api_key)
 
 
 def _category_plan(categories: dict, count: int) -> list[str]:
@@ -7,17 +7,17 @@ import random
 import re
 from typing import Callable
 
-from openai import APIConnectionError, APITimeoutError, OpenAI, OpenAIError
+from openai import APIConnectionError, APITimeoutError, OpenAIError
 
 import arjun_linear_equation_strategies as leqs
+from xai_client import XAIClient, get_xai_client
 
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 _MAX_RETRIES = 3
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL)
+def _get_client(xai_api_key: str) -> XAIClient:
+    return get_xai_client(xai_api_key)
 
 
 def _strategy_catalog_text() -> str:
@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import random
 
+import question_pool
 from arjun_linear_equation_strategies import (
     STRATEGIES,
     attach_question_parts,
@@ -79,6 +80,25 @@ def _procedural_for_slot(slot: dict, used_ids: set[str], seen_fps: set[str]) ->
     return None
 
 
+def _pool_question(category: str) -> dict | None:
+    sid, lvl = category[1:].split("_", 1)
+    return _procedural_for_slot(_slot_dict(int(sid), lvl), set(), set())
+
+
+def _pool_keys(q: dict) -> frozenset[str]:
+    from practice_quality.dedup import fingerprints_for_question
+
+    return fingerprints_for_question(q)
+
+
+question_pool.register("linear", _pool_question, keys=_pool_keys, validate="linear")
+
+
+def _pooled_for_slot(slot: dict, used_ids: set[str], seen_fps: set[str]) -> dict | None:
+    q = question_pool.take("linear", slot["category"], used_ids, seen_fps)
+    return q or _procedural_for_slot(slot, used_ids, seen_fps)
+
+
 def _build_procedural_session(config: dict, count: int = DEFAULT_QUESTION_COUNT) -> list[dict]:
     plan = _slot_plan(config, count)
     if not plan:
@@ -86,7 +106,7 @@ def _build_procedural_session(config: dict, count: int = DEFAULT_QUESTION_COUNT)
     slots = [_slot_dict(sid, lvl) for sid, lvl in plan]
     return qa_and_assemble(
         slots,
-        _procedural_for_slot,
+        _pooled_for_slot,
         program="linear",
         max_attempts_per_slot=24,
     )
@@ -122,7 +142,7 @@ def build_session_set(
 
     linear_questions = qa_and_assemble(
         slots,
-        _procedural_for_slot,
+        _pooled_for_slot,
         initial=initial,
         exclude_ids=exclude_ids,
         exclude_keys=exclude_keys,
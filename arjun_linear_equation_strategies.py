@@ -5,8 +5,9 @@ from __future__ import annotations
 import random
 import re
 from fractions import Fraction
+from functools import lru_cache
 from math import gcd
-from typing import Callable
+from typing import Callable, NamedTuple
 
 LEVEL_ORDER = ["A", "B", "C", "D", "E"]
 
@@ -225,52 +226,197 @@ def compose_question(instruction: str, equation: str, followup: str = "") -> str
     return f"{inst}. {equation.strip()}."
 
 
-def _parse_x_value(text: str) -> float | None:
-    """Parse a numeric x answer (integer or simple fraction)."""
+def _parse_x_fraction(text: str) -> Fraction | None:
+    """Parse a numeric x answer (integer or simple fraction) exactly."""
     s = _normalize_math_text(str(text).strip())
     if re.fullmatch(r"-?\d+/\d+", s):
         num, den = s.split("/", 1)
-        den_i = int(den)
-        if den_i == 0:
+        if int(den) == 0:
             return None
-        return int(num) / den_i
+        return Fraction(int(num), int(den))
     if re.fullmatch(r"-?\d+", s):
-        return float(int(s))
+        return Fraction(int(s))
     return None
 
 
-def _prepare_expr_for_eval(expr: str) -> str:
-    s = _normalize_math_text(expr).replace(" ", "")
-    s = re.sub(r"(\d)\(", r"\1*(", s)
-    s = re.sub(r"\)(\d)", r")*\1", s)
-    s = re.sub(r"(\d)/(\d)([xy])", r"((\1)/(\2)*\3)", s)
-    s = re.sub(r"(-?\d+)([xy])", r"\1*\2", s)
-    return s
+def _parse_x_value(text: str) -> float | None:
+    """Parse a numeric x answer (integer or simple fraction)."""
+    value = _parse_x_fraction(text)
+    return None if value is None else float(value)
+
+
+class LinearForm(NamedTuple):
+    """``a*x + b`` with exact rational coefficients."""
+
+    a: Fraction
+    b: Fraction
+
+    def at(self, x: Fraction | int) -> Fraction:
+        return self.a * x + self.b
+
+    def root(self) -> Fraction | None:
+        """The x that makes the form zero, if there is exactly one."""
+        return -self.b / self.a if self.a else None
+
+
+# Numbers (integers, decimals, and "3/4" directly in front of x, which reads as
+# one coefficient), single letters, and operators.
+_TOKEN_RE = re.compile(r"(\d+/\d+)(?=[xX])|(\d+(?:\.\d*)?|\.\d+)|([A-Za-z])|([-+*/()])")
+
+
+def _tokenize(expr: str) -> list:
+    tokens: list = []
+    pos = 0
+    while pos < len(expr):
+        m = _TOKEN_RE.match(expr, pos)
+        if not m:
+            raise ValueError(f"Unsupported character {expr[pos]!r} in {expr!r}")
+        frac, num, letter, op = m.groups()
+        if frac or num:
+            tokens.append(Fraction(frac or num))
+        elif letter:
+            if letter not in "xX":
+                raise ValueError(f"Unsupported variable {letter!r} in {expr!r}")
+            tokens.append("x")
+        else:
+            tokens.append(op)
+        pos = m.end()
+    return tokens
+
+
+class _LinearParser:
+    """Recursive descent over ``_tokenize`` output, folding to ``LinearForm``.
+
+    Grammar (implicit multiplication binds like ``*``)::
+
+        expr   := term (("+" | "-") term)*
+        term   := unary (("*" | "/") unary | <implicit> unary)*
+        unary  := ("-" | "+") unary | atom
+        atom   := number | "x" | "(" expr ")"
+
+    Implicit multiplication applies before ``x`` and ``(`` (``3x``, ``2(x-5)``,
+    ``(x+1)(2)``) and between ``)`` and a number.
+    """
+
+    def __init__(self, tokens: list):
+        self.tokens = tokens
+        self.pos = 0
+
+    def parse(self) -> LinearForm:
+        if not self.tokens:
+            raise ValueError("Empty expression")
+        form = self._expr()
+        if self.pos != len(self.tokens):
+            raise ValueError(f"Unexpected {self.tokens[self.pos]!r}")
+        return form
+
+    def _peek(self):
+        return self.tokens[self.pos] if self.pos < len(self.tokens) else None
+
+    def _take(self):
+        tok = self._peek()
+        if tok is None:
+            raise ValueError("Unexpected end of expression")
+        self.pos += 1
+        return tok
+
+    def _expr(self) -> LinearForm:
+        left = self._term()
+        while self._peek() in ("+", "-"):
+            sign = 1 if self._take() == "+" else -1
+            right = self._term()
+            left = LinearForm(left.a + sign * right.a, left.b + sign * right.b)
+        return left
+
+    def _implicit(self) -> bool:
+        nxt = self._peek()
+        if nxt in ("x", "("):
+            return True
+        return isinstance(nxt, Fraction) and self.tokens[self.pos - 1] == ")"
+
+    def _term(self) -> LinearForm:
+        left = self._unary()
+        while True:
+            if self._peek() == "*":
+                self.pos += 1
+                left = _multiply(left, self._unary())
+            elif self._peek() == "/":
+                self.pos += 1
+                right = self._unary()
+                if right.a:
+                    raise ValueError("Division by an x term is not linear")
+                if not right.b:
+                    raise ZeroDivisionError("Division by zero")
+                left = LinearForm(left.a / right.b, left.b / right.b)
+            elif self._implicit():
+                left = _multiply(left, self._unary())
+            else:
+                return left
+
+    def _unary(self) -> LinearForm:
+        if self._peek() in ("-", "+"):
+            sign = -1 if self._take() == "-" else 1
+            inner = self._unary()
+            return LinearForm(sign * inner.a, sign * inner.b)
+        return self._atom()
+
+    def _atom(self) -> LinearForm:
+        tok = self._take()
+        if isinstance(tok, Fraction):
+            return LinearForm(Fraction(0), tok)
+        if tok == "x":
+            return LinearForm(Fraction(1), Fraction(0))
+        if tok == "(":
+            inner = self._expr()
+            if self._take() != ")":
+                raise ValueError("Unbalanced parentheses")
+            return inner
+        raise ValueError(f"Unexpected {tok!r}")
+
+
+def _multiply(left: LinearForm, right: LinearForm) -> LinearForm:
+    if left.a and right.a:
+        raise ValueError("Product of x terms is not linear")
+    return LinearForm(left.a * right.b + right.a * left.b, left.b * right.b)
+
+
+def compile_expression(expr: str) -> LinearForm:
+    """Fold a one-sided expression in x into ``a*x + b``.
+
+    Raises ValueError for anything that is not linear in x (other variables,
+    products of x terms, division by x) and ZeroDivisionError for ``/ 0``.
+    """
+    return _LinearParser(_tokenize(re.sub(r"\s+", "", _normalize_math_text(expr)))).parse()
+
+
+@lru_cache(maxsize=4096)
+def _compile_normalized(equation: str) -> LinearForm | None:
+    if equation.count("=") != 1:
+        return None
+    lhs, rhs = equation.split("=")
+    try:
+        left, right = compile_expression(lhs), compile_expression(rhs)
+    except (ValueError, ZeroDivisionError):
+        return None
+    return LinearForm(left.a - right.a, left.b - right.b)
 
 
-def _eval_expr_at_x(expr: str, x_val: float) -> float:
-    s = _prepare_expr_for_eval(expr)
-    s = re.sub(r"\bx\b", f"({x_val})", s, flags=re.I)
-    if not re.fullmatch(r"[-+*/().0-9]+", s):
-        raise ValueError(f"Unsupported expression: {expr}")
-    return float(eval(s, {"__builtins__": {}}, {}))
+def compile_equation(equation: str) -> LinearForm | None:
+    """``lhs - rhs`` as ``a*x + b``, or None when the equation is not linear in x.
+
+    Compiled once per distinct equation text (whitespace and unicode minus
+    signs ignored); every later check is exact Fraction arithmetic.
+    """
+    return _compile_normalized(re.sub(r"\s+", "", _normalize_math_text(str(equation))))
 
 
 def equation_holds_for_x(equation: str, x_value: str) -> bool:
     """True when substituting x_value satisfies the equation."""
-    x_val = _parse_x_value(x_value)
+    x_val = _parse_x_fraction(x_value)
     if x_val is None:
         return False
-    eq = _normalize_math_text(equation)
-    if "=" not in eq:
-        return False
-    lhs, rhs = eq.split("=", 1)
-    try:
-        left = _eval_expr_at_x(lhs, x_val)
-        right = _eval_expr_at_x(rhs, x_val)
-    except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
-        return False
-    return abs(left - right) < 1e-6
+    form = compile_equation(equation)
+    return form is not None and form.at(x_val) == 0
 
 
 def options_look_like_x_values(options: list[str]) -> bool:
@@ -307,7 +453,11 @@ def resolve_x_answer_index(
         return None
     if not question_asks_for_x_value(sid, lvl, instruction, followup):
         return None
-    matches = [i for i, opt in enumerate(options) if equation_holds_for_x(equation, opt)]
+    form = compile_equation(equation)
+    if form is None:
+        return None
+    values = [_parse_x_fraction(opt) for opt in options]
+    matches = [i for i, v in enumerate(values) if v is not None and form.at(v) == 0]
     if len(matches) == 1:
         return matches[0]
     return None
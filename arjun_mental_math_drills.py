@@ -5,6 +5,8 @@ from __future__ import annotations
 import random
 from math import gcd, lcm
 
+import question_pool
+
 MENTAL_MATH_PER_SESSION = 5
 MENTAL_MATH_COUNT_MAX = 15
 
@@ -755,6 +757,14 @@ def generate_drill_question(drill_id: str, level: str) -> dict | None:
     return fn(level)
 
 
+def _pool_question(slot: str) -> dict | None:
+    did, lvl = slot.rsplit("_", 1)
+    return generate_drill_question(did, lvl)
+
+
+question_pool.register("mental_drill", _pool_question)
+
+
 def build_mental_warmups(config: dict, count: int | None = None) -> list[dict]:
     """Generate mental-math warm-up questions from weekly drill selections."""
     slots = _active_drill_slots(config)
@@ -775,7 +785,8 @@ def build_mental_warmups(config: dict, count: int | None = None) -> list[dict]:
         if len(selected) >= count:
             break
         for _ in range(12):
-            q = generate_drill_question(did, lvl)
+            q = question_pool.take("mental_drill", f"{did}_{lvl}", used_ids)
+            q = q or generate_drill_question(did, lvl)
             if q and q["id"] not in used_ids:
                 selected.append(q)
                 used_ids.add(q["id"])
@@ -16,7 +16,8 @@ import time
 from datetime import date
 
 import httpx
-from openai import OpenAI
+
+from xai_client import get_xai_client
 
 XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
@@ -302,7 +303,7 @@ def generate_arjun_story(xai_api_key: str, topic: str | None = None) -> dict:
     if not topic:
         _, topic = get_random_topic()
 
-    client = OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL)
+    client = get_xai_client(xai_api_key)
 
     response = client.chat.completions.create(
         model=XAI_MODEL,
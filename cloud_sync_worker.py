@@ -0,0 +1,166 @@
+"""Background worker that drains the SQLite cloud-sync outbox.
+
+``database`` queues SharePoint rows and Google Sheets session flushes into
+``cloud_sync_outbox`` instead of calling the HTTPS APIs inside the Streamlit
+request thread.  One daemon thread per process pushes them, throttled per
+backend, retrying failures with exponential backoff until ``MAX_ATTEMPTS``.
+
+Queue health for a status panel or CLI::
+
+    import database as db
+    db.outbox_status()  # {"sheets": {"queue_depth": 0, "last_error": None, ...}, ...}
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from typing import Callable
+
+import database as db
+
+BACKENDS = ("sharepoint", "sheets")
+
+# Minimum seconds between two pushes to the same backend.  A Sheets session
+# flush costs 3-4 API calls against a 60 writes/minute quota.
+MIN_PUSH_INTERVAL = {"sharepoint": 0.5, "sheets": 5.0}
+
+MAX_ATTEMPTS = 8
+BACKOFF_BASE_SECONDS = 5.0
+BACKOFF_MAX_SECONDS = 900.0
+IDLE_POLL_SECONDS = 30.0
+CLAIM_BATCH = 20
+
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_thread: threading.Thread | None = None
+_last_push_at: dict[str, float] = {}
+
+
+def _push_sharepoint(kind: str, payload: dict) -> tuple[bool, str | None]:
+    import sharepoint_sync as sps
+
+    if not sps.is_configured():
+        return False, None
+    return getattr(sps, kind)(**payload)
+
+
+def _push_sheets(kind: str, payload: dict) -> tuple[bool, str | None]:
+    import google_sheets_sync as gss
+
+    if not gss.cloud_sync_enabled():
+        return False, None
+    return getattr(gss, kind)(**payload)
+
+
+def _push_sharepoint_batch(events: list[dict]) -> list[str | None]:
+    import sharepoint_sync as sps
+
+    return sps.persist_batch([(e["kind"], e["payload"]) for e in events])
+
+
+# backend -> handler(kind, payload) -> (pushed, error).  ``(False, None)`` means
+# the backend is switched off and the event is simply dropped.
+HANDLERS: dict[str, Callable[[str, dict], tuple[bool, str | None]]] = {
+    "sharepoint": _push_sharepoint,
+    "sheets": _push_sheets,
+}
+
+# Backends that can push a whole claimed batch in one go: handler(events) ->
+# one error (or None) per event.  SharePoint rows go out through Graph $batch.
+BATCH_HANDLERS: dict[str, Callable[[list[dict]], list[str | None]]] = {
+    "sharepoint": _push_sharepoint_batch,
+}
+
+
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts`` (1-based)."""
+    return min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+
+
+def _throttle(backend: str) -> None:
+    interval = MIN_PUSH_INTERVAL.get(backend, 0.0)
+    last = _last_push_at.get(backend)
+    if last is not None and interval > 0:
+        wait = interval - (time.monotonic() - last)
+        if wait > 0:
+            time.sleep(wait)
+    _last_push_at[backend] = time.monotonic()
+
+
+def _settle(event: dict, error: str | None) -> None:
+    backend = event["backend"]
+    if not error:
+        db.outbox_complete(event["id"], backend)
+        return
+    attempts = int(event["attempts"]) + 1
+    retry_at = None if attempts >= MAX_ATTEMPTS else time.time() + backoff_seconds(attempts)
+    db.outbox_fail(event["id"], backend, error, retry_at=retry_at)
+
+
+def _push_one(event: dict) -> None:
+    backend = event["backend"]
+    handler = HANDLERS.get(backend)
+    try:
+        if handler is None:
+            raise RuntimeError(f"no handler for backend {backend!r}")
+        _throttle(backend)
+        _, error = handler(event["kind"], event["payload"])
+    except Exception as exc:
+        error = str(exc) or exc.__class__.__name__
+    _settle(event, error)
+
+
+def _push_batch(backend: str, events: list[dict]) -> None:
+    try:
+        _throttle(backend)
+        errors = list(BATCH_HANDLERS[backend](events))
+    except Exception as exc:
+        errors = [str(exc) or exc.__class__.__name__] * len(events)
+    for event, error in zip(events, errors):
+        _settle(event, error)
+
+
+def drain_once(*, backends: tuple[str, ...] = BACKENDS, limit: int = CLAIM_BATCH) -> int:
+    """Push every currently-due event once. Returns how many were attempted."""
+    attempted = 0
+    for backend in backends:
+        events = db.outbox_claim(backend, limit=limit)
+        if not events:
+            continue
+        if backend in BATCH_HANDLERS:
+            _push_batch(backend, events)
+        else:
+            for event in events:
+                _push_one(event)
+        attempted += len(events)
+    return attempted
+
+
+def _run() -> None:
+    while True:
+        try:
+            if drain_once():
+                continue
+            due = db.outbox_next_due()
+        except Exception:
+            due = None
+        timeout = IDLE_POLL_SECONDS if due is None else min(max(due, 0.05), IDLE_POLL_SECONDS)
+        _wake.wait(timeout)
+        _wake.clear()
+
+
+def ensure_started() -> None:
+    """Start the per-process drain thread (idempotent)."""
+    global _thread
+    with _start_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, name="cloud-sync-outbox", daemon=True)
+        _thread.start()
+
+
+def notify() -> None:
+    """Wake the worker after an enqueue, starting it on first use."""
+    ensure_started()
+    _wake.set()
@@ -6,26 +6,203 @@ Uses SQLite for persistent storage of user activity, streaks, and scores.
 import json
 import sqlite3
 import os
+import threading
+import time
+import weakref
+from collections.abc import Callable, Sequence
 from datetime import datetime, timedelta
 from contextlib import contextmanager
+from dataclasses import dataclass
 
 DB_PATH = os.environ.get("ONEPERCENT_DB", "onepercent.db")
 
+# Applied once when a pooled connection is opened (not on every checkout).
+_CONNECTION_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-16000",
+    "PRAGMA mmap_size=134217728",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA busy_timeout=5000",
+)
+
+
+class _ThreadSlot:
+    """Connection bound to one thread; released back to the pool when the thread exits."""
+
+    __slots__ = ("path", "conn", "depth", "__weakref__")
+
+    def __init__(self, path: str, conn: sqlite3.Connection):
+        self.path = path
+        self.conn = conn
+        self.depth = 0
+
+
+class _ConnectionPool:
+    """One long-lived SQLite connection per thread, with idle connections recycled.
+
+    Streamlit runs each script rerun on a worker thread; when such a thread
+    exits its connection goes onto a small idle list so the next thread
+    reuses it instead of paying for ``sqlite3.connect`` + pragmas again.
+    """
+
+    def __init__(self, max_idle: int = 8):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._idle: list[tuple[str, sqlite3.Connection]] = []
+        self._live: dict[int, sqlite3.Connection] = {}
+        self._max_idle = max_idle
+        self._opened = 0
+        self._reused = 0
+
+    def _open(self, path: str) -> sqlite3.Connection:
+        # "IMMEDIATE": sqlite3 opens the transaction with BEGIN IMMEDIATE right before
+        # the first INSERT/UPDATE/DELETE, so reads before it run in autocommit and a
+        # block never has to upgrade a read snapshot to a write lock (which fails
+        # with "database is locked" at once if another connection committed since).
+        conn = sqlite3.connect(path, isolation_level="IMMEDIATE", check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            try:
+                conn.execute(pragma)
+            except sqlite3.DatabaseError:
+                pass
+        with self._lock:
+            self._opened += 1
+            self._live[id(conn)] = conn
+        return conn
+
+    def _close(self, conn: sqlite3.Connection) -> None:
+        with self._lock:
+            self._live.pop(id(conn), None)
+        try:
+            conn.close()
+        except sqlite3.Error:
+            pass
+
+    def _release(self, path: str, conn: sqlite3.Connection) -> None:
+        """Return a thread's connection to the idle list (called when its slot dies)."""
+        if conn.in_transaction:
+            try:
+                conn.rollback()
+            except sqlite3.Error:
+                pass
+        with self._lock:
+            keep = id(conn) in self._live and len(self._idle) < self._max_idle
+            if keep:
+                self._idle.append((path, conn))
+        if not keep:
+            self._close(conn)
+
+    def _take_idle(self, path: str) -> sqlite3.Connection | None:
+        with self._lock:
+            for i in range(len(self._idle) - 1, -1, -1):
+                if self._idle[i][0] == path:
+                    return self._idle.pop(i)[1]
+        return None
+
+    def slot(self, path: str) -> _ThreadSlot:
+        """This thread's slot for ``path`` (opening or recycling a connection if needed)."""
+        slot = getattr(self._local, "slot", None)
+        if slot is not None and slot.path == path:
+            with self._lock:
+                self._reused += 1
+            return slot
+        if slot is not None:
+            # DB_PATH changed (tests / CLI tools); drop the old binding.
+            self._local.slot = None
+            del slot
+        conn = self._take_idle(path)
+        if conn is None:
+            conn = self._open(path)
+        else:
+            with self._lock:
+                self._reused += 1
+        slot = _ThreadSlot(path, conn)
+        weakref.finalize(slot, self._release, path, conn)
+        self._local.slot = slot
+        return slot
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections_opened": self._opened,
+                "connections_reused": self._reused,
+                "connections_live": len(self._live),
+                "connections_idle": len(self._idle),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._opened = 0
+            self._reused = 0
+
+    def close_all(self) -> None:
+        """Close every pooled connection (shutdown, tests, or after swapping DB files)."""
+        self._local = threading.local()
+        with self._lock:
+            conns = list(self._live.values())
+            self._live.clear()
+            self._idle.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except sqlite3.Error:
+                pass
+
+
+_pool = _ConnectionPool()
+
 
 @contextmanager
-def get_connection():
-    """Context manager for database connections."""
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA journal_mode=WAL")
+def get_connection(snapshot: bool = False):
+    """Context manager for database connections.
+
+    Yields this thread's pooled connection. The outermost ``with`` block's
+    writes form one transaction, begun (IMMEDIATE) at its first write and
+    committed on success or rolled back on error; nested blocks on the same
+    thread join it.
+
+    ``snapshot=True`` is for read-only blocks that need every query to see
+    the same data: the block runs in one deferred read transaction, and
+    writes are refused (``PRAGMA query_only``) since they could not upgrade
+    it safely.
+    """
+    slot = _pool.slot(DB_PATH)
+    conn = slot.conn
+    outermost = slot.depth == 0
+    read_only = snapshot and outermost and not conn.in_transaction
+    slot.depth += 1
     try:
+        if read_only:
+            conn.execute("PRAGMA query_only = ON")
+            conn.execute("BEGIN")
         yield conn
-        conn.commit()
-    except Exception:
-        conn.rollback()
+        if outermost and conn.in_transaction:
+            conn.commit()
+    except BaseException:
+        if outermost and conn.in_transaction:
+            conn.rollback()
         raise
     finally:
-        conn.close()
+        slot.depth -= 1
+        if read_only:
+            conn.execute("PRAGMA query_only = OFF")
+
+
+def get_connection_stats() -> dict:
+    """Pool counters: connections opened vs. reused, plus live/idle totals."""
+    return _pool.stats()
+
+
+def reset_connection_stats() -> None:
+    """Zero the opened/reused counters (e.g. before timing one rerun)."""
+    _pool.reset_stats()
+
+
+def close_all_connections() -> None:
+    """Close every pooled connection; the next ``get_connection`` reopens lazily."""
+    _pool.close_all()
 
 
 def init_db():
@@ -220,21 +397,7 @@ def init_db():
             CREATE INDEX IF NOT EXISTS idx_harshit_practice_user_prereq
                 ON harshit_practice_sessions(user_id, prereq_id, completed_at DESC);
         """)
-        # Migration: add time_spent_seconds if missing (added after initial schema)
-        try:
-            conn.execute("ALTER TABLE activity_scores ADD COLUMN time_spent_seconds INTEGER DEFAULT 0")
-        except sqlite3.OperationalError:
-            pass
-        for stmt in (
-            "ALTER TABLE activity_scores ADD COLUMN sync_id TEXT",
-            "ALTER TABLE reading_progress ADD COLUMN sync_id TEXT",
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_activity_scores_sync_id ON activity_scores(sync_id)",
-            "CREATE UNIQUE INDEX IF NOT EXISTS idx_reading_progress_sync_id ON reading_progress(sync_id)",
-        ):
-            try:
-                conn.execute(stmt)
-            except sqlite3.OperationalError:
-                pass
+        _run_migrations(conn)
 
         # Seed default users
         default_users = [
@@ -251,6 +414,308 @@ def init_db():
             )
 
 
+# ── Schema migrations ──
+#
+# Each step runs once, in order, inside its own savepoint; the highest applied
+# version is recorded in ``schema_version``.  Steps must be safe on databases
+# created before this table existed (those already carry some v1 columns).
+
+
+def _column_exists(conn: sqlite3.Connection, table: str, column: str) -> bool:
+    return any(r["name"] == column for r in conn.execute(f"PRAGMA table_info({table})"))
+
+
+def _add_column(conn: sqlite3.Connection, table: str, column: str, decl: str) -> None:
+    if not _column_exists(conn, table, column):
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {decl}")
+
+
+def _migration_sync_columns(conn: sqlite3.Connection) -> None:
+    _add_column(conn, "activity_scores", "time_spent_seconds", "INTEGER DEFAULT 0")
+    _add_column(conn, "activity_scores", "sync_id", "TEXT")
+    _add_column(conn, "reading_progress", "sync_id", "TEXT")
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_activity_scores_sync_id ON activity_scores(sync_id)"
+    )
+    conn.execute(
+        "CREATE UNIQUE INDEX IF NOT EXISTS idx_reading_progress_sync_id ON reading_progress(sync_id)"
+    )
+
+
+def _migration_query_indexes(conn: sqlite3.Connection) -> None:
+    for stmt in (
+        # Per-day aggregates (calendars, daily summary, totals, dashboard snapshot):
+        # covering, so SUM/AVG/COUNT never touch the table rows.
+        """CREATE INDEX IF NOT EXISTS idx_activity_scores_user_date
+               ON activity_scores(user_id, log_date, score, time_spent_seconds)""",
+        # Per-activity history and today's scores for one activity type.
+        """CREATE INDEX IF NOT EXISTS idx_activity_scores_user_type_date
+               ON activity_scores(user_id, activity_type, log_date)""",
+        """CREATE INDEX IF NOT EXISTS idx_reading_progress_user_date
+               ON reading_progress(user_id, log_date)""",
+        """CREATE INDEX IF NOT EXISTS idx_ec3_sessions_user_unit
+               ON ec3_practice_sessions(user_id, unit_id, completed_at DESC)""",
+    ):
+        conn.execute(stmt)
+
+
+# daily_summaries rows with source='local' are maintained by these triggers from
+# activity_scores; source='sheet' rows come from Google Sheets imports and are
+# replaced the first time a local activity lands on that day.  The imported
+# values are kept in the sheet_* columns and come back when the day's last
+# local activity is deleted.
+_SHEET_RESTORE_SQL = """
+    activities_count = sheet_activities_count,
+    avg_score_pct = sheet_avg_score_pct,
+    time_spent_seconds = sheet_time_spent_seconds,
+    score_sum = 0,
+    best_score = 0,
+    source = 'sheet',
+    updated_at = datetime('now', 'localtime')"""
+
+
+def _summary_add_sql(ref: str) -> str:
+    return f"""
+        INSERT INTO daily_summaries
+            (user_id, log_date, activities_count, score_sum, best_score,
+             avg_score_pct, time_spent_seconds, source, updated_at)
+        VALUES ({ref}.user_id, {ref}.log_date, 1, COALESCE({ref}.score, 0),
+                COALESCE({ref}.score, 0), COALESCE({ref}.score, 0),
+                COALESCE({ref}.time_spent_seconds, 0), 'local',
+                datetime('now', 'localtime'))
+        ON CONFLICT(user_id, log_date) DO UPDATE SET
+            activities_count = CASE WHEN source = 'local'
+                THEN activities_count + 1 ELSE 1 END,
+            score_sum = CASE WHEN source = 'local'
+                THEN score_sum + excluded.score_sum ELSE excluded.score_sum END,
+            best_score = CASE WHEN source = 'local'
+                THEN MAX(best_score, excluded.best_score) ELSE excluded.best_score END,
+            time_spent_seconds = CASE WHEN source = 'local'
+                THEN time_spent_seconds + excluded.time_spent_seconds
+                ELSE excluded.time_spent_seconds END,
+            source = 'local',
+            updated_at = excluded.updated_at;
+        UPDATE daily_summaries
+        SET avg_score_pct = CAST(ROUND(1.0 * score_sum / activities_count) AS INTEGER)
+        WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date;
+    """
+
+
+def _summary_remove_sql(ref: str) -> str:
+    return f"""
+        UPDATE daily_summaries SET
+            activities_count = activities_count - 1,
+            score_sum = score_sum - COALESCE({ref}.score, 0),
+            time_spent_seconds = time_spent_seconds - COALESCE({ref}.time_spent_seconds, 0),
+            best_score = (SELECT MAX(score) FROM activity_scores
+                          WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date),
+            updated_at = datetime('now', 'localtime')
+        WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date AND source = 'local';
+        UPDATE daily_summaries SET {_SHEET_RESTORE_SQL}
+        WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date
+          AND source = 'local' AND activities_count <= 0
+          AND sheet_activities_count IS NOT NULL;
+        DELETE FROM daily_summaries
+        WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date
+          AND source = 'local' AND activities_count <= 0;
+        UPDATE daily_summaries
+        SET avg_score_pct = CAST(ROUND(1.0 * score_sum / activities_count) AS INTEGER)
+        WHERE user_id = {ref}.user_id AND log_date = {ref}.log_date AND source = 'local';
+    """
+
+
+def _add_summary_columns(conn: sqlite3.Connection) -> None:
+    _add_column(conn, "daily_summaries", "score_sum", "INTEGER DEFAULT 0")
+    _add_column(conn, "daily_summaries", "best_score", "INTEGER DEFAULT 0")
+    _add_column(conn, "daily_summaries", "source", "TEXT NOT NULL DEFAULT 'sheet'")
+    _add_column(conn, "daily_summaries", "sheet_activities_count", "INTEGER")
+    _add_column(conn, "daily_summaries", "sheet_avg_score_pct", "INTEGER")
+    _add_column(conn, "daily_summaries", "sheet_time_spent_seconds", "INTEGER")
+
+
+def _migration_incremental_daily_summaries(conn: sqlite3.Connection) -> None:
+    _add_summary_columns(conn)
+    _create_summary_triggers(conn)
+    _rebuild_daily_summaries(conn)
+
+
+def _create_summary_triggers(conn: sqlite3.Connection) -> None:
+    """(Re)create the activity_scores triggers from the current trigger SQL."""
+    for name in ("insert", "delete", "update"):
+        conn.execute(f"DROP TRIGGER IF EXISTS trg_activity_scores_summary_{name}")
+    conn.execute(
+        f"""CREATE TRIGGER trg_activity_scores_summary_insert
+            AFTER INSERT ON activity_scores
+            BEGIN {_summary_add_sql("NEW")} END"""
+    )
+    conn.execute(
+        f"""CREATE TRIGGER trg_activity_scores_summary_delete
+            AFTER DELETE ON activity_scores
+            BEGIN {_summary_remove_sql("OLD")} END"""
+    )
+    conn.execute(
+        f"""CREATE TRIGGER trg_activity_scores_summary_update
+            AFTER UPDATE OF user_id, log_date, score, time_spent_seconds ON activity_scores
+            BEGIN {_summary_remove_sql("OLD")} {_summary_add_sql("NEW")} END"""
+    )
+
+
+def _migration_summary_sheet_values(conn: sqlite3.Connection) -> None:
+    _add_summary_columns(conn)
+    conn.execute(
+        """UPDATE daily_summaries SET
+               sheet_activities_count = activities_count,
+               sheet_avg_score_pct = avg_score_pct,
+               sheet_time_spent_seconds = time_spent_seconds
+           WHERE source = 'sheet'"""
+    )
+    _create_summary_triggers(conn)
+
+
+def _migration_cloud_sync_outbox(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS cloud_sync_outbox (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               backend TEXT NOT NULL,
+               kind TEXT NOT NULL,
+               payload_json TEXT NOT NULL,
+               coalesce_key TEXT,
+               status TEXT NOT NULL DEFAULT 'pending',
+               attempts INTEGER NOT NULL DEFAULT 0,
+               next_attempt_at REAL NOT NULL,
+               claimed_at REAL,
+               created_at REAL NOT NULL,
+               last_error TEXT
+           )"""
+    )
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_cloud_sync_outbox_due
+               ON cloud_sync_outbox(backend, status, next_attempt_at)"""
+    )
+    # At most one *pending* event per key, so repeat events fold into one push.
+    conn.execute(
+        """CREATE UNIQUE INDEX IF NOT EXISTS idx_cloud_sync_outbox_coalesce
+               ON cloud_sync_outbox(coalesce_key) WHERE status = 'pending'"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS cloud_sync_backend_state (
+               backend TEXT PRIMARY KEY,
+               last_success_at REAL,
+               last_error TEXT,
+               last_error_at REAL
+           )"""
+    )
+
+
+def _migration_sharepoint_pushed_ids(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS sharepoint_pushed (
+               sync_id TEXT PRIMARY KEY,
+               pushed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           ) WITHOUT ROWID"""
+    )
+
+
+def _migration_sharepoint_delta_state(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS sharepoint_delta_state (
+               list_key TEXT PRIMARY KEY,
+               delta_link TEXT NOT NULL,
+               updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+
+
+def _migration_gk_question_signatures(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS gk_question_signatures (
+               user_id INTEGER NOT NULL,
+               question TEXT NOT NULL,
+               gk_quiz_id INTEGER NOT NULL,
+               signature BLOB NOT NULL,
+               PRIMARY KEY (user_id, question)
+           ) WITHOUT ROWID"""
+    )
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS gk_signature_watermarks (
+               user_id INTEGER PRIMARY KEY,
+               last_quiz_id INTEGER NOT NULL
+           )"""
+    )
+
+
+def _migration_question_pool(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS question_pool (
+               id INTEGER PRIMARY KEY AUTOINCREMENT,
+               program TEXT NOT NULL,
+               slot TEXT NOT NULL,
+               version TEXT NOT NULL,
+               question_id TEXT NOT NULL,
+               keys_json TEXT NOT NULL,
+               question_json TEXT NOT NULL,
+               created_at REAL NOT NULL
+           )"""
+    )
+    conn.execute(
+        """CREATE INDEX IF NOT EXISTS idx_question_pool_slot
+               ON question_pool(program, slot, version, id)"""
+    )
+
+
+_MIGRATIONS: list[tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "activity/reading sync columns", _migration_sync_columns),
+    (2, "covering indexes for dashboard and history queries", _migration_query_indexes),
+    (3, "trigger-maintained daily_summaries", _migration_incremental_daily_summaries),
+    (4, "cloud sync outbox", _migration_cloud_sync_outbox),
+    (5, "local set of sync_ids already pushed to SharePoint", _migration_sharepoint_pushed_ids),
+    (6, "SharePoint delta import cursor", _migration_sharepoint_delta_state),
+    (7, "MinHash signatures of past GK questions", _migration_gk_question_signatures),
+    (8, "pre-generated practice question pools", _migration_question_pool),
+    (9, "sheet values kept under local daily_summaries", _migration_summary_sheet_values),
+]
+
+
+def _run_migrations(conn: sqlite3.Connection) -> int:
+    """Apply pending migration steps; returns the resulting schema version."""
+    conn.execute(
+        """CREATE TABLE IF NOT EXISTS schema_version (
+               version INTEGER PRIMARY KEY,
+               description TEXT NOT NULL,
+               applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+           )"""
+    )
+    row = conn.execute("SELECT MAX(version) AS v FROM schema_version").fetchone()
+    current = int(row["v"] or 0)
+    for version, description, step in _MIGRATIONS:
+        if version <= current:
+            continue
+        conn.execute(f"SAVEPOINT migration_{version}")
+        try:
+            step(conn)
+            conn.execute(
+                "INSERT INTO schema_version (version, description) VALUES (?, ?)",
+                (version, description),
+            )
+        except Exception:
+            conn.execute(f"ROLLBACK TO migration_{version}")
+            conn.execute(f"RELEASE migration_{version}")
+            raise
+        conn.execute(f"RELEASE migration_{version}")
+        current = version
+    return current
+
+
+def get_schema_version() -> int:
+    """Highest migration version applied to the current database (0 if none)."""
+    with get_connection() as conn:
+        try:
+            row = conn.execute("SELECT MAX(version) AS v FROM schema_version").fetchone()
+        except sqlite3.OperationalError:
+            return 0
+    return int(row["v"] or 0)
+
+
 def get_user(name: str) -> dict | None:
     """Get a user by name."""
     with get_connection() as conn:
@@ -282,8 +747,18 @@ def get_user_by_id(user_id: int) -> dict | None:
         return dict(row) if row else None
 
 
-def _sharepoint_push(method_name: str, **kwargs) -> None:
-    """Best-effort SharePoint sync; never raises."""
+def _enqueue_cloud_sync(
+    backend: str, kind: str, payload: dict, *, coalesce_key: str | None = None
+) -> None:
+    """Queue a push for the background worker instead of blocking this rerun."""
+    outbox_enqueue(backend, kind, payload, coalesce_key=coalesce_key)
+    import cloud_sync_worker
+
+    cloud_sync_worker.notify()
+
+
+def _sharepoint_push(method_name: str, *, coalesce_key: str | None = None, **kwargs) -> None:
+    """Best-effort SharePoint sync via the outbox; never raises."""
     try:
         import google_sheets_sync as gss
 
@@ -292,7 +767,7 @@ def _sharepoint_push(method_name: str, **kwargs) -> None:
         import sharepoint_sync as sps
 
         if sps.is_configured():
-            getattr(sps, method_name)(**kwargs)
+            _enqueue_cloud_sync("sharepoint", method_name, kwargs, coalesce_key=coalesce_key)
     except Exception:
         pass
 
@@ -309,12 +784,44 @@ def record_daily_login(user_id: int):
     if user:
         _sharepoint_push(
             "persist_daily_login",
+            coalesce_key=f"sharepoint:login:{user_id}:{today}",
             user_name=user["name"],
             user_id=user_id,
             log_date=today,
         )
 
 
+# Gaps-and-islands: consecutive dates share ``julianday(date) - row_number``, so
+# the island holding the most recent login is the current run of days.
+_STREAK_SQL = """
+    WITH days AS (
+        SELECT DISTINCT log_date FROM daily_logs WHERE user_id = :user_id
+    ),
+    islands AS (
+        SELECT log_date,
+               julianday(log_date) - ROW_NUMBER() OVER (ORDER BY log_date) AS grp
+        FROM days
+    ),
+    latest AS (
+        SELECT MAX(log_date) AS last_day, COUNT(*) AS run_length
+        FROM islands GROUP BY grp ORDER BY last_day DESC LIMIT 1
+    )
+    SELECT
+        (SELECT COUNT(*) FROM days) AS total_days,
+        COALESCE(
+            (SELECT CASE WHEN julianday(:today) - julianday(last_day) <= 1
+                         THEN run_length ELSE 0 END
+             FROM latest),
+            0
+        ) AS streak
+"""
+
+
+def _login_streak_row(conn: sqlite3.Connection, user_id: int) -> sqlite3.Row:
+    today = datetime.now().strftime("%Y-%m-%d")
+    return conn.execute(_STREAK_SQL, {"user_id": user_id, "today": today}).fetchone()
+
+
 def get_login_streak(user_id: int) -> int:
     """Calculate the current consecutive login streak for a user.
 
@@ -324,29 +831,8 @@ def get_login_streak(user_id: int) -> int:
     the app today).
     """
     with get_connection() as conn:
-        rows = conn.execute(
-            "SELECT DISTINCT log_date FROM daily_logs WHERE user_id = ? ORDER BY log_date DESC",
-            (user_id,),
-        ).fetchall()
-
-    if not rows:
-        return 0
-
-    today = datetime.now().date()
-    dates = [datetime.strptime(r["log_date"], "%Y-%m-%d").date() for r in rows]
-
-    # The streak is only valid if the most recent login is today or yesterday
-    if (today - dates[0]).days > 1:
-        return 0
-
-    streak = 1
-    for i in range(1, len(dates)):
-        if (dates[i - 1] - dates[i]).days == 1:
-            streak += 1
-        else:
-            break
-
-    return streak
+        row = _login_streak_row(conn, user_id)
+    return int(row["streak"]) if row else 0
 
 
 def get_total_login_days(user_id: int) -> int:
@@ -421,12 +907,17 @@ def save_activity_score(
 
 
 def _google_sheets_flush_user_session(user_id: int, log_date: str) -> None:
-    """Best-effort Google Sheets sync once after a session completes."""
+    """Best-effort Google Sheets sync once after a session completes (queued, coalesced per day)."""
     try:
         import google_sheets_sync as gss
 
         if gss.cloud_sync_enabled():
-            gss.flush_user_session_to_sheets(user_id, log_date)
+            _enqueue_cloud_sync(
+                "sheets",
+                "flush_user_session_to_sheets",
+                {"user_id": user_id, "log_date": log_date},
+                coalesce_key=f"sheets:session:{user_id}:{log_date}",
+            )
     except Exception:
         pass
 
@@ -586,17 +1077,27 @@ def get_daily_time_spent(user_id: int, days: int = 30) -> list[dict]:
     with get_connection() as conn:
         rows = conn.execute(
             """SELECT log_date,
-                      SUM(COALESCE(time_spent_seconds, 0)) as total_seconds,
-                      COUNT(*) as activity_count
-               FROM activity_scores
-               WHERE user_id = ? AND log_date >= ?
-               GROUP BY log_date
+                      time_spent_seconds as total_seconds,
+                      activities_count as activity_count
+               FROM daily_summaries
+               WHERE user_id = ? AND log_date >= ? AND source = 'local'
                ORDER BY log_date ASC""",
             (user_id, start_date),
         ).fetchall()
         return [dict(r) for r in rows]
 
 
+def _local_summaries_since(conn: sqlite3.Connection, user_id: int, start: str) -> dict:
+    """Trigger-maintained per-day aggregates keyed by log_date."""
+    rows = conn.execute(
+        """SELECT log_date, activities_count, score_sum, best_score, time_spent_seconds
+           FROM daily_summaries
+           WHERE user_id = ? AND log_date >= ? AND source = 'local'""",
+        (user_id, start),
+    ).fetchall()
+    return {r["log_date"]: r for r in rows}
+
+
 def get_daily_time_spent_calendar(user_id: int, days: int = 30) -> list[dict]:
     """Every calendar day in the last `days` days (including today) with time totals.
 
@@ -605,30 +1106,20 @@ def get_daily_time_spent_calendar(user_id: int, days: int = 30) -> list[dict]:
     """
     end = datetime.now().date()
     start = end - timedelta(days=days - 1)
-    start_str = start.strftime("%Y-%m-%d")
     with get_connection() as conn:
-        rows = conn.execute(
-            """SELECT log_date,
-                      SUM(COALESCE(time_spent_seconds, 0)) as total_seconds,
-                      COUNT(*) as activity_count
-               FROM activity_scores
-               WHERE user_id = ? AND log_date >= ?
-               GROUP BY log_date""",
-            (user_id, start_str),
-        ).fetchall()
-    by_date = {
-        r["log_date"]: {
-            "total_seconds": r["total_seconds"] or 0,
-            "activity_count": r["activity_count"] or 0,
-        }
-        for r in rows
-    }
+        by_date = _local_summaries_since(conn, user_id, start.strftime("%Y-%m-%d"))
     out = []
     d = start
     while d <= end:
         ds = d.strftime("%Y-%m-%d")
-        rec = by_date.get(ds, {"total_seconds": 0, "activity_count": 0})
-        out.append({"log_date": ds, **rec})
+        r = by_date.get(ds)
+        out.append(
+            {
+                "log_date": ds,
+                "total_seconds": int(r["time_spent_seconds"]) if r else 0,
+                "activity_count": int(r["activities_count"]) if r else 0,
+            }
+        )
         d += timedelta(days=1)
     return out
 
@@ -640,31 +1131,20 @@ def get_daily_score_calendar(user_id: int, days: int = 30) -> list[dict]:
     """
     end = datetime.now().date()
     start = end - timedelta(days=days - 1)
-    start_str = start.strftime("%Y-%m-%d")
     with get_connection() as conn:
-        rows = conn.execute(
-            """SELECT log_date,
-                      AVG(score) as avg_score,
-                      MAX(score) as best_score,
-                      COUNT(*) as activity_count
-               FROM activity_scores
-               WHERE user_id = ? AND log_date >= ?
-               GROUP BY log_date""",
-            (user_id, start_str),
-        ).fetchall()
-    by_date = {r["log_date"]: dict(r) for r in rows}
+        by_date = _local_summaries_since(conn, user_id, start.strftime("%Y-%m-%d"))
     out = []
     d = start
     while d <= end:
         ds = d.strftime("%Y-%m-%d")
-        if ds in by_date:
-            r = by_date[ds]
+        r = by_date.get(ds)
+        if r:
             out.append(
                 {
                     "log_date": ds,
-                    "avg_score": round(r["avg_score"], 1) if r["avg_score"] is not None else None,
-                    "best_score": int(r["best_score"]) if r["best_score"] is not None else None,
-                    "activity_count": int(r["activity_count"] or 0),
+                    "avg_score": round(r["score_sum"] / r["activities_count"], 1),
+                    "best_score": int(r["best_score"]),
+                    "activity_count": int(r["activities_count"]),
                 }
             )
         else:
@@ -684,7 +1164,8 @@ def get_total_time_spent(user_id: int) -> int:
     """Get the all-time total seconds spent across all activities."""
     with get_connection() as conn:
         row = conn.execute(
-            "SELECT SUM(COALESCE(time_spent_seconds, 0)) as total FROM activity_scores WHERE user_id = ?",
+            "SELECT SUM(time_spent_seconds) as total FROM daily_summaries "
+            "WHERE user_id = ? AND source = 'local'",
             (user_id,),
         ).fetchone()
         return row["total"] if row and row["total"] else 0
@@ -692,37 +1173,39 @@ def get_total_time_spent(user_id: int) -> int:
 
 def get_today_time_spent(user_id: int) -> int:
     """Get total seconds spent on activities today."""
-    today = datetime.now().strftime("%Y-%m-%d")
-    with get_connection() as conn:
-        row = conn.execute(
-            "SELECT SUM(COALESCE(time_spent_seconds, 0)) as total FROM activity_scores "
-            "WHERE user_id = ? AND log_date = ?",
-            (user_id, today),
-        ).fetchone()
-        return row["total"] if row and row["total"] else 0
+    return compute_user_daily_summary(user_id)["time_spent_seconds"]
+
+
+def _summary_stats(row: sqlite3.Row | None) -> dict:
+    """Dashboard dict for one daily_summaries row (averages local rows from score_sum)."""
+    if row is None:
+        return {"activities_count": 0, "avg_score_pct": 0, "time_spent_seconds": 0}
+    count = int(row["activities_count"])
+    if row["source"] == "local":
+        avg = round(row["score_sum"] / count) if count else 0
+    else:
+        avg = int(row["avg_score_pct"])
+    return {
+        "activities_count": count,
+        "avg_score_pct": avg,
+        "time_spent_seconds": int(row["time_spent_seconds"]),
+    }
+
+
+def _daily_summary_row(conn: sqlite3.Connection, user_id: int, log_date: str) -> sqlite3.Row | None:
+    return conn.execute(
+        """SELECT activities_count, score_sum, avg_score_pct, time_spent_seconds, source
+           FROM daily_summaries WHERE user_id = ? AND log_date = ?""",
+        (user_id, log_date),
+    ).fetchone()
 
 
 def compute_user_daily_summary(user_id: int, log_date: str | None = None) -> dict:
     """Activities count, average score %, and time spent for one user on one day."""
     log_date = log_date or datetime.now().strftime("%Y-%m-%d")
     with get_connection() as conn:
-        rows = conn.execute(
-            """SELECT score, COALESCE(time_spent_seconds, 0) AS time_spent_seconds
-               FROM activity_scores WHERE user_id = ? AND log_date = ?""",
-            (user_id, log_date),
-        ).fetchall()
-    activities_count = len(rows)
-    if activities_count:
-        avg_score_pct = round(sum(r["score"] for r in rows) / activities_count)
-        time_spent_seconds = sum(int(r["time_spent_seconds"] or 0) for r in rows)
-    else:
-        avg_score_pct = 0
-        time_spent_seconds = 0
-    return {
-        "activities_count": activities_count,
-        "avg_score_pct": avg_score_pct,
-        "time_spent_seconds": time_spent_seconds,
-    }
+        row = _daily_summary_row(conn, user_id, log_date)
+    return _summary_stats(row if row is not None and row["source"] == "local" else None)
 
 
 def import_daily_summary(
@@ -734,18 +1217,31 @@ def import_daily_summary(
     time_spent_seconds: int,
     updated_at: str = "",
 ) -> None:
-    """Upsert a daily summary row imported from Google Sheets."""
+    """Upsert a daily summary row imported from Google Sheets.
+
+    Days that already have local activity keep their trigger-maintained totals;
+    the sheet values are stored alongside and shown again if that activity is deleted.
+    """
     when = updated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     with get_connection() as conn:
         conn.execute(
             """INSERT INTO daily_summaries
-               (user_id, log_date, activities_count, avg_score_pct, time_spent_seconds, updated_at)
-               VALUES (?, ?, ?, ?, ?, ?)
+               (user_id, log_date, activities_count, avg_score_pct, time_spent_seconds,
+                updated_at, source, sheet_activities_count, sheet_avg_score_pct,
+                sheet_time_spent_seconds)
+               VALUES (?1, ?2, ?3, ?4, ?5, ?6, 'sheet', ?3, ?4, ?5)
                ON CONFLICT(user_id, log_date) DO UPDATE SET
-                 activities_count = excluded.activities_count,
-                 avg_score_pct = excluded.avg_score_pct,
-                 time_spent_seconds = excluded.time_spent_seconds,
-                 updated_at = excluded.updated_at""",
+                 sheet_activities_count = excluded.sheet_activities_count,
+                 sheet_avg_score_pct = excluded.sheet_avg_score_pct,
+                 sheet_time_spent_seconds = excluded.sheet_time_spent_seconds,
+                 activities_count = CASE WHEN source = 'local'
+                   THEN activities_count ELSE excluded.activities_count END,
+                 avg_score_pct = CASE WHEN source = 'local'
+                   THEN avg_score_pct ELSE excluded.avg_score_pct END,
+                 time_spent_seconds = CASE WHEN source = 'local'
+                   THEN time_spent_seconds ELSE excluded.time_spent_seconds END,
+                 updated_at = CASE WHEN source = 'local'
+                   THEN updated_at ELSE excluded.updated_at END""",
             (
                 user_id,
                 log_date,
@@ -760,23 +1256,196 @@ def import_daily_summary(
 def get_user_daily_stats(user_id: int, log_date: str | None = None) -> dict:
     """Dashboard stats for one day — live activity_scores, else sheet cache."""
     log_date = log_date or datetime.now().strftime("%Y-%m-%d")
-    computed = compute_user_daily_summary(user_id, log_date)
-    if computed["activities_count"] > 0:
-        return computed
+    with get_connection() as conn:
+        row = _daily_summary_row(conn, user_id, log_date)
+    return _summary_stats(row)
+
+
+def _rebuild_daily_summaries(conn: sqlite3.Connection, user_id: int | None = None) -> int:
+    """Recompute local daily_summaries rows from activity_scores; returns rows written."""
+    where = "" if user_id is None else "WHERE user_id = :user_id"
+    user_filter = "" if user_id is None else " AND user_id = :user_id"
+    conn.execute(
+        f"UPDATE daily_summaries SET {_SHEET_RESTORE_SQL} "
+        f"WHERE source = 'local' AND sheet_activities_count IS NOT NULL{user_filter}",
+        {"user_id": user_id},
+    )
+    conn.execute(
+        f"DELETE FROM daily_summaries WHERE source = 'local'{user_filter}",
+        {"user_id": user_id},
+    )
+    cur = conn.execute(
+        f"""INSERT INTO daily_summaries
+                (user_id, log_date, activities_count, score_sum, best_score,
+                 avg_score_pct, time_spent_seconds, source, updated_at)
+            SELECT user_id, log_date, COUNT(*), SUM(COALESCE(score, 0)),
+                   MAX(COALESCE(score, 0)),
+                   CAST(ROUND(1.0 * SUM(COALESCE(score, 0)) / COUNT(*)) AS INTEGER),
+                   SUM(COALESCE(time_spent_seconds, 0)), 'local',
+                   datetime('now', 'localtime')
+            FROM activity_scores {where}
+            GROUP BY user_id, log_date
+            ORDER BY user_id, log_date
+            ON CONFLICT(user_id, log_date) DO UPDATE SET
+                activities_count = excluded.activities_count,
+                score_sum = excluded.score_sum,
+                best_score = excluded.best_score,
+                avg_score_pct = excluded.avg_score_pct,
+                time_spent_seconds = excluded.time_spent_seconds,
+                source = 'local',
+                updated_at = excluded.updated_at""",
+        {"user_id": user_id},
+    )
+    return cur.rowcount
 
+
+def verify_daily_summaries(user_id: int | None = None) -> list[dict]:
+    """Days where daily_summaries disagrees with a fresh aggregate of activity_scores."""
+    where = "" if user_id is None else "WHERE user_id = :user_id"
+    summary_filter = "" if user_id is None else "AND user_id = :user_id"
     with get_connection() as conn:
-        row = conn.execute(
-            """SELECT activities_count, avg_score_pct, time_spent_seconds
-               FROM daily_summaries WHERE user_id = ? AND log_date = ?""",
-            (user_id, log_date),
+        rows = conn.execute(
+            f"""WITH raw AS (
+                    SELECT user_id, log_date, COUNT(*) AS activities_count,
+                           SUM(COALESCE(score, 0)) AS score_sum,
+                           MAX(COALESCE(score, 0)) AS best_score,
+                           SUM(COALESCE(time_spent_seconds, 0)) AS time_spent_seconds
+                    FROM activity_scores {where}
+                    GROUP BY user_id, log_date
+                ),
+                cached AS (
+                    SELECT user_id, log_date, activities_count, score_sum, best_score,
+                           time_spent_seconds
+                    FROM daily_summaries WHERE source = 'local' {summary_filter}
+                )
+                SELECT raw.user_id, raw.log_date, 'raw' AS side FROM raw
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM cached c
+                    WHERE c.user_id = raw.user_id AND c.log_date = raw.log_date
+                      AND c.activities_count = raw.activities_count
+                      AND c.score_sum = raw.score_sum
+                      AND c.best_score = raw.best_score
+                      AND c.time_spent_seconds = raw.time_spent_seconds
+                )
+                UNION ALL
+                SELECT c.user_id, c.log_date, 'summary' AS side FROM cached c
+                WHERE NOT EXISTS (
+                    SELECT 1 FROM raw
+                    WHERE raw.user_id = c.user_id AND raw.log_date = c.log_date
+                )""",
+            {"user_id": user_id},
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def rebuild_daily_summaries(user_id: int | None = None) -> dict:
+    """Backfill daily_summaries from raw activity history, then verify they agree.
+
+    Returns ``{"rows": <summary rows written>, "mismatches": [...]}``; an empty
+    mismatch list means the trigger-maintained table matches activity_scores.
+    """
+    with get_connection() as conn:
+        written = _rebuild_daily_summaries(conn, user_id)
+    return {"rows": written, "mismatches": verify_daily_summaries(user_id)}
+
+
+@dataclass(frozen=True)
+class DashboardSnapshot:
+    """Everything ``render_user_dashboard`` shows, read in one transaction."""
+
+    user_id: int
+    streak: int
+    total_login_days: int
+    today: dict
+    time_calendar: list[dict]
+    score_calendar: list[dict]
+    total_time_seconds: int
+    has_lifetime_activity: bool
+
+
+def get_dashboard_snapshot(user_id: int, days: int = 30) -> DashboardSnapshot:
+    """Streak, login totals, today's stats and both calendars in one round-trip.
+
+    ``time_calendar`` / ``score_calendar`` match ``get_daily_time_spent_calendar``
+    and ``get_daily_score_calendar`` for the same ``days``; callers needing a
+    shorter window can slice the tail.
+    """
+    days = max(int(days), 1)
+    end = datetime.now().date()
+    start_str = (end - timedelta(days=days - 1)).strftime("%Y-%m-%d")
+    today = end.strftime("%Y-%m-%d")
+    lifetime_cutoff = (datetime.now() - timedelta(days=365)).strftime("%Y-%m-%d")
+
+    with get_connection(snapshot=True) as conn:
+        login = _login_streak_row(conn, user_id)
+        cal_rows = conn.execute(
+            """WITH RECURSIVE calendar(log_date) AS (
+                   SELECT :start
+                   UNION ALL
+                   SELECT date(log_date, '+1 day') FROM calendar WHERE log_date < :today
+               ),
+               per_day AS (
+                   SELECT log_date,
+                          time_spent_seconds AS total_seconds,
+                          activities_count AS activity_count,
+                          score_sum,
+                          best_score
+                   FROM daily_summaries
+                   WHERE user_id = :user_id AND log_date >= :start AND source = 'local'
+               )
+               SELECT calendar.log_date,
+                      COALESCE(per_day.total_seconds, 0) AS total_seconds,
+                      COALESCE(per_day.activity_count, 0) AS activity_count,
+                      per_day.score_sum,
+                      per_day.best_score
+               FROM calendar LEFT JOIN per_day ON per_day.log_date = calendar.log_date
+               ORDER BY calendar.log_date""",
+            {"user_id": user_id, "start": start_str, "today": today},
+        ).fetchall()
+        lifetime = conn.execute(
+            """SELECT
+                   SUM(time_spent_seconds) AS total_time,
+                   MAX(log_date) >= :cutoff AS recent_scores,
+                   EXISTS(SELECT 1 FROM reading_progress
+                          WHERE user_id = :user_id AND log_date >= :cutoff) AS recent_reading
+               FROM daily_summaries WHERE user_id = :user_id AND source = 'local'""",
+            {"user_id": user_id, "cutoff": lifetime_cutoff},
         ).fetchone()
-    if row:
-        return {
-            "activities_count": int(row["activities_count"]),
-            "avg_score_pct": int(row["avg_score_pct"]),
-            "time_spent_seconds": int(row["time_spent_seconds"]),
-        }
-    return computed
+        today_row = _daily_summary_row(conn, user_id, today)
+    today_stats = _summary_stats(today_row)
+
+    time_calendar = []
+    score_calendar = []
+    for r in cal_rows:
+        count = int(r["activity_count"])
+        time_calendar.append(
+            {
+                "log_date": r["log_date"],
+                "total_seconds": int(r["total_seconds"]),
+                "activity_count": count,
+            }
+        )
+        score_calendar.append(
+            {
+                "log_date": r["log_date"],
+                "avg_score": round(r["score_sum"] / count, 1) if count else None,
+                "best_score": int(r["best_score"]) if count else None,
+                "activity_count": count,
+            }
+        )
+    total_time = int(lifetime["total_time"] or 0)
+    return DashboardSnapshot(
+        user_id=user_id,
+        streak=int(login["streak"]),
+        total_login_days=int(login["total_days"]),
+        today=today_stats,
+        time_calendar=time_calendar,
+        score_calendar=score_calendar,
+        total_time_seconds=total_time,
+        has_lifetime_activity=bool(
+            total_time > 0 or lifetime["recent_scores"] or lifetime["recent_reading"]
+        ),
+    )
 
 
 def save_reading_progress(
@@ -897,6 +1566,54 @@ def get_recent_gk_questions(user_id: int, limit: int = 100) -> list[str]:
     return seen
 
 
+def get_gk_quizzes_after(user_id: int, after_id: int) -> list[dict]:
+    """Saved GK quizzes (id, questions_json) with id > ``after_id``, oldest first."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT id, questions_json FROM gk_daily_questions "
+            "WHERE user_id = ? AND id > ? ORDER BY id",
+            (user_id, after_id),
+        ).fetchall()
+    return [dict(r) for r in rows]
+
+
+def get_gk_question_signatures(user_id: int) -> list[tuple[str, bytes]]:
+    """(question, MinHash signature bytes) for every indexed past GK question."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            "SELECT question, signature FROM gk_question_signatures WHERE user_id = ?",
+            (user_id,),
+        ).fetchall()
+    return [(r["question"], bytes(r["signature"])) for r in rows]
+
+
+def get_gk_signature_watermark(user_id: int) -> int:
+    """Highest gk_daily_questions id already folded into the signature table."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT last_quiz_id FROM gk_signature_watermarks WHERE user_id = ?",
+            (user_id,),
+        ).fetchone()
+    return int(row["last_quiz_id"]) if row else 0
+
+
+def save_gk_question_signatures(
+    user_id: int, rows: Sequence[tuple[int, str, bytes]], *, watermark: int
+) -> None:
+    """Store ``(gk_quiz_id, question, signature)`` rows and advance the watermark."""
+    with get_connection() as conn:
+        conn.executemany(
+            """INSERT OR IGNORE INTO gk_question_signatures
+               (user_id, gk_quiz_id, question, signature) VALUES (?, ?, ?, ?)""",
+            [(user_id, quiz_id, question, sig) for quiz_id, question, sig in rows],
+        )
+        conn.execute(
+            """INSERT INTO gk_signature_watermarks (user_id, last_quiz_id) VALUES (?, ?)
+               ON CONFLICT(user_id) DO UPDATE SET last_quiz_id = excluded.last_quiz_id""",
+            (user_id, watermark),
+        )
+
+
 def get_arjun_vocab_index(user_id: int) -> int:
     """Next word position (0-based) in the ordered Arjun vocabulary list."""
     with get_connection() as conn:
@@ -1098,6 +1815,17 @@ def import_daily_login(user_id: int, log_date: str) -> bool:
         return cur.rowcount > 0
 
 
+def import_daily_logins(rows: Sequence[tuple[int, str]]) -> int:
+    """Import many ``(user_id, log_date)`` login rows in one transaction. Returns rows inserted."""
+    if not rows:
+        return 0
+    with get_connection() as conn:
+        return conn.executemany(
+            "INSERT OR IGNORE INTO daily_logs (user_id, log_date) VALUES (?, ?)",
+            rows,
+        ).rowcount
+
+
 def gss_push_state_get(key: str) -> str | None:
     """Return cached Google Sheets row pointer / push marker, if any."""
     with get_connection() as conn:
@@ -1121,6 +1849,143 @@ def gss_push_state_set(key: str, value: str) -> None:
         )
 
 
+def gss_push_state_get_many(keys: Sequence[str]) -> dict[str, str]:
+    """Cached Google Sheets markers / row indexes for many keys in one query."""
+    found: dict[str, str] = {}
+    if not keys:
+        return found
+    with get_connection() as conn:
+        for start in range(0, len(keys), 500):
+            chunk = list(keys[start : start + 500])
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"""SELECT state_key, state_value FROM gss_push_state
+                    WHERE state_key IN ({placeholders})""",
+                chunk,
+            ).fetchall()
+            found.update((r["state_key"], str(r["state_value"])) for r in rows)
+    return found
+
+
+def gss_push_state_set_many(values: dict[str, str]) -> None:
+    """Remember many Google Sheets markers / row indexes in one transaction."""
+    if not values:
+        return
+    when = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    with get_connection() as conn:
+        conn.executemany(
+            """INSERT INTO gss_push_state (state_key, state_value, updated_at)
+               VALUES (?, ?, ?)
+               ON CONFLICT(state_key) DO UPDATE SET
+                 state_value = excluded.state_value,
+                 updated_at = excluded.updated_at""",
+            [(k, v, when) for k, v in values.items()],
+        )
+
+
+def sharepoint_pushed_filter(sync_ids: list[str]) -> set[str]:
+    """Subset of ``sync_ids`` already present in the SharePoint list."""
+    if not sync_ids:
+        return set()
+    found: set[str] = set()
+    with get_connection() as conn:
+        for start in range(0, len(sync_ids), 500):
+            chunk = sync_ids[start : start + 500]
+            placeholders = ",".join("?" * len(chunk))
+            rows = conn.execute(
+                f"SELECT sync_id FROM sharepoint_pushed WHERE sync_id IN ({placeholders})",
+                chunk,
+            ).fetchall()
+            found.update(r["sync_id"] for r in rows)
+    return found
+
+
+def sharepoint_mark_pushed(sync_ids: list[str]) -> None:
+    """Remember sync_ids written to (or read from) SharePoint so they are never re-posted."""
+    if not sync_ids:
+        return
+    with get_connection() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO sharepoint_pushed (sync_id) VALUES (?)",
+            [(sid,) for sid in sync_ids],
+        )
+
+
+def sharepoint_delta_link_get(list_key: str) -> str | None:
+    """Graph deltaLink saved by the last SharePoint import of this list, if any."""
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT delta_link FROM sharepoint_delta_state WHERE list_key = ?",
+            (list_key,),
+        ).fetchone()
+    return str(row["delta_link"]) if row else None
+
+
+def sharepoint_delta_link_set(list_key: str, delta_link: str | None) -> None:
+    """Save (or with ``None`` forget) the deltaLink to resume the next import from."""
+    with get_connection() as conn:
+        if delta_link is None:
+            conn.execute("DELETE FROM sharepoint_delta_state WHERE list_key = ?", (list_key,))
+            return
+        conn.execute(
+            """INSERT INTO sharepoint_delta_state (list_key, delta_link, updated_at)
+               VALUES (?, ?, ?)
+               ON CONFLICT(list_key) DO UPDATE SET
+                 delta_link = excluded.delta_link,
+                 updated_at = excluded.updated_at""",
+            (list_key, delta_link, datetime.now().strftime("%Y-%m-%d %H:%M:%S")),
+        )
+
+
+def import_sharepoint_rows(
+    *,
+    logins: Sequence[tuple[int, str]] = (),
+    activities: Sequence[tuple] = (),
+    readings: Sequence[tuple] = (),
+    pushed_sync_ids: Sequence[str] = (),
+) -> int:
+    """Bulk-import rows read from SharePoint in one transaction. Returns rows inserted.
+
+    ``logins`` are ``(user_id, log_date)``; ``activities`` follow the
+    ``import_activity_score_row`` column order (user_id, activity_type,
+    activity_name, score, max_score, log_date, details, time_spent_seconds,
+    sync_id, completed_at); ``readings`` follow ``import_reading_progress_row``
+    (user_id, story_id, story_title, questions_total, questions_correct,
+    time_spent_seconds, log_date, sync_id, completed_at).  Rows already present
+    are skipped by the unique sync_id / (user_id, log_date) indexes.
+    ``pushed_sync_ids`` are recorded in ``sharepoint_pushed`` as well.
+    """
+    inserted = 0
+    with get_connection() as conn:
+        if logins:
+            inserted += conn.executemany(
+                "INSERT OR IGNORE INTO daily_logs (user_id, log_date) VALUES (?, ?)",
+                logins,
+            ).rowcount
+        if activities:
+            inserted += conn.executemany(
+                """INSERT OR IGNORE INTO activity_scores
+                   (user_id, activity_type, activity_name, score, max_score, log_date, details,
+                    time_spent_seconds, sync_id, completed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                activities,
+            ).rowcount
+        if readings:
+            inserted += conn.executemany(
+                """INSERT OR IGNORE INTO reading_progress
+                   (user_id, story_id, story_title, questions_total, questions_correct,
+                    time_spent_seconds, log_date, sync_id, completed_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                readings,
+            ).rowcount
+        if pushed_sync_ids:
+            conn.executemany(
+                "INSERT OR IGNORE INTO sharepoint_pushed (sync_id) VALUES (?)",
+                [(sid,) for sid in pushed_sync_ids],
+            )
+    return inserted
+
+
 def _sync_id_exists(table: str, sync_id: str) -> bool:
     with get_connection() as conn:
         row = conn.execute(
@@ -1622,3 +2487,257 @@ def save_harshit_class10_week_config(
             (unit_id, week_label, json.dumps(payload)),
         )
 
+
+# ── Cloud sync outbox (drained by cloud_sync_worker) ──
+
+OUTBOX_STALE_CLAIM_SECONDS = 600
+
+
+def outbox_enqueue(
+    backend: str,
+    kind: str,
+    payload: dict,
+    *,
+    coalesce_key: str | None = None,
+    now: float | None = None,
+) -> int:
+    """Durably queue one cloud push. A pending event with the same coalesce_key is replaced."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        row = conn.execute(
+            """INSERT INTO cloud_sync_outbox
+               (backend, kind, payload_json, coalesce_key, next_attempt_at, created_at)
+               VALUES (?, ?, ?, ?, ?, ?)
+               ON CONFLICT(coalesce_key) WHERE status = 'pending' DO UPDATE SET
+                 kind = excluded.kind,
+                 payload_json = excluded.payload_json
+               RETURNING id""",
+            (backend, kind, json.dumps(payload, ensure_ascii=False), coalesce_key, now, now),
+        ).fetchone()
+    return int(row["id"])
+
+
+def outbox_claim(backend: str, *, limit: int = 20, now: float | None = None) -> list[dict]:
+    """Atomically mark up to ``limit`` due events as running and return them (oldest first)."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        # Events claimed by a worker that died mid-push go back to the queue.
+        conn.execute(
+            """UPDATE cloud_sync_outbox SET status = 'pending', claimed_at = NULL
+               WHERE backend = ? AND status = 'running' AND claimed_at < ?""",
+            (backend, now - OUTBOX_STALE_CLAIM_SECONDS),
+        )
+        rows = conn.execute(
+            """UPDATE cloud_sync_outbox SET status = 'running', claimed_at = :now
+               WHERE id IN (
+                   SELECT id FROM cloud_sync_outbox
+                   WHERE backend = :backend AND status = 'pending' AND next_attempt_at <= :now
+                   ORDER BY next_attempt_at, id
+                   LIMIT :limit
+               )
+               RETURNING id, backend, kind, payload_json, coalesce_key, attempts, created_at""",
+            {"backend": backend, "now": now, "limit": max(int(limit), 1)},
+        ).fetchall()
+    out = []
+    for r in sorted(rows, key=lambda r: r["id"]):
+        item = dict(r)
+        try:
+            item["payload"] = json.loads(item.pop("payload_json") or "{}")
+        except json.JSONDecodeError:
+            item["payload"] = {}
+        out.append(item)
+    return out
+
+
+def outbox_complete(event_id: int, backend: str, *, now: float | None = None) -> None:
+    """Drop a pushed event and record the backend's last success."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        conn.execute("DELETE FROM cloud_sync_outbox WHERE id = ?", (event_id,))
+        conn.execute(
+            """INSERT INTO cloud_sync_backend_state (backend, last_success_at)
+               VALUES (?, ?)
+               ON CONFLICT(backend) DO UPDATE SET last_success_at = excluded.last_success_at""",
+            (backend, now),
+        )
+
+
+def outbox_fail(
+    event_id: int,
+    backend: str,
+    error: str,
+    *,
+    retry_at: float | None,
+    now: float | None = None,
+) -> None:
+    """Record a failed push; ``retry_at=None`` parks the event as dead."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        if retry_at is None:
+            conn.execute(
+                """UPDATE cloud_sync_outbox
+                   SET status = 'dead', attempts = attempts + 1, last_error = ?, claimed_at = NULL
+                   WHERE id = ?""",
+                (error, event_id),
+            )
+        else:
+            # A newer pending event for the same key may exist; fold this one into it.
+            conn.execute(
+                """DELETE FROM cloud_sync_outbox
+                   WHERE id = ? AND coalesce_key IS NOT NULL AND EXISTS (
+                       SELECT 1 FROM cloud_sync_outbox o
+                       WHERE o.coalesce_key = cloud_sync_outbox.coalesce_key
+                         AND o.status = 'pending')""",
+                (event_id,),
+            )
+            conn.execute(
+                """UPDATE cloud_sync_outbox
+                   SET status = 'pending', attempts = attempts + 1, last_error = ?,
+                       next_attempt_at = ?, claimed_at = NULL
+                   WHERE id = ?""",
+                (error, retry_at, event_id),
+            )
+        conn.execute(
+            """INSERT INTO cloud_sync_backend_state (backend, last_error, last_error_at)
+               VALUES (?, ?, ?)
+               ON CONFLICT(backend) DO UPDATE SET
+                 last_error = excluded.last_error,
+                 last_error_at = excluded.last_error_at""",
+            (backend, error, now),
+        )
+
+
+def outbox_next_due(*, now: float | None = None) -> float | None:
+    """Seconds until the earliest pending event is due (0 if overdue, None if queue empty)."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        row = conn.execute(
+            "SELECT MIN(next_attempt_at) AS due FROM cloud_sync_outbox WHERE status = 'pending'"
+        ).fetchone()
+    if not row or row["due"] is None:
+        return None
+    return max(0.0, float(row["due"]) - now)
+
+
+def outbox_status(*, now: float | None = None) -> dict[str, dict]:
+    """Per-backend queue depth, oldest pending age, dead-letter count and last error."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        queued = conn.execute(
+            """SELECT backend,
+                      SUM(status IN ('pending', 'running')) AS depth,
+                      SUM(status = 'dead') AS dead,
+                      MIN(CASE WHEN status IN ('pending', 'running') THEN created_at END) AS oldest
+               FROM cloud_sync_outbox GROUP BY backend"""
+        ).fetchall()
+        state = conn.execute(
+            "SELECT backend, last_success_at, last_error, last_error_at FROM cloud_sync_backend_state"
+        ).fetchall()
+    out: dict[str, dict] = {}
+    for r in state:
+        out[r["backend"]] = {
+            "queue_depth": 0,
+            "dead": 0,
+            "oldest_pending_age_seconds": None,
+            "last_success_at": r["last_success_at"],
+            "last_error": r["last_error"],
+            "last_error_at": r["last_error_at"],
+        }
+    for r in queued:
+        item = out.setdefault(
+            r["backend"],
+            {"last_success_at": None, "last_error": None, "last_error_at": None},
+        )
+        item["queue_depth"] = int(r["depth"] or 0)
+        item["dead"] = int(r["dead"] or 0)
+        item["oldest_pending_age_seconds"] = (
+            max(0.0, now - float(r["oldest"])) if r["oldest"] is not None else None
+        )
+    return out
+
+
+# ── Pre-generated practice questions (refilled by question_pool) ──
+
+
+def question_pool_add(
+    program: str,
+    slot: str,
+    version: str,
+    rows: Sequence[tuple[str, Sequence[str], dict]],
+    *,
+    now: float | None = None,
+) -> list[int]:
+    """Store ``(question_id, exclusion keys, question)`` rows for one slot; returns row ids."""
+    now = time.time() if now is None else now
+    with get_connection() as conn:
+        return [
+            int(
+                conn.execute(
+                    """INSERT INTO question_pool
+                       (program, slot, version, question_id, keys_json, question_json, created_at)
+                       VALUES (?, ?, ?, ?, ?, ?, ?) RETURNING id""",
+                    (
+                        program,
+                        slot,
+                        version,
+                        qid,
+                        json.dumps(list(keys), ensure_ascii=False),
+                        json.dumps(q, ensure_ascii=False),
+                        now,
+                    ),
+                ).fetchone()["id"]
+            )
+            for qid, keys, q in rows
+        ]
+
+
+def question_pool_rows(program: str, slot: str, version: str) -> list[dict]:
+    """Pooled rows for one slot, oldest first: ``{id, question_id, keys, question}``."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """SELECT id, question_id, keys_json, question_json FROM question_pool
+               WHERE program = ? AND slot = ? AND version = ?
+               ORDER BY id""",
+            (program, slot, version),
+        ).fetchall()
+    return [
+        {
+            "id": r["id"],
+            "question_id": r["question_id"],
+            "keys": json.loads(r["keys_json"]),
+            "question": json.loads(r["question_json"]),
+        }
+        for r in rows
+    ]
+
+
+def question_pool_remove(row_ids: Sequence[int]) -> int:
+    """Delete pooled rows that sessions have taken; returns how many were still there."""
+    with get_connection() as conn:
+        return conn.executemany(
+            "DELETE FROM question_pool WHERE id = ?", [(int(i),) for i in row_ids]
+        ).rowcount
+
+
+def question_pool_depths() -> dict[tuple[str, str, str], int]:
+    """Pooled question count per ``(program, slot, version)``."""
+    with get_connection() as conn:
+        rows = conn.execute(
+            """SELECT program, slot, version, COUNT(*) AS n FROM question_pool
+               GROUP BY program, slot, version"""
+        ).fetchall()
+    return {(r["program"], r["slot"], r["version"]): int(r["n"]) for r in rows}
+
+
+def question_pool_clear(program: str | None = None, *, keep_version: str | None = None) -> int:
+    """Drop pooled questions (one program's, optionally all but ``keep_version``)."""
+    sql = "DELETE FROM question_pool WHERE 1 = 1"
+    params: list = []
+    if program is not None:
+        sql += " AND program = ?"
+        params.append(program)
+    if keep_version is not None:
+        sql += " AND version != ?"
+        params.append(keep_version)
+    with get_connection() as conn:
+        return conn.execute(sql, params).rowcount
@@ -0,0 +1,466 @@
+"""
+Incremental, parallel build of the matplotlib diagram generators.
+
+Every ``generate_*`` script renders all of its figures serially and rewrites
+every PNG on each run.  This runner imports the scripts, collects their
+figures and renders only the stale ones across a process pool:
+
+    python diagram_build.py                    # build what changed
+    python diagram_build.py --only 'generate_unit3_*'
+    python diagram_build.py --list             # show stale / up-to-date figures
+    python diagram_build.py --force --jobs 4
+
+Figures are discovered from the registries the scripts already keep:
+``GENERATORS`` ({activity: [(png, fn)]}), ``LESSON_FUNCS`` /
+``PRACTICE_FUNCS`` and ``FIGURES`` (lists of no-argument functions), and
+``figure_jobs()`` returning ``(fn, kwargs)`` pairs for figures that take
+parameters (the per-state maps).  ``FIGURE_INPUTS`` lists data files the
+figures read; ``FIGURE_OUTPUTS`` ({fn: [path]}) declares files a job writes
+without ``savefig`` (the map bounds JSON), so those count as outputs too.
+
+A figure is rebuilt when its build key changes.  The key hashes the figure
+function's AST, its keyword arguments, the rest of its module (constants and
+helpers such as ``_save`` — but not the other figure functions, ``main`` or
+the registries), the ASTs of any figure functions it references (so a
+figure that calls another is rebuilt with it), the contents of ``FIGURE_INPUTS`` and the matplotlib
+version.  Keys are compared against ``.diagram_build.json``, which also
+records each figure's outputs (rebuilt if deleted) and last render time
+(used to start the slowest figures first).  Because the key comes from the
+AST, comment and formatting edits rebuild nothing, and editing one figure
+function rebuilds only that figure and any figures that call it.
+
+The HF Inference API scripts (``generate_course3_diagrams``,
+``generate_state_maps``, ``generate_remaining_maps``, ``generate_*_images``)
+are not matplotlib and are not built here.
+"""
+
+from __future__ import annotations
+
+import argparse
+import ast
+import contextlib
+import fnmatch
+import hashlib
+import importlib
+import io
+import json
+import os
+import sys
+import time
+import traceback
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from pathlib import Path
+from typing import NamedTuple
+
+ROOT = Path(__file__).resolve().parent
+MANIFEST_PATH = ROOT / ".diagram_build.json"
+MANIFEST_VERSION = 1
+
+GENERATOR_MODULES = [
+    "generate_unit1_diagrams",
+    "generate_unit2_diagrams",
+    "generate_unit3_diagrams",
+    "generate_unit4_diagrams",
+    "generate_unit5_diagrams",
+    "generate_activity9_diagrams",
+    "generate_edgenuity_unit1_diagrams",
+    "generate_edgenuity_unit2_diagrams",
+    "generate_edgenuity_unit3_diagrams",
+    "generate_edgenuity_unit4_diagrams",
+    "generate_edgenuity_unit5_diagrams",
+    "generate_edgenuity_unit6_diagrams",
+    "generate_state_maps_geo",
+    "generate_us_maps",
+    "generate_world_map",
+]
+# Module-level names that list figures rather than affect how they render.
+_REGISTRY_NAMES = {
+    "GENERATORS", "LESSON_FUNCS", "PRACTICE_FUNCS", "FIGURES", "FIGURE_INPUTS", "FIGURE_OUTPUTS",
+}
+_RUNNER_FUNCS = {"main", "figure_jobs"}
+
+
+class Figure(NamedTuple):
+    id: str  # "module:function" or "module:function[key=value]"
+    module: str
+    fn: Callable
+    kwargs: dict
+    inputs: tuple[Path, ...]
+    outputs: tuple[str, ...] = ()  # declared in FIGURE_OUTPUTS; savefig calls are recorded
+
+
+class Result(NamedTuple):
+    id: str
+    status: str  # built | up-to-date | failed | missing-input
+    seconds: float
+    outputs: tuple[str, ...] = ()
+    error: str = ""
+
+
+def _use_agg() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _figure_id(module: str, fn: Callable, kwargs: dict) -> str:
+    fid = f"{module}:{fn.__name__}"
+    if kwargs:
+        fid += "[" + ",".join(f"{k}={v}" for k, v in sorted(kwargs.items())) + "]"
+    return fid
+
+
+def _output_name(fname: str | os.PathLike) -> str:
+    """How the manifest records an output: relative to ROOT when inside it."""
+    path = Path(fname).resolve()
+    try:
+        return path.relative_to(ROOT).as_posix()
+    except ValueError:
+        return str(path)
+
+
+def module_figures(module_name: str) -> list[Figure]:
+    """The figures ``module_name`` registers, in its own order, without duplicates."""
+    _use_agg()
+    mod = importlib.import_module(module_name)
+    pairs: list[tuple[Callable, dict]] = []
+    for _png, fn in (item for group in getattr(mod, "GENERATORS", {}).values() for item in group):
+        pairs.append((fn, {}))
+    for name in ("LESSON_FUNCS", "PRACTICE_FUNCS", "FIGURES"):
+        pairs.extend((fn, {}) for fn in getattr(mod, name, ()))
+    if callable(getattr(mod, "figure_jobs", None)):
+        pairs.extend(mod.figure_jobs())
+    inputs = tuple((ROOT / p).resolve() for p in getattr(mod, "FIGURE_INPUTS", ()))
+    declared = getattr(mod, "FIGURE_OUTPUTS", {})
+    figures: dict[str, Figure] = {}
+    for fn, kwargs in pairs:
+        fid = _figure_id(module_name, fn, kwargs)
+        outputs = tuple(_output_name(ROOT / p) for p in declared.get(fn, ()))
+        figures.setdefault(fid, Figure(fid, module_name, fn, dict(kwargs), inputs, outputs))
+    return list(figures.values())
+
+
+def discover(modules: list[str] | None = None) -> tuple[list[Figure], dict[str, str]]:
+    """All figures of ``modules``, plus import errors by module name."""
+    figures: list[Figure] = []
+    errors: dict[str, str] = {}
+    for name in GENERATOR_MODULES if modules is None else modules:
+        try:
+            figures.extend(module_figures(name))
+        except Exception as exc:
+            errors[name] = f"{type(exc).__name__}: {exc}"
+    return figures, errors
+
+
+@lru_cache(maxsize=None)
+def _module_tree(module_name: str) -> ast.Module:
+    mod = sys.modules.get(module_name) or importlib.import_module(module_name)
+    return ast.parse(Path(mod.__file__).read_text(encoding="utf-8"))
+
+
+def _assigned_names(node: ast.stmt) -> set[str]:
+    if isinstance(node, ast.Assign):
+        return {t.id for t in node.targets if isinstance(t, ast.Name)}
+    if isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name):
+        return {node.target.id}
+    return set()
+
+
+def _is_main_guard(node: ast.stmt) -> bool:
+    return isinstance(node, ast.If) and "__main__" in ast.dump(node.test)
+
+
+@lru_cache(maxsize=None)
+def _shared_digest(module_name: str, figure_names: frozenset[str]) -> str:
+    """Hash of everything in the module a figure may depend on besides its own function."""
+    h = hashlib.sha256()
+    for node in _module_tree(module_name).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and (
+            node.name in figure_names or node.name in _RUNNER_FUNCS
+        ):
+            continue
+        if _assigned_names(node) & _REGISTRY_NAMES or _is_main_guard(node):
+            continue
+        if isinstance(node, ast.Expr) and isinstance(node.value, ast.Constant):
+            continue  # docstrings
+        h.update(ast.dump(node).encode())
+    return h.hexdigest()
+
+
+def _function_node(module_name: str, name: str) -> ast.AST | None:
+    for node in _module_tree(module_name).body:
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)) and node.name == name:
+            return node
+    return None
+
+
+@lru_cache(maxsize=None)
+def _figure_closure(module_name: str, name: str, figure_names: frozenset[str]) -> tuple[str, ...]:
+    """``name`` plus the figure functions it references by name, transitively.
+
+    The shared digest leaves other figure functions out, so a figure that
+    calls one (to reuse its drawing) hashes that function's AST itself.
+    """
+    seen = {name}
+    todo = [name]
+    while todo:
+        node = _function_node(module_name, todo.pop())
+        if node is None:
+            continue
+        for ref in ast.walk(node):
+            if isinstance(ref, ast.Name) and ref.id in figure_names and ref.id not in seen:
+                seen.add(ref.id)
+                todo.append(ref.id)
+    return tuple(sorted(seen))
+
+
+def _function_dump(fn: Callable, figure_names: frozenset[str] = frozenset()) -> str:
+    dumps = []
+    for name in _figure_closure(fn.__module__, fn.__name__, figure_names):
+        node = _function_node(fn.__module__, name)
+        if node is not None:
+            dumps.append(ast.dump(node))
+    return "\n".join(dumps) or repr(fn)
+
+
+@lru_cache(maxsize=None)
+def _file_digest(path: Path, mtime_ns: int, size: int) -> str:
+    return hashlib.sha256(path.read_bytes()).hexdigest()
+
+
+def _matplotlib_version() -> str:
+    import matplotlib
+
+    return matplotlib.__version__
+
+
+def build_key(figure: Figure, figures: list[Figure]) -> str | None:
+    """The figure's build key; None when one of its input files is missing."""
+    h = hashlib.sha256(f"v{MANIFEST_VERSION} mpl{_matplotlib_version()}".encode())
+    figure_names = frozenset(f.fn.__name__ for f in figures if f.module == figure.module)
+    h.update(_shared_digest(figure.module, figure_names).encode())
+    h.update(_function_dump(figure.fn, figure_names).encode())
+    h.update(repr(sorted(figure.kwargs.items())).encode())
+    for path in figure.inputs:
+        try:
+            st = path.stat()
+        except OSError:
+            return None
+        h.update(_file_digest(path, st.st_mtime_ns, st.st_size).encode())
+    return h.hexdigest()
+
+
+def load_manifest(path: Path = MANIFEST_PATH) -> dict[str, dict]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if data.get("version") != MANIFEST_VERSION:
+        return {}
+    return data.get("figures", {})
+
+
+def save_manifest(entries: dict[str, dict], path: Path = MANIFEST_PATH) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(
+        json.dumps({"version": MANIFEST_VERSION, "figures": entries}, indent=1, sort_keys=True),
+        encoding="utf-8",
+    )
+    os.replace(tmp, path)
+
+
+def is_current(entry: dict | None, key: str, declared: tuple[str, ...] = ()) -> bool:
+    if not entry or entry.get("key") != key:
+        return False
+    return all((ROOT / out).exists() for out in (*entry.get("outputs", ()), *declared))
+
+
+@contextlib.contextmanager
+def _record_savefig(outputs: list[str]):
+    """Note every file the figure function saves (relative to ROOT when inside it)."""
+    from matplotlib.figure import Figure as MplFigure
+
+    original = MplFigure.savefig
+
+    def savefig(self, fname, *args, **kwargs):
+        if isinstance(fname, (str, os.PathLike)):
+            outputs.append(_output_name(fname))
+        return original(self, fname, *args, **kwargs)
+
+    MplFigure.savefig = savefig
+    try:
+        yield
+    finally:
+        MplFigure.savefig = original
+
+
+@lru_cache(maxsize=None)
+def _worker_figures(module_name: str) -> dict[str, Figure]:
+    return {f.id: f for f in module_figures(module_name)}
+
+
+def render(figure: Figure) -> Result:
+    """Render one figure in this process; stdout from the generator is swallowed."""
+    outputs: list[str] = []
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(io.StringIO()), _record_savefig(outputs):
+            figure.fn(**figure.kwargs)
+    except Exception:
+        import matplotlib.pyplot as plt
+
+        plt.close("all")
+        return Result(figure.id, "failed", time.perf_counter() - start, error=traceback.format_exc())
+    outputs.extend(figure.outputs)
+    return Result(figure.id, "built", time.perf_counter() - start, tuple(dict.fromkeys(outputs)))
+
+
+def _render_in_worker(module_name: str, figure_id: str) -> Result:
+    # Functions don't pickle across processes; workers import the module and look the figure up.
+    try:
+        figure = _worker_figures(module_name)[figure_id]
+    except Exception:
+        return Result(figure_id, "failed", 0.0, error=traceback.format_exc())
+    return render(figure)
+
+
+def _init_worker() -> None:
+    os.chdir(ROOT)
+    if str(ROOT) not in sys.path:
+        sys.path.insert(0, str(ROOT))
+    _use_agg()
+
+
+def build(
+    figures: list[Figure],
+    *,
+    all_figures: list[Figure] | None = None,
+    force: bool = False,
+    jobs: int | None = None,
+    manifest_path: Path = MANIFEST_PATH,
+    on_result: Callable[[Result], None] | None = None,
+) -> list[Result]:
+    """Render the stale ``figures`` (``jobs`` processes; 1 renders inline) and update the manifest.
+
+    ``all_figures`` is the full discovered set; build keys depend on which
+    functions in a module are figures, and manifest entries for figures no
+    longer discovered are dropped.
+    """
+    all_figures = figures if all_figures is None else all_figures
+    entries = load_manifest(manifest_path)
+    results: list[Result] = []
+    stale: list[tuple[Figure, str]] = []
+    for figure in figures:
+        key = build_key(figure, all_figures)
+        if key is None:
+            results.append(Result(figure.id, "missing-input", 0.0))
+        elif not force and is_current(entries.get(figure.id), key, figure.outputs):
+            results.append(Result(figure.id, "up-to-date", 0.0, tuple(entries[figure.id]["outputs"])))
+        else:
+            stale.append((figure, key))
+    # Longest first, by last recorded render time, so one slow map doesn't finish alone.
+    stale.sort(key=lambda fk: -entries.get(fk[0].id, {}).get("seconds", 0.0))
+    keys = {figure.id: key for figure, key in stale}
+
+    def record(result: Result) -> None:
+        results.append(result)
+        if result.status == "built":
+            entries[result.id] = {
+                "key": keys[result.id],
+                "outputs": list(result.outputs),
+                "seconds": round(result.seconds, 3),
+                "built_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            }
+        if on_result:
+            on_result(result)
+
+    jobs = jobs or os.cpu_count() or 1
+    if jobs <= 1 or len(stale) <= 1:
+        _use_agg()
+        for figure, _key in stale:
+            record(render(figure))
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker) as pool:
+            futures = [pool.submit(_render_in_worker, figure.module, figure.id) for figure, _key in stale]
+            for future in as_completed(futures):
+                record(future.result())
+
+    known = {f.id for f in all_figures}
+    discovered_modules = {f.module for f in all_figures}
+    entries = {
+        fid: entry for fid, entry in entries.items()
+        if fid in known or fid.split(":", 1)[0] not in discovered_modules
+    }
+    save_manifest(entries, manifest_path)
+    return results
+
+
+def reset_caches() -> None:
+    """Forget parsed sources and digests (tests, or after editing a generator in-process)."""
+    for cached in (_module_tree, _shared_digest, _figure_closure, _file_digest, _worker_figures):
+        cached.cache_clear()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--only", action="append", default=[], metavar="GLOB",
+                        help="build figures whose id (module:function) matches; repeatable")
+    parser.add_argument("--force", action="store_true", help="rebuild even if up to date")
+    parser.add_argument("--jobs", "-j", type=int, default=None,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument("--list", action="store_true", help="show figure status and exit")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    all_figures, errors = discover()
+    for name, err in errors.items():
+        print(f"  cannot import {name}: {err}")
+    figures = [
+        f for f in all_figures
+        if not args.only or any(fnmatch.fnmatch(f.id, pat) for pat in args.only)
+    ]
+
+    if args.list:
+        entries = load_manifest()
+        for f in figures:
+            key = build_key(f, all_figures)
+            state = "missing-input" if key is None else (
+                "up-to-date" if is_current(entries.get(f.id), key, f.outputs) else "stale"
+            )
+            print(f"{state:>13}  {f.id}")
+        return 0
+
+    def report(result: Result) -> None:
+        if result.status in ("built", "failed"):
+            print(f"{result.status:>7} {result.seconds:7.2f}s  {result.id}", flush=True)
+
+    start = time.perf_counter()
+    results = build(figures, all_figures=all_figures, force=args.force, jobs=args.jobs,
+                    on_result=report)
+    wall = time.perf_counter() - start
+
+    by_status: dict[str, list[Result]] = {}
+    for r in results:
+        by_status.setdefault(r.status, []).append(r)
+    for r in by_status.get("failed", []):
+        print(f"\n{r.id} failed:\n{r.error}")
+    built = by_status.get("built", [])
+    if built:
+        print("\nSlowest:")
+        for r in sorted(built, key=lambda r: -r.seconds)[:5]:
+            print(f"  {r.seconds:7.2f}s  {r.id}")
+    missing = by_status.get("missing-input", [])
+    if missing:
+        print(f"\nSkipped (input file missing): {', '.join(r.id for r in missing)}")
+    print(
+        f"\n{len(built)} built, {len(by_status.get('up-to-date', []))} up to date, "
+        f"{len(by_status.get('failed', []))} failed, {len(missing)} missing input "
+        f"in {wall:.1f}s ({sum(r.seconds for r in built):.1f}s render)"
+    )
+    return 1 if by_status.get("failed") or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,236 @@
+"""Keyed cache for rendered diagrams: spec -> SVG markup or PNG bytes.
+
+``get_or_render(namespace, spec, render)`` returns the cached rendering of
+``spec`` (any JSON-able dict: a Harshit diagram spec, a mental-math
+``hint_meta``, a text-to-image prompt) or calls ``render()`` once and keeps
+the result.  Two tiers:
+
+- memory: a per-process LRU over every namespace, bounded by
+  ``MEMORY_MAX_ENTRIES`` / ``MEMORY_MAX_BYTES``;
+- disk: content-addressed files under ``DIAGRAM_CACHE_DIR`` (default
+  ``.diagram_cache/``) for namespaces that pass ``persist=True``, evicted
+  least-recently-used beyond ``DIAGRAM_CACHE_MAX_FILES``.  Only bytes are
+  persisted — the Hugging Face hint images, which cost a remote FLUX call
+  and are the same for every session and user with the same prompt.  SVG
+  markup stays in memory: rebuilding it takes microseconds, less than
+  reading a file back.
+
+``None`` results (no diagram, a failed remote call) are never cached.
+Concurrent misses on one key render once; the other callers wait for it.
+
+Hit rates per namespace::
+
+    import diagram_cache
+    diagram_cache.stats()  # {"hf_hint": {"memory_hits": 4, "disk_hits": 2, "misses": 1, "hit_rate": 0.857, ...}}
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import Counter, OrderedDict
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+MEMORY_MAX_ENTRIES = 4096
+MEMORY_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_FILES = 5000
+
+T = TypeVar("T", str, bytes)
+
+_encoder = json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+_lock = threading.Lock()
+# (namespace, canonical spec JSON) -> rendering, least recently used first
+_memory: OrderedDict[tuple[str, str], str | bytes] = OrderedDict()
+_memory_bytes = 0
+_inflight: dict[tuple[str, str], threading.Lock] = {}
+_counts: dict[str, Counter] = {}
+_writes_since_prune = 0
+
+
+def spec_key(spec: Any) -> str:
+    """Stable hash of a JSON-able spec (key order does not matter); names files on disk."""
+    return _digest(_encoder.encode(spec))
+
+
+def _digest(canonical: str) -> str:
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def cache_dir() -> Path:
+    return Path(
+        os.environ.get("DIAGRAM_CACHE_DIR", "").strip()
+        or Path(__file__).resolve().parent / ".diagram_cache"
+    )
+
+
+def _max_files() -> int:
+    try:
+        return int(os.environ.get("DIAGRAM_CACHE_MAX_FILES", DEFAULT_MAX_FILES))
+    except ValueError:
+        return DEFAULT_MAX_FILES
+
+
+def _count(namespace: str, name: str) -> None:
+    with _lock:
+        _counts.setdefault(namespace, Counter())[name] += 1
+
+
+def _memory_hit(slot: tuple[str, str]) -> str | bytes | None:
+    with _lock:
+        value = _memory.get(slot)
+        if value is not None:
+            _memory.move_to_end(slot)
+            _counts.setdefault(slot[0], Counter())["memory_hits"] += 1
+        return value
+
+
+def _memory_put(slot: tuple[str, str], value: str | bytes) -> None:
+    global _memory_bytes
+    with _lock:
+        old = _memory.pop(slot, None)
+        if old is not None:
+            _memory_bytes -= len(old)
+        _memory[slot] = value
+        _memory_bytes += len(value)
+        while _memory and (len(_memory) > MEMORY_MAX_ENTRIES or _memory_bytes > MEMORY_MAX_BYTES):
+            (namespace, _key), evicted = _memory.popitem(last=False)
+            _memory_bytes -= len(evicted)
+            _counts.setdefault(namespace, Counter())["evicted"] += 1
+
+
+def _path(namespace: str, key: str, suffix: str) -> Path:
+    return cache_dir() / namespace / key[:2] / f"{key}{suffix}"
+
+
+def _disk_get(path: Path) -> bytes | None:
+    try:
+        data = path.read_bytes()
+        os.utime(path)  # LRU: a hit makes the file young again
+    except OSError:
+        return None
+    return data
+
+
+def _disk_put(path: Path, data: bytes) -> None:
+    global _writes_since_prune
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+    except OSError:
+        return
+    with _lock:
+        _writes_since_prune += 1
+        due = _writes_since_prune >= max(_max_files() // 10, 1)
+        if due:
+            _writes_since_prune = 0
+    if due:
+        prune()
+
+
+def prune() -> None:
+    """Delete the least recently used files beyond ``DIAGRAM_CACHE_MAX_FILES``."""
+    entries = []
+    for path in cache_dir().glob("*/*/*"):
+        if path.name.startswith("."):
+            continue
+        try:
+            entries.append((path.stat().st_mtime, path))
+        except OSError:
+            continue
+    excess = len(entries) - _max_files()
+    for _, path in sorted(entries)[: max(excess, 0)]:
+        path.unlink(missing_ok=True)
+
+
+def peek(namespace: str, spec: Any, *, suffix: str = ".png") -> bytes | str | None:
+    """The cached rendering of ``spec`` without rendering on a miss (misses are not counted)."""
+    slot = (namespace, _encoder.encode(spec))
+    value = _memory_hit(slot)
+    if value is not None:
+        return value
+    data = _disk_get(_path(namespace, _digest(slot[1]), suffix))
+    if data is not None:
+        _memory_put(slot, data)
+        _count(namespace, "disk_hits")
+    return data
+
+
+def get_or_render(
+    namespace: str,
+    spec: Any,
+    render: Callable[[], T | None],
+    *,
+    persist: bool = False,
+    suffix: str = ".png",
+) -> T | None:
+    """Cached ``render()`` for ``spec``; with ``persist`` the bytes are also kept on disk."""
+    slot = (namespace, _encoder.encode(spec))
+    value = _memory_hit(slot)
+    if value is not None:
+        return value
+    with _lock:
+        flight = _inflight.setdefault(slot, threading.Lock())
+    with flight:
+        try:
+            return _load_or_render(slot, render, persist=persist, suffix=suffix)
+        finally:
+            with _lock:
+                if _inflight.get(slot) is flight:
+                    del _inflight[slot]
+
+
+def _load_or_render(slot: tuple[str, str], render: Callable[[], T | None], *, persist: bool, suffix: str):
+    namespace, canonical = slot
+    value = _memory_hit(slot)  # rendered by the caller we waited for
+    if value is not None:
+        return value
+    path = _path(namespace, _digest(canonical), suffix) if persist else None
+    if path is not None:
+        data = _disk_get(path)
+        if data is not None:
+            _memory_put(slot, data)
+            _count(namespace, "disk_hits")
+            return data
+    _count(namespace, "misses")
+    value = render()
+    if value is not None:
+        _memory_put(slot, value)
+        _count(namespace, "stores")
+        if path is not None and isinstance(value, bytes):
+            _disk_put(path, value)
+    return value
+
+
+def stats() -> dict[str, dict]:
+    """Per-namespace hits (memory / disk), misses, stores, evictions and hit rate."""
+    with _lock:
+        out = {}
+        for namespace, counts in _counts.items():
+            hits = counts["memory_hits"] + counts["disk_hits"]
+            total = hits + counts["misses"]
+            out[namespace] = {
+                "memory_hits": counts["memory_hits"],
+                "disk_hits": counts["disk_hits"],
+                "misses": counts["misses"],
+                "stores": counts["stores"],
+                "evicted": counts["evicted"],
+                "hit_rate": round(hits / total, 3) if total else None,
+            }
+    return out
+
+
+def reset_cache() -> None:
+    """Drop the memory tier and counters (tests); files on disk are kept."""
+    global _memory_bytes, _writes_since_prune
+    with _lock:
+        _memory.clear()
+        _memory_bytes = 0
+        _inflight.clear()
+        _counts.clear()
+        _writes_since_prune = 0
@@ -334,14 +334,20 @@ def example_1():
     _save(fig, "activity_9_example_1.png")
 
 
+FIGURES = [
+    constant_difference,
+    square_numbers,
+    rectangular_numbers,
+    triangular_numbers,
+    table_to_expression,
+    example_1,
+]
+
+
 def main():
     print("Generating Activity 9 diagrams (matplotlib)...\n")
-    constant_difference()
-    square_numbers()
-    rectangular_numbers()
-    triangular_numbers()
-    table_to_expression()
-    example_1()
+    for fn in FIGURES:
+        fn()
     print(f"\nDone → {OUT_DIR}/")
 
 
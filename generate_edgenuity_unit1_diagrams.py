@@ -131,7 +131,7 @@ def activity_2_function_equations():
 
 
 # ── Activity 3 ──
-def activity_3_segment_graph():
+def _segment_graph_figure():
     fig, ax = plt.subplots(figsize=(7, 4))
     _axes_style(ax, (-1, 8), (-2, 6), "Graph behavior A → F")
     xs = [0, 2, 4, 5, 7, 8]
@@ -143,7 +143,11 @@ def activity_3_segment_graph():
     ax.text(1, 5, "increasing", color=GREEN, fontsize=9)
     ax.text(3.5, 5, "constant", color=ORANGE, fontsize=9)
     ax.text(6, 3, "decreasing", color=RED, fontsize=9)
-    _save(fig, "activity_3_segment_graph.png")
+    return fig
+
+
+def activity_3_segment_graph():
+    _save(_segment_graph_figure(), "activity_3_segment_graph.png")
 
 
 def activity_3_parabola_behavior():
@@ -287,13 +291,7 @@ def activity_6_inverse_lookup():
 
 # ── Practice images ──
 def practice_segment_graph():
-    activity_3_segment_graph()
-    import shutil
-    src = os.path.join(OUT_DIR, "activity_3_segment_graph.png")
-    dst = os.path.join(PRACTICE_DIR, "practice_segment_graph.png")
-    os.makedirs(PRACTICE_DIR, exist_ok=True)
-    shutil.copy(src, dst)
-    print(f"  saved {dst}")
+    _save(_segment_graph_figure(), "practice_segment_graph.png", practice=True)
 
 
 def _plot_point(ax, x, y, label="P", color=RED, *, show_coords: bool = False, guides: bool = True):
@@ -15,12 +15,23 @@ Prerequisites:
 
 Images are generated via the fal-ai Inference Provider (FLUX.1-schnell).
 On macOS, if Python SSL fails, a curl fallback is used automatically.
+
+Pages are drawn by a small thread pool, paced per provider, and each story
+keeps a manifest in ``images/.manifests/`` so an interrupted run resumes
+with only the missing pages.  ``FakeImageBackend`` stands in for the API
+offline (see ``scripts/bench_image_pipeline.py``).
 """
 
+from __future__ import annotations
+
+import hashlib
+import json
 import os
 import subprocess
 import sys
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from huggingface_hub import InferenceClient
 
@@ -33,7 +44,9 @@ PROVIDER = "fal-ai"
 FAL_MODEL = "fal-ai/flux/schnell"
 WIDTH = 512
 HEIGHT = 384
-DELAY_SECONDS = 1
+MAX_WORKERS = 4
+# Request starts per second allowed per provider (unlisted providers are unthrottled).
+PROVIDER_REQUESTS_PER_SECOND = {PROVIDER: 2.0}
 
 STYLE_SUFFIX = (
     ", children's picture book illustration, cute simple cartoon,"
@@ -45,7 +58,6 @@ _HF_ROUTER_URL = f"https://router.huggingface.co/{PROVIDER}/{FAL_MODEL}"
 
 def _generate_via_curl(prompt: str, out_path: str, hf_token: str) -> None:
     """Fallback image generation when Python SSL verification fails (common on macOS)."""
-    import json
     import tempfile
 
     payload = {
@@ -99,69 +111,230 @@ def _generate_via_curl(prompt: str, out_path: str, hf_token: str) -> None:
         raise RuntimeError("curl returned empty or invalid image data")
 
 
-def generate_images_for_story(story, hf_token, progress_callback=None):
+class HFImageBackend:
+    """FLUX.1-schnell on the fal-ai provider, with the curl fallback for SSL trouble."""
+
+    provider = PROVIDER
+
+    def __init__(self, hf_token: str):
+        self.hf_token = hf_token
+        self.client = _inference_client(hf_token)
+
+    def render(self, prompt: str, out_path: str) -> None:
+        try:
+            image = self.client.text_to_image(prompt, model=MODEL, width=WIDTH, height=HEIGHT)
+            image.save(out_path, format="PNG")
+        except Exception as exc:
+            err_msg = str(exc)
+            if "CERTIFICATE_VERIFY_FAILED" not in err_msg and "SSL" not in err_msg:
+                raise
+            _generate_via_curl(prompt, out_path, self.hf_token)
+
+
+class FakeImageBackend:
+    """Offline stand-in: sleeps ``latency`` seconds and writes a noise PNG.
+
+    Prompts containing any of ``fail_on`` raise, to exercise failure and
+    resume paths without network access.
+    """
+
+    provider = "fake"
+
+    def __init__(self, latency: float = 0.0, fail_on: tuple[str, ...] = ()):
+        self.latency = latency
+        self.fail_on = fail_on
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def render(self, prompt: str, out_path: str) -> None:
+        with self._lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if any(marker in prompt for marker in self.fail_on):
+            raise RuntimeError(f"fake backend refused: {prompt[:40]}")
+        from PIL import Image
+
+        Image.frombytes("RGB", (64, 48), os.urandom(64 * 48 * 3)).save(out_path, format="PNG")
+
+
+class _RateLimiter:
+    """Spaces request starts at least ``1 / per_second`` apart across all workers."""
+
+    def __init__(self, per_second: float):
+        self.interval = 1.0 / per_second
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_registry_lock = threading.Lock()
+_clients: dict[str, InferenceClient] = {}
+_limiters: dict[str, _RateLimiter] = {}
+
+
+def _inference_client(hf_token: str) -> InferenceClient:
+    with _registry_lock:
+        client = _clients.get(hf_token)
+        if client is None:
+            client = _clients[hf_token] = InferenceClient(provider=PROVIDER, api_key=hf_token)
+        return client
+
+
+def _rate_limiter(provider: str) -> _RateLimiter | None:
+    per_second = PROVIDER_REQUESTS_PER_SECOND.get(provider)
+    if not per_second:
+        return None
+    with _registry_lock:
+        limiter = _limiters.get(provider)
+        if limiter is None:
+            limiter = _limiters[provider] = _RateLimiter(per_second)
+        return limiter
+
+
+def _prompt_fingerprint(prompt: str) -> str:
+    return hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:16]
+
+
+def manifest_path(story_id: str, out_dir: str | None = None) -> str:
+    return os.path.join(out_dir or OUT_DIR, ".manifests", f"{story_id}.json")
+
+
+def load_manifest(story_id: str, out_dir: str | None = None) -> dict:
+    """Per-page state of a story's last run: ``{"pages": {"3": {"status": ...}}}``."""
+    try:
+        with open(manifest_path(story_id, out_dir), encoding="utf-8") as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        return {"story_id": story_id, "pages": {}}
+    manifest.setdefault("pages", {})
+    return manifest
+
+
+def _save_manifest(manifest: dict, out_dir: str) -> None:
+    path = manifest_path(manifest["story_id"], out_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        json.dump(manifest, fh, indent=1, sort_keys=True)
+    os.replace(tmp, path)
+
+
+def _needs_drawing(out_path: str, entry: dict | None, fingerprint: str) -> bool:
+    if not os.path.exists(out_path) or os.path.getsize(out_path) < rc.MIN_IMAGE_BYTES:
+        return True
+    # Images from before manifests existed are kept; recorded ones are
+    # redrawn only if the page's prompt has changed since.
+    return entry is not None and entry.get("prompt") != fingerprint
+
+
+def _draw_page(backend, limiter: _RateLimiter | None, prompt: str, out_path: str) -> None:
+    part_path = f"{out_path}.part"
+    if limiter:
+        limiter.wait()
+    try:
+        backend.render(prompt, part_path)
+        if not os.path.exists(part_path) or os.path.getsize(part_path) < rc.MIN_IMAGE_BYTES:
+            raise RuntimeError("backend returned empty or invalid image data")
+        os.replace(part_path, out_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+
+
+def generate_images_for_story(
+    story,
+    hf_token,
+    progress_callback=None,
+    *,
+    backend=None,
+    max_workers: int = MAX_WORKERS,
+    out_dir: str | None = None,
+):
     """Generate illustrations for every page in a single story.
 
+    Pages are drawn concurrently by up to ``max_workers`` threads, with
+    request starts paced per provider (``PROVIDER_REQUESTS_PER_SECOND``).
+    Each image is rendered to a ``.part`` file and renamed into place, and
+    a manifest under ``images/.manifests/`` records finished pages, so a
+    crashed or interrupted run picks up exactly the pages still missing.
+
     Args:
         story: A story dict with ``id`` and ``pages`` (each page must have
                an ``image_prompt`` field).
-        hf_token: HuggingFace API token string.
-        progress_callback: Optional callable ``(page_num, total, status_msg)``
-                           invoked after each page is processed.  Useful for
-                           updating a Streamlit progress indicator.
+        hf_token: HuggingFace API token string (unused with ``backend``).
+        progress_callback: Optional callable ``(done, total, status_msg)``
+                           invoked on the calling thread as each page
+                           finishes, so it can drive a Streamlit progress bar.
+        backend: Image backend (``render(prompt, out_path)``); defaults to
+                 ``HFImageBackend(hf_token)``.  ``FakeImageBackend`` runs offline.
+        max_workers: Pages drawn at once.
+        out_dir: Image directory (defaults to ``OUT_DIR``).
 
     Returns:
         tuple ``(generated, skipped, failed)`` counts.
     """
-    os.makedirs(OUT_DIR, exist_ok=True)
-    client = InferenceClient(provider=PROVIDER, api_key=hf_token)
+    out_dir = out_dir or OUT_DIR
+    os.makedirs(out_dir, exist_ok=True)
 
     story_id = story["id"]
     pages = story["pages"]
     total = len(pages)
-    generated = skipped = failed = 0
+    generated = skipped = failed = done = 0
+    manifest = load_manifest(story_id, out_dir)
+    entries = manifest["pages"]
 
+    todo = []
     for i, page in enumerate(pages, start=1):
-        out_path = os.path.join(OUT_DIR, f"{story_id}_{i}.png")
-
-        if os.path.exists(out_path) and os.path.getsize(out_path) >= 1000:
-            skipped += 1
-            if progress_callback:
-                progress_callback(i, total, f"Page {i}/{total}: already exists")
-            continue
-
         prompt = page["image_prompt"] + STYLE_SUFFIX
+        fingerprint = _prompt_fingerprint(prompt)
+        out_path = os.path.join(out_dir, f"{story_id}_{i}.png")
+        if _needs_drawing(out_path, entries.get(str(i)), fingerprint):
+            todo.append((i, prompt, fingerprint, out_path))
+            continue
+        skipped += 1
+        done += 1
+        entries[str(i)] = {"status": "done", "prompt": fingerprint}
         if progress_callback:
-            progress_callback(i, total, f"Drawing page {i}/{total}...")
-
-        try:
-            image = client.text_to_image(
-                prompt,
-                model=MODEL,
-                width=WIDTH,
-                height=HEIGHT,
-            )
-            image.save(out_path)
-            generated += 1
-        except Exception as exc:
-            err_msg = str(exc)
-            if "CERTIFICATE_VERIFY_FAILED" in err_msg or "SSL" in err_msg:
+            progress_callback(done, total, f"Page {i}/{total}: already exists")
+
+    if todo:
+        backend = backend or HFImageBackend(hf_token)
+        limiter = _rate_limiter(backend.provider)
+        manifest["total"] = total
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(todo)))) as pool:
+            futures = {
+                pool.submit(_draw_page, backend, limiter, prompt, out_path): (i, fingerprint)
+                for i, prompt, fingerprint, out_path in todo
+            }
+            for future in as_completed(futures):
+                i, fingerprint = futures[future]
+                done += 1
                 try:
-                    _generate_via_curl(prompt, out_path, hf_token)
-                    generated += 1
-                    continue
-                except Exception as curl_exc:
+                    future.result()
+                except Exception as exc:
                     failed += 1
-                    if progress_callback:
-                        progress_callback(i, total, f"Page {i} failed: {curl_exc}")
-                    time.sleep(DELAY_SECONDS)
-                    continue
-            failed += 1
-            if progress_callback:
-                progress_callback(i, total, f"Page {i} failed: {exc}")
-
-        time.sleep(DELAY_SECONDS)
-
+                    entries[str(i)] = {"status": "failed", "prompt": fingerprint, "error": str(exc)[:300]}
+                    msg = f"Page {i} failed: {exc}"
+                else:
+                    generated += 1
+                    entries[str(i)] = {"status": "done", "prompt": fingerprint}
+                    msg = f"Drew page {i} ({done}/{total})"
+                _save_manifest(manifest, out_dir)
+                if progress_callback:
+                    progress_callback(done, total, msg)
+    elif skipped:
+        _save_manifest(manifest, out_dir)
+
+    if generated:
+        rc.catalog.invalidate()
     return generated, skipped, failed
 
 
@@ -12,6 +12,7 @@ Usage:
 
 import json
 import os
+from functools import lru_cache
 
 import matplotlib
 matplotlib.use("Agg")
@@ -164,20 +165,15 @@ def plot_india(all_features, out_path, figsize=(6, 8)):
     plt.close(fig)
 
 
-def main():
+@lru_cache(maxsize=1)
+def load_states():
+    """GeoJSON polygons per state key (Dadra and Daman/Diu merged), plus every polygon."""
     with open(GEOJSON_PATH) as f:
         geojson = json.load(f)
 
-    os.makedirs(STATE_MAPS_DIR, exist_ok=True)
-    os.makedirs(INDIA_MAP_DIR, exist_ok=True)
-
-    # Parse all features
-    features_data = {}  # key → (display_name, polys)
+    merged = {}  # key → {"name": display_name, "polys": polys}
     all_polys_flat = []  # for background rendering
 
-    # Collect Dadra and Daman/Diu polygons together
-    merged = {}
-
     for feat in geojson["features"]:
         name = feat["properties"]["st_nm"]
         polys = extract_polygons(feat["geometry"])
@@ -194,41 +190,70 @@ def main():
 
         all_polys_flat.extend(polys)
 
-    # Build bounds dict for coordinate conversion
-    bounds_data = {}
+    return merged, all_polys_flat
 
-    print(f"Generating maps for {len(merged)} states/UTs...\n")
 
-    for i, (key, data) in enumerate(sorted(merged.items())):
-        name = data["name"]
-        polys = data["polys"]
-        out_path = os.path.join(STATE_MAPS_DIR, f"{key}.png")
-        color = STATE_COLORS[i % len(STATE_COLORS)]
+def render_state_map(key):
+    """Write state_maps/<key>.png: the state over a faded map of all the others."""
+    merged, all_polys_flat = load_states()
+    polys = merged[key]["polys"]
+    color = STATE_COLORS[sorted(merged).index(key) % len(STATE_COLORS)]
 
-        # Get neighbouring context polygons (all other states)
-        bg = [p for p in all_polys_flat if not any(np.array_equal(p, sp) for sp in polys)]
+    # Get neighbouring context polygons (all other states)
+    bg = [p for p in all_polys_flat if not any(np.array_equal(p, sp) for sp in polys)]
+
+    os.makedirs(STATE_MAPS_DIR, exist_ok=True)
+    plot_state(polys, os.path.join(STATE_MAPS_DIR, f"{key}.png"), fill_color=color, bg_polys=bg)
 
-        print(f"  [{i+1}/{len(merged)}] {name} ({key}): generating...")
-        plot_state(polys, out_path, fill_color=color, bg_polys=bg)
 
-        # Store bounds
-        min_lon, max_lon, min_lat, max_lat = get_bounds(polys)
+def render_india_map():
+    """Write the India overview map."""
+    merged, _ = load_states()
+    os.makedirs(INDIA_MAP_DIR, exist_ok=True)
+    all_features = [(d["name"], d["polys"]) for d in merged.values()]
+    plot_india(all_features, os.path.join(INDIA_MAP_DIR, "india_map.png"))
+
+
+def write_bounds():
+    """Save bounding boxes for coordinate conversion."""
+    merged, _ = load_states()
+    bounds_data = {}
+    for key, data in sorted(merged.items()):
+        min_lon, max_lon, min_lat, max_lat = get_bounds(data["polys"])
         bounds_data[key] = {
-            "name": name,
+            "name": data["name"],
             "min_lon": min_lon, "max_lon": max_lon,
             "min_lat": min_lat, "max_lat": max_lat,
         }
-
-    # Generate India overview map
-    india_path = os.path.join(INDIA_MAP_DIR, "india_map.png")
-    print(f"\n  Generating India overview map...")
-    all_features = [(d["name"], d["polys"]) for d in merged.values()]
-    plot_india(all_features, india_path)
-
-    # Save bounds for coordinate conversion
     with open(BOUNDS_PATH, "w") as f:
         json.dump(bounds_data, f, indent=2)
 
+
+def figure_jobs():
+    """(function, kwargs) for every output; used by diagram_build.py."""
+    merged, _ = load_states()
+    return [(render_state_map, {"key": key}) for key in sorted(merged)] + [
+        (render_india_map, {}),
+        (write_bounds, {}),
+    ]
+
+
+FIGURE_INPUTS = [GEOJSON_PATH]
+FIGURE_OUTPUTS = {write_bounds: [BOUNDS_PATH]}
+
+
+def main():
+    merged, _ = load_states()
+    print(f"Generating maps for {len(merged)} states/UTs...\n")
+
+    for i, key in enumerate(sorted(merged)):
+        print(f"  [{i+1}/{len(merged)}] {merged[key]['name']} ({key}): generating...")
+        render_state_map(key)
+
+    print(f"\n  Generating India overview map...")
+    render_india_map()
+    write_bounds()
+
     print(f"\nDone! Generated {len(merged)} state maps + 1 India map")
     print(f"Bounds saved to {BOUNDS_PATH}")
 
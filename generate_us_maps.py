@@ -9,6 +9,7 @@ Reads us_states.geojson and produces:
 
 import json
 import os
+from functools import lru_cache
 
 import matplotlib
 matplotlib.use("Agg")
@@ -137,16 +138,16 @@ def plot_us(all_features, out_path, figsize=(10, 6)):
     plt.close(fig)
 
 
-def main():
+NON_CONTIGUOUS = ("alaska", "hawaii", "puerto_rico")
+
+
+@lru_cache(maxsize=1)
+def load_states():
+    """GeoJSON polygons per state key, plus the contiguous-48 polygons used as background."""
     with open(GEOJSON_PATH) as f:
         geojson = json.load(f)
 
-    os.makedirs(STATE_MAPS_DIR, exist_ok=True)
-    os.makedirs(US_MAP_DIR, exist_ok=True)
-
     features_data = {}
-    all_polys_flat = []
-
     for feat in geojson["features"]:
         name = feat["properties"]["name"]
         polys = extract_polygons(feat["geometry"])
@@ -155,50 +156,82 @@ def main():
             print(f"  WARNING: No key for '{name}', skipping")
             continue
         features_data[key] = {"name": name, "polys": polys}
-        all_polys_flat.extend(polys)
-
-    bounds_data = {}
-    total = len(features_data)
-    print(f"Generating maps for {total} US states/territories...\n")
 
     # Filter contiguous-only background polys (exclude Alaska/Hawaii for bg context)
     contiguous_polys = []
     for k, d in features_data.items():
-        if k not in ("alaska", "hawaii", "puerto_rico"):
+        if k not in NON_CONTIGUOUS:
             contiguous_polys.extend(d["polys"])
 
-    for i, (key, data) in enumerate(sorted(features_data.items())):
-        name = data["name"]
-        polys = data["polys"]
-        out_path = os.path.join(STATE_MAPS_DIR, f"{key}.png")
-        color = STATE_COLORS[i % len(STATE_COLORS)]
+    return features_data, contiguous_polys
+
 
-        # Use contiguous states as background for contiguous states
-        if key in ("alaska", "hawaii", "puerto_rico"):
-            bg = []
-        else:
-            bg = [p for p in contiguous_polys if not any(np.array_equal(p, sp) for sp in polys)]
+def render_state_map(key):
+    """Write us_state_maps/<key>.png; contiguous states get the other 47 as background."""
+    features_data, contiguous_polys = load_states()
+    polys = features_data[key]["polys"]
+    color = STATE_COLORS[sorted(features_data).index(key) % len(STATE_COLORS)]
 
-        print(f"  [{i+1}/{total}] {name} ({key}): generating...")
-        plot_state(polys, out_path, fill_color=color, bg_polys=bg)
+    # Use contiguous states as background for contiguous states
+    if key in NON_CONTIGUOUS:
+        bg = []
+    else:
+        bg = [p for p in contiguous_polys if not any(np.array_equal(p, sp) for sp in polys)]
+
+    os.makedirs(STATE_MAPS_DIR, exist_ok=True)
+    plot_state(polys, os.path.join(STATE_MAPS_DIR, f"{key}.png"), fill_color=color, bg_polys=bg)
+
+
+def render_us_map():
+    """Write the US overview map (contiguous only)."""
+    features_data, _ = load_states()
+    os.makedirs(US_MAP_DIR, exist_ok=True)
+    contiguous_features = [(d["name"], d["polys"]) for k, d in features_data.items()
+                           if k not in NON_CONTIGUOUS]
+    plot_us(contiguous_features, os.path.join(US_MAP_DIR, "us_map.png"))
 
-        min_lon, max_lon, min_lat, max_lat = get_bounds(polys)
+
+def write_bounds():
+    """Save bounding boxes for coordinate conversion."""
+    features_data, _ = load_states()
+    bounds_data = {}
+    for key, data in sorted(features_data.items()):
+        min_lon, max_lon, min_lat, max_lat = get_bounds(data["polys"])
         bounds_data[key] = {
-            "name": name,
+            "name": data["name"],
             "min_lon": min_lon, "max_lon": max_lon,
             "min_lat": min_lat, "max_lat": max_lat,
         }
-
-    # US overview (contiguous only)
-    us_path = os.path.join(US_MAP_DIR, "us_map.png")
-    print(f"\n  Generating US overview map...")
-    contiguous_features = [(d["name"], d["polys"]) for k, d in features_data.items()
-                           if k not in ("alaska", "hawaii", "puerto_rico")]
-    plot_us(contiguous_features, us_path)
-
     with open(BOUNDS_PATH, "w") as f:
         json.dump(bounds_data, f, indent=2)
 
+
+def figure_jobs():
+    """(function, kwargs) for every output; used by diagram_build.py."""
+    features_data, _ = load_states()
+    return [(render_state_map, {"key": key}) for key in sorted(features_data)] + [
+        (render_us_map, {}),
+        (write_bounds, {}),
+    ]
+
+
+FIGURE_INPUTS = [GEOJSON_PATH]
+FIGURE_OUTPUTS = {write_bounds: [BOUNDS_PATH]}
+
+
+def main():
+    features_data, _ = load_states()
+    total = len(features_data)
+    print(f"Generating maps for {total} US states/territories...\n")
+
+    for i, key in enumerate(sorted(features_data)):
+        print(f"  [{i+1}/{total}] {features_data[key]['name']} ({key}): generating...")
+        render_state_map(key)
+
+    print(f"\n  Generating US overview map...")
+    render_us_map()
+    write_bounds()
+
     print(f"\nDone! Generated {total} state maps + 1 US overview map")
     print(f"Bounds saved to {BOUNDS_PATH}")
 
@@ -84,5 +84,9 @@ def generate_world_map():
     print(f"Saved bounds to {BOUNDS_FILE}")
 
 
+FIGURES = [generate_world_map]
+FIGURE_INPUTS = [GEOJSON_PATH]
+
+
 if __name__ == "__main__":
     generate_world_map()
@@ -15,10 +15,10 @@ import random
 import re
 from datetime import date
 
-from openai import OpenAI
+from xai_client import XAIClient, get_xai_client
+
 
 # ── xAI Grok configuration ──
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 
 # Post-generation diversity checks (pairwise question text)
@@ -27,6 +27,8 @@ _DIVERSITY_MAX_ADJACENT_SIMILARITY = 0.70
 _DIVERSITY_OPENING_WORDS = 5
 _DIVERSITY_MIN_ANSWER_LEN_FOR_UNIQUENESS = 5
 _DIVERSITY_GENERATION_RETRIES = 3
+# Past-question check (MinHash estimate of shingle Jaccard, see gk_similarity)
+_HISTORY_MAX_SIMILARITY = 0.5
 
 # ──────────────────────────────────────────────
 # User profiles — each defines topics, prompts, and tone
@@ -365,9 +367,9 @@ def get_profile(user_name: str) -> dict:
     return PROFILES.get(user_name, PROFILES[DEFAULT_PROFILE])
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
-    """Create an OpenAI client configured for xAI."""
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL)
+def _get_client(xai_api_key: str) -> XAIClient:
+    """Shared pooled xAI client (see ``xai_client``)."""
+    return get_xai_client(xai_api_key)
 
 
 def _normalize_for_compare(text: str) -> str:
@@ -387,22 +389,29 @@ def _word_jaccard(a: str, b: str) -> float:
 
 def _question_similarity(q1: str, q2: str) -> float:
     """Blend sequence similarity and word overlap (no extra dependencies)."""
-    n1, n2 = _normalize_for_compare(q1), _normalize_for_compare(q2)
+    return _normalized_similarity(_normalize_for_compare(q1), _normalize_for_compare(q2))
+
+
+def _normalized_similarity(n1: str, n2: str, floor: float = 0.0) -> float:
+    """``_question_similarity`` on pre-normalized text.
+
+    When the cheap upper bounds (``real_quick_ratio``/``quick_ratio``) show the
+    score cannot reach ``floor``, returns that bound instead of running the
+    quadratic ``ratio()``; results at or above ``floor`` are exact.
+    """
     if not n1 or not n2:
         return 0.0
     if n1 == n2:
         return 1.0
-    seq = difflib.SequenceMatcher(None, n1, n2).ratio()
     jac = _word_jaccard(n1, n2)
-    return max(seq, jac)
-
-
-def _same_opening_prefix(a: str, b: str, words: int) -> bool:
-    wa = _normalize_for_compare(a).split()
-    wb = _normalize_for_compare(b).split()
-    if len(wa) < words or len(wb) < words:
-        return False
-    return wa[:words] == wb[:words]
+    if jac >= floor > 0:
+        return max(jac, difflib.SequenceMatcher(None, n1, n2).ratio())
+    matcher = difflib.SequenceMatcher(None, n1, n2)
+    for bound in (matcher.real_quick_ratio, matcher.quick_ratio):
+        upper = bound()
+        if upper < floor:
+            return max(upper, jac)
+    return max(matcher.ratio(), jac)
 
 
 def check_quiz_diversity(
@@ -414,7 +423,8 @@ def check_quiz_diversity(
     """Return (ok, issues). If strict=False, only topic + duplicate-answer checks."""
     issues: list[str] = []
     n = len(questions)
-    texts = [str(q.get("question", "")) for q in questions]
+    texts = [_normalize_for_compare(str(q.get("question", ""))) for q in questions]
+    openings = [t.split()[:_DIVERSITY_OPENING_WORDS] for t in texts]
 
     if require_unique_topics:
         topics = [str(q.get("topic", "")).strip().lower() for q in questions]
@@ -452,19 +462,19 @@ def check_quiz_diversity(
 
     for i in range(n):
         for j in range(i + 1, n):
-            if _same_opening_prefix(texts[i], texts[j], _DIVERSITY_OPENING_WORDS):
+            if len(openings[i]) == _DIVERSITY_OPENING_WORDS and openings[i] == openings[j]:
                 issues.append(
                     f"Questions {i + 1} and {j + 1} use the same first "
                     f"{_DIVERSITY_OPENING_WORDS} words — rewrite one with a different structure."
                 )
-            sim = _question_similarity(texts[i], texts[j])
+            sim = _normalized_similarity(texts[i], texts[j], _DIVERSITY_MAX_PAIR_SIMILARITY)
             if sim >= _DIVERSITY_MAX_PAIR_SIMILARITY:
                 issues.append(
                     f"Questions {i + 1} and {j + 1} are too similar (score {sim:.2f})."
                 )
 
     for i in range(n - 1):
-        sim = _question_similarity(texts[i], texts[i + 1])
+        sim = _normalized_similarity(texts[i], texts[i + 1], _DIVERSITY_MAX_ADJACENT_SIMILARITY)
         if sim >= _DIVERSITY_MAX_ADJACENT_SIMILARITY:
             issues.append(
                 f"Consecutive questions {i + 1} and {i + 2} are too similar "
@@ -479,6 +489,25 @@ def check_quiz_diversity(
     return (len(out) == 0, out)
 
 
+def history_repeat_issues(
+    questions: list[dict],
+    history_index,
+    *,
+    threshold: float = _HISTORY_MAX_SIMILARITY,
+) -> list[str]:
+    """Issues for questions that repeat a past one (``gk_similarity.MinHashIndex``)."""
+    issues: list[str] = []
+    for i, q in enumerate(questions):
+        hits = history_index.query(str(q.get("question", "")), threshold)
+        if hits:
+            sim, past = hits[0]
+            issues.append(
+                f"Question {i + 1} repeats a previously asked question "
+                f"(score {sim:.2f}): \"{past}\" — ask about a different fact."
+            )
+    return issues
+
+
 def _parse_validate_shuffle_questions(raw: str) -> list:
     """Parse model JSON, validate fields, shuffle options. Raises ValueError."""
     json_match = re.search(r"\[[\s\S]*\]", raw)
@@ -517,18 +546,23 @@ def generate_daily_questions(
     xai_api_key: str,
     user_name: str = "Arjun",
     past_questions: list[str] | None = None,
+    history_index=None,
 ) -> list:
     """Generate daily GK questions using xAI Grok.
 
     After each successful parse, runs ``check_quiz_diversity`` (see profile flag
-    ``strict_diversity_post_checks``). On failure, retries up to
+    ``strict_diversity_post_checks``) and, with ``history_index``, rejects
+    near-repeats of any past question. On failure, retries up to
     ``_DIVERSITY_GENERATION_RETRIES`` with automated feedback to the model.
 
     Args:
         xai_api_key: xAI API key.
         user_name: Name of the user (determines profile/topics/tone).
         past_questions: Optional list of previously asked question strings
-            to exclude from generation.
+            to exclude from generation (a sample goes into the prompt).
+        history_index: Optional ``gk_similarity.MinHashIndex`` over the
+            user's full question history; threshold from the profile key
+            ``history_max_similarity``.
 
     Returns a list of question dicts, each with:
       topic, question, options (list of 4), answer (int), explanation (str)
@@ -611,6 +645,13 @@ def generate_daily_questions(
             require_unique_topics=require_unique_topics,
             strict=strict_checks,
         )
+        if history_index is not None:
+            issues += history_repeat_issues(
+                validated,
+                history_index,
+                threshold=profile.get("history_max_similarity", _HISTORY_MAX_SIMILARITY),
+            )
+            ok = not issues
         if ok:
             return validated
 
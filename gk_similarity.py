@@ -0,0 +1,167 @@
+"""MinHash index over past GK questions, for near-duplicate checks against full history.
+
+``gk_content.check_quiz_diversity`` compares the questions *within* one quiz
+with difflib; comparing a new quiz against every question a user has ever
+been asked that way is O(history · L²).  Here each question is reduced to a
+MinHash signature of its character shingles and bucketed with LSH banding,
+so a lookup only scores the few past questions sharing a band.
+
+Signatures are persisted in SQLite (``gk_question_signatures``) next to
+``gk_daily_questions``; ``history_index(user_id)`` keeps one in-memory index
+per user and folds in quizzes saved since it was last used::
+
+    idx = history_index(user["id"])
+    idx.query("Which planet is known as the red planet?")  # [(0.91, "What planet ..."), ...]
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import zlib
+
+import numpy as np
+
+import database as db
+from gk_content import _normalize_for_compare
+
+SHINGLE_CHARS = 3
+NUM_PERM = 96
+BANDS = 32  # 32 bands x 3 rows: ~99% recall at Jaccard 0.5, ~20% candidates at 0.2
+ROWS_PER_BAND = NUM_PERM // BANDS
+# Estimated trigram Jaccard at or above which two questions count as the same fact
+# (roughly the 0.76 difflib ratio check_quiz_diversity uses within one quiz).
+DEFAULT_THRESHOLD = 0.5
+
+_PRIME = np.uint64(4294967311)  # smallest prime above 2**32
+# Fixed seed: persisted signatures must keep meaning the same permutations.
+_rng = np.random.default_rng(0x9C5)
+_A = _rng.integers(1, 2**31, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 2**31, NUM_PERM, dtype=np.uint64)
+
+
+def _shingles(text: str) -> set[str]:
+    norm = _normalize_for_compare(text)
+    if len(norm) <= SHINGLE_CHARS:
+        return {norm} if norm else set()
+    return {norm[i : i + SHINGLE_CHARS] for i in range(len(norm) - SHINGLE_CHARS + 1)}
+
+
+def signature(text: str) -> np.ndarray:
+    """MinHash signature (``NUM_PERM`` uint64 values) of a question's shingles."""
+    shingles = _shingles(text)
+    if not shingles:
+        return np.full(NUM_PERM, _PRIME, dtype=np.uint64)
+    hashes = np.fromiter(
+        (zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles)
+    )
+    return ((hashes[:, None] * _A + _B) % _PRIME).min(axis=0)
+
+
+def estimated_similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Fraction of agreeing MinHash slots: an unbiased estimate of shingle Jaccard."""
+    return float(np.count_nonzero(a == b)) / NUM_PERM
+
+
+class MinHashIndex:
+    """LSH-banded MinHash signatures of question texts."""
+
+    def __init__(self) -> None:
+        self._texts: list[str] = []
+        self._known: set[str] = set()
+        self._sigs = np.empty((0, NUM_PERM), dtype=np.uint64)
+        self._pending: list[np.ndarray] = []
+        self._buckets: list[dict[bytes, list[int]]] = [{} for _ in range(BANDS)]
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def __contains__(self, text: str) -> bool:
+        return text in self._known
+
+    def add(self, text: str, sig: np.ndarray | None = None) -> np.ndarray | None:
+        """Index ``text``; returns its signature, or None if it was already indexed."""
+        if not text or text in self._known:
+            return None
+        sig = signature(text) if sig is None else sig
+        pos = len(self._texts)
+        self._texts.append(text)
+        self._known.add(text)
+        self._pending.append(sig)
+        for band, key in enumerate(self._band_keys(sig)):
+            self._buckets[band].setdefault(key, []).append(pos)
+        return sig
+
+    def _band_keys(self, sig: np.ndarray) -> list[bytes]:
+        return [
+            sig[b * ROWS_PER_BAND : (b + 1) * ROWS_PER_BAND].tobytes() for b in range(BANDS)
+        ]
+
+    def _matrix(self) -> np.ndarray:
+        if self._pending:
+            self._sigs = np.vstack([self._sigs, *self._pending])
+            self._pending = []
+        return self._sigs
+
+    def query(self, text: str, threshold: float = DEFAULT_THRESHOLD) -> list[tuple[float, str]]:
+        """Indexed questions whose estimated similarity to ``text`` is >= ``threshold``.
+
+        Returns ``(similarity, question)`` pairs, most similar first.
+        """
+        sig = signature(text)
+        candidates: set[int] = set()
+        for band, key in enumerate(self._band_keys(sig)):
+            candidates.update(self._buckets[band].get(key, ()))
+        if not candidates:
+            return []
+        ids = np.fromiter(candidates, dtype=np.int64, count=len(candidates))
+        scores = np.count_nonzero(self._matrix()[ids] == sig, axis=1) / NUM_PERM
+        hits = [(float(s), self._texts[i]) for i, s in zip(ids, scores) if s >= threshold]
+        return sorted(hits, reverse=True)
+
+
+_indexes: dict[int, MinHashIndex] = {}
+_watermarks: dict[int, int] = {}
+_lock = threading.Lock()
+
+
+def _question_texts(questions_json: str) -> list[str]:
+    try:
+        questions = json.loads(questions_json)
+    except (TypeError, ValueError):
+        return []
+    if not isinstance(questions, list):
+        return []
+    return [str(q.get("question") or "") for q in questions if isinstance(q, dict)]
+
+
+def history_index(user_id: int) -> MinHashIndex:
+    """The user's index over every GK question saved so far (cached per process)."""
+    with _lock:
+        idx = _indexes.get(user_id)
+        if idx is None:
+            idx = MinHashIndex()
+            for question, blob in db.get_gk_question_signatures(user_id):
+                idx.add(question, np.frombuffer(blob, dtype=np.uint64))
+            _indexes[user_id] = idx
+            _watermarks[user_id] = db.get_gk_signature_watermark(user_id)
+
+        new_rows = []
+        last = _watermarks[user_id]
+        for quiz in db.get_gk_quizzes_after(user_id, last):
+            for text in _question_texts(quiz["questions_json"]):
+                sig = idx.add(text)
+                if sig is not None:
+                    new_rows.append((quiz["id"], text, sig.tobytes()))
+            last = max(last, int(quiz["id"]))
+        if last != _watermarks[user_id]:
+            db.save_gk_question_signatures(user_id, new_rows, watermark=last)
+            _watermarks[user_id] = last
+        return idx
+
+
+def reset_history_indexes() -> None:
+    """Drop the per-process indexes (tests, or after editing gk_daily_questions by hand)."""
+    with _lock:
+        _indexes.clear()
+        _watermarks.clear()
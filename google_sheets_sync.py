@@ -128,6 +128,9 @@ def skip_cloud_sync() -> bool:
 
 _spreadsheet_cache: dict[str, object] = {}
 _HEADERS_VERIFIED: set[int] = set()
+# worksheet title -> {(user_name, log_date): 1-based row}, built from one bulk read
+# per process and kept current as rows are appended (see ``_row_index``).
+_row_index_cache: dict[str, dict[tuple[str, str], int]] = {}
 
 T = TypeVar("T")
 
@@ -302,11 +305,49 @@ def _streak_row_key(user_id: int) -> str:
     return f"streak_row:{user_id}"
 
 
-def _sheet_has_daily_login(ws, user_name: str, log_date: str) -> bool:
-    for row in ws.get_all_values()[1:]:
-        if len(row) >= 2 and row[0].strip() == user_name and row[1].strip()[:10] == log_date:
-            return True
-    return False
+def _tab_records(ws) -> list[dict[str, str]]:
+    """Read a user/date keyed tab once; refreshes its row index as a side effect."""
+    values = _retry_sheets_api(ws.get_all_values)
+    index: dict[tuple[str, str], int] = {}
+    records: list[dict[str, str]] = []
+    header = values[0] if values else []
+    for idx, row in enumerate(values[1:], start=2):
+        if len(row) >= 2 and row[0].strip():
+            index.setdefault((row[0].strip(), row[1].strip()[:10]), idx)
+        records.append(dict(zip(header, row)))
+    _row_index_cache[ws.title] = index
+    return records
+
+
+def _row_index(ws) -> dict[tuple[str, str], int]:
+    """(user_name, log_date) -> sheet row for a tab, reading it at most once per process."""
+    index = _row_index_cache.get(ws.title)
+    if index is None:
+        _tab_records(ws)
+        index = _row_index_cache[ws.title]
+    return index
+
+
+def reset_row_index_cache() -> None:
+    """Forget cached sheet row positions (after rows were edited by hand)."""
+    _row_index_cache.clear()
+
+
+def _write_rows(ws, updates: list[tuple[int, list]], appends: list[list], last_col: str) -> list[int]:
+    """Rewrite rows in place with one values batchUpdate and add new ones with one append.
+
+    Returns the sheet row numbers of ``appends``.
+    """
+    if updates:
+        data = [
+            {"range": f"A{target}:{last_col}{target}", "values": [row]} for target, row in updates
+        ]
+        _retry_sheets_api(lambda: ws.batch_update(data, value_input_option="USER_ENTERED"))
+    if not appends:
+        return []
+    resp = _retry_sheets_api(lambda: ws.append_rows(appends, value_input_option="USER_ENTERED"))
+    first = _appended_row_index(resp, ws)
+    return list(range(first, first + len(appends)))
 
 
 def append_daily_login(user_name: str, log_date: str, *, user_id: int | None = None) -> None:
@@ -322,10 +363,13 @@ def append_daily_login(user_name: str, log_date: str, *, user_id: int | None = N
     when = datetime.now()
     row = [user_name, log_date, when.strftime("%Y-%m-%d %H:%M:%S")]
 
-    def _append() -> None:
-        ws.append_row(row, value_input_option="USER_ENTERED")
+    def _append() -> object:
+        return ws.append_row(row, value_input_option="USER_ENTERED")
 
-    _retry_sheets_api(_append)
+    resp = _retry_sheets_api(_append)
+    index = _row_index_cache.get(ws.title)
+    if index is not None:
+        index.setdefault((user_name, log_date), _appended_row_index(resp, ws))
     if user_id:
         db.gss_push_state_set(_login_push_key(user_id, log_date), "1")
 
@@ -337,15 +381,19 @@ def sync_daily_logins_from_sheet() -> int:
 
     ws = _daily_logins_worksheet()
     _ensure_daily_logins_headers(ws)
-    imported = 0
-    for rec in ws.get_all_records():
+    user_ids = {u["name"]: u["id"] for u in db.get_all_users()}
+    logins: list[tuple[int, str]] = []
+    for rec in _tab_records(ws):
         user_name = str(rec.get("user_name", "")).strip()
         log_date = str(rec.get("log_date", "")).strip()[:10]
         if not user_name or not log_date:
             continue
-        user = db.get_user(user_name)
-        if user and db.import_daily_login(user["id"], log_date):
-            imported += 1
+        user_id = user_ids.get(user_name)
+        if user_id is not None:
+            logins.append((user_id, log_date))
+    imported = db.import_daily_logins(logins)
+    # Rows already on the sheet never need pushing back.
+    db.gss_push_state_set_many({_login_push_key(uid, d): "1" for uid, d in logins})
     return imported
 
 
@@ -354,14 +402,28 @@ def push_local_daily_logins_to_sheet() -> int:
     if not is_configured():
         return 0
 
-    pushed = 0
+    candidates: dict[str, tuple[str, str]] = {}
     for user in db.get_all_users():
         for log_date in db.get_user_log_dates(user["id"]):
-            if db.gss_push_state_get(_login_push_key(user["id"], log_date)):
-                continue
-            append_daily_login(user["name"], log_date, user_id=user["id"])
-            pushed += 1
-    return pushed
+            candidates[_login_push_key(user["id"], log_date)] = (user["name"], log_date)
+    marked = db.gss_push_state_get_many(list(candidates))
+    missing = {k: v for k, v in candidates.items() if k not in marked}
+    if not missing:
+        return 0
+
+    ws = _daily_logins_worksheet()
+    _ensure_daily_logins_headers(ws)
+    index = _row_index(ws)
+    when = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    appends = [
+        [name, log_date, when]
+        for name, log_date in missing.values()
+        if (name, log_date) not in index
+    ]
+    for row, target in zip(appends, _write_rows(ws, [], appends, "C")):
+        index[(row[0], row[1])] = target
+    db.gss_push_state_set_many({k: "1" for k in missing})
+    return len(appends)
 
 
 def refresh_user_streaks_sheet() -> None:
@@ -385,14 +447,6 @@ def refresh_user_streaks_sheet() -> None:
     ws.update(range_name="A1", values=rows)
 
 
-def _summary_row_index(ws, user_name: str, log_date: str) -> int | None:
-    """1-based sheet row for user+date, or None."""
-    for idx, row in enumerate(ws.get_all_values()[1:], start=2):
-        if len(row) >= 2 and row[0].strip() == user_name and row[1].strip()[:10] == log_date:
-            return idx
-    return None
-
-
 def upsert_daily_summary_row(
     user_name: str,
     log_date: str,
@@ -420,7 +474,8 @@ def upsert_daily_summary_row(
     ]
     row_key = _summary_row_key(user_id, log_date) if user_id else None
     stored = db.gss_push_state_get(row_key) if row_key else None
-    target = int(stored) if stored else None
+    index = _row_index_cache.get(ws.title)
+    target = int(stored) if stored else (index or {}).get((user_name, log_date))
 
     def _write() -> None:
         nonlocal target
@@ -428,8 +483,10 @@ def upsert_daily_summary_row(
             ws.update(range_name=f"A{target}:F{target}", values=[row])
             return
         resp = ws.append_row(row, value_input_option="USER_ENTERED")
+        target = _appended_row_index(resp, ws)
+        if index is not None:
+            index[(user_name, log_date)] = target
         if row_key:
-            target = _appended_row_index(resp, ws)
             db.gss_push_state_set(row_key, str(target))
 
     _retry_sheets_api(_write)
@@ -441,15 +498,41 @@ def refresh_user_daily_summary_sheet(log_date: str | None = None) -> None:
         return
 
     log_date = log_date or datetime.now().strftime("%Y-%m-%d")
-    for user in db.get_all_users():
+    users = db.get_all_users()
+    keys = {user["id"]: _summary_row_key(user["id"], log_date) for user in users}
+    stored = db.gss_push_state_get_many(list(keys.values()))
+
+    ws = _daily_summary_worksheet()
+    _ensure_daily_summary_headers(ws)
+    index = _row_index(ws)
+    when = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    updates: list[tuple[int, list]] = []
+    appends: list[list] = []
+    pointers: dict[str, str] = {}
+    for user in users:
         stats = db.compute_user_daily_summary(user["id"], log_date)
-        upsert_daily_summary_row(
+        row = [
             user["name"],
             log_date,
-            activities_count=stats["activities_count"],
-            avg_score_pct=stats["avg_score_pct"],
-            time_spent_seconds=stats["time_spent_seconds"],
-        )
+            int(stats["activities_count"]),
+            int(stats["avg_score_pct"]),
+            int(stats["time_spent_seconds"]),
+            when,
+        ]
+        key = keys[user["id"]]
+        target = int(stored[key]) if key in stored else index.get((user["name"], log_date))
+        if target:
+            updates.append((target, row))
+            pointers[key] = str(target)
+        else:
+            appends.append(row)
+
+    new_rows = _write_rows(ws, updates, appends, "F")
+    ids = {user["name"]: user["id"] for user in users}
+    for row, target in zip(appends, new_rows):
+        index[(row[0], log_date)] = target
+        pointers[keys[ids[row[0]]]] = str(target)
+    db.gss_push_state_set_many(pointers)
 
 
 def sync_daily_summaries_from_sheet() -> int:
@@ -459,23 +542,24 @@ def sync_daily_summaries_from_sheet() -> int:
 
     ws = _daily_summary_worksheet()
     _ensure_daily_summary_headers(ws)
+    user_ids = {u["name"]: u["id"] for u in db.get_all_users()}
     imported = 0
-    for rec in ws.get_all_records():
+    for rec in _tab_records(ws):
         user_name = str(rec.get("user_name", "")).strip()
         log_date = str(rec.get("log_date", "")).strip()[:10]
         if not user_name or not log_date:
             continue
-        user = db.get_user(user_name)
-        if not user:
+        user_id = user_ids.get(user_name)
+        if user_id is None:
             continue
         try:
-            activities_count = int(rec.get("activities_count") or 0)
-            avg_score_pct = int(rec.get("avg_score_pct") or 0)
-            time_spent_seconds = int(rec.get("time_spent_seconds") or 0)
+            activities_count = int(float(rec.get("activities_count") or 0))
+            avg_score_pct = int(float(rec.get("avg_score_pct") or 0))
+            time_spent_seconds = int(float(rec.get("time_spent_seconds") or 0))
         except (TypeError, ValueError):
             continue
         db.import_daily_summary(
-            user["id"],
+            user_id,
             log_date,
             activities_count=activities_count,
             avg_score_pct=avg_score_pct,
@@ -0,0 +1,234 @@
+"""Memory-resident store for the Harshit topic question bank files.
+
+Each ``topic_XX.json`` bank (PreReq chapter banks and Class 10 unit banks)
+is parsed once per process and kept with per-level arrays of
+``BankEntry(question, qid, key, good)`` — the dedup key and quality check
+precomputed — plus a per-level dedup-key -> id index.  A bank is reloaded
+only when its file (or journal) changes on disk.
+
+New questions are appended to a ``topic_XX.jsonl`` journal next to the bank
+instead of rewriting the whole JSON file; the journal is folded back into
+the JSON on ``save`` or once it reaches ``COMPACT_AFTER`` lines.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import threading
+from collections.abc import Callable, Sequence
+from pathlib import Path
+from typing import NamedTuple
+
+from llm_question_format import is_quality_practice_question
+
+COMPACT_AFTER = 500
+# Random draws tried before falling back to a scan of the whole pool.
+_SAMPLE_TRIES = 24
+
+
+class BankEntry(NamedTuple):
+    question: dict
+    qid: str
+    key: str
+    good: bool  # passes is_quality_practice_question
+
+
+def journal_path(path: Path) -> Path:
+    return path.with_suffix(".jsonl")
+
+
+def _is_good(q: dict) -> bool:
+    opts = q.get("options") or []
+    return is_quality_practice_question(str(q.get("question", "")), [str(o) for o in opts])
+
+
+class TopicBank:
+    """One parsed bank file, indexed by level."""
+
+    def __init__(self, data: dict, key_fn: Callable[[dict], str]):
+        self.data = data
+        self.journal_lines = 0
+        self._key_fn = key_fn
+        self._pools: dict[str | None, list[BankEntry]] = {None: []}
+        self._good: dict[str | None, list[BankEntry]] = {None: []}
+        # level -> {dedup key: question id}; ids per level for add-time dedup
+        self.key_index: dict[str, dict[str, str]] = {}
+        self._ids: dict[str, set[str]] = {}
+        questions = data.setdefault("questions", {})
+        if not isinstance(questions, dict):
+            questions = data["questions"] = {}
+        for level, bucket in list(questions.items()):
+            if not isinstance(bucket, list):
+                continue
+            kept = [q for q in bucket if isinstance(q, dict)]
+            questions[level] = kept
+            for q in kept:
+                self._index(level, q)
+
+    def _index(self, level: str, q: dict) -> None:
+        qid = str(q.get("id") or "")
+        key = self._key_fn(q)
+        entry = BankEntry(q, qid, key, _is_good(q))
+        for lvl in (level, None):
+            self._pools.setdefault(lvl, []).append(entry)
+            if entry.good:
+                self._good.setdefault(lvl, []).append(entry)
+        if qid:
+            self._ids.setdefault(level, set()).add(qid)
+        self.key_index.setdefault(level, {}).setdefault(key, qid)
+
+    def add(self, level: str, q: dict) -> None:
+        self.data["questions"].setdefault(level, []).append(q)
+        self._index(level, q)
+
+    def has(self, level: str, q: dict) -> bool:
+        """True if ``q``'s id or dedup key is already in ``level``."""
+        if str(q.get("id") or "") in self._ids.get(level, ()):
+            return True
+        return self._key_fn(q) in self.key_index.get(level, {})
+
+    def pool(self, level: str | None = None) -> Sequence[BankEntry]:
+        """Entries for ``level`` (None: every level), in file order."""
+        return self._pools.get(level, ())
+
+    def good_pool(self, level: str | None = None) -> Sequence[BankEntry]:
+        return self._good.get(level, ())
+
+    def count(self) -> int:
+        return len(self._pools[None])
+
+    def snapshot(self) -> dict:
+        """A copy of the bank dict that callers may mutate freely."""
+        return {
+            **self.data,
+            "meta": dict(self.data.get("meta") or {}),
+            "questions": {lvl: list(qs) for lvl, qs in self.data["questions"].items()},
+        }
+
+
+def draw(entries: Sequence[BankEntry], excluded: Callable[[BankEntry], bool]) -> BankEntry | None:
+    """A uniformly random entry that is not ``excluded``.
+
+    Random probes first (sessions exclude a handful of a large pool), then
+    one scan when the pool is mostly used up.
+    """
+    n = len(entries)
+    for _ in range(min(n, _SAMPLE_TRIES)):
+        entry = entries[random.randrange(n)]
+        if not excluded(entry):
+            return entry
+    rest = [e for e in entries if not excluded(e)]
+    return random.choice(rest) if rest else None
+
+
+def _signature(path: Path) -> tuple:
+    sig = []
+    for p in (path, journal_path(path)):
+        try:
+            st = p.stat()
+            sig.append((st.st_mtime_ns, st.st_size))
+        except OSError:
+            sig.append(None)
+    return tuple(sig)
+
+
+class BankStore:
+    """Process-wide cache of ``TopicBank`` objects keyed by file path."""
+
+    def __init__(self, key_fn: Callable[[dict], str]):
+        self._key_fn = key_fn
+        self._banks: dict[Path, tuple[tuple, TopicBank]] = {}
+        self._lock = threading.RLock()
+        self.loads = 0
+
+    def get(self, path: Path) -> TopicBank:
+        sig = _signature(path)
+        with self._lock:
+            cached = self._banks.get(path)
+            if cached and cached[0] == sig:
+                return cached[1]
+            bank = self._load(path)
+            self._banks[path] = (sig, bank)
+            return bank
+
+    def _load(self, path: Path) -> TopicBank:
+        self.loads += 1
+        data: dict = {}
+        if path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except (json.JSONDecodeError, OSError):
+                data = {}
+        if not isinstance(data, dict):
+            data = {}
+        bank = TopicBank(data, self._key_fn)
+        try:
+            lines = journal_path(path).read_text(encoding="utf-8").splitlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # torn last line from an interrupted append
+            if isinstance(rec.get("meta"), dict):
+                bank.data.setdefault("meta", {}).update(rec["meta"])
+            if isinstance(rec.get("question"), dict):
+                bank.add(str(rec.get("level", "")), rec["question"])
+            bank.journal_lines += 1
+        return bank
+
+    def save(self, path: Path, data: dict) -> Path:
+        """Write ``data`` as the whole bank (atomically) and drop the journal."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        with self._lock:
+            os.replace(tmp, path)
+            journal_path(path).unlink(missing_ok=True)
+            self._banks.pop(path, None)  # the caller may keep mutating ``data``
+        return path
+
+    def append(self, path: Path, level: str, questions: list[dict], *, meta: dict | None = None) -> int:
+        """Add ``questions`` not already in ``level`` (by id or dedup key); returns how many."""
+        with self._lock:
+            bank = self.get(path)
+            lines = []
+            if meta and any(bank.data.get("meta", {}).get(k) != v for k, v in meta.items()):
+                bank.data.setdefault("meta", {}).update(meta)
+                lines.append({"meta": meta})
+            added = 0
+            for q in questions:
+                if bank.has(level, q):
+                    continue
+                bank.add(level, q)
+                lines.append({"level": level, "question": q})
+                added += 1
+            if not lines:
+                return 0
+            if bank.journal_lines + len(lines) >= COMPACT_AFTER:
+                self.save(path, bank.data)
+                bank.journal_lines = 0
+                self._banks[path] = (_signature(path), bank)
+                return added
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with journal_path(path).open("a", encoding="utf-8") as fh:
+                fh.write("".join(json.dumps(rec, ensure_ascii=False) + "\n" for rec in lines))
+            bank.journal_lines += len(lines)
+            self._banks[path] = (_signature(path), bank)
+            return added
+
+    def compact(self, path: Path) -> None:
+        """Fold the journal (if any) back into the JSON file."""
+        with self._lock:
+            if journal_path(path).exists():
+                self.save(path, self.get(path).data)
+
+    def invalidate(self, path: Path | None = None) -> None:
+        with self._lock:
+            if path is None:
+                self._banks.clear()
+            else:
+                self._banks.pop(path, None)
@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
-import json
-import random
 import re
 import uuid
 from pathlib import Path
 
+import harshit_bank_store as hbs
 import harshit_math_render as hmr
 import harshit_prereq_topics as hpt
 from llm_question_format import is_quality_practice_question
@@ -53,24 +52,11 @@ def bank_path(prereq_id: int, topic_id: int) -> Path:
 
 
 def load_bank(prereq_id: int, topic_id: int) -> dict:
-    path = bank_path(prereq_id, topic_id)
-    if not path.is_file():
-        return {"questions": {}}
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {"questions": {}}
-    if not isinstance(data, dict):
-        return {"questions": {}}
-    data.setdefault("questions", {})
-    return data
+    return store.get(bank_path(prereq_id, topic_id)).snapshot()
 
 
 def save_bank(prereq_id: int, topic_id: int, bank: dict) -> Path:
-    path = bank_path(prereq_id, topic_id)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    return path
+    return store.save(bank_path(prereq_id, topic_id), bank)
 
 
 def bank_stats(prereq_id: int) -> dict:
@@ -78,8 +64,7 @@ def bank_stats(prereq_id: int) -> dict:
     total = 0
     by_topic: dict[int, int] = {}
     for tid in topics:
-        bank = load_bank(prereq_id, tid)
-        count = sum(len(v) for v in bank.get("questions", {}).values() if isinstance(v, list))
+        count = store.get(bank_path(prereq_id, tid)).count()
         by_topic[tid] = count
         total += count
     return {"total": total, "by_topic": by_topic}
@@ -106,35 +91,16 @@ def add_questions(
     chapter_num: int | None = None,
     source_pdf: str = "",
 ) -> int:
-    bank = load_bank(prereq_id, topic_id)
-    bank.setdefault("meta", {})
-    bank["meta"].update(
-        {
-            "prereq_id": prereq_id,
-            "topic_id": topic_id,
-            "chapter_num": chapter_num or chapter_for_topic(prereq_id, topic_id),
-            "source_pdf": source_pdf or bank["meta"].get("source_pdf", ""),
-        }
-    )
-    bucket = bank.setdefault("questions", {}).setdefault(level, [])
-    existing_ids = {q.get("id") for q in bucket if isinstance(q, dict)}
-    existing_keys = {
-        question_dedup_key(str(q.get("question", "")))
-        for q in bucket
-        if isinstance(q, dict)
+    path = bank_path(prereq_id, topic_id)
+    meta = {
+        "prereq_id": prereq_id,
+        "topic_id": topic_id,
+        "chapter_num": chapter_num or chapter_for_topic(prereq_id, topic_id),
     }
-    added = 0
-    for raw in questions:
-        q = normalize_question(raw, prereq_id, topic_id, level)
-        key = question_dedup_key(str(q.get("question", "")))
-        if q["id"] in existing_ids or key in existing_keys:
-            continue
-        bucket.append(q)
-        existing_ids.add(q["id"])
-        existing_keys.add(key)
-        added += 1
-    save_bank(prereq_id, topic_id, bank)
-    return added
+    if source_pdf or not store.get(path).data.get("meta", {}).get("source_pdf"):
+        meta["source_pdf"] = source_pdf
+    normalized = [normalize_question(raw, prereq_id, topic_id, level) for raw in questions]
+    return store.append(path, level, normalized, meta=meta)
 
 
 def question_dedup_key(text: str) -> str:
@@ -144,23 +110,27 @@ def question_dedup_key(text: str) -> str:
     return t.rstrip(".?!").strip()
 
 
+store = hbs.BankStore(lambda q: question_dedup_key(str(q.get("question", ""))))
+
+
 def is_question_excluded(
     q: dict,
     *,
     exclude_ids: set[str] | None = None,
     exclude_text: set[str] | None = None,
 ) -> bool:
-    """True if question id or normalized text was already used."""
-    exclude_ids = exclude_ids or set()
-    exclude_text = exclude_text or set()
+    """True if question id or normalized text was already used.
+
+    ``exclude_text`` holds ``question_dedup_key`` values (raw question text
+    also matches), so the check is two set lookups.
+    """
     qid = str(q.get("id") or "")
-    if qid and qid in exclude_ids:
+    if qid and exclude_ids and qid in exclude_ids:
         return True
+    if not exclude_text:
+        return False
     raw = str(q.get("question", "")).strip()
-    if raw in exclude_text:
-        return True
-    key = question_dedup_key(raw)
-    return key in exclude_text or any(question_dedup_key(t) == key for t in exclude_text)
+    return raw in exclude_text or question_dedup_key(raw) in exclude_text
 
 
 def normalize_question(raw: dict, prereq_id: int, topic_id: int, level: str) -> dict:
@@ -204,35 +174,22 @@ def pick_question(
     exclude_text: set[str] | None = None,
     quality_only: bool = True,
 ) -> dict | None:
-    bank = load_bank(prereq_id, topic_id)
-    pool = list(bank.get("questions", {}).get(level, []))
-    if not pool:
-        pool = [
-            q
-            for lvl, qs in bank.get("questions", {}).items()
-            if isinstance(qs, list)
-            for q in qs
-        ]
-    if not pool:
-        return None
+    bank = store.get(bank_path(prereq_id, topic_id))
+    level_pool = level if bank.pool(level) else None  # None: draw from any level
     exclude_ids = exclude_ids or set()
     exclude_text = exclude_text or set()
 
-    def _excluded(q: dict) -> bool:
-        return is_question_excluded(q, exclude_ids=exclude_ids, exclude_text=exclude_text)
-
-    def _quality_ok(q: dict) -> bool:
-        if not quality_only:
+    def _excluded(e: hbs.BankEntry) -> bool:
+        if e.qid and e.qid in exclude_ids:
             return True
-        opts = q.get("options") or []
-        return is_quality_practice_question(str(q.get("question", "")), [str(o) for o in opts])
+        return e.key in exclude_text or str(e.question.get("question", "")).strip() in exclude_text
 
-    candidates = [q for q in pool if not _excluded(q) and _quality_ok(q)]
-    if not candidates and quality_only:
-        candidates = [q for q in pool if not _excluded(q)]
-    if not candidates:
+    entry = hbs.draw(bank.good_pool(level_pool), _excluded) if quality_only else None
+    if entry is None:
+        entry = hbs.draw(bank.pool(level_pool), _excluded)
+    if entry is None:
         return None
-    raw = random.choice(candidates)
+    raw = entry.question
     try:
         normalized = normalize_question(raw, prereq_id, topic_id, level)
         if quality_only and not is_quality_practice_question(
@@ -256,13 +213,8 @@ def purge_low_quality_banks() -> int:
             continue
         prereq_id = int(m_pre.group(1))
         topic_id = int(m_top.group(1))
-        try:
-            data = json.loads(path.read_text(encoding="utf-8"))
-        except (json.JSONDecodeError, OSError):
-            continue
-        questions = data.get("questions", {})
-        if not isinstance(questions, dict):
-            continue
+        data = load_bank(prereq_id, topic_id)
+        questions = data["questions"]
         changed = False
         for level, bucket in list(questions.items()):
             if not isinstance(bucket, list):
@@ -6,15 +6,15 @@ import json
 import random
 import re
 
-from openai import APIConnectionError, APITimeoutError, OpenAI, OpenAIError
+from openai import APIConnectionError, APITimeoutError, OpenAIError
 
 import harshit_class10_questions as h10q
 import harshit_class10_topics as h10t
 import harshit_class10_units as h10u
 import harshit_math_render as hmr
 from llm_question_format import KID_NUMERIC_FORMAT_RULES, validate_practice_question
+from xai_client import XAIClient, get_xai_client
 
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 _MAX_RETRIES = 3
 BATCH_MAX_TOKENS = 5000
@@ -23,8 +23,8 @@ MAX_EXCERPT_CHARS = 6000
 MAX_SEED_EXAMPLES = 3
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL, timeout=BATCH_TIMEOUT_SEC)
+def _get_client(xai_api_key: str) -> XAIClient:
+    return get_xai_client(xai_api_key, timeout=BATCH_TIMEOUT_SEC)
 
 
 def _batch_system_prompt() -> str:
@@ -2,14 +2,13 @@
 
 from __future__ import annotations
 
-import json
-import random
+import re
 import uuid
 from pathlib import Path
 
+import harshit_bank_store as hbs
 import harshit_class10_topics as h10t
 import harshit_math_render as hmr
-from llm_question_format import is_quality_practice_question
 
 ROOT = Path(__file__).resolve().parent
 BANK_DIR = ROOT / "HarshitMath" / "class10" / "question_banks"
@@ -20,29 +19,14 @@ def bank_path(unit_id: int, topic_id: int) -> Path:
 
 
 def load_bank(unit_id: int, topic_id: int) -> dict:
-    path = bank_path(unit_id, topic_id)
-    if not path.is_file():
-        return {"questions": {}}
-    try:
-        data = json.loads(path.read_text(encoding="utf-8"))
-    except (json.JSONDecodeError, OSError):
-        return {"questions": {}}
-    if not isinstance(data, dict):
-        return {"questions": {}}
-    data.setdefault("questions", {})
-    return data
+    return store.get(bank_path(unit_id, topic_id)).snapshot()
 
 
 def save_bank(unit_id: int, topic_id: int, bank: dict) -> Path:
-    path = bank_path(unit_id, topic_id)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(bank, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
-    return path
+    return store.save(bank_path(unit_id, topic_id), bank)
 
 
 def question_dedup_key(text: str, options: list[str] | None = None) -> str:
-    import re
-
     t = str(text or "").strip().lower()
     t = re.sub(r"\s+", " ", t)
     t = t.rstrip(".?!").strip()
@@ -52,6 +36,9 @@ def question_dedup_key(text: str, options: list[str] | None = None) -> str:
     return t
 
 
+store = hbs.BankStore(lambda q: question_dedup_key(str(q.get("question", "")), q.get("options")))
+
+
 def normalize_question(raw: dict, unit_id: int, topic_id: int, level: str) -> dict:
     options = [hmr.sanitize_grok_math_text(str(o)) for o in raw.get("options", [])]
     answer = int(raw.get("answer", 0))
@@ -80,27 +67,10 @@ def normalize_question(raw: dict, unit_id: int, topic_id: int, level: str) -> di
 
 
 def add_questions(unit_id: int, topic_id: int, level: str, questions: list[dict]) -> int:
-    bank = load_bank(unit_id, topic_id)
-    bank.setdefault("meta", {"unit_id": unit_id, "topic_id": topic_id})
-    bucket = bank.setdefault("questions", {}).setdefault(level, [])
-    existing_ids = {q.get("id") for q in bucket if isinstance(q, dict)}
-    existing_keys = {
-        question_dedup_key(str(q.get("question", "")), q.get("options"))
-        for q in bucket
-        if isinstance(q, dict)
-    }
-    added = 0
-    for raw in questions:
-        q = normalize_question(raw, unit_id, topic_id, level)
-        key = question_dedup_key(str(q.get("question", "")), q.get("options"))
-        if q["id"] in existing_ids or key in existing_keys:
-            continue
-        bucket.append(q)
-        existing_ids.add(q["id"])
-        existing_keys.add(key)
-        added += 1
-    save_bank(unit_id, topic_id, bank)
-    return added
+    normalized = [normalize_question(raw, unit_id, topic_id, level) for raw in questions]
+    path = bank_path(unit_id, topic_id)
+    meta = None if store.get(path).data.get("meta") else {"unit_id": unit_id, "topic_id": topic_id}
+    return store.append(path, level, normalized, meta=meta)
 
 
 def pick_question(
@@ -111,28 +81,16 @@ def pick_question(
     exclude_ids: set[str] | None = None,
     exclude_text: set[str] | None = None,
 ) -> dict | None:
-    bank = load_bank(unit_id, topic_id)
-    pool = list(bank.get("questions", {}).get(level, []))
-    if not pool:
-        return None
+    bank = store.get(bank_path(unit_id, topic_id))
     exclude_ids = exclude_ids or set()
     exclude_text = exclude_text or set()
-    candidates = []
-    for q in pool:
-        qid = str(q.get("id") or "")
-        if qid and qid in exclude_ids:
-            continue
-        key = question_dedup_key(str(q.get("question", "")), q.get("options"))
-        if key in exclude_text:
-            continue
-        opts = q.get("options") or []
-        if is_quality_practice_question(str(q.get("question", "")), [str(o) for o in opts]):
-            candidates.append(q)
-    if not candidates:
-        candidates = [q for q in pool if str(q.get("id") or "") not in exclude_ids]
-    if not candidates:
+    entry = hbs.draw(
+        bank.good_pool(level),
+        lambda e: (bool(e.qid) and e.qid in exclude_ids) or e.key in exclude_text,
+    ) or hbs.draw(bank.pool(level), lambda e: e.qid in exclude_ids)
+    if entry is None:
         return None
-    raw = random.choice(candidates)
+    raw = entry.question
     try:
         return normalize_question(raw, unit_id, topic_id, level)
     except (ValueError, TypeError, KeyError):
@@ -147,6 +105,8 @@ def clear_unit_bank(unit_id: int) -> int:
     removed = 0
     for path in folder.glob("topic_*.json"):
         path.unlink(missing_ok=True)
+        hbs.journal_path(path).unlink(missing_ok=True)
+        store.invalidate(path)
         removed += 1
     return removed
 
@@ -156,8 +116,7 @@ def bank_stats(unit_id: int) -> dict:
     total = 0
     by_topic: dict[int, int] = {}
     for tid in topics:
-        bank = load_bank(unit_id, tid)
-        count = sum(len(v) for v in bank.get("questions", {}).values() if isinstance(v, list))
+        count = store.get(bank_path(unit_id, tid)).count()
         by_topic[tid] = count
         total += count
     return {"total": total, "by_topic": by_topic}
@@ -6,6 +6,7 @@ import math
 import re
 from typing import Any
 
+import diagram_cache
 import harshit_geometry_diagrams as hgd
 
 
@@ -359,6 +360,11 @@ def render_svg(question: dict) -> str | None:
     spec = diagram_spec(question)
     if not spec:
         return None
+    return diagram_cache.get_or_render("harshit_svg", spec, lambda: render_spec_svg(spec))
+
+
+def render_spec_svg(spec: dict) -> str | None:
+    """SVG for a diagram spec, uncached (``render_svg`` caches by spec)."""
     kind = spec.get("type")
     if kind == "unit_square":
         return svg_unit_square()
@@ -11,7 +11,7 @@ from collections import Counter
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Callable
 
-from openai import APIConnectionError, APITimeoutError, OpenAI, OpenAIError
+from openai import APIConnectionError, APITimeoutError, OpenAIError
 
 import harshit_chapter_pdf as hcp
 import harshit_chapter_questions as hcq
@@ -23,8 +23,8 @@ from llm_question_format import (
     NUMERIC_RETRY_HINT,
     validate_practice_question,
 )
+from xai_client import XAIClient, get_xai_client
 
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 _MAX_RETRIES = 3
 DEFAULT_PARALLEL = 2
@@ -44,9 +44,9 @@ def _parallel_workers(max_workers: int | None = None) -> int:
         return DEFAULT_PARALLEL
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
+def _get_client(xai_api_key: str) -> XAIClient:
     """Same client pattern as Arjun Course 3 / Linear Equations / GK."""
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL, timeout=BATCH_TIMEOUT_SEC)
+    return get_xai_client(xai_api_key, timeout=BATCH_TIMEOUT_SEC)
 
 
 def _batch_system_prompt() -> str:
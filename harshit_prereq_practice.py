@@ -9,6 +9,7 @@ import database as db
 import harshit_chapter_questions as hcq
 import harshit_math_diagrams as hmd
 import harshit_prereq_topics as hpt
+import question_pool
 from practice_quality.assembler import qa_and_assemble
 from practice_quality.report import build_learning_report
 
@@ -101,6 +102,11 @@ def _generate_one(
     if q:
         return q
 
+    slot = f"p{prereq_id}_t{topic_id}_{level}"
+    q = _fresh(question_pool.take("harshit", slot, used_ids, used_keys))
+    if q:
+        return q
+
     return _fresh(
         hpt.generate_question(
             prereq_id,
@@ -113,6 +119,20 @@ def _generate_one(
     )
 
 
+def _pool_question(slot: str) -> dict | None:
+    prereq, topic, level = slot.split("_")
+    return hpt.generate_question(int(prereq[1:]), int(topic[1:]), level, templates_only=True)
+
+
+def _pool_keys(q: dict) -> set[str]:
+    from practice_quality.dedup import fingerprints_for_question
+
+    return {*fingerprints_for_question(q), _question_key(q)}
+
+
+question_pool.register("harshit", _pool_question, keys=_pool_keys)
+
+
 def _fill_from_bank_and_templates(
     prereq_id: int,
     config: dict,
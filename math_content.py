@@ -8,28 +8,14 @@ Three levels:
   - Subtraction:  One group with some crossed out, "How many are left?"
 """
 
-import base64
 import os
 import random
 
+from static_assets import image_src
+
 # ── Directory where cartoon object images live ──
 _MATH_IMG_DIR = os.path.join(os.path.dirname(__file__), "math_images")
 
-# ── Cache for base64-encoded images (loaded once per object) ──
-_B64_CACHE: dict[str, str] = {}
-
-
-def _get_b64(img_path: str) -> str | None:
-    """Load an image file and return its base64 data URI string, cached."""
-    if img_path in _B64_CACHE:
-        return _B64_CACHE[img_path]
-    if not os.path.exists(img_path):
-        return None
-    with open(img_path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-    data_uri = f"data:image/png;base64,{encoded}"
-    _B64_CACHE[img_path] = data_uri
-    return data_uri
 
 # ── Object pool: (display_name, image_filename, fallback_emoji) ──
 OBJECT_POOL = [
@@ -114,11 +100,11 @@ def _make_options(correct, low=0, high=20):
 
 
 def _img_tag(img_path, fallback_emoji, size=60):
-    """Return an <img> tag using base64 data URI, or a styled emoji span as fallback."""
-    data_uri = _get_b64(img_path)
-    if data_uri:
+    """Return an <img> tag for the object image, or a styled emoji span as fallback."""
+    src = image_src(img_path)
+    if src:
         return (
-            f'<img src="{data_uri}" '
+            f'<img src="{src}" '
             f'style="width:{size}px;height:{size}px;object-fit:contain;'
             f'margin:4px;vertical-align:middle;" />'
         )
@@ -138,11 +124,11 @@ def _render_image_grid(img_path, fallback_emoji, count, per_row=5, size=60):
 
 def _render_crossed_image(img_path, fallback_emoji, size=60):
     """Return an image with a red X overlay to show it's been taken away."""
-    data_uri = _get_b64(img_path)
-    if data_uri:
+    src = image_src(img_path)
+    if src:
         return (
             f'<span style="position:relative;display:inline-block;width:{size}px;height:{size}px;margin:4px;">'
-            f'<img src="{data_uri}" '
+            f'<img src="{src}" '
             f'style="width:{size}px;height:{size}px;object-fit:contain;opacity:0.35;filter:grayscale(80%);" />'
             f'<span style="position:absolute;top:50%;left:50%;transform:translate(-50%,-50%);'
             f'font-size:{int(size*0.7)}px;color:#ef4444;font-weight:bold;">✕</span>'
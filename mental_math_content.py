@@ -11,6 +11,8 @@ Difficulty is calibrated for an 11-year-old (medium-hard).
 
 import random
 
+import question_pool
+
 CATEGORIES = {
     "fractions": {"name": "Fractions & Decimals", "emoji": "🍕", "color": "#f59e0b"},
     "integers": {"name": "Integers", "emoji": "🔢", "color": "#6366f1"},
@@ -1817,6 +1819,13 @@ _GENERATORS = {
 }
 
 
+def _pool_question(category: str) -> dict:
+    return random.choice(_GENERATORS[category])()
+
+
+question_pool.register("sprint", _pool_question)
+
+
 def generate_sprint(num_questions: int = 10, category: str | None = None) -> list:
     """Generate a set of math questions for a sprint round.
 
@@ -1826,16 +1835,13 @@ def generate_sprint(num_questions: int = 10, category: str | None = None) -> lis
     questions = []
 
     if category and category in _GENERATORS:
-        gens = _GENERATORS[category]
         for _ in range(num_questions):
-            gen = random.choice(gens)
-            questions.append(gen())
+            questions.append(question_pool.take("sprint", category) or _pool_question(category))
     else:
         cats = list(_GENERATORS.keys())
         for i in range(num_questions):
             cat = cats[i % len(cats)]
-            gen = random.choice(_GENERATORS[cat])
-            questions.append(gen())
+            questions.append(question_pool.take("sprint", cat) or _pool_question(cat))
         random.shuffle(questions)
 
     return questions
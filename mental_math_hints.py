@@ -3,6 +3,8 @@ Optional visual hints for Mental Math Sprint: lightweight SVG diagrams
 and optional Hugging Face image generation for richer illustrations.
 
 SVG hints work offline. HF requires HF_TOKEN (env or Streamlit secrets).
+Both are cached by ``diagram_cache``; generated HF images are kept on disk
+and reused for every session and user that asks for the same prompt.
 """
 
 from __future__ import annotations
@@ -11,6 +13,11 @@ import io
 import os
 from typing import Any
 
+import diagram_cache
+
+HF_MODEL = "black-forest-labs/FLUX.1-schnell"
+HF_WIDTH, HF_HEIGHT = 512, 320
+
 
 def _esc(x: Any) -> str:
     return str(x).replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
@@ -256,9 +263,13 @@ def svg_area_model_split(a: int, b: int, c: int) -> str:
 
 
 def hint_svg_html(hint_meta: dict[str, Any]) -> str | None:
-    """Return HTML wrapping an inline SVG, or None."""
+    """Return HTML wrapping an inline SVG, or None (cached by ``hint_meta``)."""
     if not hint_meta:
         return None
+    return diagram_cache.get_or_render("mm_hint_svg", hint_meta, lambda: _hint_svg_html(hint_meta))
+
+
+def _hint_svg_html(hint_meta: dict[str, Any]) -> str | None:
     kind = hint_meta.get("kind")
     try:
         if kind == "number_line":
@@ -379,14 +390,31 @@ def hf_prompt_for_diagram(hint_meta: dict[str, Any]) -> str:
     )
 
 
+def _hf_spec(prompt: str) -> dict[str, Any]:
+    return {"model": HF_MODEL, "prompt": prompt[:500], "width": HF_WIDTH, "height": HF_HEIGHT}
+
+
+def cached_hf_diagram_image(prompt: str) -> bytes | None:
+    """A previously generated image for ``prompt`` (any session or user), or None."""
+    return diagram_cache.peek("hf_hint", _hf_spec(prompt))
+
+
 def generate_hf_diagram_image(prompt: str, api_key: str | None = None) -> bytes | None:
     """
     Generate a PNG using Hugging Face Inference API (FLUX.1-schnell).
-    Returns PNG bytes or None on failure.
+    Returns PNG bytes or None on failure.  Images are cached on disk by
+    prompt, so each one is generated once for all sessions and users.
     """
     key = api_key or os.environ.get("HF_TOKEN")
     if not key:
-        return None
+        return cached_hf_diagram_image(prompt)
+    spec = _hf_spec(prompt)
+    return diagram_cache.get_or_render(
+        "hf_hint", spec, lambda: _hf_text_to_image(spec, key), persist=True
+    )
+
+
+def _hf_text_to_image(spec: dict[str, Any], key: str) -> bytes | None:
     try:
         from huggingface_hub import InferenceClient
     except ImportError:
@@ -394,10 +422,10 @@ def generate_hf_diagram_image(prompt: str, api_key: str | None = None) -> bytes
     try:
         client = InferenceClient(provider="auto", api_key=key)
         image = client.text_to_image(
-            prompt[:500],
-            model="black-forest-labs/FLUX.1-schnell",
-            width=512,
-            height=320,
+            spec["prompt"],
+            model=spec["model"],
+            width=spec["width"],
+            height=spec["height"],
         )
         buf = io.BytesIO()
         image.save(buf, format="PNG")
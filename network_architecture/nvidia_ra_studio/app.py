@@ -16,7 +16,7 @@ if str(ROOT) not in sys.path:
 
 import streamlit as st
 
-from core.progress_store import ProgressStore
+from core.progress_store import get_store
 from core.llm_client import get_anthropic_api_key, llm_available
 from ui.session import init_session, inject_styles, nav_sidebar, profile_selector
 from pages import (
@@ -53,7 +53,7 @@ if get_anthropic_api_key():
     st.sidebar.success("Claude connected")
 else:
     st.sidebar.caption("Set ANTHROPIC_API_KEY in ~/.zshrc or secrets")
-store = ProgressStore()
+store = get_store()
 store, user_id, profile = init_session(store)
 profile_selector(store)
 page = nav_sidebar()
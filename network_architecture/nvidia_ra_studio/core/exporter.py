@@ -6,18 +6,18 @@ import json
 from typing import Any
 
 from .content_catalog import MODULES
-from .progress_store import ProgressStore
+from .progress_store import ProgressSnapshot, ProgressStore
 
 
 def export_plan_markdown(markdown: str) -> str:
     return markdown
 
 
-def export_progress_markdown(store: ProgressStore, user_id: int, profile: str) -> str:
-    prog = store.get_module_progress(user_id)
-    stats = store.dashboard_summary(user_id, len(MODULES))
-    q = store.quiz_stats(user_id)
-    drills = store.drill_progress(user_id)
+def export_progress_markdown(
+    store: ProgressStore, user_id: int, profile: str, snap: ProgressSnapshot | None = None
+) -> str:
+    snap = snap or store.snapshot(user_id, len(MODULES))
+    prog, stats, q, drills = snap.modules, snap.summary, snap.quizzes, snap.drills
 
     lines = [
         f"# Progress Report — {profile}",
@@ -44,14 +44,17 @@ def export_progress_markdown(store: ProgressStore, user_id: int, profile: str) -
     return "\n".join(lines)
 
 
-def export_progress_json(store: ProgressStore, user_id: int, profile: str) -> str:
+def export_progress_json(
+    store: ProgressStore, user_id: int, profile: str, snap: ProgressSnapshot | None = None
+) -> str:
+    snap = snap or store.snapshot(user_id, len(MODULES))
     data: dict[str, Any] = {
         "profile": profile,
-        "summary": store.dashboard_summary(user_id, len(MODULES)),
-        "modules": store.get_module_progress(user_id),
-        "quizzes": store.quiz_stats(user_id),
-        "drills": store.drill_progress(user_id),
-        "bookmarks": store.list_bookmarks(user_id),
-        "latest_plan": store.latest_plan(user_id),
+        "summary": snap.summary,
+        "modules": snap.modules,
+        "quizzes": snap.quizzes,
+        "drills": snap.drills,
+        "bookmarks": snap.bookmarks,
+        "latest_plan": snap.latest_plan,
     }
     return json.dumps(data, indent=2)
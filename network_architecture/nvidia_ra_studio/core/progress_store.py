@@ -1,114 +1,203 @@
-"""SQLite persistence for profiles, progress, quizzes, notes, and plans."""
+"""SQLite persistence for profiles, progress, quizzes, notes, and plans.
+
+Use ``get_store()``: one ``ProgressStore`` per database file per process,
+so Streamlit reruns reuse its pooled connections and skip the schema check,
+which runs once per store (and only applies DDL when ``PRAGMA user_version``
+is behind ``SCHEMA_VERSION``).
+"""
 
 from __future__ import annotations
 
 import json
 import sqlite3
+import threading
 from contextlib import contextmanager
+from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
 ROOT = Path(__file__).resolve().parents[1]
 DEFAULT_DB = ROOT / "data" / "studio.db"
 
+# 1: tables; 2: per-user indexes for dashboard/export reads.
+SCHEMA_VERSION = 2
+MAX_IDLE_CONNECTIONS = 4
+
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA busy_timeout=5000",
+)
+
+_SCHEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        profile_name TEXT UNIQUE NOT NULL,
+        role TEXT DEFAULT '',
+        level TEXT DEFAULT 'beginner',
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS modules (
+        id INTEGER PRIMARY KEY,
+        slug TEXT UNIQUE NOT NULL,
+        title TEXT NOT NULL,
+        domain TEXT NOT NULL,
+        difficulty TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS lessons (
+        id INTEGER PRIMARY KEY,
+        module_id INTEGER NOT NULL,
+        title TEXT NOT NULL,
+        FOREIGN KEY (module_id) REFERENCES modules(id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS user_progress (
+        user_id INTEGER NOT NULL,
+        module_id INTEGER NOT NULL,
+        completed INTEGER DEFAULT 0,
+        notes TEXT DEFAULT '',
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (user_id, module_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS quiz_attempts (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        quiz_id TEXT NOT NULL,
+        score REAL NOT NULL,
+        total INTEGER NOT NULL,
+        answers_json TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS design_drills (
+        id TEXT PRIMARY KEY,
+        title TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS drill_completions (
+        user_id INTEGER NOT NULL,
+        drill_id TEXT NOT NULL,
+        completed INTEGER DEFAULT 0,
+        notes TEXT DEFAULT '',
+        updated_at TEXT NOT NULL,
+        PRIMARY KEY (user_id, drill_id)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS generated_plans (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        plan_json TEXT NOT NULL,
+        markdown TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS notes (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        user_id INTEGER NOT NULL,
+        module_id INTEGER,
+        body TEXT NOT NULL,
+        created_at TEXT NOT NULL
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS bookmarks (
+        user_id INTEGER NOT NULL,
+        ref_type TEXT NOT NULL,
+        ref_id TEXT NOT NULL,
+        created_at TEXT NOT NULL,
+        PRIMARY KEY (user_id, ref_type, ref_id)
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_quiz_attempts_user_created ON quiz_attempts(user_id, created_at)",
+    "CREATE INDEX IF NOT EXISTS idx_generated_plans_user ON generated_plans(user_id, id)",
+    "CREATE INDEX IF NOT EXISTS idx_notes_user ON notes(user_id, module_id)",
+)
+
 
 def _utcnow() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+@dataclass(frozen=True)
+class ProgressSnapshot:
+    """Everything the dashboard and progress exports show, read in one transaction."""
+
+    summary: dict[str, Any]
+    modules: dict[int, dict]
+    quizzes: dict[str, Any]
+    drills: dict[str, bool]
+    bookmarks: list[dict]
+    latest_plan: dict | None
+
+
 class ProgressStore:
     def __init__(self, db_path: Path | None = None):
         self.db_path = Path(db_path or DEFAULT_DB)
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._idle: list[sqlite3.Connection] = []
+        self._user_ids: dict[str, int] = {}
         self._init_schema()
 
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None: _conn() issues BEGIN/COMMIT itself.
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        return conn
+
     @contextmanager
     def _conn(self):
-        conn = sqlite3.connect(self.db_path)
-        conn.row_factory = sqlite3.Row
+        """A pooled connection, with the block run as one transaction."""
+        with self._lock:
+            conn = self._idle.pop() if self._idle else None
+        if conn is None:
+            conn = self._connect()
         try:
+            conn.execute("BEGIN")
             yield conn
             conn.commit()
+        except BaseException:
+            if conn.in_transaction:
+                conn.rollback()
+            raise
         finally:
+            with self._lock:
+                keep = len(self._idle) < MAX_IDLE_CONNECTIONS
+                if keep:
+                    self._idle.append(conn)
+            if not keep:
+                conn.close()
+
+    def close(self) -> None:
+        """Close idle pooled connections (the store stays usable)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
             conn.close()
 
     def _init_schema(self) -> None:
         with self._conn() as conn:
-            conn.executescript(
-                """
-                CREATE TABLE IF NOT EXISTS users (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    profile_name TEXT UNIQUE NOT NULL,
-                    role TEXT DEFAULT '',
-                    level TEXT DEFAULT 'beginner',
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS modules (
-                    id INTEGER PRIMARY KEY,
-                    slug TEXT UNIQUE NOT NULL,
-                    title TEXT NOT NULL,
-                    domain TEXT NOT NULL,
-                    difficulty TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS lessons (
-                    id INTEGER PRIMARY KEY,
-                    module_id INTEGER NOT NULL,
-                    title TEXT NOT NULL,
-                    FOREIGN KEY (module_id) REFERENCES modules(id)
-                );
-                CREATE TABLE IF NOT EXISTS user_progress (
-                    user_id INTEGER NOT NULL,
-                    module_id INTEGER NOT NULL,
-                    completed INTEGER DEFAULT 0,
-                    notes TEXT DEFAULT '',
-                    updated_at TEXT NOT NULL,
-                    PRIMARY KEY (user_id, module_id)
-                );
-                CREATE TABLE IF NOT EXISTS quiz_attempts (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    quiz_id TEXT NOT NULL,
-                    score REAL NOT NULL,
-                    total INTEGER NOT NULL,
-                    answers_json TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS design_drills (
-                    id TEXT PRIMARY KEY,
-                    title TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS drill_completions (
-                    user_id INTEGER NOT NULL,
-                    drill_id TEXT NOT NULL,
-                    completed INTEGER DEFAULT 0,
-                    notes TEXT DEFAULT '',
-                    updated_at TEXT NOT NULL,
-                    PRIMARY KEY (user_id, drill_id)
-                );
-                CREATE TABLE IF NOT EXISTS generated_plans (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    plan_json TEXT NOT NULL,
-                    markdown TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS notes (
-                    id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    user_id INTEGER NOT NULL,
-                    module_id INTEGER,
-                    body TEXT NOT NULL,
-                    created_at TEXT NOT NULL
-                );
-                CREATE TABLE IF NOT EXISTS bookmarks (
-                    user_id INTEGER NOT NULL,
-                    ref_type TEXT NOT NULL,
-                    ref_id TEXT NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (user_id, ref_type, ref_id)
-                );
-                """
-            )
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SCHEMA_VERSION:
+                return
+            for statement in _SCHEMA:
+                conn.execute(statement)
+            conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
 
     def list_profiles(self) -> list[str]:
         with self._conn() as conn:
@@ -116,17 +205,26 @@ class ProgressStore:
             return [r["profile_name"] for r in rows]
 
     def get_or_create_user(self, profile_name: str, role: str = "", level: str = "beginner") -> int:
+        # Users are never deleted, so ids are cached for the life of the store.
+        with self._lock:
+            cached = self._user_ids.get(profile_name)
+        if cached is not None:
+            return cached
         with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO users (profile_name, role, level, created_at)
+                VALUES (?, ?, ?, ?)
+                """,
+                (profile_name, role, level, _utcnow()),
+            )
             row = conn.execute(
                 "SELECT id FROM users WHERE profile_name = ?", (profile_name,)
             ).fetchone()
-            if row:
-                return int(row["id"])
-            cur = conn.execute(
-                "INSERT INTO users (profile_name, role, level, created_at) VALUES (?, ?, ?, ?)",
-                (profile_name, role, level, _utcnow()),
-            )
-            return int(cur.lastrowid)
+        user_id = int(row["id"])
+        with self._lock:
+            self._user_ids[profile_name] = user_id
+        return user_id
 
     def set_module_completed(self, user_id: int, module_id: int, completed: bool, notes: str = "") -> None:
         with self._conn() as conn:
@@ -144,11 +242,15 @@ class ProgressStore:
 
     def get_module_progress(self, user_id: int) -> dict[int, dict]:
         with self._conn() as conn:
-            rows = conn.execute(
-                "SELECT module_id, completed, notes FROM user_progress WHERE user_id = ?",
-                (user_id,),
-            ).fetchall()
-            return {int(r["module_id"]): {"completed": bool(r["completed"]), "notes": r["notes"]} for r in rows}
+            return self._module_progress(conn, user_id)
+
+    @staticmethod
+    def _module_progress(conn: sqlite3.Connection, user_id: int) -> dict[int, dict]:
+        rows = conn.execute(
+            "SELECT module_id, completed, notes FROM user_progress WHERE user_id = ?",
+            (user_id,),
+        ).fetchall()
+        return {int(r["module_id"]): {"completed": bool(r["completed"]), "notes": r["notes"]} for r in rows}
 
     def save_module_notes(self, user_id: int, module_id: int, notes: str) -> None:
         self.set_module_completed(user_id, module_id, self.is_module_completed(user_id, module_id), notes)
@@ -171,20 +273,33 @@ class ProgressStore:
 
     def quiz_stats(self, user_id: int) -> dict[str, Any]:
         with self._conn() as conn:
-            rows = conn.execute(
-                """
-                SELECT quiz_id, score, total, created_at FROM quiz_attempts
-                WHERE user_id = ? ORDER BY created_at DESC
-                """,
-                (user_id,),
-            ).fetchall()
-        if not rows:
+            return self._quiz_stats(conn, user_id)
+
+    @staticmethod
+    def _quiz_stats(conn: sqlite3.Connection, user_id: int) -> dict[str, Any]:
+        # Aggregate in SQL and fetch only the recent rows (both walk the
+        # (user_id, created_at) index) instead of loading every attempt.
+        agg = conn.execute(
+            """
+            SELECT COUNT(*) AS n,
+                   AVG(CASE WHEN total THEN score * 100.0 / total ELSE 0 END) AS pct
+            FROM quiz_attempts WHERE user_id = ?
+            """,
+            (user_id,),
+        ).fetchone()
+        if not agg["n"]:
             return {"count": 0, "average_pct": 0.0, "recent": []}
-        pcts = [(r["score"] / r["total"] * 100) if r["total"] else 0 for r in rows]
+        recent = conn.execute(
+            """
+            SELECT quiz_id, score, total, created_at FROM quiz_attempts
+            WHERE user_id = ? ORDER BY created_at DESC LIMIT 5
+            """,
+            (user_id,),
+        ).fetchall()
         return {
-            "count": len(rows),
-            "average_pct": round(sum(pcts) / len(pcts), 1),
-            "recent": [dict(r) for r in rows[:5]],
+            "count": int(agg["n"]),
+            "average_pct": round(agg["pct"], 1),
+            "recent": [dict(r) for r in recent],
         }
 
     def weak_domains(self, user_id: int, domain_scores: dict[str, list[float]]) -> list[str]:
@@ -205,13 +320,17 @@ class ProgressStore:
 
     def latest_plan(self, user_id: int) -> dict | None:
         with self._conn() as conn:
-            row = conn.execute(
-                """
-                SELECT plan_json, markdown, created_at FROM generated_plans
-                WHERE user_id = ? ORDER BY id DESC LIMIT 1
-                """,
-                (user_id,),
-            ).fetchone()
+            return self._latest_plan(conn, user_id)
+
+    @staticmethod
+    def _latest_plan(conn: sqlite3.Connection, user_id: int) -> dict | None:
+        row = conn.execute(
+            """
+            SELECT plan_json, markdown, created_at FROM generated_plans
+            WHERE user_id = ? ORDER BY id DESC LIMIT 1
+            """,
+            (user_id,),
+        ).fetchone()
         if not row:
             return None
         return {
@@ -236,10 +355,14 @@ class ProgressStore:
 
     def drill_progress(self, user_id: int) -> dict[str, bool]:
         with self._conn() as conn:
-            rows = conn.execute(
-                "SELECT drill_id, completed FROM drill_completions WHERE user_id = ?",
-                (user_id,),
-            ).fetchall()
+            return self._drill_progress(conn, user_id)
+
+    @staticmethod
+    def _drill_progress(conn: sqlite3.Connection, user_id: int) -> dict[str, bool]:
+        rows = conn.execute(
+            "SELECT drill_id, completed FROM drill_completions WHERE user_id = ?",
+            (user_id,),
+        ).fetchall()
         return {r["drill_id"]: bool(r["completed"]) for r in rows}
 
     def toggle_bookmark(self, user_id: int, ref_type: str, ref_id: str) -> bool:
@@ -262,23 +385,44 @@ class ProgressStore:
 
     def list_bookmarks(self, user_id: int) -> list[dict]:
         with self._conn() as conn:
-            rows = conn.execute(
-                "SELECT ref_type, ref_id, created_at FROM bookmarks WHERE user_id = ?",
-                (user_id,),
-            ).fetchall()
+            return self._bookmarks(conn, user_id)
+
+    @staticmethod
+    def _bookmarks(conn: sqlite3.Connection, user_id: int) -> list[dict]:
+        rows = conn.execute(
+            "SELECT ref_type, ref_id, created_at FROM bookmarks WHERE user_id = ?",
+            (user_id,),
+        ).fetchall()
         return [dict(r) for r in rows]
 
     def dashboard_summary(self, user_id: int, total_modules: int) -> dict[str, Any]:
-        prog = self.get_module_progress(user_id)
+        return self.snapshot(user_id, total_modules).summary
+
+    def snapshot(self, user_id: int, total_modules: int) -> ProgressSnapshot:
+        """Summary, module/quiz/drill progress, bookmarks and latest plan in one transaction."""
+        with self._conn() as conn:
+            prog = self._module_progress(conn, user_id)
+            q = self._quiz_stats(conn, user_id)
+            drills = self._drill_progress(conn, user_id)
+            bookmarks = self._bookmarks(conn, user_id)
+            plan = self._latest_plan(conn, user_id)
         completed = sum(1 for p in prog.values() if p["completed"])
-        q = self.quiz_stats(user_id)
-        drills = self.drill_progress(user_id)
-        drill_done = sum(1 for v in drills.values() if v)
-        return {
+        summary = {
             "modules_completed": completed,
             "modules_total": total_modules,
             "progress_pct": round(completed / total_modules * 100, 1) if total_modules else 0,
             "quiz_average_pct": q["average_pct"],
             "quiz_attempts": q["count"],
-            "drills_completed": drill_done,
+            "drills_completed": sum(1 for v in drills.values() if v),
         }
+        return ProgressSnapshot(summary, prog, q, drills, bookmarks, plan)
+
+
+@lru_cache(maxsize=None)
+def _store(db_path: Path) -> ProgressStore:
+    return ProgressStore(db_path)
+
+
+def get_store(db_path: Path | None = None) -> ProgressStore:
+    """The process-wide ``ProgressStore`` for ``db_path`` (default ``DEFAULT_DB``)."""
+    return _store(Path(db_path or DEFAULT_DB).resolve())
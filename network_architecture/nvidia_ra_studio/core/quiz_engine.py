@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import random
+from collections.abc import Iterable
 from typing import Any
 
 from .content_catalog import MODULES
@@ -186,42 +187,100 @@ def build_quiz_bank() -> list[QuizQuestion]:
     return bank
 
 
+class QuizBank:
+    """Questions indexed by id, module, domain and qtype, built once.
+
+    ``assessment`` draws a seeded, stratified sample: every module gets a
+    quota (one question each when ``n`` allows, the rest split in proportion
+    to module size by largest remainder), filled with ``random.sample`` per
+    module, so assembly is linear in the bank size.
+    """
+
+    def __init__(self, questions: Iterable[QuizQuestion]):
+        self.questions = list(questions)
+        self.by_id: dict[str, QuizQuestion] = {}
+        self.by_module: dict[int, list[QuizQuestion]] = {}
+        self.by_domain: dict[str, list[QuizQuestion]] = {}
+        self.by_qtype: dict[str, list[QuizQuestion]] = {}
+        self.answer_keys: dict[str, frozenset[int]] = {}
+        for q in self.questions:
+            self.by_id[q.id] = q
+            self.by_module.setdefault(q.module_id, []).append(q)
+            self.by_domain.setdefault(q.domain, []).append(q)
+            self.by_qtype.setdefault(q.qtype, []).append(q)
+            self.answer_keys[q.id] = frozenset(q.correct)
+
+    def __len__(self) -> int:
+        return len(self.questions)
+
+    def for_module(self, module_id: int) -> list[QuizQuestion]:
+        return list(self.by_module.get(module_id, ()))
+
+    def for_domain(self, domain: str) -> list[QuizQuestion]:
+        return list(self.by_domain.get(domain, ()))
+
+    def for_qtype(self, qtype: str) -> list[QuizQuestion]:
+        return list(self.by_qtype.get(qtype, ()))
+
+    def module_quotas(self, n: int, rng: random.Random) -> dict[int, int]:
+        """Questions to draw per module for an ``n``-question assessment."""
+        sizes = {m: len(qs) for m, qs in self.by_module.items()}
+        if n <= 0:
+            return {}
+        if n >= len(self.questions):
+            return sizes
+        if n < len(sizes):
+            return {m: 1 for m in rng.sample(list(sizes), n)}
+        quotas = {m: 1 for m in sizes}
+        spare = {m: size - 1 for m, size in sizes.items()}
+        rest, capacity = n - len(sizes), sum(spare.values())
+        shares = {m: rest * spare[m] / capacity for m in sizes}
+        for m, share in shares.items():
+            quotas[m] += int(share)
+        leftover = rest - sum(int(share) for share in shares.values())
+        by_remainder = sorted(sizes, key=lambda m: int(shares[m]) - shares[m])
+        for m in by_remainder[:leftover]:
+            quotas[m] += 1
+        return quotas
+
+    def assessment(self, n: int = 50, seed: int = 42) -> list[QuizQuestion]:
+        rng = random.Random(seed)
+        chosen: list[QuizQuestion] = []
+        for module_id, quota in self.module_quotas(n, rng).items():
+            chosen.extend(rng.sample(self.by_module[module_id], quota))
+        rng.shuffle(chosen)
+        return chosen
+
+    def is_correct(self, question: QuizQuestion, selected: Iterable[int]) -> bool:
+        key = self.answer_keys.get(question.id)
+        if key is None:  # not from this bank
+            key = frozenset(question.correct)
+        return frozenset(selected) == key
+
+    def score(self, questions: list[QuizQuestion], answers: dict[str, list[int]]) -> tuple[int, int]:
+        correct = sum(1 for q in questions if self.is_correct(q, answers.get(q.id, ())))
+        return correct, len(questions)
+
+
 QUIZ_BANK: list[QuizQuestion] = build_quiz_bank()
+BANK = QuizBank(QUIZ_BANK)
 
 
 def questions_for_module(module_id: int) -> list[QuizQuestion]:
-    return [q for q in QUIZ_BANK if q.module_id == module_id]
+    return BANK.for_module(module_id)
 
 
 def questions_for_domain(domain: str) -> list[QuizQuestion]:
-    return [q for q in QUIZ_BANK if q.domain == domain]
+    return BANK.for_domain(domain)
 
 
 def final_assessment_questions(n: int = 50, seed: int = 42) -> list[QuizQuestion]:
-    rng = random.Random(seed)
-    pool = QUIZ_BANK.copy()
-    rng.shuffle(pool)
-    # Ensure spread across modules
-    chosen: list[QuizQuestion] = []
-    seen_mod: set[int] = set()
-    for q in pool:
-        if len(chosen) >= n:
-            break
-        if q.module_id not in seen_mod or len(seen_mod) >= len(MODULES):
-            chosen.append(q)
-            seen_mod.add(q.module_id)
-    for q in pool:
-        if len(chosen) >= n:
-            break
-        if q not in chosen:
-            chosen.append(q)
-    return chosen[:n]
+    return BANK.assessment(n, seed)
 
 
 def grade_answer(question: QuizQuestion, selected: list[int]) -> bool:
-    return sorted(selected) == sorted(question.correct)
+    return BANK.is_correct(question, selected)
 
 
 def score_quiz(questions: list[QuizQuestion], answers: dict[str, list[int]]) -> tuple[int, int]:
-    correct = sum(1 for q in questions if grade_answer(q, answers.get(q.id, [])))
-    return correct, len(questions)
+    return BANK.score(questions, answers)
@@ -11,8 +11,8 @@ from ui.session import inject_styles
 
 def render(store, user_id: int, profile: str) -> None:
     inject_styles()
-    stats = store.dashboard_summary(user_id, len(MODULES))
-    prog = store.get_module_progress(user_id)
+    snap = store.snapshot(user_id, len(MODULES))
+    stats, prog = snap.summary, snap.modules
 
     st.markdown(
         f"""
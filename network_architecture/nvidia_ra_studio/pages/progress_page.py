@@ -11,16 +11,16 @@ from core.exporter import export_progress_json, export_progress_markdown
 def render(store, user_id: int, profile: str) -> None:
     st.header("📈 Progress & Export")
 
-    stats = store.dashboard_summary(user_id, len(MODULES))
-    st.json(stats)
+    snap = store.snapshot(user_id, len(MODULES))
+    st.json(snap.summary)
 
-    prog_md = export_progress_markdown(store, user_id, profile)
-    prog_json = export_progress_json(store, user_id, profile)
+    prog_md = export_progress_markdown(store, user_id, profile, snap)
+    prog_json = export_progress_json(store, user_id, profile, snap)
 
     st.download_button("Export progress (Markdown)", prog_md, f"progress-{profile}.md", "text/markdown")
     st.download_button("Export progress (JSON)", prog_json, f"progress-{profile}.json", "application/json")
 
-    if plan := store.latest_plan(user_id):
+    if plan := snap.latest_plan:
         st.download_button(
             "Export latest learning plan",
             plan["markdown"],
@@ -29,5 +29,5 @@ def render(store, user_id: int, profile: str) -> None:
         )
 
     st.markdown("### Bookmarks")
-    for b in store.list_bookmarks(user_id):
+    for b in snap.bookmarks:
         st.write(f"- {b['ref_type']}:{b['ref_id']}")
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import streamlit as st
 
-from core.progress_store import ProgressStore
+from core.progress_store import ProgressStore, get_store
 
 STUDIO_CSS = """
 <style>
@@ -45,7 +45,7 @@ def init_session(store: ProgressStore | None = None) -> tuple[ProgressStore, int
     if "nra_profile" not in st.session_state:
         st.session_state.nra_profile = "default"
     if store is None:
-        store = ProgressStore()
+        store = get_store()
     uid = store.get_or_create_user(st.session_state.nra_profile)
     return store, uid, st.session_state.nra_profile
 
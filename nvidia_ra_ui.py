@@ -11,7 +11,7 @@ STUDIO_ROOT = Path(__file__).resolve().parent / "network_architecture" / "nvidia
 if str(STUDIO_ROOT) not in sys.path:
     sys.path.insert(0, str(STUDIO_ROOT))
 
-from core.progress_store import ProgressStore  # noqa: E402
+from core.progress_store import get_store  # noqa: E402
 from ui.session import init_session, inject_styles, nav_sidebar, profile_selector  # noqa: E402
 from pages import (  # noqa: E402
     agent_coach,
@@ -100,7 +100,7 @@ def render_nvidia_ra_studio(anthropic_key: str | None = None):
             _back_to_dash()
 
     inject_styles()
-    store = ProgressStore()
+    store = get_store()
     store, user_id, profile = init_session(store)
     if st.session_state.nra_profile == "default" and st.session_state.selected_user:
         st.session_state.nra_profile = st.session_state.selected_user
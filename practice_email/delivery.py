@@ -1,10 +1,19 @@
-"""Queue + in-process delivery — Streamlit uses HTTPS (Gmail API) when configured."""
+"""Queue + in-process delivery — Streamlit uses HTTPS (Gmail API) when configured.
+
+Reports that cannot be sent right away are written to ``.email_queue/`` and
+delivered by one long-lived thread per process (``ensure_worker_started``).
+It claims each file by renaming it into ``processing/``, reuses the cached
+Gmail token / pooled HTTPS client and a single SMTP connection per pass, and
+retries failures with exponential backoff until ``MAX_ATTEMPTS``, after
+which the message is moved to ``dead/`` for a human to look at.
+"""
 
 from __future__ import annotations
 
 import json
-import subprocess
-import sys
+import os
+import threading
+import time
 import uuid
 from dataclasses import dataclass
 from datetime import datetime
@@ -18,11 +27,27 @@ from practice_email.settings import (
     format_delivery_error,
     load_settings,
 )
+from practice_email.smtp_client import SmtpSession
 from practice_email.transport import deliver_now
 
 ROOT = Path(__file__).resolve().parent.parent
 QUEUE_DIR = ROOT / ".email_queue"
-WORKER = ROOT / "send_practice_email.py"
+# A worker moves a message here (atomic rename) before sending it, so two
+# Streamlit sessions or processes never pick up the same file.
+PROCESSING_DIR = QUEUE_DIR / "processing"
+# Messages that exhausted their attempts or hit a permanent error.
+DEAD_DIR = QUEUE_DIR / "dead"
+
+MAX_ATTEMPTS = 6
+BACKOFF_BASE_SECONDS = 30.0
+BACKOFF_MAX_SECONDS = 3600.0
+IDLE_POLL_SECONDS = 60.0
+# A claim older than this belongs to a worker that died mid-send.
+STALE_CLAIM_SECONDS = 300.0
+
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_thread: threading.Thread | None = None
 
 
 @dataclass
@@ -36,59 +61,67 @@ class EmailSendResult:
 
 
 def _ensure_queue() -> None:
-    QUEUE_DIR.mkdir(exist_ok=True)
+    for path in (QUEUE_DIR, PROCESSING_DIR, DEAD_DIR):
+        path.mkdir(exist_ok=True)
 
 
-def _python_executable() -> str:
-    venv_python = ROOT / ".venv" / "bin" / "python3"
-    if venv_python.is_file():
-        return str(venv_python)
-    return sys.executable
+def _write_json(path: Path, payload: dict) -> None:
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
 
 
 def _write_payload(*, subject: str, plain: str, html: str) -> Path:
     _ensure_queue()
     path = QUEUE_DIR / f"{uuid.uuid4().hex}.json"
-    path.write_text(
-        json.dumps({"subject": subject, "plain": plain, "html": html}, ensure_ascii=False),
-        encoding="utf-8",
+    _write_json(
+        path,
+        {
+            "subject": subject,
+            "plain": plain,
+            "html": html,
+            "attempts": 0,
+            "next_attempt_at": 0,
+            "queued_at": time.time(),
+        },
     )
     return path
 
 
-def _run_worker(path: Path, *, wait: bool) -> tuple[bool, str]:
-    """Run standalone worker for queued payloads. Returns (success, error_message)."""
-    cmd = [_python_executable(), str(WORKER), str(path)]
+def backoff_seconds(attempts: int) -> float:
+    """Delay before retry number ``attempts`` (1-based)."""
+    return min(BACKOFF_BASE_SECONDS * (2 ** max(attempts - 1, 0)), BACKOFF_MAX_SECONDS)
+
+
+def _read(path: Path) -> dict | None:
     try:
-        if wait:
-            proc = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=90,
-                cwd=str(ROOT),
-                start_new_session=True,
-            )
-            if proc.returncode == 0:
-                path.unlink(missing_ok=True)
-                return True, ""
-            detail = (proc.stderr or proc.stdout or "").strip()
-            return False, detail or f"worker exit {proc.returncode}"
-        subprocess.Popen(
-            cmd,
-            cwd=str(ROOT),
-            start_new_session=True,
-            close_fds=True,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-        )
-        return True, ""
-    except Exception as exc:
-        return False, str(exc)
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def _claim(path: Path) -> Path | None:
+    """Move ``path`` into PROCESSING_DIR; None if another worker got it first."""
+    claimed = PROCESSING_DIR / path.name
+    try:
+        os.rename(path, claimed)
+    except FileNotFoundError:
+        return None
+    os.utime(claimed)  # claim age, for stale-claim recovery
+    return claimed
+
+
+def _release_stale_claims(now: float) -> None:
+    for path in PROCESSING_DIR.glob("*.json"):
+        try:
+            if now - path.stat().st_mtime > STALE_CLAIM_SECONDS:
+                os.rename(path, QUEUE_DIR / path.name)
+        except OSError:
+            continue
 
 
 def _is_retryable(exc: Exception) -> bool:
-    """Config and DNS/host errors should not spawn background SMTP retries."""
+    """Config and DNS/host errors go straight to the dead-letter folder."""
     if isinstance(exc, EmailConfigError):
         return False
     msg = str(exc).lower()
@@ -101,20 +134,127 @@ def _is_retryable(exc: Exception) -> bool:
     return True
 
 
-def flush_pending(*, max_items: int = 10, blocking: bool = True) -> tuple[int, int]:
-    """Try to send queued emails. Returns (sent_count, remaining_count)."""
+def _deliver_claimed(claimed: Path, settings, smtp_session: SmtpSession) -> tuple[str, str]:
+    """Send one claimed message. Returns (outcome, error) with outcome sent/retry/dead."""
+    payload = _read(claimed)
+    if payload is None:
+        os.replace(claimed, DEAD_DIR / claimed.name)
+        return "dead", "unreadable payload"
+    try:
+        deliver_now(
+            settings, payload["subject"], payload["plain"], payload["html"], smtp_session=smtp_session
+        )
+    except Exception as exc:
+        attempts = int(payload.get("attempts", 0)) + 1
+        payload["attempts"] = attempts
+        payload["last_error"] = str(exc) or exc.__class__.__name__
+        if attempts >= MAX_ATTEMPTS or not _is_retryable(exc):
+            _write_json(claimed, payload)
+            os.replace(claimed, DEAD_DIR / claimed.name)
+            return "dead", payload["last_error"]
+        payload["next_attempt_at"] = time.time() + backoff_seconds(attempts)
+        _write_json(claimed, payload)
+        os.replace(claimed, QUEUE_DIR / claimed.name)
+        return "retry", payload["last_error"]
+    claimed.unlink(missing_ok=True)
+    return "sent", ""
+
+
+def _due_paths(now: float) -> tuple[list[Path], float | None]:
+    """Queued files due now (oldest first) and when the next one comes due."""
+    due: list[tuple[float, Path]] = []
+    next_due = None
+    for path in QUEUE_DIR.glob("*.json"):
+        payload = _read(path) or {}
+        at = float(payload.get("next_attempt_at") or 0)
+        if at <= now:
+            due.append((float(payload.get("queued_at") or 0), path))
+        elif next_due is None or at < next_due:
+            next_due = at
+    return [p for _, p in sorted(due)], next_due
+
+
+def deliver_pending(*, max_items: int | None = None, only: Path | None = None) -> dict[str, int]:
+    """Claim and send due queued messages on this thread.
+
+    Returns outcome counts (``sent``, ``retry``, ``dead``).  ``only`` limits
+    the pass to one queued file, whatever its retry time.
+    """
+    _ensure_queue()
+    now = time.time()
+    _release_stale_claims(now)
+    paths = [only] if only is not None else _due_paths(now)[0]
+    if max_items is not None:
+        paths = paths[:max_items]
+    counts = {"sent": 0, "retry": 0, "dead": 0}
+    if not paths:
+        return counts
+    settings = load_settings()
+    smtp_session = SmtpSession()
+    try:
+        for path in paths:
+            claimed = _claim(path)
+            if claimed is None:
+                continue
+            outcome, _ = _deliver_claimed(claimed, settings, smtp_session)
+            counts[outcome] += 1
+    finally:
+        smtp_session.close()
+    return counts
+
+
+def queue_status() -> dict[str, int]:
+    """Message counts per folder: queued, processing, dead."""
     _ensure_queue()
+    return {
+        "queued": len(list(QUEUE_DIR.glob("*.json"))),
+        "processing": len(list(PROCESSING_DIR.glob("*.json"))),
+        "dead": len(list(DEAD_DIR.glob("*.json"))),
+    }
+
+
+def _run() -> None:
+    while True:
+        try:
+            deliver_pending()
+            _, next_due = _due_paths(time.time())
+        except Exception:
+            next_due = None
+        timeout = IDLE_POLL_SECONDS
+        if next_due is not None:
+            timeout = min(max(next_due - time.time(), 0.05), IDLE_POLL_SECONDS)
+        _wake.wait(timeout)
+        _wake.clear()
+
+
+def ensure_worker_started() -> None:
+    """Start the per-process delivery thread (idempotent)."""
+    global _thread
+    with _start_lock:
+        if _thread is not None and _thread.is_alive():
+            return
+        _ensure_queue()
+        _thread = threading.Thread(target=_run, name="practice-email-delivery", daemon=True)
+        _thread.start()
+
+
+def notify() -> None:
+    """Wake the delivery thread after an enqueue, starting it on first use."""
+    ensure_worker_started()
+    _wake.set()
+
+
+def flush_pending(*, max_items: int = 10, blocking: bool = True) -> tuple[int, int]:
+    """Try to send queued emails. Returns (sent_count, remaining_count).
+
+    Non-blocking calls just wake the delivery thread.
+    """
     sent = 0
-    for path in sorted(QUEUE_DIR.glob("*.json"))[:max_items]:
-        if not path.is_file():
-            continue
-        ok, _ = _run_worker(path, wait=blocking)
-        if blocking:
-            if ok and not path.exists():
-                sent += 1
-        # Non-blocking: spawn worker only; worker deletes the file on success.
-    remaining = len(list(QUEUE_DIR.glob("*.json")))
-    return sent, remaining
+    if blocking:
+        sent = deliver_pending(max_items=max_items)["sent"]
+    else:
+        notify()
+    return sent, queue_status()["queued"]
 
 
 def send_report(
@@ -131,7 +271,7 @@ def send_report(
     program_name: str = "Edgenuity Course 3",
     report_heading: str = "Edgenuity Practice Report",
 ) -> EmailSendResult:
-    """Send a practice report email (Gmail API in-process, SMTP via worker fallback)."""
+    """Send a practice report email now, queueing it for the delivery worker on failure."""
     settings = load_settings()
     if not settings.enabled:
         return EmailSendResult(ok=False, skipped=True, error="Email disabled")
@@ -178,19 +318,18 @@ def send_report(
             )
 
         path = _write_payload(subject=subject, plain=plain, html=html)
-        ok, worker_err = _run_worker(path, wait=True)
-        if ok and not path.exists():
+        counts = deliver_pending(only=path)
+        if counts["sent"]:
             return EmailSendResult(ok=True, recipient=settings.recipient, transport="worker")
-        sent, _remaining = flush_pending(max_items=3, blocking=True)
-        if sent and not path.exists():
-            return EmailSendResult(ok=True, recipient=settings.recipient, transport="worker")
-        err = format_delivery_error(
-            RuntimeError(worker_err or user_err or "Send failed"),
-            settings,
-        )
+        dead = DEAD_DIR / path.name
+        pending = not dead.exists()
+        # Report the worker's last attempt; the first one may have failed differently.
+        retry_err = (_read(path if pending else dead) or {}).get("last_error")
+        if pending:
+            notify()
         return EmailSendResult(
             ok=False,
-            pending=path.exists(),
+            pending=pending,
             recipient=settings.recipient,
-            error=err,
+            error=format_delivery_error(RuntimeError(retry_err), settings) if retry_err else user_err,
         )
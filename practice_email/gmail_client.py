@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import base64
+import threading
+import time
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 
@@ -12,10 +14,58 @@ from practice_email.settings import EmailSettings
 
 _TOKEN_URL = "https://oauth2.googleapis.com/token"
 _SEND_URL = "https://gmail.googleapis.com/gmail/v1/users/me/messages/send"
+# Refresh this long before Google's stated expiry so a send never races it.
+_TOKEN_EXPIRY_MARGIN = 120.0
 
+_lock = threading.Lock()
+_http: httpx.Client | None = None
+# (client_id, refresh_token) -> (access_token, monotonic expiry)
+_tokens: dict[tuple[str, str], tuple[str, float]] = {}
 
-def _refresh_access_token(settings: EmailSettings) -> str:
-    resp = httpx.post(
+
+def _client() -> httpx.Client:
+    """One keep-alive client for token refreshes and sends."""
+    global _http
+    with _lock:
+        if _http is None:
+            _http = httpx.Client(timeout=30.0)
+        return _http
+
+
+def _token_key(settings: EmailSettings) -> tuple[str, str]:
+    return settings.gmail_client_id, settings.gmail_refresh_token
+
+
+def _access_token(settings: EmailSettings) -> str:
+    """Cached OAuth access token, refreshed only when it is about to expire."""
+    key = _token_key(settings)
+    with _lock:
+        cached = _tokens.get(key)
+    if cached and cached[1] > time.monotonic():
+        return cached[0]
+    token, expires_in = _refresh_access_token(settings)
+    with _lock:
+        _tokens[key] = (token, time.monotonic() + max(expires_in - _TOKEN_EXPIRY_MARGIN, 0.0))
+    return token
+
+
+def _forget_token(settings: EmailSettings) -> None:
+    with _lock:
+        _tokens.pop(_token_key(settings), None)
+
+
+def reset_gmail_client() -> None:
+    """Drop the cached token(s) and close the pooled HTTP client."""
+    global _http
+    with _lock:
+        _tokens.clear()
+        http, _http = _http, None
+    if http is not None:
+        http.close()
+
+
+def _refresh_access_token(settings: EmailSettings) -> tuple[str, float]:
+    resp = _client().post(
         _TOKEN_URL,
         data={
             "client_id": settings.gmail_client_id,
@@ -23,13 +73,13 @@ def _refresh_access_token(settings: EmailSettings) -> str:
             "refresh_token": settings.gmail_refresh_token,
             "grant_type": "refresh_token",
         },
-        timeout=30.0,
     )
     resp.raise_for_status()
-    token = resp.json().get("access_token")
+    data = resp.json()
+    token = data.get("access_token")
     if not token:
         raise RuntimeError("Gmail OAuth token refresh returned no access_token")
-    return str(token)
+    return str(token), float(data.get("expires_in") or 0)
 
 
 def _build_raw_message(settings: EmailSettings, subject: str, plain: str, html: str) -> str:
@@ -46,14 +96,16 @@ def send_gmail(settings: EmailSettings, subject: str, plain: str, html: str) ->
     """Send one report via Gmail API. Raises on failure."""
     if not settings.gmail_client_id or not settings.gmail_client_secret or not settings.gmail_refresh_token:
         raise RuntimeError("Gmail API OAuth not configured")
-    token = _refresh_access_token(settings)
     raw = _build_raw_message(settings, subject, plain, html)
-    resp = httpx.post(
-        _SEND_URL,
-        headers={"Authorization": f"Bearer {token}"},
-        json={"raw": raw},
-        timeout=30.0,
-    )
+    for attempt in range(2):
+        resp = _client().post(
+            _SEND_URL,
+            headers={"Authorization": f"Bearer {_access_token(settings)}"},
+            json={"raw": raw},
+        )
+        if resp.status_code != 401 or attempt:
+            break
+        _forget_token(settings)  # revoked or expired early: refresh once and retry
     if resp.status_code >= 400:
         detail = resp.text.strip() or resp.reason_phrase
         raise RuntimeError(f"Gmail API send failed ({resp.status_code}): {detail}")
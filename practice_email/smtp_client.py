@@ -1,4 +1,4 @@
-"""SMTP delivery only — used by the standalone worker process."""
+"""SMTP delivery — one-off sends, or a reusable session for the delivery worker."""
 
 from __future__ import annotations
 
@@ -19,6 +19,13 @@ from practice_email.settings import (
 
 _RETRIES = 3
 _RETRY_DELAY = 1.5
+# A kept-open connection that fails with one of these is dead; reconnect and resend.
+_DROPPED = (
+    smtplib.SMTPServerDisconnected,
+    smtplib.SMTPConnectError,
+    ConnectionResetError,
+    socket.timeout,
+)
 
 
 def build_message(settings: EmailSettings, subject: str, plain: str, html: str) -> MIMEMultipart:
@@ -31,44 +38,100 @@ def build_message(settings: EmailSettings, subject: str, plain: str, html: str)
     return msg
 
 
-def send_smtp(settings: EmailSettings, subject: str, plain: str, html: str) -> None:
-    """Send one report email. Raises on failure."""
+def _connect(settings: EmailSettings) -> smtplib.SMTP:
+    """Open a logged-in SMTP connection (STARTTLS with retries, then SMTPS on 465)."""
     assert_smtp_ready(settings)
     host_ok, host_msg = validate_smtp_host(settings.smtp_host)
     if not host_ok:
         raise EmailConfigError(host_msg)
 
-    msg = build_message(settings, subject, plain, html)
     host = settings.smtp_host
     port = settings.smtp_port
     ctx = ssl.create_default_context()
     last_error: Exception | None = None
 
     for attempt in range(_RETRIES):
+        server = None
         try:
             try:
                 socket.getaddrinfo(host, port, socket.AF_INET, socket.SOCK_STREAM)
             except OSError:
                 socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
-            with smtplib.SMTP(host, port, timeout=30) as server:
-                if settings.use_tls:
-                    server.starttls(context=ctx)
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.sendmail(settings.smtp_from, [settings.recipient], msg.as_string())
-            return
+            server = smtplib.SMTP(host, port, timeout=30)
+            if settings.use_tls:
+                server.starttls(context=ctx)
+            server.login(settings.smtp_user, settings.smtp_password)
+            return server
         except OSError as exc:
             last_error = exc
+            if server is not None:
+                server.close()
             if attempt + 1 < _RETRIES:
                 time.sleep(_RETRY_DELAY)
 
     if settings.use_tls and port != 465:
         try:
-            with smtplib.SMTP_SSL(host, 465, context=ctx, timeout=30) as server:
-                server.login(settings.smtp_user, settings.smtp_password)
-                server.sendmail(settings.smtp_from, [settings.recipient], msg.as_string())
-            return
+            server = smtplib.SMTP_SSL(host, 465, context=ctx, timeout=30)
+            server.login(settings.smtp_user, settings.smtp_password)
+            return server
         except OSError as exc:
             last_error = exc
 
     assert last_error is not None
     raise RuntimeError(format_delivery_error(last_error, settings)) from last_error
+
+
+class SmtpSession:
+    """Keeps one logged-in SMTP connection open across several sends.
+
+    The connection is reopened when the settings change or the server has
+    dropped it; call ``close()`` when the batch is done.
+    """
+
+    def __init__(self) -> None:
+        self._server: smtplib.SMTP | None = None
+        self._key: tuple | None = None
+
+    def send(self, settings: EmailSettings, subject: str, plain: str, html: str) -> None:
+        msg = build_message(settings, subject, plain, html).as_string()
+        key = (settings.smtp_host, settings.smtp_port, settings.smtp_user, settings.use_tls)
+        if self._server is not None and self._key == key:
+            try:
+                self._server.sendmail(settings.smtp_from, [settings.recipient], msg)
+                return
+            except _DROPPED:
+                # No QUIT on a dead socket; it would only wait out the timeout.
+                self._server.close()
+                self._server = None
+        self.close()
+        self._server = _connect(settings)
+        self._key = key
+        self._server.sendmail(settings.smtp_from, [settings.recipient], msg)
+
+    def close(self) -> None:
+        server, self._server, self._key = self._server, None, None
+        if server is None:
+            return
+        try:
+            server.quit()
+        except (OSError, smtplib.SMTPException):
+            server.close()
+
+
+def send_smtp(
+    settings: EmailSettings,
+    subject: str,
+    plain: str,
+    html: str,
+    *,
+    session: SmtpSession | None = None,
+) -> None:
+    """Send one report email (over ``session``'s open connection if given). Raises on failure."""
+    if session is not None:
+        session.send(settings, subject, plain, html)
+        return
+    session = SmtpSession()
+    try:
+        session.send(settings, subject, plain, html)
+    finally:
+        session.close()
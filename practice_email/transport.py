@@ -11,11 +11,22 @@ from practice_email.settings import (
     in_streamlit_runtime,
     smtp_configured,
 )
-from practice_email.smtp_client import send_smtp
-
-
-def deliver_now(settings: EmailSettings, subject: str, plain: str, html: str) -> str:
-    """Send email now. Returns transport name used ('gmail_api' or 'smtp')."""
+from practice_email.smtp_client import SmtpSession, send_smtp
+
+
+def deliver_now(
+    settings: EmailSettings,
+    subject: str,
+    plain: str,
+    html: str,
+    *,
+    smtp_session: SmtpSession | None = None,
+) -> str:
+    """Send email now. Returns transport name used ('gmail_api' or 'smtp').
+
+    ``smtp_session`` lets a caller sending several messages reuse one SMTP
+    connection; the Gmail API client pools its connection and token itself.
+    """
     mode = (settings.transport or "auto").lower()
     in_streamlit = in_streamlit_runtime()
 
@@ -33,7 +44,7 @@ def deliver_now(settings: EmailSettings, subject: str, plain: str, html: str) ->
     if mode == "smtp":
         if not smtp_configured(settings):
             raise EmailConfigError(format_config_error(settings, "smtp"))
-        send_smtp(settings, subject, plain, html)
+        send_smtp(settings, subject, plain, html, session=smtp_session)
         return "smtp"
 
     # auto — prefer Gmail API (HTTPS) when OAuth is complete
@@ -41,7 +52,7 @@ def deliver_now(settings: EmailSettings, subject: str, plain: str, html: str) ->
         send_gmail(settings, subject, plain, html)
         return "gmail_api"
     if smtp_configured(settings):
-        send_smtp(settings, subject, plain, html)
+        send_smtp(settings, subject, plain, html, session=smtp_session)
         return "smtp"
 
     raise EmailConfigError(format_config_error(settings, "auto"))
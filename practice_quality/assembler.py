@@ -6,7 +6,7 @@ import random
 from collections.abc import Callable
 from typing import Any
 
-from practice_quality.dedup import fingerprints_for_question, is_duplicate_of_any, register_fingerprints
+from practice_quality.dedup import FingerprintIndex, fingerprints_for_question
 from practice_quality.validator import ValidationResult, validate_question
 
 
@@ -26,14 +26,16 @@ def _try_accept(
     used_ids: set[str],
     seen_fps: set[str],
     program: str,
-) -> dict | None:
+) -> tuple[dict, frozenset[str]] | None:
+    """Validate ``q`` for ``slot``; returns it with its fingerprints, or None."""
     if not q:
         return None
     q = _attach_slot(q, slot)
     qid = str(q.get("id", ""))
     if qid and qid in used_ids:
         return None
-    if is_duplicate_of_any(q, seen_fps):
+    fps = fingerprints_for_question(q)
+    if not fps.isdisjoint(seen_fps):
         return None
     vr = validate_question(q, program=program)
     if not vr.ok:
@@ -42,8 +44,8 @@ def _try_accept(
         q = dict(q)
         q["answer"] = vr.verified_answer
     used_ids.add(qid)
-    register_fingerprints(q, seen_fps)
-    return q
+    seen_fps.update(fps)
+    return q, fps
 
 
 def qa_and_assemble(
@@ -66,26 +68,24 @@ def qa_and_assemble(
     used_ids: set[str] = set(exclude_ids or ())
     seen_fps: set[str] = set(exclude_keys or ())
     result: list[dict | None] = [None] * len(slots)
+    result_fps: list[frozenset[str]] = [frozenset()] * len(slots)
+
+    def _accept(i: int, q: dict | None) -> bool:
+        accepted = _try_accept(q, slot=slots[i], used_ids=used_ids, seen_fps=seen_fps, program=program)
+        if accepted:
+            result[i], result_fps[i] = accepted
+        return accepted is not None
 
     initial = initial or []
-    for i, slot in enumerate(slots):
+    for i in range(len(slots)):
         if i < len(initial) and initial[i]:
-            accepted = _try_accept(
-                initial[i], slot=slot, used_ids=used_ids, seen_fps=seen_fps, program=program
-            )
-            if accepted:
-                result[i] = accepted
+            _accept(i, initial[i])
 
     for i, slot in enumerate(slots):
         if result[i] is not None:
             continue
         for _ in range(max_attempts_per_slot):
-            candidate = generate_for_slot(slot, used_ids, seen_fps)
-            accepted = _try_accept(
-                candidate, slot=slot, used_ids=used_ids, seen_fps=seen_fps, program=program
-            )
-            if accepted:
-                result[i] = accepted
+            if _accept(i, generate_for_slot(slot, used_ids, seen_fps)):
                 break
 
     missing = [i for i, q in enumerate(result) if q is None]
@@ -95,24 +95,27 @@ def qa_and_assemble(
             f"(indices: {missing[:5]}{'...' if len(missing) > 5 else ''})"
         )
 
-    # Final QA sweep — replace any duplicate that slipped through.
-    for i in range(len(result)):
-        other_fps = {fp for k, q in enumerate(result) if k != i for fp in fingerprints_for_question(q)}
-        if is_duplicate_of_any(result[i], other_fps):
-            slot = slots[i]
-            replaced = None
-            for _ in range(max_attempts_per_slot):
-                candidate = generate_for_slot(slot, used_ids, seen_fps)
-                accepted = _try_accept(
-                    candidate, slot=slot, used_ids=used_ids, seen_fps=seen_fps, program=program
-                )
-                if accepted and not is_duplicate_of_any(accepted, other_fps):
-                    replaced = accepted
-                    break
-            if replaced:
-                result[i] = replaced
-            else:
-                raise ValueError(f"Final QA found duplicate at slot {i} and could not replace")
+    # Final QA sweep — replace any duplicate that slipped through.  The index
+    # holds every slot's fingerprints, so "shared with another slot" is a
+    # count check instead of re-fingerprinting the rest of the session.
+    index = FingerprintIndex(result_fps)
+    for i, slot in enumerate(slots):
+        if not index.shared(result_fps[i]):
+            continue
+        index.remove(result_fps[i])
+        replaced = None
+        for _ in range(max_attempts_per_slot):
+            candidate = generate_for_slot(slot, used_ids, seen_fps)
+            accepted = _try_accept(
+                candidate, slot=slot, used_ids=used_ids, seen_fps=seen_fps, program=program
+            )
+            if accepted and not index.overlaps(accepted[1]):
+                replaced = accepted
+                break
+        if not replaced:
+            raise ValueError(f"Final QA found duplicate at slot {i} and could not replace")
+        result[i], result_fps[i] = replaced
+        index.add(result_fps[i])
 
     random.shuffle(result)
     return result  # type: ignore[return-value]
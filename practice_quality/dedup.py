@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import re
+from collections import Counter
+from collections.abc import Iterable
 from fractions import Fraction
+from functools import lru_cache
 
 # Instruction prefixes stripped before comparing math bodies.
 _INSTRUCTION_PREFIXES = (
@@ -21,6 +24,10 @@ _INSTRUCTION_PREFIXES = (
     "find",
 )
 
+# Question fields fingerprints depend on (see question_text / extract_equation).
+_FINGERPRINT_FIELDS = ("question", "equation", "instruction", "followup")
+_FINGERPRINT_CACHE_SIZE = 8192
+
 _VAR_RE = re.compile(r"\b[xy]\b", re.I)
 _FRAC_RE = re.compile(r"(-?\d+)/(\d+)")
 
@@ -108,27 +115,15 @@ def linear_equation_signature(eq: str) -> tuple[float, float] | None:
     """Canonical (a, b) for ax + b = 0 form of lhs - rhs, if linear in x."""
     if not eq or "=" not in eq:
         return None
-    try:
-        import arjun_linear_equation_strategies as leqs
-
-        lhs, rhs = eq.split("=", 1)
-
-        def delta(x: float) -> float:
-            return leqs._eval_expr_at_x(lhs, x) - leqs._eval_expr_at_x(rhs, x)
+    import arjun_linear_equation_strategies as leqs
 
-        b = delta(0.0)
-        a = delta(1.0) - b
-        if abs(delta(2.0) - (a * 2.0 + b)) > 1e-4:
-            return None
-        if abs(delta(-1.0) - (a * -1.0 + b)) > 1e-4:
-            return None
-        return (round(a, 6), round(b, 6))
-    except Exception:
+    form = leqs.compile_equation(eq)
+    if form is None:
         return None
+    return (round(float(form.a), 6), round(float(form.b), 6))
 
 
-def fingerprints_for_question(q: dict) -> set[str]:
-    """Multiple keys so spacing, formatting, and equivalent equations match."""
+def _compute_fingerprints(q: dict) -> frozenset[str]:
     text = question_text(q)
     norm = normalize_question_text(text)
     fps: set[str] = {f"text:{norm}"}
@@ -143,12 +138,63 @@ def fingerprints_for_question(q: dict) -> set[str]:
     skeleton = re.sub(r"[a-z]", "v", norm)
     skeleton = re.sub(r"\s+", "", skeleton)
     fps.add(f"sk:{skeleton}")
-    return fps
+    return frozenset(fps)
+
+
+@lru_cache(maxsize=_FINGERPRINT_CACHE_SIZE)
+def _cached_fingerprints(fields: tuple) -> frozenset[str]:
+    return _compute_fingerprints(dict(zip(_FINGERPRINT_FIELDS, fields)))
+
+
+def fingerprints_for_question(q: dict) -> frozenset[str]:
+    """Multiple keys so spacing, formatting, and equivalent equations match.
+
+    Memoized on the question's text fields, so a candidate checked by its
+    generator, by the assembler and by the final sweep is fingerprinted once.
+    """
+    fields = tuple(q.get(k) for k in _FINGERPRINT_FIELDS)
+    try:
+        return _cached_fingerprints(fields)
+    except TypeError:  # unhashable field values
+        return _compute_fingerprints(q)
 
 
 def is_duplicate_of_any(q: dict, seen: set[str]) -> bool:
-    return bool(fingerprints_for_question(q) & seen)
+    return not fingerprints_for_question(q).isdisjoint(seen)
 
 
 def register_fingerprints(q: dict, seen: set[str]) -> None:
     seen.update(fingerprints_for_question(q))
+
+
+class FingerprintIndex:
+    """Reference-counted multiset of the fingerprints of a group of questions.
+
+    Questions can be added and removed in O(fingerprints), and a question
+    already in the index can ask whether any other question shares one of
+    its fingerprints without rebuilding the union of everyone else's.
+    """
+
+    def __init__(self, groups: Iterable[Iterable[str]] = ()):
+        self._counts: Counter[str] = Counter()
+        for fps in groups:
+            self.add(fps)
+
+    def add(self, fps: Iterable[str]) -> None:
+        self._counts.update(fps)
+
+    def remove(self, fps: Iterable[str]) -> None:
+        for fp in fps:
+            left = self._counts[fp] - 1
+            if left > 0:
+                self._counts[fp] = left
+            else:
+                del self._counts[fp]
+
+    def overlaps(self, fps: Iterable[str]) -> bool:
+        """True if any of ``fps`` belongs to an indexed question."""
+        return any(fp in self._counts for fp in fps)
+
+    def shared(self, fps: Iterable[str]) -> bool:
+        """For an indexed question's own ``fps``: True if another question has one too."""
+        return any(self._counts[fp] > 1 for fp in fps)
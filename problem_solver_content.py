@@ -10,9 +10,9 @@ import json
 import random
 import re
 
-from openai import OpenAI
+from xai_client import XAIClient, get_xai_client
+
 
-XAI_BASE_URL = "https://api.x.ai/v1"
 XAI_MODEL = "grok-3-mini"
 
 CATEGORIES = {
@@ -107,8 +107,8 @@ speed misses the bigger picture."
 Generate EXACTLY 6 steps. Respond with ONLY the JSON object."""
 
 
-def _get_client(xai_api_key: str) -> OpenAI:
-    return OpenAI(api_key=xai_api_key, base_url=XAI_BASE_URL)
+def _get_client(xai_api_key: str) -> XAIClient:
+    return get_xai_client(xai_api_key)
 
 
 def generate_scenario(xai_api_key: str, category: str | None = None) -> dict:
@@ -0,0 +1,291 @@
+"""Pre-generated, pre-validated procedural questions per (program, slot).
+
+Session builders used to generate, validate and fingerprint every question
+while the kid waits on "Start".  Each builder now registers a producer for
+its slots here.  A daemon thread keeps every slot that has been asked for
+topped up to ``TARGET_DEPTH`` questions, stored in the SQLite
+``question_pool`` table so pools survive restarts, and session start
+becomes ``take()`` — a pop from an in-memory mirror of the slot plus an
+exclusion filter — with live generation as the fallback when a slot is
+empty.  Taken rows are deleted from SQLite by the worker, off the request
+path; a crash before that only means a few questions are served again.
+
+Nothing is pooled until ``ensure_started()`` runs (the app does this at
+startup); before that ``take()`` returns None and builders generate live.
+
+Pool health and session-start latency::
+
+    import question_pool
+    question_pool.stats()  # {"linear": {"depth": 412, "slots": 35, "hits": 30, "take_ms_p50": 0.01, ...}}
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from collections import Counter, deque
+from collections.abc import Callable, Iterable
+from typing import NamedTuple
+
+import database as db
+
+TARGET_DEPTH = 12
+# Slots whose templates only produce a handful of distinct questions stop
+# after this many candidates per missing question instead of spinning on
+# duplicates.
+PRODUCE_TRIES_PER_QUESTION = 3
+# Pooled questions inspected per take() before giving up on the exclusion filter.
+PEEK_LIMIT = 64
+IDLE_POLL_SECONDS = 300.0
+_LATENCY_SAMPLES = 512
+
+
+class Producer(NamedTuple):
+    produce: Callable[[str], dict | None]  # slot key -> one fresh question
+    keys: Callable[[dict], Iterable[str]]  # exclusion keys (fingerprints, dedup keys)
+    validate: str | None  # validate_question program, or None to store as generated
+    version: str  # bump when the generators change; older rows are dropped
+
+
+class _Pooled(NamedTuple):
+    row_id: int
+    qid: str
+    keys: frozenset[str]
+    question: dict
+
+
+_producers: dict[str, Producer] = {}
+# (program, slot) -> pooled questions, oldest first; loaded from SQLite on first use
+_pools: dict[tuple[str, str], deque[_Pooled]] = {}
+_wanted: set[tuple[str, str]] = set()
+_taken: list[int] = []
+_pruned: set[str] = set()
+_lock = threading.RLock()
+_wake = threading.Event()
+_start_lock = threading.Lock()
+_thread: threading.Thread | None = None
+_enabled = False
+_counts: dict[str, Counter] = {}
+_take_ms: dict[str, deque] = {}
+
+
+def _no_keys(q: dict) -> tuple[str, ...]:
+    return ()
+
+
+def register(
+    program: str,
+    produce: Callable[[str], dict | None],
+    *,
+    keys: Callable[[dict], Iterable[str]] = _no_keys,
+    validate: str | None = None,
+    version: str = "1",
+) -> None:
+    """Let the refill worker fill ``program``'s slots with ``produce(slot)``."""
+    with _lock:
+        old = _producers.get(program)
+        _producers[program] = Producer(produce, keys, validate, version)
+        if old is not None and old.version != version:
+            for key in [k for k in _pools if k[0] == program]:
+                del _pools[key]
+            _pruned.discard(program)
+
+
+def _pool(program: str, slot: str, producer: Producer) -> deque[_Pooled]:
+    with _lock:
+        pool = _pools.get((program, slot))
+        if pool is None:
+            rows = db.question_pool_rows(program, slot, producer.version)
+            pool = _pools[(program, slot)] = deque(
+                _Pooled(r["id"], r["question_id"], frozenset(r["keys"]), r["question"]) for r in rows
+            )
+        return pool
+
+
+def _entry(producer: Producer, slot: str) -> tuple[str, list[str], dict] | None:
+    q = producer.produce(slot)
+    if not q:
+        return None
+    if producer.validate is not None:
+        from practice_quality.validator import validate_question
+
+        vr = validate_question(q, program=producer.validate)
+        if not vr.ok:
+            return None
+        if vr.verified_answer is not None:
+            q = {**q, "answer": vr.verified_answer}
+    return str(q.get("id") or ""), sorted(set(producer.keys(q))), q
+
+
+def refill_slot(program: str, slot: str, *, depth: int | None = None) -> int:
+    """Top one slot up to ``depth`` questions; returns how many were added."""
+    producer = _producers.get(program)
+    if producer is None:
+        return 0
+    depth = TARGET_DEPTH if depth is None else depth
+    pool = _pool(program, slot, producer)
+    with _lock:
+        need = depth - len(pool)
+        ids = {p.qid for p in pool if p.qid}
+        keys = {k for p in pool for k in p.keys}
+    if need <= 0:
+        return 0
+    rows: list[tuple[str, list[str], dict]] = []
+    for _ in range(need * PRODUCE_TRIES_PER_QUESTION):
+        if len(rows) >= need:
+            break
+        try:
+            entry = _entry(producer, slot)
+        except Exception:
+            entry = None
+        if entry is None:
+            continue
+        qid, qkeys, _q = entry
+        if (qid and qid in ids) or not keys.isdisjoint(qkeys):
+            continue
+        rows.append(entry)
+        if qid:
+            ids.add(qid)
+        keys.update(qkeys)
+    if not rows:
+        return 0
+    row_ids = db.question_pool_add(program, slot, producer.version, rows)
+    with _lock:
+        pool.extend(_Pooled(rid, qid, frozenset(k), q) for rid, (qid, k, q) in zip(row_ids, rows))
+    return len(rows)
+
+
+def _flush_taken() -> None:
+    with _lock:
+        ids = _taken[:]
+        _taken.clear()
+    if ids:
+        db.question_pool_remove(ids)
+
+
+def refill_once() -> int:
+    """Persist takes, then top up every wanted (or already pooled) slot; returns questions added."""
+    _flush_taken()
+    for program, producer in list(_producers.items()):
+        if program not in _pruned:
+            db.question_pool_clear(program, keep_version=producer.version)
+            _pruned.add(program)
+    with _lock:
+        slots = set(_wanted) | set(_pools)
+    slots.update((program, slot) for program, slot, _v in db.question_pool_depths())
+    added = 0
+    for program, slot in sorted(slots):
+        if program in _producers:
+            added += refill_slot(program, slot)
+    return added
+
+
+def take(
+    program: str,
+    slot: str,
+    used_ids: set[str] | None = None,
+    used_keys: set[str] | None = None,
+) -> dict | None:
+    """Pop a pooled question for ``slot`` not in ``used_ids`` / sharing no ``used_keys``.
+
+    Returns None (the caller generates live) when pooling is off, the slot
+    is empty, or every pooled question is excluded for this session.
+    """
+    producer = _producers.get(program)
+    if not _enabled or producer is None:
+        return None
+    start = time.perf_counter()
+    q = None
+    with _lock:
+        _wanted.add((program, slot))
+        try:
+            pool = _pool(program, slot, producer)
+        except sqlite3.Error:
+            pool = deque()
+        for i, item in enumerate(pool):
+            if i >= PEEK_LIMIT:
+                break
+            if used_ids and item.qid in used_ids:
+                continue
+            if used_keys and not used_keys.isdisjoint(item.keys):
+                continue
+            del pool[i]
+            _taken.append(item.row_id)
+            q = item.question
+            break
+        _counts.setdefault(program, Counter())["hits" if q else "misses"] += 1
+        _take_ms.setdefault(program, deque(maxlen=_LATENCY_SAMPLES)).append(
+            (time.perf_counter() - start) * 1000
+        )
+    _wake.set()
+    return q
+
+
+def _percentile(samples: list[float], pct: float) -> float | None:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(int(len(ordered) * pct), len(ordered) - 1)], 4)
+
+
+def stats() -> dict[str, dict]:
+    """Per-program pool depth, slot count, take hits/misses and take() latency."""
+    try:
+        depths = {
+            (program, slot): n
+            for (program, slot, version), n in db.question_pool_depths().items()
+            if program not in _producers or _producers[program].version == version
+        }
+    except sqlite3.Error:
+        depths = {}
+    out: dict[str, dict] = {}
+    with _lock:
+        depths.update({key: len(pool) for key, pool in _pools.items()})
+        for (program, _slot), n in depths.items():
+            item = out.setdefault(program, {"depth": 0, "slots": 0})
+            item["depth"] += n
+            item["slots"] += 1
+        for program in set(_counts) | set(_take_ms):
+            item = out.setdefault(program, {"depth": 0, "slots": 0})
+            counts = _counts.get(program, Counter())
+            samples = list(_take_ms.get(program, ()))
+            item.update(
+                hits=counts["hits"],
+                misses=counts["misses"],
+                take_ms_p50=_percentile(samples, 0.5),
+                take_ms_p95=_percentile(samples, 0.95),
+            )
+    return out
+
+
+def _run() -> None:
+    while True:
+        try:
+            refill_once()
+        except Exception:
+            pass
+        _wake.wait(IDLE_POLL_SECONDS)
+        _wake.clear()
+
+
+def ensure_started() -> None:
+    """Turn pooling on and start the per-process refill thread (idempotent)."""
+    global _thread, _enabled
+    with _start_lock:
+        _enabled = True
+        if _thread is not None and _thread.is_alive():
+            return
+        _thread = threading.Thread(target=_run, name="question-pool-refill", daemon=True)
+        _thread.start()
+
+
+def reset_pool_state() -> None:
+    """Drop the in-memory mirrors and counters (tests); SQLite rows are kept."""
+    with _lock:
+        _pools.clear()
+        _wanted.clear()
+        _taken.clear()
+        _pruned.clear()
+        _counts.clear()
+        _take_ms.clear()
@@ -17,11 +17,16 @@ Run  generate_images.py  to regenerate them.
 import glob
 import json
 import os
+import threading
+import time
 
 _BASE_DIR = os.path.dirname(__file__)
 _IMG_DIR = os.path.join(_BASE_DIR, "images")
 _STORIES_DIR = os.path.join(_BASE_DIR, "stories")
 
+# Illustrations smaller than this are treated as failed downloads.
+MIN_IMAGE_BYTES = 1000
+
 
 def get_image_path(story_id: str, page_num: int) -> str:
     """Return the local file path for a story page illustration."""
@@ -30,8 +35,7 @@ def get_image_path(story_id: str, page_num: int) -> str:
 
 def page_image_exists(story_id: str, page_num: int) -> bool:
     """True if a valid illustration file exists for this page."""
-    path = get_image_path(story_id, page_num)
-    return os.path.exists(path) and os.path.getsize(path) >= 1000
+    return catalog.image_exists(story_id, page_num)
 
 
 def count_missing_images(story: dict) -> int:
@@ -705,12 +709,12 @@ STORIES = {
 }
 
 
-def _load_generated_stories() -> dict:
+def _load_generated_stories(stories_dir: str = _STORIES_DIR) -> dict:
     """Scan stories/*.json and return them as {id: story_dict}."""
     generated = {}
-    if not os.path.isdir(_STORIES_DIR):
+    if not os.path.isdir(stories_dir):
         return generated
-    for path in glob.glob(os.path.join(_STORIES_DIR, "*.json")):
+    for path in glob.glob(os.path.join(stories_dir, "*.json")):
         try:
             with open(path, "r", encoding="utf-8") as f:
                 story = json.load(f)
@@ -721,32 +725,124 @@ def _load_generated_stories() -> dict:
     return generated
 
 
+def _dir_mtime(path: str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+class StoryCatalog:
+    """Built-in + generated stories and page-image status, loaded once and indexed by id.
+
+    The stories/ and images/ directories are re-stat'ed at most every
+    ``recheck_seconds``; a changed mtime (a story file or image added,
+    renamed or removed) reloads that side.  ``invalidate()`` forces a reload,
+    e.g. after a story JSON or an image was rewritten in place.
+    """
+
+    def __init__(self, stories_dir: str, img_dir: str, *, recheck_seconds: float = 2.0):
+        self.stories_dir = stories_dir
+        self.img_dir = img_dir
+        self.recheck_seconds = recheck_seconds
+        self._lock = threading.Lock()
+        self._stories: dict[str, dict] = {}
+        self._generated: dict[str, dict] = {}
+        self._image_sizes: dict[str, int] = {}
+        self._stories_mtime: int | None = None
+        self._images_mtime: int | None = None
+        self._checked_at: float | None = None
+        self.loads = 0
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._checked_at = None
+            self._stories_mtime = self._images_mtime = None
+            self._stories = {}
+            self._image_sizes = {}
+
+    def _scan_images(self) -> dict[str, int]:
+        sizes: dict[str, int] = {}
+        try:
+            with os.scandir(self.img_dir) as entries:
+                for entry in entries:
+                    if entry.name.endswith(".png") and entry.is_file():
+                        sizes[entry.name] = entry.stat().st_size
+        except OSError:
+            pass
+        return sizes
+
+    def _fresh(self) -> None:
+        now = time.monotonic()
+        with self._lock:
+            if (
+                self._checked_at is not None
+                and self._stories
+                and now - self._checked_at < self.recheck_seconds
+            ):
+                return
+            self._checked_at = now
+            stories_mtime = _dir_mtime(self.stories_dir)
+            if not self._stories or stories_mtime != self._stories_mtime:
+                self._generated = _load_generated_stories(self.stories_dir)
+                merged = dict(STORIES)
+                merged.update(self._generated)
+                self._stories = merged
+                self._stories_mtime = stories_mtime
+                self.loads += 1
+            images_mtime = _dir_mtime(self.img_dir)
+            if images_mtime != self._images_mtime or not self._image_sizes:
+                self._image_sizes = self._scan_images()
+                self._images_mtime = images_mtime
+
+    def stories(self) -> dict[str, dict]:
+        """{id: story}, built-ins first; the returned dict must not be mutated."""
+        self._fresh()
+        return self._stories
+
+    def generated(self) -> dict[str, dict]:
+        self._fresh()
+        return self._generated
+
+    def get(self, story_id: str) -> dict | None:
+        if story_id in STORIES:
+            return STORIES[story_id]
+        return self.stories().get(story_id)
+
+    def image_exists(self, story_id: str, page_num: int) -> bool:
+        self._fresh()
+        size = self._image_sizes.get(f"{story_id}_{page_num}.png", 0)
+        return size >= MIN_IMAGE_BYTES
+
+
+catalog = StoryCatalog(_STORIES_DIR, _IMG_DIR)
+
+
 def save_generated_story(story: dict) -> str:
     """Save a generated story dict to stories/<id>.json. Returns the file path."""
     os.makedirs(_STORIES_DIR, exist_ok=True)
     path = os.path.join(_STORIES_DIR, f"{story['id']}.json")
     with open(path, "w", encoding="utf-8") as f:
         json.dump(story, f, ensure_ascii=False, indent=2)
+    catalog.invalidate()
     return path
 
 
+def get_generated_stories() -> dict:
+    """Generated stories only, as {id: story_dict}."""
+    return dict(catalog.generated())
+
+
 def get_all_stories() -> list:
     """Get all stories (built-in + generated) as a list."""
-    merged = dict(STORIES)
-    merged.update(_load_generated_stories())
-    return list(merged.values())
+    return list(catalog.stories().values())
 
 
 def get_story(story_id: str) -> dict | None:
     """Get a story by its ID (checks built-in first, then generated)."""
-    if story_id in STORIES:
-        return STORIES[story_id]
-    generated = _load_generated_stories()
-    return generated.get(story_id)
+    return catalog.get(story_id)
 
 
 def get_all_story_ids() -> list:
     """Get all story IDs (built-in + generated)."""
-    merged = dict(STORIES)
-    merged.update(_load_generated_stories())
-    return list(merged.keys())
+    return list(catalog.stories().keys())
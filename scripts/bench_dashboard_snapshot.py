@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""Benchmark dashboard reads: separate per-widget queries vs. get_dashboard_snapshot.
+
+Seeds a throwaway SQLite file with N years of synthetic daily logins and
+activity scores, then times one simulated dashboard rerun each way.
+
+Usage:
+    python scripts/bench_dashboard_snapshot.py
+    python scripts/bench_dashboard_snapshot.py --years 5 --per-day 6 --reruns 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import database as db
+
+ACTIVITY_TYPES = ("Math", "GK", "Reading", "MentalMath", "Science", "Vocabulary")
+
+
+def _seed(user_id: int, years: int, per_day: int, seed: int) -> int:
+    rng = random.Random(seed)
+    today = datetime.now().date()
+    logins = []
+    scores = []
+    for offset in range(years * 365):
+        day = today - timedelta(days=offset)
+        if rng.random() < 0.1:
+            continue  # leave gaps so the streak query has islands to find
+        ds = day.strftime("%Y-%m-%d")
+        logins.append((user_id, ds))
+        for i in range(rng.randint(1, per_day)):
+            scores.append(
+                (
+                    user_id,
+                    rng.choice(ACTIVITY_TYPES),
+                    "Synthetic",
+                    rng.randint(40, 100),
+                    100,
+                    ds,
+                    "",
+                    rng.randint(60, 900),
+                    f"bench-{ds}-{i}",
+                    f"{ds} 12:00:00",
+                )
+            )
+    with db.get_connection() as conn:
+        conn.executemany(
+            "INSERT OR IGNORE INTO daily_logs (user_id, log_date) VALUES (?, ?)", logins
+        )
+        conn.executemany(
+            """INSERT INTO activity_scores
+               (user_id, activity_type, activity_name, score, max_score, log_date, details,
+                time_spent_seconds, sync_id, completed_at)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+            scores,
+        )
+    return len(scores)
+
+
+def _rerun_separate(user_id: int) -> None:
+    """The per-widget calls render_user_dashboard made before the snapshot."""
+    db.get_user_by_id(user_id)
+    db.get_login_streak(user_id)
+    db.get_total_login_days(user_id)
+    db.get_user_daily_stats(user_id)
+    db.get_daily_score_calendar(user_id, days=30)
+    db.get_daily_time_spent_calendar(user_id, days=30)
+    db.get_daily_time_spent_calendar(user_id, days=60)
+    db.get_total_time_spent(user_id)
+    db.get_scores_history(user_id, days=365)
+    db.get_reading_history(user_id, days=365)
+    db.get_total_time_spent(user_id)
+
+
+def _rerun_snapshot(user_id: int) -> None:
+    db.get_user_by_id(user_id)
+    db.get_dashboard_snapshot(user_id, days=60)
+
+
+def _time(fn, user_id: int, reruns: int) -> float:
+    fn(user_id)  # warm the page cache
+    start = time.perf_counter()
+    for _ in range(reruns):
+        fn(user_id)
+    return (time.perf_counter() - start) / reruns * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--per-day", type=int, default=6, help="max activities per day")
+    parser.add_argument("--reruns", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = str(Path(tmp) / "bench.db")
+        db.init_db()
+        user_id = db.get_user("Arjun")["id"]
+        rows = _seed(user_id, args.years, args.per_day, args.seed)
+        print(f"Seeded {rows:,} activity rows over {args.years} years")
+
+        separate_ms = _time(_rerun_separate, user_id, args.reruns)
+        snapshot_ms = _time(_rerun_snapshot, user_id, args.reruns)
+        stats = db.get_connection_stats()
+        db.close_all_connections()
+
+    print(f"separate queries : {separate_ms:8.2f} ms / rerun")
+    print(f"dashboard snapshot: {snapshot_ms:8.2f} ms / rerun")
+    if snapshot_ms > 0:
+        print(f"speedup          : {separate_ms / snapshot_ms:8.1f}x")
+    print(
+        f"connections opened={stats['connections_opened']} "
+        f"reused={stats['connections_reused']}"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
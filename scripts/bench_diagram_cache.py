@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Measure diagram render time per rerun with and without ``diagram_cache``.
+
+Replays every Harshit bank question through ``harshit_math_diagrams.render_svg``
+and a batch of Mental Math Sprint questions through
+``mental_math_hints.hint_svg_html`` — once with the cache bypassed (the old
+behaviour) and then for ``--reruns`` passes with it, as Streamlit reruns do —
+then simulates AI hint images for the sprint questions across ``--users``
+users with the remote FLUX call stubbed out, counting how many remote calls
+the persisted tier avoids.
+
+Usage:
+    python scripts/bench_diagram_cache.py
+    python scripts/bench_diagram_cache.py --reruns 20 --users 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import diagram_cache
+import harshit_math_diagrams as hmd
+import mental_math_content as mmc
+import mental_math_hints as mmh
+
+
+def _harshit_questions() -> list[dict]:
+    out = []
+    for path in glob.glob(str(ROOT / "HarshitMath" / "**" / "*.json"), recursive=True):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        items = data.get("questions", data) if isinstance(data, dict) else data
+        if isinstance(items, dict):
+            items = [q for level in items.values() if isinstance(level, list) for q in level]
+        out.extend(q for q in items or () if isinstance(q, dict) and q.get("question"))
+    return out
+
+
+def _per_pass_ms(fn, items: list, passes: int) -> float:
+    start = time.perf_counter()
+    for _ in range(passes):
+        for item in items:
+            fn(item)
+    return (time.perf_counter() - start) / passes * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=10)
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--sprint", type=int, default=200, help="sprint questions to replay")
+    args = parser.parse_args()
+
+    random.seed(7)
+    harshit = [q for q in _harshit_questions() if hmd.diagram_spec(q)]
+    sprint = [q["hint_meta"] for q in mmc.generate_sprint(args.sprint) if q.get("hint_meta")]
+    cases = {
+        "harshit render_svg": (harshit, hmd.render_svg, lambda q: hmd.render_spec_svg(hmd.diagram_spec(q))),
+        "sprint hint_svg_html": (sprint, mmh.hint_svg_html, mmh._hint_svg_html),
+    }
+    print(f"{'renderer':<22}{'items':>7}{'uncached':>12}{'cached':>11}{'hit rate':>10}")
+    for name, (items, cached, uncached) in cases.items():
+        diagram_cache.reset_cache()
+        before = _per_pass_ms(uncached, items, args.reruns)
+        after = _per_pass_ms(cached, items, args.reruns)
+        rate = next(iter(diagram_cache.stats().values()), {}).get("hit_rate")
+        print(f"{name:<22}{len(items):>7}{before:9.2f} ms{after:8.2f} ms{rate:>10}")
+
+    remote = 0
+
+    def fake_remote(spec, key):
+        nonlocal remote
+        remote += 1
+        return b"\x89PNG" + spec["prompt"].encode()
+
+    mmh._hf_text_to_image = fake_remote
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["DIAGRAM_CACHE_DIR"] = tmp
+        requests = 0
+        for _user in range(args.users):
+            diagram_cache.reset_cache()  # each user on a fresh process: only the disk tier is shared
+            for meta in random.sample(sprint, min(10, len(sprint))):
+                mmh.generate_hf_diagram_image(mmh.hf_prompt_for_diagram(meta), api_key="bench")
+                requests += 1
+    print(
+        f"\nAI hint images: {requests} requests from {args.users} users, "
+        f"{remote} remote calls ({1 - remote / requests:.0%} avoided)"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""Benchmark past-question checks: difflib over all history vs. the MinHash index.
+
+Builds N synthetic historical GK questions, then checks a 10-question quiz
+(half near-repeats, half new) against all of them both ways and reports
+timings plus how many difflib-flagged repeats the index also catches.
+
+Usage:
+    python scripts/bench_gk_similarity.py
+    python scripts/bench_gk_similarity.py --history 10000 --threshold 0.55
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import gk_content as gk
+import gk_similarity as gks
+
+TEMPLATES = [
+    "Which {a} is known as the {b} of {c}?",
+    "What is the capital city of {a} {b}?",
+    "In which year did {a} {b} first reach {c}?",
+    "Who painted the famous picture of the {a} {b}?",
+    "How many {a} live in the {b} {c} forest?",
+    "Why do {a} migrate to {b} every winter?",
+    "Which scientist explained how {a} turns into {b}?",
+    "What does the word {a} mean in the {b} language?",
+]
+SYLLABLES = ["ka", "lo", "mi", "ren", "ta", "vo", "shi", "dra", "ne", "pu", "zor", "bel", "qui", "fa"]
+
+
+def _word(rng: random.Random) -> str:
+    return "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+
+
+def _question(rng: random.Random) -> str:
+    return rng.choice(TEMPLATES).format(a=_word(rng), b=_word(rng), c=_word(rng))
+
+
+def _paraphrase(text: str) -> str:
+    return "Can you tell me " + text[0].lower() + text[1:].rstrip("?") + " today?"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--history", type=int, default=10_000)
+    parser.add_argument("--threshold", type=float, default=gks.DEFAULT_THRESHOLD)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    history = list(dict.fromkeys(_question(rng) for _ in range(args.history)))
+    quiz = [_paraphrase(q) for q in rng.sample(history, 5)] + [_question(rng) for _ in range(5)]
+
+    start = time.perf_counter()
+    difflib_hits = set()
+    for i, q in enumerate(quiz):
+        best = max(gk._question_similarity(q, past) for past in history)
+        if best >= gk._DIVERSITY_MAX_PAIR_SIMILARITY:
+            difflib_hits.add(i)
+    difflib_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index = gks.MinHashIndex()
+    for q in history:
+        index.add(q)
+    build_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    index_hits = {i for i, q in enumerate(quiz) if index.query(q, args.threshold)}
+    query_s = time.perf_counter() - start
+
+    print(f"history questions : {len(history):,}")
+    print(f"difflib full scan : {difflib_s * 1000:10.1f} ms  ({len(difflib_hits)} repeats flagged)")
+    print(f"minhash build     : {build_s * 1000:10.1f} ms  (one-off; persisted in SQLite)")
+    print(f"minhash query     : {query_s * 1000:10.1f} ms  ({len(index_hits)} repeats flagged)")
+    if query_s > 0:
+        print(f"query speedup     : {difflib_s / query_s:10.0f}x")
+    print(f"difflib repeats also caught by index: {len(difflib_hits & index_hits)}/{len(difflib_hits)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
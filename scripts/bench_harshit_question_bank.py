@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark Harshit question bank picks: re-parse per pick vs. the bank store.
+
+Writes a synthetic prereq bank of N questions per topic into a temporary
+directory, then assembles S practice sessions of Q questions each (every
+pick excludes the session's earlier questions) two ways:
+
+  * baseline — what ``pick_question`` used to do: parse the topic JSON on
+    every pick and filter the whole pool with the O(pool x exclusions)
+    ``any(question_dedup_key(t) == key ...)`` check;
+  * store    — ``harshit_chapter_questions.pick_question`` on the
+    memory-resident ``BankStore``.
+
+Usage:
+    python scripts/bench_harshit_question_bank.py
+    python scripts/bench_harshit_question_bank.py --questions 5000 --sessions 100
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import harshit_bank_store as hbs
+import harshit_chapter_questions as hcq
+
+PREREQ_ID = 2
+TOPICS = (1, 2, 3)
+LEVELS = ("A", "B", "C", "D", "E")
+
+
+def _bank(topic_id: int, n: int) -> dict:
+    questions: dict[str, list[dict]] = {lvl: [] for lvl in LEVELS}
+    for i in range(n):
+        a, b = i % 97 + 2, i // 97 + 3
+        questions[LEVELS[i % len(LEVELS)]].append(
+            {
+                "id": f"t{topic_id}_{i}",
+                "question": f"Simplify {a}x + {b}x - {i}.",
+                "options": [f"{a + b}x - {i}", f"{a * b}x - {i}", f"{a + b}x + {i}", f"{a - b}x - {i}"],
+                "answer": 0,
+                "explanation": "Combine like terms.",
+            }
+        )
+    return {"meta": {"prereq_id": PREREQ_ID, "topic_id": topic_id}, "questions": questions}
+
+
+def _baseline_pick(topic_id: int, level: str, exclude_ids: set[str], exclude_text: set[str]) -> dict | None:
+    data = json.loads(hcq.bank_path(PREREQ_ID, topic_id).read_text(encoding="utf-8"))
+    pool = data["questions"].get(level, [])
+
+    def _excluded(q: dict) -> bool:
+        if q["id"] in exclude_ids:
+            return True
+        key = hcq.question_dedup_key(q["question"])
+        return key in exclude_text or any(hcq.question_dedup_key(t) == key for t in exclude_text)
+
+    candidates = [q for q in pool if not _excluded(q)]
+    if not candidates:
+        return None
+    return hcq.normalize_question(random.choice(candidates), PREREQ_ID, topic_id, level)
+
+
+def _sessions(pick, sessions: int, per_session: int) -> float:
+    rng = random.Random(5)
+    start = time.perf_counter()
+    for _ in range(sessions):
+        used_ids: set[str] = set()
+        used_keys: set[str] = set()
+        for _ in range(per_session):
+            q = pick(rng.choice(TOPICS), rng.choice(LEVELS), used_ids, used_keys)
+            if q:
+                used_ids.add(q["id"])
+                used_keys.add(hcq.question_dedup_key(q["question"]))
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=5000, help="questions per topic bank")
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--per-session", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        hcq.BANK_DIR = Path(tmp)
+        hcq.store = hbs.BankStore(hcq.store._key_fn)
+        for tid in TOPICS:
+            hcq.save_bank(PREREQ_ID, tid, _bank(tid, args.questions))
+
+        baseline_s = _sessions(_baseline_pick, args.sessions, args.per_session)
+
+        def _store_pick(tid, lvl, ids, keys):
+            return hcq.pick_question(PREREQ_ID, tid, lvl, exclude_ids=ids, exclude_text=keys)
+
+        start = time.perf_counter()
+        for tid in TOPICS:
+            hcq.store.get(hcq.bank_path(PREREQ_ID, tid))
+        load_s = time.perf_counter() - start
+        store_s = _sessions(_store_pick, args.sessions, args.per_session)
+
+    picks = args.sessions * args.per_session
+    print(f"bank size         : {len(TOPICS)} topics x {args.questions:,} questions")
+    print(f"sessions          : {args.sessions} x {args.per_session} picks")
+    print(f"baseline          : {baseline_s * 1000:9.1f} ms  ({baseline_s / picks * 1e6:8.0f} us/pick)")
+    print(f"bank store        : {store_s * 1000:9.1f} ms  ({store_s / picks * 1e6:8.0f} us/pick)")
+    print(f"store first load  : {load_s * 1000:9.1f} ms  (once per process, {hcq.store.loads} files)")
+    print(f"speedup           : {baseline_s / store_s:9.0f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""Benchmark the story illustration pipeline offline with the fake image backend.
+
+Draws every page of N synthetic stories into a temporary directory, once
+with a single worker (the old one-page-at-a-time behaviour) and once with
+the thread pool, and reports pages per second.  ``--latency`` is the
+simulated per-image API time.
+
+Usage:
+    python scripts/bench_image_pipeline.py
+    python scripts/bench_image_pipeline.py --stories 3 --pages 12 --latency 0.5 --workers 6
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import generate_images as gi
+
+
+def _run(stories: list[dict], latency: float, workers: int) -> tuple[float, int]:
+    backend = gi.FakeImageBackend(latency=latency)
+    drawn = 0
+    with tempfile.TemporaryDirectory() as out_dir:
+        start = time.perf_counter()
+        for story in stories:
+            generated, _, _ = gi.generate_images_for_story(
+                story, None, backend=backend, max_workers=workers, out_dir=out_dir
+            )
+            drawn += generated
+        return time.perf_counter() - start, drawn
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--stories", type=int, default=2)
+    parser.add_argument("--pages", type=int, default=12)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--workers", type=int, default=gi.MAX_WORKERS)
+    args = parser.parse_args()
+
+    stories = [
+        {"id": f"bench_{s}", "pages": [{"image_prompt": f"story {s} page {p}"} for p in range(args.pages)]}
+        for s in range(args.stories)
+    ]
+    serial_s, serial_n = _run(stories, args.latency, 1)
+    pooled_s, pooled_n = _run(stories, args.latency, args.workers)
+
+    print(f"pages per run     : {serial_n}")
+    print(f"1 worker          : {serial_s:7.2f} s  ({serial_n / serial_s:6.1f} pages/s)")
+    print(f"{args.workers} workers         : {pooled_s:7.2f} s  ({pooled_n / pooled_s:6.1f} pages/s)")
+    print(f"speedup           : {serial_s / pooled_s:7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Benchmark linear-equation checks: substitute-and-eval vs. compiled linear forms.
+
+Draws N questions from every strategy/level generator, then runs the checks
+the practice pipeline repeats for each question — the dedup signature (lhs -
+rhs sampled at x = 0, 1, 2, -1) and ``equation_holds_for_x`` on every
+option — R times, two ways:
+
+  * eval     — the old evaluator: regex-rewrite the side, substitute x, and
+    ``eval`` it, for every sample point and option;
+  * compiled — ``compile_equation`` once per distinct equation (cold: empty
+    cache; warm: cache already filled), then Fraction arithmetic.
+
+Usage:
+    python scripts/bench_linear_expression.py
+    python scripts/bench_linear_expression.py --per-slot 200 --rounds 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import arjun_linear_equation_strategies as leqs
+from practice_quality.dedup import linear_equation_signature
+
+
+def _eval_side(expr: str, x_val: float) -> float:
+    s = leqs._normalize_math_text(expr).replace(" ", "")
+    s = re.sub(r"(\d)\(", r"\1*(", s)
+    s = re.sub(r"\)(\d)", r")*\1", s)
+    s = re.sub(r"(\d)/(\d)([xy])", r"((\1)/(\2)*\3)", s)
+    s = re.sub(r"(-?\d+)([xy])", r"\1*\2", s)
+    s = re.sub(r"\bx\b", f"({x_val})", s, flags=re.I)
+    if not re.fullmatch(r"[-+*/().0-9]+", s):
+        raise ValueError(f"Unsupported expression: {expr}")
+    return float(eval(s, {"__builtins__": {}}, {}))
+
+
+def _eval_checks(eq: str, options: list[str]) -> None:
+    lhs, rhs = leqs._normalize_math_text(eq).split("=", 1)
+    try:
+        for x in (0.0, 1.0, 2.0, -1.0):
+            _eval_side(lhs, x) - _eval_side(rhs, x)
+    except Exception:
+        pass
+    for opt in options:
+        x_val = leqs._parse_x_value(opt)
+        if x_val is None:
+            continue
+        try:
+            abs(_eval_side(lhs, x_val) - _eval_side(rhs, x_val)) < 1e-6
+        except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
+            pass
+
+
+def _compiled_checks(eq: str, options: list[str]) -> None:
+    linear_equation_signature(eq)
+    for opt in options:
+        leqs.equation_holds_for_x(eq, opt)
+
+
+def _time(check, items: list[tuple[str, list[str]]], rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        for eq, options in items:
+            check(eq, options)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--per-slot", type=int, default=100, help="questions drawn per strategy/level")
+    parser.add_argument("--rounds", type=int, default=3, help="times each question is re-checked")
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    items: list[tuple[str, list[str]]] = []
+    for sid in sorted(leqs.STRATEGIES):
+        for lvl in leqs.LEVEL_ORDER:
+            for _ in range(args.per_slot):
+                q = leqs.attach_question_parts(dict(leqs.generate_question(sid, lvl) or {}))
+                if "=" in q.get("equation", ""):
+                    items.append((q["equation"], [str(o) for o in q.get("options", [])]))
+
+    eval_s = _time(_eval_checks, items, args.rounds)
+    leqs._compile_normalized.cache_clear()
+    cold_s = _time(_compiled_checks, items, 1)
+    warm_s = _time(_compiled_checks, items, args.rounds)
+    cache = leqs._compile_normalized.cache_info()
+
+    checks = len(items) * args.rounds
+    print(f"equations         : {len(items):,} ({len(set(eq for eq, _ in items)):,} distinct) x {args.rounds} rounds")
+    print(f"eval              : {eval_s * 1000:9.1f} ms  ({eval_s / checks * 1e6:7.1f} us/question)")
+    print(f"compiled (cold)   : {cold_s * 1000:9.1f} ms  ({cold_s / len(items) * 1e6:7.1f} us/question, 1 round)")
+    print(f"compiled (warm)   : {warm_s * 1000:9.1f} ms  ({warm_s / checks * 1e6:7.1f} us/question)")
+    print(f"compile cache     : {cache.currsize:,} forms, {cache.hits:,} hits")
+    print(f"speedup (warm)    : {eval_s / warm_s:9.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Profile practice_quality.qa_and_assemble on large linear-equation sessions.
+
+Assembles N procedural sessions of Q questions (every strategy and level
+with a usable pool, ``max_attempts_per_slot=28``) under cProfile, then
+reports time per session, how many fingerprints were actually computed, how many
+equations were compiled to linear forms, and what the old O(n^2) final sweep — re-
+fingerprinting every other question for each slot — would cost on the same
+sessions.
+
+Usage:
+    python scripts/bench_practice_assembler.py
+    python scripts/bench_practice_assembler.py --sessions 10 --questions 50 --top 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import pstats
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import arjun_linear_equation_practice as lep
+import arjun_linear_equation_strategies as leqs
+from practice_quality import dedup
+from practice_quality.assembler import qa_and_assemble
+
+
+# Every strategy, skipping the levels whose templates only produce a handful
+# of distinct equations (a 50-question session would exhaust them).
+CONFIG = {
+    "strategies": [
+        {"id": 1, "levels": ["A", "B", "C"]},
+        {"id": 2, "levels": ["A", "B", "C"]},
+        {"id": 3, "levels": ["A", "B", "C", "D", "E"]},
+        {"id": 4, "levels": ["A", "B", "C", "D", "E"]},
+        {"id": 5, "levels": ["A", "B"]},
+        {"id": 6, "levels": ["A", "B", "C"]},
+    ]
+}
+
+
+def _slots(count: int) -> list[dict]:
+    return [lep._slot_dict(sid, lvl) for sid, lvl in lep._slot_plan(CONFIG, count)]
+
+
+def _old_sweep_seconds(session: list[dict]) -> float:
+    """The pre-index sweep: union of every other question's fresh fingerprints, per slot."""
+    start = time.perf_counter()
+    for i in range(len(session)):
+        other = {fp for k, q in enumerate(session) if k != i for fp in dedup._compute_fingerprints(q)}
+        dedup._compute_fingerprints(session[i]).isdisjoint(other)
+    return time.perf_counter() - start
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5)
+    parser.add_argument("--questions", type=int, default=50)
+    parser.add_argument("--attempts", type=int, default=28)
+    parser.add_argument("--top", type=int, default=12, help="profile rows to print")
+    parser.add_argument("--seed", type=int, default=3)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    # Warm-up: the validator imports its helpers lazily on first use.
+    qa_and_assemble(_slots(5), lep._procedural_for_slot, program="linear")
+    dedup._cached_fingerprints.cache_clear()
+    leqs._compile_normalized.cache_clear()
+    sessions: list[list[dict]] = []
+    profiler = cProfile.Profile()
+    start = time.perf_counter()
+    profiler.enable()
+    for _ in range(args.sessions):
+        sessions.append(
+            qa_and_assemble(
+                _slots(args.questions),
+                lep._procedural_for_slot,
+                program="linear",
+                max_attempts_per_slot=args.attempts,
+            )
+        )
+    profiler.disable()
+    elapsed = time.perf_counter() - start
+
+    stats = pstats.Stats(profiler)
+    cache = dedup._cached_fingerprints.cache_info()
+    forms = leqs._compile_normalized.cache_info()
+    old_sweep = sum(_old_sweep_seconds(s) for s in sessions)
+
+    print(f"sessions          : {args.sessions} x {args.questions} questions (max {args.attempts} attempts/slot)")
+    print(f"assemble          : {elapsed / args.sessions * 1000:9.1f} ms/session (profiled)")
+    print(f"fingerprints      : {cache.misses:,} computed, {cache.hits:,} reused")
+    print(f"linear forms      : {forms.misses:,} compiled, {forms.hits:,} reused")
+    print(f"old O(n^2) sweep  : {old_sweep / args.sessions * 1000:9.1f} ms/session on top (not profiled)")
+    print()
+    stats.sort_stats("cumulative").print_stats(args.top)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Measure practice session start latency: live generation vs. pre-generated pools.
+
+Builds S sessions per builder against a temporary database twice:
+
+  * live   — pooling off, every question generated, validated and
+    fingerprinted while the session is assembled (what "Start" used to do);
+  * pooled — slots topped up first (as the refill worker would), then each
+    session pops its questions from ``question_pool``.
+
+Builders: linear procedural sessions, Arjun mental-math warm-ups, Harshit
+PreReq template sessions (empty chapter bank) and mental-math sprints.
+
+Usage:
+    python scripts/bench_question_pool.py
+    python scripts/bench_question_pool.py --sessions 20 --questions 15
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import arjun_linear_equation_practice as lep
+import arjun_mental_math_drills as amd
+import database as db
+import harshit_bank_store as hbs
+import harshit_chapter_questions as hcq
+import harshit_prereq_practice as hpp
+import mental_math_content as mm
+import question_pool
+
+LINEAR_CONFIG = {
+    "strategies": [
+        {"id": 1, "levels": ["A", "B", "C"]},
+        {"id": 3, "levels": ["A", "B", "C", "D"]},
+        {"id": 4, "levels": ["A", "C", "D"]},
+        {"id": 6, "levels": ["A", "B"]},
+    ],
+}
+DRILL_CONFIG = {"mental_math": [{"id": "squares", "levels": ["A", "B"]}, {"id": "frac_ops", "levels": ["A"]}]}
+PREREQ_ID = 2
+HARSHIT_CONFIG = {"topics": [{"id": 1, "levels": ["A", "B", "C"]}, {"id": 2, "levels": ["A", "B"]}]}
+
+
+def _builders(questions: int) -> dict:
+    return {
+        "linear": lambda: lep._build_procedural_session(LINEAR_CONFIG, count=questions),
+        "mental_drill": lambda: amd.build_mental_warmups(DRILL_CONFIG, count=questions),
+        "harshit": lambda: hpp._fill_from_bank_and_templates(PREREQ_ID, HARSHIT_CONFIG, questions),
+        "sprint": lambda: mm.generate_sprint(questions),
+    }
+
+
+def _time_sessions(build, sessions: int) -> list[float]:
+    out = []
+    for _ in range(sessions):
+        start = time.perf_counter()
+        build()
+        out.append((time.perf_counter() - start) * 1000)
+    return out
+
+
+def _prefill(program: str, build, sessions: int) -> None:
+    # One throwaway session records which slots the builder asks for.
+    question_pool._enabled = True
+    build()
+    question_pool.TARGET_DEPTH = max(question_pool.TARGET_DEPTH, 2 * sessions)
+    while question_pool.refill_once():
+        pass
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--questions", type=int, default=15)
+    parser.add_argument("--seed", type=int, default=11)
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = str(Path(tmp) / "bench.db")
+        db.init_db()
+        hcq.BANK_DIR = Path(tmp) / "banks"
+        hcq.store = hbs.BankStore(hcq.store._key_fn)
+
+        builders = _builders(args.questions)
+        for build in builders.values():  # warm imports and caches
+            build()
+
+        print(f"sessions          : {args.sessions} x {args.questions} questions per builder")
+        print(f"{'builder':<14}{'live p50':>12}{'pooled p50':>13}{'take p50':>11}{'take p95':>11}{'hit rate':>10}")
+        for program, build in builders.items():
+            question_pool._enabled = False
+            live = _time_sessions(build, args.sessions)
+            refill_start = time.perf_counter()
+            _prefill(program, build, args.sessions * args.questions)
+            refill_s = time.perf_counter() - refill_start
+            question_pool.reset_pool_state()
+            question_pool.refill_once()  # the worker's first pass loads each slot's mirror
+            pooled = _time_sessions(build, args.sessions)
+            st = question_pool.stats().get(program, {})
+            total = st.get("hits", 0) + st.get("misses", 0)
+            print(
+                f"{program:<14}{statistics.median(live):9.2f} ms{statistics.median(pooled):10.2f} ms"
+                f"{st.get('take_ms_p50') or 0:8.3f} ms{st.get('take_ms_p95') or 0:8.3f} ms"
+                f"{st.get('hits', 0) / max(total, 1):9.0%}   (refill {refill_s:.1f} s, off the request path)"
+            )
+        db.close_all_connections()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
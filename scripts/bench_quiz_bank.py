@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Time NVIDIA RA Studio quiz bank indexing, assessment assembly and scoring on a synthetic bank.
+
+Builds ``--questions`` synthetic questions over ``--modules`` modules (sizes
+skewed so some modules are much larger than others), then times the
+QuizBank index build, ``assessment(n)`` against the pre-index sampler (a
+shuffled copy of the bank plus a ``q not in chosen`` fill), a module lookup
+against a linear filter, and ``score`` on the assembled assessment.
+
+Usage:
+    python scripts/bench_quiz_bank.py
+    python scripts/bench_quiz_bank.py --questions 50000 --n 200 --repeat 50
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+STUDIO_ROOT = ROOT / "network_architecture" / "nvidia_ra_studio"
+sys.path.insert(0, str(STUDIO_ROOT))
+
+from core.models import QuizQuestion
+from core.quiz_engine import QuizBank
+
+
+def _synthetic_bank(count: int, modules: int, rng: random.Random) -> list[QuizQuestion]:
+    weights = [1.0 / (m + 1) ** 0.7 for m in range(modules)]
+    module_ids = rng.choices(range(1, modules + 1), weights=weights, k=count)
+    out = []
+    for i, module_id in enumerate(module_ids):
+        qtype = rng.choice(("mcq", "mcq", "multi", "scenario"))
+        correct = rng.sample(range(4), 2) if qtype == "multi" else [rng.randrange(4)]
+        out.append(
+            QuizQuestion(
+                id=f"q{i}",
+                module_id=module_id,
+                domain=f"domain-{module_id % 12}",
+                qtype=qtype,
+                prompt=f"Synthetic question {i} for module {module_id}?",
+                choices=["A", "B", "C", "D"],
+                correct=correct,
+                explanation="",
+            )
+        )
+    return out
+
+
+def _old_assessment(bank: list[QuizQuestion], modules: int, n: int, seed: int) -> list[QuizQuestion]:
+    """The pre-index sampler: one pass for module spread, then an O(n * chosen) fill."""
+    rng = random.Random(seed)
+    pool = bank.copy()
+    rng.shuffle(pool)
+    chosen: list[QuizQuestion] = []
+    seen_mod: set[int] = set()
+    for q in pool:
+        if len(chosen) >= n:
+            break
+        if q.module_id not in seen_mod or len(seen_mod) >= modules:
+            chosen.append(q)
+            seen_mod.add(q.module_id)
+    for q in pool:
+        if len(chosen) >= n:
+            break
+        if q not in chosen:
+            chosen.append(q)
+    return chosen[:n]
+
+
+def _ms(fn, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--questions", type=int, default=20_000)
+    parser.add_argument("--modules", type=int, default=120)
+    parser.add_argument("--n", type=int, default=50, help="assessment size")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    questions = _synthetic_bank(args.questions, args.modules, random.Random(args.seed))
+    start = time.perf_counter()
+    bank = QuizBank(questions)
+    build = (time.perf_counter() - start) * 1000
+
+    picked = bank.assessment(args.n, args.seed)
+    answers = {q.id: list(q.correct) if i % 3 else [9] for i, q in enumerate(picked)}
+    sizes = sorted(len(qs) for qs in bank.by_module.values())
+    print(f"bank              : {len(bank):,} questions, {len(sizes)} modules ({sizes[0]}-{sizes[-1]} each)")
+    print(f"index build       : {build:9.2f} ms (once, at import)")
+    print(f"{f'assessment({args.n})':<18}: {_ms(lambda: bank.assessment(args.n, args.seed), args.repeat):9.3f} ms")
+    old_ms = _ms(lambda: _old_assessment(questions, args.modules, args.n, args.seed), max(1, args.repeat // 4))
+    print(f"old sampler       : {old_ms:9.3f} ms")
+    module_id = bank.questions[0].module_id
+    print(f"module lookup     : {_ms(lambda: bank.for_module(module_id), args.repeat):9.3f} ms")
+    print(f"old linear filter : {_ms(lambda: [q for q in questions if q.module_id == module_id], args.repeat):9.3f} ms")
+    print(f"{f'score({args.n})':<18}: {_ms(lambda: bank.score(picked, answers), args.repeat):9.3f} ms")
+    print(f"modules covered   : {len({q.module_id for q in picked})} of {len(sizes)}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Count Graph round-trips for pushing N progress rows to the SharePoint list.
+
+Runs against the in-memory Graph server from ``tests/fake_graph.py`` (no
+network, no credentials).  Before the shared client / list cache / $batch
+rewrite every row cost one token request plus five Graph calls (site, list
+lookup, columns, existence filter, item POST).
+
+Usage:
+    python scripts/bench_sharepoint_roundtrips.py
+    python scripts/bench_sharepoint_roundtrips.py --rows 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import database as db
+import sharepoint_sync as sps
+from tests.fake_graph import FakeGraph
+
+LEGACY_CALLS_PER_ROW = 5
+LEGACY_TOKENS_PER_ROW = 1
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200)
+    args = parser.parse_args()
+
+    os.environ.update(
+        SHAREPOINT_ENABLED="true",
+        SHAREPOINT_SITE_URL="https://contoso.sharepoint.com/sites/OnePercent",
+        AZURE_TENANT_ID="bench",
+        AZURE_CLIENT_ID="bench",
+        AZURE_CLIENT_SECRET="bench",
+    )
+    tokens = 0
+
+    def _fake_token() -> tuple[str, float]:
+        nonlocal tokens
+        tokens += 1
+        return "bench", 3600.0
+
+    graph = FakeGraph()
+    sps._acquire_token = _fake_token
+    sps._transport = graph.transport()
+    sps.reset_caches()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db.DB_PATH = str(Path(tmp) / "bench.db")
+        db.init_db()
+        events = [
+            (
+                "persist_daily_login",
+                {"user_name": "Arjun", "user_id": 1, "log_date": f"day-{i:05d}"},
+            )
+            for i in range(args.rows)
+        ]
+        start = time.perf_counter()
+        for i in range(0, len(events), sps.BATCH_LIMIT):
+            errors = sps.persist_batch(events[i : i + sps.BATCH_LIMIT])
+            if any(errors):
+                print(f"FAIL: {next(e for e in errors if e)}")
+                return 1
+        elapsed = time.perf_counter() - start
+        sps.reset_caches()
+        db.close_all_connections()
+
+    legacy = args.rows * (LEGACY_CALLS_PER_ROW + LEGACY_TOKENS_PER_ROW)
+    now = graph.round_trips + tokens
+    print(f"rows pushed       : {args.rows}")
+    for key, count in sorted(graph.requests.items()):
+        print(f"  {count:6d}  {key}")
+    print(f"token requests    : {tokens}")
+    print(f"round-trips now   : {now}  ({elapsed * 1000:.1f} ms against the fake)")
+    print(f"round-trips before: {legacy}  (estimated)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Compare the HTML payload per rerun: base64 data URIs vs. content-hashed static URLs.
+
+Renders one rerun's worth of HTML for each image-heavy screen — the world,
+India and US maps with a marker, an Indian and a US state map, and Krish's
+counting / addition / subtraction problems — first with images inlined as
+data URIs (the old behaviour), then with ``static_assets`` URLs.  Reports
+the HTML bytes sent per rerun, the time to build it, and the one-off image
+bytes the browser fetches (and then caches) in the static case.
+
+Usage:
+    python scripts/bench_static_assets.py
+    python scripts/bench_static_assets.py --reruns 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import india_map_data
+import math_content
+import state_map_data
+import static_assets
+import us_map_data
+import us_state_map_data
+import world_map_data
+
+
+def _screens() -> dict:
+    india_loc = next(iter(india_map_data.LOCATIONS))
+    us_loc = next(iter(us_map_data.LOCATIONS))
+    state, state_loc = "Kerala", next(iter(state_map_data.STATE_LOCATIONS["kerala"]))
+    us_state, us_state_loc = "Texas", next(iter(us_state_map_data.STATE_LOCATIONS["texas"]))
+
+    def counting() -> str:
+        random.seed(1)  # same object and count for both modes
+        while True:
+            p = math_content.generate_counting_problem()
+            if p["count"] == 10:
+                return p["display_html"]
+
+    return {
+        "world map": lambda: world_map_data.render_map_with_marker(48.9, 2.35, "Paris"),
+        "India map": lambda: india_map_data.render_map_with_marker(india_loc),
+        "US map": lambda: us_map_data.render_map_with_marker(us_loc),
+        "state map (IN)": lambda: state_map_data.render_state_map_with_marker(state, state_loc),
+        "state map (US)": lambda: us_state_map_data.render_state_map_with_marker(us_state, us_state_loc),
+        "count 10 apples": counting,
+        "addition": lambda: (random.seed(2), math_content.generate_addition_problem()["display_html"])[1],
+        "subtraction": lambda: (random.seed(3), math_content.generate_subtraction_problem()["display_html"])[1],
+    }
+
+
+def _measure(render, reruns: int) -> tuple[int, float, str]:
+    html = render() or ""  # first call fills the per-process caches
+    start = time.perf_counter()
+    for _ in range(reruns):
+        render()
+    return len(html.encode()), (time.perf_counter() - start) / reruns * 1000, html
+
+
+def _static_bytes(html: str) -> int:
+    total = 0
+    for url in set(re.findall(r'src="(app/static/[^"]+)"', html)):
+        total += (static_assets.STATIC_DIR / url.removeprefix("app/static/")).stat().st_size
+    return total
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--reruns", type=int, default=100)
+    args = parser.parse_args()
+
+    screens = _screens()
+    print(f"{'screen':<17}{'data URI html':>15}{'static html':>13}{'build (uri)':>13}{'build (static)':>16}{'fetched once':>14}")
+    totals = [0, 0]
+    for name, render in screens.items():
+        static_assets._static_serving = False
+        before, before_ms, _ = _measure(render, args.reruns)
+        static_assets._static_serving = True
+        after, after_ms, html = _measure(render, args.reruns)
+        totals[0] += before
+        totals[1] += after
+        print(
+            f"{name:<17}{before / 1024:12.1f} KB{after / 1024:10.1f} KB"
+            f"{before_ms:10.3f} ms{after_ms:13.3f} ms{_static_bytes(html) / 1024:11.1f} KB"
+        )
+    print(f"{'total per rerun':<17}{totals[0] / 1024:12.1f} KB{totals[1] / 1024:10.1f} KB")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
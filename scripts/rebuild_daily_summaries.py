@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Rebuild the trigger-maintained daily_summaries table from activity_scores.
+
+Usage:
+    python scripts/rebuild_daily_summaries.py              # rebuild all users, then verify
+    python scripts/rebuild_daily_summaries.py --user Arjun
+    python scripts/rebuild_daily_summaries.py --verify-only
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import database as db
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--user", help="only this user (by name)")
+    parser.add_argument(
+        "--verify-only",
+        action="store_true",
+        help="compare summaries with raw history without rewriting them",
+    )
+    args = parser.parse_args()
+
+    db.init_db()
+    user_id = None
+    if args.user:
+        user = db.get_user(args.user)
+        if not user:
+            print(f"FAIL: unknown user {args.user!r}")
+            return 1
+        user_id = user["id"]
+
+    if args.verify_only:
+        mismatches = db.verify_daily_summaries(user_id)
+    else:
+        result = db.rebuild_daily_summaries(user_id)
+        print(f"Rebuilt {result['rows']} daily summary rows")
+        mismatches = result["mismatches"]
+
+    if mismatches:
+        for m in mismatches[:20]:
+            print(f"  mismatch user={m['user_id']} date={m['log_date']} ({m['side']})")
+        print(f"FAIL: {len(mismatches)} day(s) disagree with activity_scores")
+        return 1
+    print("OK: daily_summaries match activity_scores")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,28 +1,27 @@
 #!/usr/bin/env python3
-"""Standalone email worker — never import Streamlit."""
+"""Standalone email worker — never import Streamlit.
+
+    python send_practice_email.py               # deliver every due message in .email_queue/
+    python send_practice_email.py <payload.json>  # send one queued file now
+"""
 
 from __future__ import annotations
 
-import json
 import sys
 from pathlib import Path
 
 
 def main() -> int:
-    if len(sys.argv) < 2:
-        print("Usage: send_practice_email.py <payload.json>", file=sys.stderr)
-        return 2
-
-    path = Path(sys.argv[1])
-    payload = json.loads(path.read_text(encoding="utf-8"))
-
-    from practice_email.settings import load_settings
-    from practice_email.transport import deliver_now
-
-    settings = load_settings()
-    deliver_now(settings, payload["subject"], payload["plain"], payload["html"])
-    path.unlink(missing_ok=True)
-    return 0
+    from practice_email.delivery import deliver_pending, queue_status
+
+    only = Path(sys.argv[1]).resolve() if len(sys.argv) > 1 else None
+    counts = deliver_pending(only=only)
+    status = queue_status()
+    print(
+        f"sent {counts['sent']}, retrying {counts['retry']}, dead-lettered {counts['dead']}; "
+        f"{status['queued']} queued, {status['dead']} in dead/"
+    )
+    return 1 if only is not None and not counts["sent"] else 0
 
 
 if __name__ == "__main__":
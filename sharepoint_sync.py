@@ -25,6 +25,8 @@ from __future__ import annotations
 import json
 import os
 import re
+import threading
+import time
 import uuid
 from datetime import datetime
 from typing import Any
@@ -95,7 +97,20 @@ def is_configured() -> bool:
     return bool(_azure_app() and _secret("SHAREPOINT_SITE_URL"))
 
 
-def _access_token() -> str:
+# Process-wide Graph state: one pooled client, the bearer token until shortly
+# before it expires, and resolved site/list ids (columns ensured once per list).
+_state_lock = threading.Lock()
+_token: dict[str, Any] = {}
+_http_client: httpx.Client | None = None
+_list_targets: dict[tuple[str, str], tuple[str, str]] = {}
+_transport: httpx.BaseTransport | None = None  # tests swap in a fake Graph server
+
+TOKEN_REFRESH_MARGIN_SECONDS = 120
+BATCH_LIMIT = 20  # Graph JSON batching caps a $batch body at 20 requests
+
+
+def _acquire_token() -> tuple[str, float]:
+    """Fetch an app-only Graph token. Returns (token, expires_in_seconds)."""
     azure = _azure_app()
     if not azure:
         raise RuntimeError("Azure app credentials not configured")
@@ -110,16 +125,60 @@ def _access_token() -> str:
     if not result or "access_token" not in result:
         err = result.get("error_description") or result.get("error") or "token acquisition failed"
         raise RuntimeError(str(err))
-    return str(result["access_token"])
+    return str(result["access_token"]), float(result.get("expires_in") or 3599)
+
+
+def _access_token() -> str:
+    with _state_lock:
+        if _token and _token["expires_at"] - TOKEN_REFRESH_MARGIN_SECONDS > time.time():
+            return str(_token["value"])
+    value, expires_in = _acquire_token()
+    with _state_lock:
+        _token["value"] = value
+        _token["expires_at"] = time.time() + expires_in
+    return value
+
+
+def _invalidate_token() -> None:
+    with _state_lock:
+        _token.clear()
+
+
+class _GraphAuth(httpx.Auth):
+    """Attach the cached bearer token; on 401 refresh it once and retry."""
+
+    def auth_flow(self, request):
+        request.headers["Authorization"] = f"Bearer {_access_token()}"
+        response = yield request
+        if response.status_code == 401:
+            _invalidate_token()
+            request.headers["Authorization"] = f"Bearer {_access_token()}"
+            yield request
 
 
 def _client() -> httpx.Client:
-    token = _access_token()
-    return httpx.Client(
-        base_url=GRAPH,
-        headers={"Authorization": f"Bearer {token}"},
-        timeout=60.0,
-    )
+    """Shared keep-alive Graph client (do not close; see ``reset_caches``)."""
+    global _http_client
+    with _state_lock:
+        if _http_client is None:
+            _http_client = httpx.Client(
+                base_url=GRAPH,
+                auth=_GraphAuth(),
+                timeout=60.0,
+                transport=_transport,
+            )
+        return _http_client
+
+
+def reset_caches() -> None:
+    """Drop the pooled client, token and resolved site/list ids (config changes, tests)."""
+    global _http_client
+    with _state_lock:
+        client, _http_client = _http_client, None
+        _token.clear()
+        _list_targets.clear()
+    if client is not None:
+        client.close()
 
 
 def _site_path_from_url(site_url: str) -> str:
@@ -181,17 +240,21 @@ def _get_or_create_list(client: httpx.Client, site_id: str) -> str:
     return list_id
 
 
-def _list_item_exists(client: httpx.Client, site_id: str, list_id: str, sync_id: str) -> bool:
-    safe = sync_id.replace("'", "''")
-    resp = client.get(
-        f"/sites/{site_id}/lists/{list_id}/items",
-        params={"$filter": f"fields/Title eq '{safe}'", "$expand": "fields", "$top": 1},
-    )
-    resp.raise_for_status()
-    return bool(resp.json().get("value"))
+def _list_target(client: httpx.Client) -> tuple[str, str]:
+    """(site_id, list_id), resolved and column-checked once per process."""
+    key = (_secret("SHAREPOINT_SITE_URL"), _list_display_name())
+    with _state_lock:
+        cached = _list_targets.get(key)
+    if cached:
+        return cached
+    site_id = _get_site_id(client)
+    list_id = _get_or_create_list(client, site_id)
+    with _state_lock:
+        _list_targets[key] = (site_id, list_id)
+    return site_id, list_id
 
 
-def append_record(
+def _record_fields(
     *,
     sync_id: str,
     user_name: str,
@@ -205,8 +268,7 @@ def append_record(
     time_spent_seconds: int = 0,
     completed_at: str | None = None,
     extra_json: str = "{}",
-) -> None:
-    """Append one progress row to the SharePoint list (idempotent on sync_id)."""
+) -> dict[str, Any]:
     when = completed_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     fields: dict[str, Any] = {
         "Title": sync_id,
@@ -224,17 +286,74 @@ def append_record(
         fields["score"] = int(score)
     if max_score is not None:
         fields["max_score"] = int(max_score)
-
-    with _client() as client:
-        site_id = _get_site_id(client)
-        list_id = _get_or_create_list(client, site_id)
-        if _list_item_exists(client, site_id, list_id, sync_id):
-            return
-        resp = client.post(
-            f"/sites/{site_id}/lists/{list_id}/items",
-            json={"fields": fields},
-        )
+    return fields
+
+
+def _batch_error(resp: dict) -> str | None:
+    status = int(resp.get("status") or 0)
+    if 200 <= status < 300:
+        return None
+    body = resp.get("body") or {}
+    message = ""
+    if isinstance(body, dict):
+        message = str((body.get("error") or {}).get("message") or "")
+    return f"HTTP {status} {message}".strip()
+
+
+def append_records(records: list[dict[str, Any]]) -> dict[str, str | None]:
+    """Append many progress rows through Graph ``$batch`` (20 per request).
+
+    ``records`` hold ``append_record`` keyword arguments.  Rows whose sync_id
+    was already pushed (tracked locally in SQLite) are skipped without any
+    remote lookup.  Returns ``{sync_id: error_or_None}``.
+    """
+    results: dict[str, str | None] = {}
+    by_id: dict[str, dict[str, Any]] = {}
+    for rec in records:
+        by_id.setdefault(str(rec["sync_id"]), rec)
+    already = db.sharepoint_pushed_filter(list(by_id))
+    for sync_id in already:
+        results[sync_id] = None
+    pending = [sid for sid in by_id if sid not in already]
+    if not pending:
+        return results
+
+    client = _client()
+    site_id, list_id = _list_target(client)
+    items_url = f"/sites/{site_id}/lists/{list_id}/items"
+    for start in range(0, len(pending), BATCH_LIMIT):
+        chunk = pending[start : start + BATCH_LIMIT]
+        body = {
+            "requests": [
+                {
+                    "id": str(i),
+                    "method": "POST",
+                    "url": items_url,
+                    "headers": {"Content-Type": "application/json"},
+                    "body": {"fields": _record_fields(**by_id[sid])},
+                }
+                for i, sid in enumerate(chunk)
+            ]
+        }
+        resp = client.post("/$batch", json=body)
         resp.raise_for_status()
+        answered = {str(r.get("id")): r for r in resp.json().get("responses") or []}
+        pushed = []
+        for i, sid in enumerate(chunk):
+            item = answered.get(str(i))
+            err = _batch_error(item) if item else "missing batch response"
+            results[sid] = err
+            if err is None:
+                pushed.append(sid)
+        db.sharepoint_mark_pushed(pushed)
+    return results
+
+
+def append_record(**record: Any) -> None:
+    """Append one progress row to the SharePoint list (idempotent on sync_id)."""
+    error = append_records([record]).get(str(record["sync_id"]))
+    if error:
+        raise RuntimeError(error)
 
 
 def fetch_all_records() -> list[dict[str, Any]]:
@@ -243,39 +362,92 @@ def fetch_all_records() -> list[dict[str, Any]]:
         return []
 
     rows: list[dict[str, Any]] = []
-    with _client() as client:
-        site_id = _get_site_id(client)
-        list_id = _get_or_create_list(client, site_id)
-        url: str | None = f"/sites/{site_id}/lists/{list_id}/items"
-        params: dict[str, Any] | None = {"$expand": "fields", "$top": 200}
-
-        while url:
-            resp = client.get(url, params=params)
-            resp.raise_for_status()
-            data = resp.json()
-            for item in data.get("value") or []:
-                fields = dict(item.get("fields") or {})
-                fields["sync_id"] = str(fields.get("Title") or "").strip()
-                rows.append(fields)
-            url = data.get("@odata.nextLink")
-            params = None
+    client = _client()
+    site_id, list_id = _list_target(client)
+    url: str | None = f"/sites/{site_id}/lists/{list_id}/items"
+    params: dict[str, Any] | None = {"$expand": "fields", "$top": 200}
 
+    while url:
+        resp = client.get(url, params=params)
+        resp.raise_for_status()
+        data = resp.json()
+        for item in data.get("value") or []:
+            fields = dict(item.get("fields") or {})
+            fields["sync_id"] = str(fields.get("Title") or "").strip()
+            rows.append(fields)
+        url = data.get("@odata.nextLink")
+        params = None
+
+    db.sharepoint_mark_pushed([r["sync_id"] for r in rows if r["sync_id"]])
     return rows
 
 
+def _list_key() -> str:
+    return f"{_secret('SHAREPOINT_SITE_URL')}|{_list_display_name()}"
+
+
+def _item_fields(item: dict[str, Any]) -> dict[str, Any] | None:
+    if "deleted" in item or "@removed" in item:
+        return None
+    fields = dict(item.get("fields") or {})
+    fields["sync_id"] = str(fields.get("Title") or "").strip()
+    return fields
+
+
+def fetch_changed_records(*, full: bool = False) -> tuple[list[dict[str, Any]], str | None]:
+    """List rows added or changed since the last import, via a Graph delta query.
+
+    Resumes from the deltaLink saved by ``sync_from_sharepoint_to_db`` (the
+    whole list when there is none, ``full`` is set, or Graph answers 410 for
+    an expired token).  Returns ``(rows, new_delta_link)``; the caller saves
+    the link only once the rows are safely imported.
+    """
+    if not is_configured():
+        return [], None
+
+    client = _client()
+    site_id, list_id = _list_target(client)
+    saved = None if full else db.sharepoint_delta_link_get(_list_key())
+    url: str | None = saved or f"/sites/{site_id}/lists/{list_id}/items/delta"
+    params: dict[str, Any] | None = None if saved else {"$expand": "fields"}
+    rows: list[dict[str, Any]] = []
+    delta_link: str | None = None
+
+    while url:
+        resp = client.get(url, params=params)
+        if resp.status_code == 410 and saved:
+            return fetch_changed_records(full=True)
+        resp.raise_for_status()
+        data = resp.json()
+        for item in data.get("value") or []:
+            fields = _item_fields(item)
+            if fields is not None:
+                rows.append(fields)
+        url = data.get("@odata.nextLink")
+        delta_link = data.get("@odata.deltaLink") or delta_link
+        params = None
+    return rows, delta_link
+
+
 def sync_from_sharepoint_to_db() -> int:
-    """Import SharePoint list rows missing from local SQLite."""
+    """Import SharePoint list rows changed since the last import into local SQLite."""
     if not is_configured():
         return 0
 
-    imported = 0
-    for rec in fetch_all_records():
+    records, delta_link = fetch_changed_records()
+    user_ids = {u["name"]: u["id"] for u in db.get_all_users()}
+    logins: list[tuple] = []
+    activities: list[tuple] = []
+    readings: list[tuple] = []
+    seen: list[str] = []
+
+    for rec in records:
         sync_id = str(rec.get("sync_id") or "").strip()
         if not sync_id:
             continue
-        user_name = str(rec.get("user_name") or "").strip()
-        user = db.get_user(user_name) if user_name else None
-        if not user:
+        seen.append(sync_id)
+        user_id = user_ids.get(str(rec.get("user_name") or "").strip())
+        if user_id is None:
             continue
 
         record_type = str(rec.get("record_type") or "").strip().lower()
@@ -284,8 +456,7 @@ def sync_from_sharepoint_to_db() -> int:
             continue
 
         if record_type == "login":
-            if db.import_daily_login(user["id"], log_date):
-                imported += 1
+            logins.append((user_id, log_date))
             continue
 
         if record_type == "activity":
@@ -295,19 +466,20 @@ def sync_from_sharepoint_to_db() -> int:
                 time_spent = int(rec.get("time_spent_seconds") or 0)
             except (TypeError, ValueError):
                 continue
-            if db.import_activity_score_row(
-                sync_id=sync_id,
-                user_id=user["id"],
-                activity_type=str(rec.get("activity_type") or ""),
-                activity_name=str(rec.get("activity_name") or ""),
-                score=score,
-                max_score=max_score,
-                log_date=log_date,
-                details=str(rec.get("details") or ""),
-                time_spent_seconds=time_spent,
-                completed_at=str(rec.get("completed_at") or ""),
-            ):
-                imported += 1
+            activities.append(
+                (
+                    user_id,
+                    str(rec.get("activity_type") or ""),
+                    str(rec.get("activity_name") or ""),
+                    score,
+                    max_score,
+                    log_date,
+                    str(rec.get("details") or ""),
+                    time_spent,
+                    sync_id,
+                    str(rec.get("completed_at") or ""),
+                )
+            )
             continue
 
         if record_type == "reading":
@@ -317,21 +489,27 @@ def sync_from_sharepoint_to_db() -> int:
             except json.JSONDecodeError:
                 extra = {}
             try:
-                if db.import_reading_progress_row(
-                    sync_id=sync_id,
-                    user_id=user["id"],
-                    story_id=str(extra.get("story_id") or ""),
-                    story_title=str(extra.get("story_title") or rec.get("activity_name") or ""),
-                    questions_total=int(extra.get("questions_total") or 0),
-                    questions_correct=int(extra.get("questions_correct") or 0),
-                    time_spent_seconds=int(rec.get("time_spent_seconds") or 0),
-                    log_date=log_date,
-                    completed_at=str(rec.get("completed_at") or ""),
-                ):
-                    imported += 1
+                readings.append(
+                    (
+                        user_id,
+                        str(extra.get("story_id") or ""),
+                        str(extra.get("story_title") or rec.get("activity_name") or ""),
+                        int(extra.get("questions_total") or 0),
+                        int(extra.get("questions_correct") or 0),
+                        int(rec.get("time_spent_seconds") or 0),
+                        log_date,
+                        sync_id,
+                        str(rec.get("completed_at") or ""),
+                    )
+                )
             except (TypeError, ValueError):
                 continue
 
+    imported = db.import_sharepoint_rows(
+        logins=logins, activities=activities, readings=readings, pushed_sync_ids=seen
+    )
+    if delta_link:
+        db.sharepoint_delta_link_set(_list_key(), delta_link)
     return imported
 
 
@@ -345,18 +523,16 @@ def _safe_push(fn, *args, **kwargs) -> tuple[bool, str | None]:
         return False, str(exc)
 
 
-def persist_daily_login(*, user_name: str, user_id: int, log_date: str) -> tuple[bool, str | None]:
-    sync_id = f"login|{user_name}|{log_date}"
-    return _safe_push(
-        append_record,
-        sync_id=sync_id,
-        user_name=user_name,
-        record_type="login",
-        log_date=log_date,
-    )
+def daily_login_record(*, user_name: str, user_id: int, log_date: str) -> dict[str, Any]:
+    return {
+        "sync_id": f"login|{user_name}|{log_date}",
+        "user_name": user_name,
+        "record_type": "login",
+        "log_date": log_date,
+    }
 
 
-def persist_activity_score(
+def activity_score_record(
     *,
     sync_id: str,
     user_name: str,
@@ -369,24 +545,23 @@ def persist_activity_score(
     details: str,
     time_spent_seconds: int,
     completed_at: str,
-) -> tuple[bool, str | None]:
-    return _safe_push(
-        append_record,
-        sync_id=sync_id,
-        user_name=user_name,
-        record_type="activity",
-        log_date=log_date,
-        activity_type=activity_type,
-        activity_name=activity_name,
-        score=score,
-        max_score=max_score,
-        details=details,
-        time_spent_seconds=time_spent_seconds,
-        completed_at=completed_at,
-    )
+) -> dict[str, Any]:
+    return {
+        "sync_id": sync_id,
+        "user_name": user_name,
+        "record_type": "activity",
+        "log_date": log_date,
+        "activity_type": activity_type,
+        "activity_name": activity_name,
+        "score": score,
+        "max_score": max_score,
+        "details": details,
+        "time_spent_seconds": time_spent_seconds,
+        "completed_at": completed_at,
+    }
 
 
-def persist_reading_progress(
+def reading_progress_record(
     *,
     sync_id: str,
     user_name: str,
@@ -398,7 +573,7 @@ def persist_reading_progress(
     time_spent_seconds: int,
     log_date: str,
     completed_at: str,
-) -> tuple[bool, str | None]:
+) -> dict[str, Any]:
     score_pct = int(100 * questions_correct / questions_total) if questions_total else 0
     extra = json.dumps(
         {
@@ -409,23 +584,59 @@ def persist_reading_progress(
         },
         ensure_ascii=False,
     )
+    return {
+        "sync_id": sync_id,
+        "user_name": user_name,
+        "record_type": "reading",
+        "log_date": log_date,
+        "activity_type": "Reading",
+        "activity_name": story_title,
+        "score": score_pct,
+        "max_score": 100,
+        "details": f"{questions_correct}/{questions_total} correct",
+        "time_spent_seconds": time_spent_seconds,
+        "completed_at": completed_at,
+        "extra_json": extra,
+    }
+
+
+# persist_* name (as queued in the cloud sync outbox) -> record builder.
+RECORD_BUILDERS = {
+    "persist_daily_login": daily_login_record,
+    "persist_activity_score": activity_score_record,
+    "persist_reading_progress": reading_progress_record,
+}
+
+
+def persist_daily_login(*, user_name: str, user_id: int, log_date: str) -> tuple[bool, str | None]:
     return _safe_push(
         append_record,
-        sync_id=sync_id,
-        user_name=user_name,
-        record_type="reading",
-        log_date=log_date,
-        activity_type="Reading",
-        activity_name=story_title,
-        score=score_pct,
-        max_score=100,
-        details=f"{questions_correct}/{questions_total} correct",
-        time_spent_seconds=time_spent_seconds,
-        completed_at=completed_at,
-        extra_json=extra,
+        **daily_login_record(user_name=user_name, user_id=user_id, log_date=log_date),
     )
 
 
+def persist_activity_score(**kwargs: Any) -> tuple[bool, str | None]:
+    """Push one activity score row (keyword arguments as ``activity_score_record``)."""
+    return _safe_push(append_record, **activity_score_record(**kwargs))
+
+
+def persist_reading_progress(**kwargs: Any) -> tuple[bool, str | None]:
+    """Push one reading row (keyword arguments as ``reading_progress_record``)."""
+    return _safe_push(append_record, **reading_progress_record(**kwargs))
+
+
+def persist_batch(events: list[tuple[str, dict[str, Any]]]) -> list[str | None]:
+    """Push queued ``(persist_* name, kwargs)`` events in as few $batch calls as possible.
+
+    Returns one error (or None) per event, in order.
+    """
+    records = [RECORD_BUILDERS[kind](**payload) for kind, payload in events]
+    if not is_configured():
+        return [None] * len(records)
+    results = append_records(records)
+    return [results.get(str(rec["sync_id"]), "not pushed") for rec in records]
+
+
 def new_sync_id(prefix: str) -> str:
     safe = re.sub(r"[^a-zA-Z0-9_-]", "", prefix)[:24]
     return f"{safe}|{uuid.uuid4().hex[:12]}"
@@ -0,0 +1,119 @@
+"""Content-hashed image URLs for HTML built in ``st.markdown``.
+
+Map and object images used to be inlined as base64 data URIs — 33% larger
+than the PNG and re-sent with every rerun (a counting problem with ten
+apples carried the apple ten times).  ``image_src`` instead publishes the
+file once per process into ``static/assets/`` under a name that includes a
+hash of its contents and returns its ``app/static/...`` URL, which
+Streamlit serves when ``server.enableStaticServing`` is on (see
+``.streamlit/config.toml``).  The browser downloads each image once: a
+hashed URL never changes content, so heuristic caching and ETag
+revalidation are always safe, and published copies keep the source file's
+mtime so their Last-Modified date (and the cache lifetime derived from it)
+is old.
+
+When static serving is off (tests, scripts, other launchers) ``image_src``
+falls back to the old data URI so the HTML still renders.
+"""
+
+from __future__ import annotations
+
+import base64
+import hashlib
+import mimetypes
+import os
+import shutil
+import threading
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent
+STATIC_DIR = ROOT / "static"
+ASSETS_DIR = STATIC_DIR / "assets"
+URL_PREFIX = "app/static/assets"
+
+_lock = threading.Lock()
+# source path -> ((mtime_ns, size), src)
+_published: dict[str, tuple[tuple[int, int], str]] = {}
+_data_uris: dict[str, tuple[tuple[int, int], str]] = {}
+_static_serving: bool | None = None
+
+
+def static_serving_enabled() -> bool:
+    """True when Streamlit serves ``static/`` (``server.enableStaticServing``)."""
+    global _static_serving
+    if _static_serving is None:
+        try:
+            from streamlit import config
+
+            _static_serving = bool(config.get_option("server.enableStaticServing"))
+        except Exception:
+            _static_serving = False
+    return _static_serving
+
+
+def _stat_key(path: Path) -> tuple[int, int] | None:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+def _relative_parent(path: Path) -> Path:
+    try:
+        return path.parent.relative_to(ROOT)
+    except ValueError:
+        return Path("external")
+
+
+def publish(path: str | os.PathLike) -> str | None:
+    """Copy ``path`` into ``static/assets/`` under a content-hashed name; returns its URL."""
+    source = Path(path).resolve()
+    sig = _stat_key(source)
+    if sig is None:
+        return None
+    with _lock:
+        cached = _published.get(str(source))
+        if cached and cached[0] == sig:
+            return cached[1]
+        digest = hashlib.sha256(source.read_bytes()).hexdigest()[:12]
+        rel = _relative_parent(source) / f"{source.stem}.{digest}{source.suffix}"
+        target = ASSETS_DIR / rel
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            tmp = target.with_name(f".{target.name}.tmp")
+            shutil.copy2(source, tmp)
+            os.replace(tmp, target)
+            # Drop copies of older versions of the same file.
+            for stale in target.parent.glob(f"{source.stem}.*{source.suffix}"):
+                if stale != target and len(stale.suffixes) == 2:
+                    stale.unlink(missing_ok=True)
+        url = f"{URL_PREFIX}/{rel.as_posix()}"
+        _published[str(source)] = (sig, url)
+        return url
+
+
+def data_uri(path: str | os.PathLike) -> str | None:
+    """The file as a base64 ``data:`` URI (cached until the file changes)."""
+    source = Path(path)
+    sig = _stat_key(source)
+    if sig is None:
+        return None
+    with _lock:
+        cached = _data_uris.get(str(source))
+        if cached and cached[0] == sig:
+            return cached[1]
+        mime = mimetypes.guess_type(source.name)[0] or "application/octet-stream"
+        uri = f"data:{mime};base64,{base64.b64encode(source.read_bytes()).decode()}"
+        _data_uris[str(source)] = (sig, uri)
+        return uri
+
+
+def image_src(path: str | os.PathLike) -> str | None:
+    """``src`` for an ``<img>`` of ``path``: a hashed static URL, or a data URI fallback."""
+    if static_serving_enabled():
+        try:
+            return publish(path)
+        except OSError:
+            pass
+    return data_uri(path)
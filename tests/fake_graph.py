@@ -0,0 +1,152 @@
+"""In-memory Microsoft Graph stand-in for SharePoint list tests and benchmarks.
+
+Serves the handful of endpoints ``sharepoint_sync`` uses through
+``httpx.MockTransport`` and counts every round-trip::
+
+    graph = FakeGraph()
+    sps._transport = graph.transport()
+    sps.reset_caches()
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections import Counter
+from urllib.parse import parse_qs
+
+import httpx
+
+SITE_ID = "contoso.sharepoint.com,site-1"
+
+
+class FakeGraph:
+    def __init__(self, *, page_size: int = 200, fail_titles: set[str] | None = None):
+        self.page_size = page_size
+        self.fail_titles = fail_titles or set()
+        self.lists: dict[str, dict] = {}
+        self.columns: dict[str, set[str]] = {}
+        self.items: dict[str, list[dict]] = {}
+        self.requests: Counter[str] = Counter()
+        self.change_seq = 0
+        self.oldest_delta_token = 0  # tokens below this answer 410 Gone
+
+    @property
+    def round_trips(self) -> int:
+        return sum(self.requests.values())
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
+
+    def seed_items(self, list_name: str, rows: list[dict]) -> None:
+        list_id = self._ensure_list(list_name)
+        for fields in rows:
+            self._add_item(list_id, dict(fields))
+
+    # ── request routing ──
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix("/v1.0")
+        key = re.sub(r"/lists/list-[0-9a-f]+", "/lists/{list}", path.replace(SITE_ID, "{site}"))
+        self.requests[f"{request.method} {key}"] += 1
+        body = json.loads(request.content) if request.content else None
+        params = {k: v[0] for k, v in parse_qs(request.url.query.decode()).items()}
+        if path == "/$batch" and request.method == "POST":
+            return httpx.Response(200, json=self._batch(body))
+        status, payload = self._route(request.method, path, params, body)
+        return httpx.Response(status, json=payload)
+
+    def _route(self, method: str, path: str, params: dict, body: dict | None) -> tuple[int, dict]:
+        if method == "GET" and re.fullmatch(r"/sites/[^/]+:/.*", path):
+            return 200, {"id": SITE_ID}
+        m = re.fullmatch(r"/sites/[^/]+/lists", path)
+        if m and method == "GET":
+            name = re.search(r"displayName eq '(.*)'", params.get("$filter", ""))
+            found = [
+                {"id": lid, "displayName": meta["displayName"]}
+                for lid, meta in self.lists.items()
+                if not name or meta["displayName"] == name.group(1).replace("''", "'")
+            ]
+            return 200, {"value": found}
+        if m and method == "POST":
+            list_id = self._ensure_list(body["displayName"])
+            return 201, {"id": list_id}
+        m = re.fullmatch(r"/sites/[^/]+/lists/([^/]+)/columns", path)
+        if m and method == "GET":
+            return 200, {"value": [{"name": c} for c in sorted(self.columns[m.group(1)])]}
+        if m and method == "POST":
+            self.columns[m.group(1)].add(body["name"])
+            return 201, {"name": body["name"]}
+        m = re.fullmatch(r"/sites/[^/]+/lists/([^/]+)/items/delta", path)
+        if m and method == "GET":
+            return self._delta(m.group(1), params)
+        m = re.fullmatch(r"/sites/[^/]+/lists/([^/]+)/items", path)
+        if m and method == "GET":
+            return 200, self._page(m.group(1), params)
+        if m and method == "POST":
+            return self._post_item(m.group(1), body)
+        return 404, {"error": {"code": "itemNotFound", "message": path}}
+
+    def _batch(self, body: dict) -> dict:
+        responses = []
+        for req in body.get("requests") or []:
+            status, payload = self._route(req["method"], req["url"], {}, req.get("body"))
+            responses.append({"id": req["id"], "status": status, "body": payload})
+        return {"responses": responses}
+
+    # ── storage ──
+
+    def _ensure_list(self, name: str) -> str:
+        for lid, meta in self.lists.items():
+            if meta["displayName"] == name:
+                return lid
+        lid = f"list-{len(self.lists) + 1:08x}"
+        self.lists[lid] = {"displayName": name}
+        self.columns[lid] = {"Title"}
+        self.items[lid] = []
+        return lid
+
+    def _add_item(self, list_id: str, fields: dict) -> dict:
+        self.change_seq += 1
+        item = {"id": str(len(self.items[list_id]) + 1), "fields": fields, "_seq": self.change_seq}
+        self.items[list_id].append(item)
+        return item
+
+    def _post_item(self, list_id: str, body: dict) -> tuple[int, dict]:
+        fields = dict(body.get("fields") or {})
+        if fields.get("Title") in self.fail_titles:
+            return 503, {"error": {"code": "serviceNotAvailable", "message": "try later"}}
+        return 201, self._add_item(list_id, fields)
+
+    def _page(self, list_id: str, params: dict) -> dict:
+        rows = self.items[list_id]
+        title = re.search(r"fields/Title eq '(.*)'", params.get("$filter", ""))
+        if title:
+            wanted = title.group(1).replace("''", "'")
+            rows = [r for r in rows if r["fields"].get("Title") == wanted]
+        top = int(params.get("$top") or self.page_size)
+        skip = int(params.get("$skiptoken") or 0)
+        page = rows[skip : skip + top]
+        out: dict = {"value": page}
+        if skip + top < len(rows):
+            query = dict(params, **{"$skiptoken": str(skip + top)})
+            qs = "&".join(f"{k}={v}" for k, v in query.items())
+            out["@odata.nextLink"] = (
+                f"https://graph.microsoft.com/v1.0/sites/{SITE_ID}/lists/{list_id}/items?{qs}"
+            )
+        return out
+
+    def _delta(self, list_id: str, params: dict) -> tuple[int, dict]:
+        since = int(params.get("token") or 0)
+        if since and since < self.oldest_delta_token:
+            return 410, {"error": {"code": "resyncRequired", "message": "token expired"}}
+        changed = [i for i in self.items[list_id] if i["_seq"] > since]
+        skip = int(params.get("$skiptoken") or 0)
+        page = changed[skip : skip + self.page_size]
+        base = f"https://graph.microsoft.com/v1.0/sites/{SITE_ID}/lists/{list_id}/items/delta"
+        out: dict = {"value": [{"id": i["id"], "fields": i["fields"]} for i in page]}
+        if skip + self.page_size < len(changed):
+            out["@odata.nextLink"] = f"{base}?token={since}&$skiptoken={skip + self.page_size}"
+        else:
+            out["@odata.deltaLink"] = f"{base}?token={self.change_seq}"
+        return 200, out
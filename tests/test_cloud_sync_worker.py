@@ -0,0 +1,87 @@
+"""Tests for the cloud-sync outbox and its drain worker."""
+
+from __future__ import annotations
+
+import pytest
+
+import cloud_sync_worker as csw
+import database as db
+
+
+@pytest.fixture
+def outbox(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "outbox.db"))
+    db.close_all_connections()
+    db.init_db()
+    monkeypatch.setattr(csw, "MIN_PUSH_INTERVAL", {})
+    calls: list[tuple[str, str, dict]] = []
+    results: dict[str, tuple[bool, str | None]] = {}
+
+    def _handler(backend):
+        def _push(kind, payload):
+            calls.append((backend, kind, payload))
+            return results.get(backend, (True, None))
+
+        return _push
+
+    monkeypatch.setattr(csw, "HANDLERS", {b: _handler(b) for b in csw.BACKENDS})
+    monkeypatch.setattr(csw, "BATCH_HANDLERS", {})
+    yield calls, results
+    db.close_all_connections()
+
+
+def test_same_user_day_events_coalesce(outbox):
+    calls, _ = outbox
+    for _ in range(3):
+        db.outbox_enqueue(
+            "sheets",
+            "flush_user_session_to_sheets",
+            {"user_id": 1, "log_date": "2026-01-02"},
+            coalesce_key="sheets:session:1:2026-01-02",
+        )
+    db.outbox_enqueue("sharepoint", "persist_activity_score", {"sync_id": "a"})
+    db.outbox_enqueue("sharepoint", "persist_activity_score", {"sync_id": "b"})
+    assert db.outbox_status()["sheets"]["queue_depth"] == 1
+    assert db.outbox_status()["sharepoint"]["queue_depth"] == 2
+
+    assert csw.drain_once() == 3
+    assert [c[0] for c in calls].count("sheets") == 1
+    status = db.outbox_status()
+    assert status["sheets"]["queue_depth"] == 0
+    assert status["sheets"]["last_success_at"] is not None
+
+
+def test_failed_push_backs_off_then_dead_letters(outbox, monkeypatch):
+    calls, results = outbox
+    results["sharepoint"] = (False, "503 Service Unavailable")
+    monkeypatch.setattr(csw, "MAX_ATTEMPTS", 2)
+    db.outbox_enqueue("sharepoint", "persist_daily_login", {"user_name": "Arjun"}, now=0)
+
+    assert csw.drain_once() == 1
+    status = db.outbox_status()["sharepoint"]
+    assert status["queue_depth"] == 1
+    assert status["last_error"] == "503 Service Unavailable"
+    # Not due again until the backoff elapses.
+    assert csw.drain_once() == 0
+    assert db.outbox_next_due() > 0
+
+    with db.get_connection() as conn:
+        conn.execute("UPDATE cloud_sync_outbox SET next_attempt_at = 0")
+    assert csw.drain_once() == 1
+    status = db.outbox_status()["sharepoint"]
+    assert status["queue_depth"] == 0
+    assert status["dead"] == 1
+    assert len(calls) == 2
+
+
+def test_backoff_is_exponential_and_capped():
+    assert csw.backoff_seconds(1) == csw.BACKOFF_BASE_SECONDS
+    assert csw.backoff_seconds(3) == csw.BACKOFF_BASE_SECONDS * 4
+    assert csw.backoff_seconds(50) == csw.BACKOFF_MAX_SECONDS
+
+
+def test_claim_is_exclusive(outbox):
+    db.outbox_enqueue("sheets", "flush_user_session_to_sheets", {"user_id": 1})
+    first = db.outbox_claim("sheets")
+    assert len(first) == 1
+    assert db.outbox_claim("sheets") == []
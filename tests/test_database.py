@@ -0,0 +1,331 @@
+"""Tests for the SQLite data layer."""
+
+from __future__ import annotations
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+import database as db
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "onepercent.db"))
+    db.close_all_connections()
+    db.init_db()
+    db.reset_connection_stats()
+    yield db
+    db.close_all_connections()
+
+
+def test_connection_reused_within_thread(fresh_db):
+    for _ in range(5):
+        fresh_db.get_user("Arjun")
+    stats = fresh_db.get_connection_stats()
+    assert stats["connections_opened"] == 0
+    assert stats["connections_reused"] == 5
+
+
+def test_pragmas_applied_once(fresh_db):
+    with fresh_db.get_connection() as conn:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2  # MEMORY
+
+
+def test_outer_block_rolls_back_nested_writes(fresh_db):
+    with pytest.raises(RuntimeError):
+        with fresh_db.get_connection() as conn:
+            conn.execute("INSERT INTO users (name) VALUES ('Nested')")
+            with fresh_db.get_connection() as inner:
+                inner.execute("INSERT INTO users (name) VALUES ('Inner')")
+            raise RuntimeError("boom")
+    assert fresh_db.get_user("Nested") is None
+    assert fresh_db.get_user("Inner") is None
+
+
+def test_read_then_write_survives_a_concurrent_commit(fresh_db):
+    fresh_db.get_user("Arjun")
+    read_done, other_committed = threading.Event(), threading.Event()
+    errors = []
+
+    def other_writer():
+        read_done.wait()
+        try:
+            with fresh_db.get_connection() as conn:
+                conn.execute("INSERT INTO users (name) VALUES ('Other')")
+        except Exception as exc:
+            errors.append(exc)
+        other_committed.set()
+
+    t = threading.Thread(target=other_writer)
+    t.start()
+    with fresh_db.get_connection() as conn:
+        conn.execute("SELECT COUNT(*) FROM users").fetchone()
+        read_done.set()
+        other_committed.wait()
+        conn.execute("INSERT INTO users (name) VALUES ('Mine')")
+    t.join()
+    assert not errors
+    assert fresh_db.get_user("Mine") and fresh_db.get_user("Other")
+
+
+def test_snapshot_block_is_read_only(fresh_db):
+    import sqlite3
+
+    with pytest.raises(sqlite3.OperationalError):
+        with fresh_db.get_connection(snapshot=True) as conn:
+            conn.execute("INSERT INTO users (name) VALUES ('Nope')")
+    with fresh_db.get_connection() as conn:
+        conn.execute("INSERT INTO users (name) VALUES ('Writable')")
+    assert fresh_db.get_user("Nope") is None and fresh_db.get_user("Writable")
+
+
+def test_exited_thread_connection_is_recycled(fresh_db):
+    def _work():
+        fresh_db.get_user("Arjun")
+
+    for _ in range(3):
+        t = threading.Thread(target=_work)
+        t.start()
+        t.join()
+    stats = fresh_db.get_connection_stats()
+    assert stats["connections_opened"] <= 1
+
+
+def _days_ago(n: int) -> str:
+    return (datetime.now().date() - timedelta(days=n)).strftime("%Y-%m-%d")
+
+
+def test_streak_from_latest_island(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    for n in (1, 2, 3, 5, 6):
+        fresh_db.import_daily_login(uid, _days_ago(n))
+    assert fresh_db.get_login_streak(uid) == 3
+    assert fresh_db.get_total_login_days(uid) == 5
+    fresh_db.import_daily_login(uid, _days_ago(0))
+    assert fresh_db.get_login_streak(uid) == 4
+
+
+def test_streak_broken_after_two_idle_days(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    fresh_db.import_daily_login(uid, _days_ago(2))
+    assert fresh_db.get_login_streak(uid) == 0
+
+
+def test_dashboard_snapshot_matches_individual_queries(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    for n in (0, 1, 4):
+        fresh_db.import_daily_login(uid, _days_ago(n))
+    fresh_db.save_activity_score(uid, "Math", "L1", 80, 100, time_spent_seconds=120, flush_sheets=False)
+    fresh_db.save_activity_score(uid, "GK", "Quiz", 65, 100, time_spent_seconds=45, flush_sheets=False)
+    with fresh_db.get_connection() as conn:
+        conn.execute(
+            """INSERT INTO activity_scores (user_id, activity_type, activity_name, score,
+                   max_score, log_date, time_spent_seconds)
+               VALUES (?, 'Math', 'Old', 90, 100, ?, 300)""",
+            (uid, _days_ago(10)),
+        )
+
+    snap = fresh_db.get_dashboard_snapshot(uid, days=30)
+    assert snap.streak == fresh_db.get_login_streak(uid) == 2
+    assert snap.total_login_days == fresh_db.get_total_login_days(uid)
+    assert snap.today == fresh_db.get_user_daily_stats(uid)
+    assert snap.time_calendar == fresh_db.get_daily_time_spent_calendar(uid, days=30)
+    assert snap.score_calendar == fresh_db.get_daily_score_calendar(uid, days=30)
+    assert snap.total_time_seconds == fresh_db.get_total_time_spent(uid) == 465
+    assert snap.has_lifetime_activity
+
+
+def test_dashboard_snapshot_empty_user(fresh_db):
+    uid = fresh_db.get_user("Krish")["id"]
+    snap = fresh_db.get_dashboard_snapshot(uid, days=7)
+    assert snap.streak == 0
+    assert len(snap.time_calendar) == 7
+    assert snap.today == {"activities_count": 0, "avg_score_pct": 0, "time_spent_seconds": 0}
+    assert not snap.has_lifetime_activity
+
+
+def test_migrations_recorded_and_idempotent(fresh_db):
+    version = fresh_db.get_schema_version()
+    assert version == fresh_db._MIGRATIONS[-1][0]
+    fresh_db.init_db()
+    with fresh_db.get_connection() as conn:
+        rows = conn.execute("SELECT version FROM schema_version ORDER BY version").fetchall()
+    assert [r["version"] for r in rows] == [m[0] for m in fresh_db._MIGRATIONS]
+
+
+def test_migrations_upgrade_legacy_schema(tmp_path, monkeypatch):
+    import sqlite3
+
+    path = tmp_path / "legacy.db"
+    legacy = sqlite3.connect(path)
+    legacy.executescript(
+        """CREATE TABLE activity_scores (
+               id INTEGER PRIMARY KEY AUTOINCREMENT, user_id INTEGER NOT NULL,
+               activity_type TEXT NOT NULL, activity_name TEXT NOT NULL,
+               score INTEGER DEFAULT 0, max_score INTEGER DEFAULT 100,
+               completed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+               log_date DATE NOT NULL, details TEXT,
+               time_spent_seconds INTEGER DEFAULT 0);"""
+    )
+    legacy.close()
+    monkeypatch.setattr(db, "DB_PATH", str(path))
+    db.close_all_connections()
+    try:
+        db.init_db()
+        with db.get_connection() as conn:
+            cols = {r["name"] for r in conn.execute("PRAGMA table_info(activity_scores)")}
+        assert "sync_id" in cols
+        assert db.get_schema_version() == db._MIGRATIONS[-1][0]
+    finally:
+        db.close_all_connections()
+
+
+# Public read paths, called with representative arguments.  Every statement they
+# issue is re-planned with EXPLAIN QUERY PLAN and must not scan a whole table.
+_QUERY_CALLS = [
+    lambda d, u: d.get_user("Arjun"),
+    lambda d, u: d.get_user_by_id(u),
+    lambda d, u: d.get_user_log_dates(u),
+    lambda d, u: d.get_login_streak(u),
+    lambda d, u: d.get_total_login_days(u),
+    lambda d, u: d.get_today_scores(u),
+    lambda d, u: d.get_today_scores(u, activity_type="Math"),
+    lambda d, u: d.get_scores_history(u),
+    lambda d, u: d.get_scores_history(u, activity_type="Math"),
+    lambda d, u: d.get_daily_time_spent(u),
+    lambda d, u: d.get_daily_time_spent_calendar(u),
+    lambda d, u: d.get_daily_score_calendar(u),
+    lambda d, u: d.get_total_time_spent(u),
+    lambda d, u: d.get_today_time_spent(u),
+    lambda d, u: d.compute_user_daily_summary(u),
+    lambda d, u: d.get_user_daily_stats(u),
+    lambda d, u: d.get_dashboard_snapshot(u, days=60),
+    lambda d, u: d.get_reading_history(u),
+    lambda d, u: d.get_daily_questions(u, _days_ago(0)),
+    lambda d, u: d.get_recent_gk_questions(u),
+    lambda d, u: d.get_gk_quizzes_after(u, 0),
+    lambda d, u: d.get_gk_question_signatures(u),
+    lambda d, u: d.get_gk_signature_watermark(u),
+    lambda d, u: d.get_arjun_vocab_index(u),
+    lambda d, u: d.get_linear_eq_week_config(),
+    lambda d, u: d.get_cvc_review_words(u, "cvc_a"),
+    lambda d, u: d.get_cvc_review_count(u, "cvc_a"),
+    lambda d, u: d.gss_push_state_get("k"),
+    lambda d, u: d.sharepoint_delta_link_get("k"),
+    lambda d, u: d.get_recent_ec3_question_ids(u, 1),
+    lambda d, u: d.get_recent_harshit_practice_exclusions(u, 1),
+    lambda d, u: d.ec3_practice_result_exists("s-1"),
+    lambda d, u: d.get_ec3_practice_results(u),
+    lambda d, u: d.get_harshit_problem_progress(u, 1, "p1"),
+    lambda d, u: d.get_harshit_day_status(u),
+    lambda d, u: d.get_harshit_prereq_chapter_status(u, 1),
+    lambda d, u: d.get_harshit_prereq_summary(u),
+    lambda d, u: d.get_harshit_prereq_week_config(1),
+    lambda d, u: d.get_harshit_class10_week_config(1),
+]
+
+
+def _full_scans(conn, sql: str, tables: set[str]) -> list[str]:
+    plan = conn.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+    scans = []
+    for row in plan:
+        detail = row["detail"]
+        if detail.startswith("SCAN "):
+            name = detail.split()[1]
+            if name in tables:
+                scans.append(detail)
+    return scans
+
+
+def test_public_queries_use_indexes(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    with fresh_db.get_connection() as conn:
+        tables = {
+            r["name"]
+            for r in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+        }
+    statements: list[str] = []
+    with fresh_db.get_connection() as conn:
+        conn.set_trace_callback(statements.append)
+        try:
+            for call in _QUERY_CALLS:
+                call(fresh_db, uid)
+        finally:
+            conn.set_trace_callback(None)
+
+    offenders = {}
+    with fresh_db.get_connection() as conn:
+        for sql in statements:
+            head = sql.lstrip().split(None, 1)[0].upper()
+            if head not in ("SELECT", "WITH"):
+                continue
+            scans = _full_scans(conn, sql, tables)
+            if scans:
+                offenders[" ".join(sql.split())[:120]] = scans
+    assert not offenders, offenders
+
+
+def test_daily_summaries_follow_activity_writes(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    today = _days_ago(0)
+    fresh_db.import_daily_summary(
+        uid, today, activities_count=9, avg_score_pct=10, time_spent_seconds=999
+    )
+    assert fresh_db.get_user_daily_stats(uid)["activities_count"] == 9
+
+    fresh_db.save_activity_score(uid, "Math", "L1", 81, 100, time_spent_seconds=60, flush_sheets=False)
+    fresh_db.save_activity_score(uid, "GK", "Quiz", 70, 100, time_spent_seconds=30, flush_sheets=False)
+    assert fresh_db.get_user_daily_stats(uid) == {
+        "activities_count": 2,
+        "avg_score_pct": round(151 / 2),
+        "time_spent_seconds": 90,
+    }
+    # Sheet imports no longer clobber a day with local activity.
+    fresh_db.import_daily_summary(
+        uid, today, activities_count=1, avg_score_pct=1, time_spent_seconds=1
+    )
+    assert fresh_db.compute_user_daily_summary(uid)["activities_count"] == 2
+
+    with fresh_db.get_connection() as conn:
+        conn.execute("UPDATE activity_scores SET log_date = ? WHERE score = 81", (_days_ago(1),))
+        conn.execute("DELETE FROM activity_scores WHERE score = 70")
+    assert fresh_db.compute_user_daily_summary(uid)["activities_count"] == 0
+    assert fresh_db.compute_user_daily_summary(uid, _days_ago(1))["time_spent_seconds"] == 60
+    assert fresh_db.verify_daily_summaries() == []
+
+
+def test_deleting_last_local_activity_restores_sheet_summary(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    today = _days_ago(0)
+    sheet = {"activities_count": 4, "avg_score_pct": 75, "time_spent_seconds": 600}
+    fresh_db.import_daily_summary(uid, today, **sheet)
+
+    fresh_db.save_activity_score(uid, "Math", "L1", 90, 100, time_spent_seconds=60, flush_sheets=False)
+    assert fresh_db.get_user_daily_stats(uid)["activities_count"] == 1
+    with fresh_db.get_connection() as conn:
+        conn.execute("DELETE FROM activity_scores WHERE user_id = ?", (uid,))
+    assert fresh_db.get_user_daily_stats(uid) == sheet
+    assert fresh_db.compute_user_daily_summary(uid)["activities_count"] == 0
+
+    fresh_db.save_activity_score(uid, "Math", "L1", 90, 100, time_spent_seconds=60, flush_sheets=False)
+    with fresh_db.get_connection() as conn:
+        conn.execute("DELETE FROM activity_scores WHERE user_id = ?", (uid,))
+        conn.execute("UPDATE daily_summaries SET source = 'local', activities_count = 1")
+    assert fresh_db.rebuild_daily_summaries()["mismatches"] == []
+    assert fresh_db.get_user_daily_stats(uid) == sheet
+
+
+def test_rebuild_daily_summaries_repairs_drift(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    fresh_db.save_activity_score(uid, "Math", "L1", 50, 100, time_spent_seconds=10, flush_sheets=False)
+    with fresh_db.get_connection() as conn:
+        conn.execute("UPDATE daily_summaries SET time_spent_seconds = 0")
+    assert len(fresh_db.verify_daily_summaries(uid)) == 1
+    result = fresh_db.rebuild_daily_summaries()
+    assert result["rows"] == 1
+    assert result["mismatches"] == []
+    assert fresh_db.get_today_time_spent(uid) == 10
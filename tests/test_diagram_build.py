@@ -0,0 +1,169 @@
+"""Incremental diagram builds: only figures whose source or inputs changed re-render."""
+
+from __future__ import annotations
+
+import importlib
+import sys
+import textwrap
+
+import pytest
+
+import diagram_build
+
+GENERATOR = '''
+import os
+
+import matplotlib.pyplot as plt
+
+OUT_DIR = {out!r}
+DPI = {dpi}
+
+
+def _save(fig, name):
+    fig.savefig(os.path.join(OUT_DIR, name), dpi=DPI)
+    plt.close(fig)
+    print("saved", name)
+
+
+def square():
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.plot([0, 1], [0, {square_y}])
+    _save(fig, "square.png")
+
+
+def line():
+    fig, ax = plt.subplots(figsize=(1, 1))
+    ax.plot([0, 1], [1, 0])  # a comment the build key ignores
+    _save(fig, "line.png")
+
+
+FIGURES = [square, line]
+
+
+if __name__ == "__main__":
+    for fn in FIGURES:
+        fn()
+'''
+
+
+@pytest.fixture
+def generator(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / "fake_diagrams.py"
+
+    def write(dpi=50, square_y=1):
+        path.write_text(textwrap.dedent(GENERATOR.format(out=str(tmp_path), dpi=dpi, square_y=square_y)))
+        sys.modules.pop("fake_diagrams", None)
+        importlib.invalidate_caches()
+        diagram_build.reset_caches()
+        return diagram_build.module_figures("fake_diagrams")
+
+    yield write
+    sys.modules.pop("fake_diagrams", None)
+    diagram_build.reset_caches()
+
+
+def _statuses(results):
+    return {r.id.split(":")[1]: r.status for r in results}
+
+
+def test_rebuilds_only_what_changed(generator, tmp_path):
+    manifest = tmp_path / "manifest.json"
+
+    def build(figures):
+        return diagram_build.build(figures, jobs=1, manifest_path=manifest)
+
+    first = build(generator())
+    assert _statuses(first) == {"square": "built", "line": "built"}
+    assert sorted(o for r in first for o in r.outputs) == sorted(
+        str(tmp_path / name) for name in ("line.png", "square.png")
+    )
+    assert _statuses(build(generator())) == {"square": "up-to-date", "line": "up-to-date"}
+
+    assert _statuses(build(generator(square_y=2))) == {"square": "built", "line": "up-to-date"}
+    (tmp_path / "line.png").unlink()
+    assert _statuses(build(generator(square_y=2))) == {"square": "up-to-date", "line": "built"}
+    assert _statuses(build(generator(dpi=60, square_y=2))) == {"square": "built", "line": "built"}
+
+
+def test_missing_input_and_failures_are_not_recorded(generator, tmp_path):
+    figures = generator()
+    missing = figures[0]._replace(inputs=(tmp_path / "absent.geojson",))
+    broken = figures[1]._replace(kwargs={"unexpected": 1})
+    results = diagram_build.build([missing, broken], jobs=1, manifest_path=tmp_path / "m.json")
+    assert [r.status for r in results] == ["missing-input", "failed"]
+    assert "unexpected" in results[1].error
+    assert diagram_build.load_manifest(tmp_path / "m.json") == {}
+
+
+def test_declared_outputs_are_rebuilt_when_deleted(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    (tmp_path / "fake_bounds.py").write_text(textwrap.dedent(f'''
+        import json
+
+        BOUNDS_PATH = {str(tmp_path / "bounds.json")!r}
+
+
+        def write_bounds():
+            with open(BOUNDS_PATH, "w") as f:
+                json.dump({{"KA": [74.0, 78.6]}}, f)
+
+
+        FIGURES = [write_bounds]
+        FIGURE_OUTPUTS = {{write_bounds: [BOUNDS_PATH]}}
+    '''))
+    sys.modules.pop("fake_bounds", None)
+    importlib.invalidate_caches()
+    diagram_build.reset_caches()
+    manifest = tmp_path / "manifest.json"
+    try:
+        figures = diagram_build.module_figures("fake_bounds")
+        (result,) = diagram_build.build(figures, jobs=1, manifest_path=manifest)
+        assert result.status == "built" and result.outputs == (str(tmp_path / "bounds.json"),)
+        assert _statuses(diagram_build.build(figures, jobs=1, manifest_path=manifest)) == {
+            "write_bounds": "up-to-date"
+        }
+        (tmp_path / "bounds.json").unlink()
+        assert _statuses(diagram_build.build(figures, jobs=1, manifest_path=manifest)) == {
+            "write_bounds": "built"
+        }
+        assert (tmp_path / "bounds.json").exists()
+    finally:
+        sys.modules.pop("fake_bounds", None)
+        diagram_build.reset_caches()
+
+
+def test_editing_a_called_figure_rebuilds_its_caller(tmp_path, monkeypatch):
+    monkeypatch.syspath_prepend(str(tmp_path))
+    path = tmp_path / "fake_callers.py"
+
+    def write(y):
+        path.write_text(textwrap.dedent(f'''
+            def base():
+                return {y}
+
+
+            def uses_base():
+                return base() + 1
+
+
+            def unrelated():
+                return 0
+
+
+            FIGURES = [base, uses_base, unrelated]
+        '''))
+        sys.modules.pop("fake_callers", None)
+        importlib.invalidate_caches()
+        diagram_build.reset_caches()
+        return diagram_build.module_figures("fake_callers")
+
+    manifest = tmp_path / "manifest.json"
+    try:
+        diagram_build.build(write(1), jobs=1, manifest_path=manifest)
+        assert _statuses(diagram_build.build(write(2), jobs=1, manifest_path=manifest)) == {
+            "base": "built", "uses_base": "built", "unrelated": "up-to-date",
+        }
+    finally:
+        sys.modules.pop("fake_callers", None)
+        diagram_build.reset_caches()
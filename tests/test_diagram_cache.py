@@ -0,0 +1,68 @@
+"""Diagram render cache: memory LRU, persisted image tier, hit-rate stats."""
+
+from __future__ import annotations
+
+import pytest
+
+import diagram_cache
+import harshit_math_diagrams as hmd
+import mental_math_hints as mmh
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("DIAGRAM_CACHE_DIR", str(tmp_path / "cache"))
+    diagram_cache.reset_cache()
+    yield tmp_path / "cache"
+    diagram_cache.reset_cache()
+
+
+def test_svg_rendered_once_per_spec(cache, monkeypatch):
+    calls = []
+    real = hmd.render_spec_svg
+    monkeypatch.setattr(hmd, "render_spec_svg", lambda spec: calls.append(spec) or real(spec))
+    q = {"question": "x", "diagram": {"type": "sqrt_number_line", "base": 2, "perp": 1}}
+    first = hmd.render_svg(q)
+    assert first and "<svg" in first
+    assert hmd.render_svg(dict(q)) == first
+    assert hmd.render_svg({"question": "no diagram here"}) is None
+    assert len(calls) == 1
+    assert diagram_cache.stats()["harshit_svg"] == {
+        "memory_hits": 1, "disk_hits": 0, "misses": 1, "stores": 1, "evicted": 0, "hit_rate": 0.5,
+    }
+    assert not cache.exists()  # SVG markup is never written to disk
+
+
+def test_hf_images_persist_across_processes(cache, monkeypatch):
+    remote = []
+
+    def fake_remote(spec, key):
+        remote.append(spec["prompt"])
+        return None if "fail" in spec["prompt"] else b"\x89PNG " + spec["prompt"].encode()
+
+    monkeypatch.setattr(mmh, "_hf_text_to_image", fake_remote)
+    prompt = mmh.hf_prompt_for_diagram({"kind": "bar_fraction", "num": 3, "den": 4})
+    assert mmh.cached_hf_diagram_image(prompt) is None
+    png = mmh.generate_hf_diagram_image(prompt, api_key="k")
+    assert mmh.generate_hf_diagram_image(prompt, api_key="k") == png
+    assert mmh.generate_hf_diagram_image("fail", api_key="k") is None
+    assert mmh.generate_hf_diagram_image("fail", api_key="k") is None  # failures are retried
+
+    diagram_cache.reset_cache()  # another process / user
+    assert mmh.cached_hf_diagram_image(prompt) == png
+    assert mmh.generate_hf_diagram_image(prompt, api_key="k") == png
+    assert mmh.generate_hf_diagram_image(prompt) == png  # no token needed for a cached image
+    assert remote == [prompt, "fail", "fail"]
+    stats = diagram_cache.stats()["hf_hint"]
+    assert (stats["disk_hits"], stats["memory_hits"], stats["misses"]) == (1, 2, 0)
+
+
+def test_memory_tier_evicts_least_recently_used(cache, monkeypatch):
+    monkeypatch.setattr(diagram_cache, "MEMORY_MAX_ENTRIES", 2)
+    for spec in ("a", "b", "a", "c"):
+        diagram_cache.get_or_render("t", spec, lambda spec=spec: spec * 3)
+    renders = []
+    for spec in ("a", "c", "b"):
+        diagram_cache.get_or_render("t", spec, lambda spec=spec: renders.append(spec) or spec)
+    assert renders == ["b"]
+    assert diagram_cache.stats()["t"]["evicted"] == 2
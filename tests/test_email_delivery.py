@@ -0,0 +1,183 @@
+"""In-process practice email delivery: claiming, backoff, dead letters, token reuse."""
+
+from __future__ import annotations
+
+import json
+import smtplib
+import socket
+import threading
+from collections import Counter
+
+import httpx
+import pytest
+
+from practice_email import delivery, gmail_client, smtp_client
+from practice_email.settings import EmailConfigError, EmailSettings
+
+
+@pytest.fixture
+def queue(tmp_path, monkeypatch):
+    monkeypatch.setattr(delivery, "QUEUE_DIR", tmp_path)
+    monkeypatch.setattr(delivery, "PROCESSING_DIR", tmp_path / "processing")
+    monkeypatch.setattr(delivery, "DEAD_DIR", tmp_path / "dead")
+    monkeypatch.setattr(delivery, "load_settings", lambda: None)
+    sent: list[str] = []
+    failures: dict[str, Exception] = {}
+    lock = threading.Lock()
+
+    def _deliver(settings, subject, plain, html, *, smtp_session=None):
+        if subject in failures:
+            raise failures[subject]
+        with lock:
+            sent.append(subject)
+        return "fake"
+
+    monkeypatch.setattr(delivery, "deliver_now", _deliver)
+    return sent, failures
+
+
+def _enqueue(n: int) -> None:
+    for i in range(n):
+        delivery._write_payload(subject=f"report {i}", plain="p", html="<p>h</p>")
+
+
+def test_concurrent_workers_never_double_send(queue):
+    sent, _ = queue
+    _enqueue(40)
+    workers = [threading.Thread(target=delivery.deliver_pending) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    assert sorted(sent) == sorted(f"report {i}" for i in range(40))
+    assert delivery.queue_status() == {"queued": 0, "processing": 0, "dead": 0}
+
+
+def test_failures_back_off_then_dead_letter(queue, monkeypatch):
+    _, failures = queue
+    monkeypatch.setattr(delivery, "MAX_ATTEMPTS", 2)
+    _enqueue(2)
+    failures["report 0"] = RuntimeError("503 from Gmail")
+    failures["report 1"] = EmailConfigError("Gmail API OAuth not configured")
+
+    assert delivery.deliver_pending() == {"sent": 0, "retry": 1, "dead": 1}
+    (queued,) = delivery.QUEUE_DIR.glob("*.json")
+    payload = json.loads(queued.read_text())
+    assert payload["attempts"] == 1 and payload["last_error"] == "503 from Gmail"
+    assert delivery.deliver_pending() == {"sent": 0, "retry": 0, "dead": 0}  # backing off
+
+    payload["next_attempt_at"] = 0
+    queued.write_text(json.dumps(payload))
+    assert delivery.deliver_pending() == {"sent": 0, "retry": 0, "dead": 1}
+    assert delivery.queue_status() == {"queued": 0, "processing": 0, "dead": 2}
+
+
+def _smtp_settings() -> EmailSettings:
+    return EmailSettings(
+        enabled=True,
+        recipient="parent@example.com",
+        transport="smtp",
+        smtp_host="smtp.example.com",
+        smtp_port=587,
+        smtp_user="me@example.com",
+        smtp_password="pw",
+        smtp_from="me@example.com",
+        use_tls=True,
+        gmail_client_id="",
+        gmail_client_secret="",
+        gmail_refresh_token="",
+    )
+
+
+def test_send_report_returns_the_worker_error(queue, monkeypatch):
+    attempts = iter([RuntimeError("first: timed out"), RuntimeError("worker: 535 bad credentials")])
+
+    def _deliver(settings, subject, plain, html, *, smtp_session=None):
+        raise next(attempts)
+
+    monkeypatch.setattr(delivery, "deliver_now", _deliver)
+    monkeypatch.setattr(delivery, "load_settings", _smtp_settings)
+    monkeypatch.setattr(delivery, "delivery_ready", lambda settings: (True, "smtp", ""))
+    monkeypatch.setattr(delivery, "format_practice_report_email", lambda **kw: ("Report", "p", "<p>h</p>"))
+    monkeypatch.setattr(delivery, "format_delivery_error", lambda exc, settings: str(exc))
+    monkeypatch.setattr(delivery, "notify", lambda: None)
+
+    result = delivery.send_report(
+        student_name="Sam", unit_title="Unit 1", unit_subtitle="", report={}, time_spent_seconds=60
+    )
+    assert not result.ok and result.pending
+    assert result.error == "worker: 535 bad credentials"
+
+
+@pytest.mark.parametrize(
+    "dropped",
+    [
+        smtplib.SMTPServerDisconnected("gone"),
+        smtplib.SMTPConnectError(421, b"busy"),
+        ConnectionResetError(104, "reset"),
+        socket.timeout("timed out"),
+    ],
+)
+def test_smtp_session_reconnects_after_a_dropped_socket(monkeypatch, dropped):
+    class Server:
+        def __init__(self, fail=None):
+            self.fail, self.sent, self.closed = fail, 0, False
+
+        def sendmail(self, *args):
+            if self.fail is not None:
+                raise self.fail
+            self.sent += 1
+
+        def close(self):
+            self.closed = True
+
+        def quit(self):
+            self.closed = True
+
+    servers = [Server(), Server()]
+    monkeypatch.setattr(smtp_client, "_connect", lambda settings: servers.pop(0))
+    settings = _smtp_settings()
+    session = smtp_client.SmtpSession()
+    first = servers[0]
+    session.send(settings, "Report 1", "p", "<p>h</p>")
+    first.fail = dropped
+    session.send(settings, "Report 2", "p", "<p>h</p>")
+    second = session._server
+    session.send(settings, "Report 3", "p", "<p>h</p>")
+    session.close()
+    assert first.closed and first.sent == 1
+    assert second is not first and second.sent == 2 and second.closed
+
+
+def test_gmail_token_refreshed_once_across_sends(monkeypatch):
+    calls = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls[request.url.host] += 1
+        if request.url.host == "oauth2.googleapis.com":
+            return httpx.Response(200, json={"access_token": "tok", "expires_in": 3600})
+        assert request.headers["Authorization"] == "Bearer tok"
+        return httpx.Response(200, json={"id": "m"})
+
+    gmail_client.reset_gmail_client()
+    monkeypatch.setattr(gmail_client, "_http", httpx.Client(transport=httpx.MockTransport(handler)))
+    settings = EmailSettings(
+        enabled=True,
+        recipient="parent@example.com",
+        transport="gmail_api",
+        smtp_host="",
+        smtp_port=587,
+        smtp_user="me@example.com",
+        smtp_password="",
+        smtp_from="me@example.com",
+        use_tls=True,
+        gmail_client_id="id",
+        gmail_client_secret="secret",
+        gmail_refresh_token="refresh",
+    )
+    try:
+        for _ in range(3):
+            gmail_client.send_gmail(settings, "Report", "plain", "<p>html</p>")
+    finally:
+        gmail_client.reset_gmail_client()
+    assert calls == {"oauth2.googleapis.com": 1, "gmail.googleapis.com": 3}
@@ -0,0 +1,44 @@
+"""Concurrent, resumable story illustration pipeline."""
+
+from __future__ import annotations
+
+import os
+import threading
+
+import generate_images as gi
+
+
+def _story(pages: int = 6) -> dict:
+    return {"id": "gen_test", "pages": [{"image_prompt": f"a cat on page {i}"} for i in range(1, pages + 1)]}
+
+
+def test_pages_drawn_concurrently_with_progress_on_caller_thread(tmp_path):
+    caller = threading.get_ident()
+    seen = []
+
+    def progress(done, total, msg):
+        assert threading.get_ident() == caller
+        seen.append(done)
+
+    backend = gi.FakeImageBackend(latency=0.05)
+    result = gi.generate_images_for_story(
+        _story(), None, progress, backend=backend, max_workers=6, out_dir=str(tmp_path)
+    )
+    assert result == (6, 0, 0)
+    assert seen == [1, 2, 3, 4, 5, 6]
+    assert sorted(os.listdir(tmp_path)) == [".manifests"] + [f"gen_test_{i}.png" for i in range(1, 7)]
+
+
+def test_rerun_resumes_only_failed_and_changed_pages(tmp_path):
+    story = _story()
+    flaky = gi.FakeImageBackend(fail_on=("page 3",))
+    assert gi.generate_images_for_story(story, None, backend=flaky, out_dir=str(tmp_path)) == (5, 0, 1)
+    manifest = gi.load_manifest("gen_test", str(tmp_path))
+    assert manifest["pages"]["3"]["status"] == "failed"
+    assert not any(name.endswith(".part") for name in os.listdir(tmp_path))
+
+    story["pages"][4]["image_prompt"] = "a dog on page 5"
+    backend = gi.FakeImageBackend()
+    assert gi.generate_images_for_story(story, None, backend=backend, out_dir=str(tmp_path)) == (2, 4, 0)
+    assert backend.calls == 2
+    assert gi.generate_images_for_story(story, None, backend=backend, out_dir=str(tmp_path)) == (0, 6, 0)
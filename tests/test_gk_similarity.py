@@ -0,0 +1,60 @@
+"""MinHash history index for GK questions."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+import database as db
+import gk_content as gk
+import gk_similarity as gks
+
+
+@pytest.fixture
+def fresh_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "onepercent.db"))
+    db.close_all_connections()
+    db.init_db()
+    gks.reset_history_indexes()
+    yield db
+    gks.reset_history_indexes()
+    db.close_all_connections()
+
+
+def test_index_finds_paraphrase_not_unrelated():
+    idx = gks.MinHashIndex()
+    idx.add("Which planet in our solar system is known as the Red Planet?")
+    idx.add("What is the largest ocean on Earth?")
+    hits = idx.query("Which planet in the solar system is called the Red Planet?")
+    assert hits and hits[0][1].startswith("Which planet")
+    assert idx.query("Who wrote the play Romeo and Juliet?") == []
+
+
+def test_history_index_persists_and_catches_up(fresh_db):
+    uid = fresh_db.get_user("Arjun")["id"]
+    quiz = [{"question": "What is the capital city of Australia?"}]
+    fresh_db.save_daily_questions(uid, "2026-01-01", json.dumps(quiz))
+    assert len(gks.history_index(uid)) == 1
+
+    gks.reset_history_indexes()  # new process: signatures load from SQLite
+    fresh_db.save_daily_questions(
+        uid, "2026-01-02", json.dumps([{"question": "Which gas do plants absorb from the air?"}])
+    )
+    idx = gks.history_index(uid)
+    assert len(idx) == 2
+    assert len(fresh_db.get_gk_question_signatures(uid)) == 2
+
+    issues = gk.history_repeat_issues(
+        [{"question": "What's the capital city of Australia?"}, {"question": "How tall is Everest?"}],
+        idx,
+    )
+    assert len(issues) == 1 and issues[0].startswith("Question 1 repeats")
+
+
+def test_diversity_bounds_keep_reported_scores_exact():
+    a = gk._normalize_for_compare("Which river flows through the city of Cairo in Egypt?")
+    b = gk._normalize_for_compare("Which river flows through the city of Paris in France?")
+    exact = gk._question_similarity(a, b)
+    assert gk._normalized_similarity(a, b, 0.5) == exact
+    assert gk._normalized_similarity(a, b, 0.99) < 0.99
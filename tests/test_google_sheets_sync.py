@@ -0,0 +1,123 @@
+"""Google Sheets sync against an in-memory worksheet (no network)."""
+
+from __future__ import annotations
+
+import re
+from collections import Counter
+from datetime import datetime, timedelta
+
+import pytest
+
+import database as db
+import google_sheets_sync as gss
+
+
+class FakeWorksheet:
+    """The few gspread Worksheet calls the sync uses, with an API call counter."""
+
+    def __init__(self, title: str, headers: list[str]):
+        self.title = title
+        self.id = hash(title)
+        self.rows: list[list] = [list(headers)]
+        self.calls: Counter[str] = Counter()
+
+    def get_all_values(self) -> list[list[str]]:
+        self.calls["read"] += 1
+        return [[str(v) for v in row] for row in self.rows]
+
+    def row_values(self, n: int) -> list[str]:
+        self.calls["read"] += 1
+        return [str(v) for v in self.rows[n - 1]]
+
+    def update(self, range_name: str, values: list[list]) -> None:
+        self.calls["write"] += 1
+        self._put(range_name, values)
+
+    def batch_update(self, data: list[dict], value_input_option: str = "RAW") -> dict:
+        self.calls["write"] += 1
+        for item in data:
+            self._put(item["range"], item["values"])
+        return {}
+
+    def append_row(self, row: list, value_input_option: str = "RAW") -> dict:
+        return self.append_rows([row], value_input_option)
+
+    def append_rows(self, rows: list[list], value_input_option: str = "RAW") -> dict:
+        self.calls["write"] += 1
+        first = len(self.rows) + 1
+        self.rows.extend(list(r) for r in rows)
+        return {"updates": {"updatedRange": f"{self.title}!A{first}:F{len(self.rows)}"}}
+
+    def _put(self, range_name: str, values: list[list]) -> None:
+        start = int(re.match(r"A(\d+)", range_name).group(1))
+        for offset, row in enumerate(values):
+            while len(self.rows) < start + offset:
+                self.rows.append([])
+            self.rows[start + offset - 1] = list(row)
+
+
+@pytest.fixture
+def sheets(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "onepercent.db"))
+    db.close_all_connections()
+    db.init_db()
+    tabs = {
+        "logins": FakeWorksheet(gss.DAILY_LOGINS_WORKSHEET, gss.DAILY_LOGINS_HEADERS),
+        "summary": FakeWorksheet(gss.DAILY_SUMMARY_WORKSHEET, gss.DAILY_SUMMARY_HEADERS),
+    }
+    monkeypatch.setattr(gss, "is_configured", lambda: True)
+    monkeypatch.setattr(gss, "_daily_logins_worksheet", lambda: tabs["logins"])
+    monkeypatch.setattr(gss, "_daily_summary_worksheet", lambda: tabs["summary"])
+    monkeypatch.setattr(gss, "_HEADERS_VERIFIED", set())
+    gss.reset_row_index_cache()
+    yield tabs
+    gss.reset_row_index_cache()
+    db.close_all_connections()
+
+
+def _days(n: int) -> list[str]:
+    today = datetime.now().date()
+    return [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in range(n)]
+
+
+def test_login_push_is_one_append_per_tab(sheets):
+    ws = sheets["logins"]
+    ws.rows.append(["Arjun", _days(1)[0], "2026-01-01 00:00:00"])
+    users = db.get_all_users()
+    for user in users:
+        for day in _days(40):
+            db.import_daily_login(user["id"], day)
+
+    assert gss.sync_daily_logins_from_sheet() == 0
+    pushed = gss.push_local_daily_logins_to_sheet()
+    assert pushed == len(users) * 40 - 1
+    assert ws.calls["write"] == 1
+    assert len(ws.rows) == 1 + len(users) * 40
+
+    ws.calls.clear()
+    assert gss.push_local_daily_logins_to_sheet() == 0
+    assert sum(ws.calls.values()) == 0
+
+
+def test_summary_refresh_batches_updates_and_appends(sheets):
+    ws = sheets["summary"]
+    today = _days(1)[0]
+    ws.rows.append(["Arjun", today, 0, 0, 0, "old"])
+    arjun = db.get_user("Arjun")
+    db.save_activity_score(arjun["id"], "Math", "L1", 80, 100, time_spent_seconds=90, flush_sheets=False)
+
+    gss.refresh_user_daily_summary_sheet(today)
+    users = db.get_all_users()
+    assert ws.calls == Counter({"read": 2, "write": 2})  # header + bulk read, batch + append
+    assert len(ws.rows) == 1 + len(users)
+    assert ws.rows[1][:5] == ["Arjun", today, 1, 80, 90]
+
+    ws.calls.clear()
+    gss.refresh_user_daily_summary_sheet(today)
+    assert ws.calls == Counter({"write": 1})
+    assert len(ws.rows) == 1 + len(users)
+
+    gss.reset_row_index_cache()
+    ws.calls.clear()
+    gss.refresh_user_daily_summary_sheet(today)  # fresh process: still updates in place
+    assert len(ws.rows) == 1 + len(users)
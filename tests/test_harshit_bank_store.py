@@ -0,0 +1,66 @@
+"""Memory-resident Harshit question bank store."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+
+import harshit_bank_store as hbs
+import harshit_chapter_questions as hcq
+
+
+def _question(i: int) -> dict:
+    return {
+        "id": f"q{i}",
+        "question": f"What is {i} + {i + 1}?",
+        "options": [str(2 * i + 1), str(2 * i), str(2 * i + 2), str(2 * i + 3)],
+        "answer": 0,
+        "explanation": f"{i} + {i + 1} = {2 * i + 1}.",
+    }
+
+
+@pytest.fixture
+def bank_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(hcq, "BANK_DIR", tmp_path)
+    monkeypatch.setattr(hcq, "store", hbs.BankStore(hcq.store._key_fn))
+    return tmp_path
+
+
+def test_bank_parsed_once_and_reloaded_on_change(bank_dir):
+    hcq.save_bank(1, 1, {"questions": {"A": [_question(i) for i in range(50)]}})
+    assert hcq.bank_stats(1)["by_topic"][1] == 50
+    loads = hcq.store.loads  # one per topic file, present or not
+    used_ids: set[str] = set()
+    used_keys: set[str] = set()
+    for _ in range(50):
+        q = hcq.pick_question(1, 1, "A", exclude_ids=used_ids, exclude_text=used_keys)
+        used_ids.add(q["id"])
+        used_keys.add(hcq.question_dedup_key(q["question"]))
+    assert len(used_ids) == 50
+    assert hcq.pick_question(1, 1, "A", exclude_ids=used_ids, exclude_text=used_keys) is None
+    assert hcq.bank_stats(1)["by_topic"][1] == 50
+    assert hcq.store.loads == loads
+
+    path = hcq.bank_path(1, 1)
+    path.write_text(json.dumps({"questions": {"A": [_question(1)]}}))
+    os.utime(path, ns=(0, 1))
+    assert hcq.bank_stats(1)["by_topic"][1] == 1
+    assert hcq.store.loads == loads + 1
+
+
+def test_add_questions_appends_journal_then_compacts(bank_dir, monkeypatch):
+    monkeypatch.setattr(hbs, "COMPACT_AFTER", 10)
+    assert hcq.add_questions(1, 2, "B", [_question(i) for i in range(4)]) == 4
+    assert hcq.add_questions(1, 2, "B", [_question(1), {**_question(9), "id": "other"}]) == 1
+    path = hcq.bank_path(1, 2)
+    assert not path.exists() and hbs.journal_path(path).exists()
+
+    fresh = hbs.BankStore(hcq.store._key_fn)
+    assert fresh.get(path).count() == 5
+    assert fresh.get(path).data["meta"]["topic_id"] == 2
+
+    hcq.add_questions(1, 2, "B", [_question(i) for i in range(10, 14)])
+    assert path.exists() and not hbs.journal_path(path).exists()
+    assert len(json.loads(path.read_text())["questions"]["B"]) == 9
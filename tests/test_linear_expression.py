@@ -0,0 +1,67 @@
+"""Compiled linear forms agree with the eval-based evaluator they replaced."""
+
+from __future__ import annotations
+
+import random
+import re
+from fractions import Fraction
+
+import pytest
+
+import arjun_linear_equation_strategies as leqs
+
+
+def _legacy_eval(expr: str, x_val: float) -> float:
+    """The substitute-and-eval evaluator ``compile_equation`` replaced."""
+    s = leqs._normalize_math_text(expr).replace(" ", "")
+    s = re.sub(r"(\d)\(", r"\1*(", s)
+    s = re.sub(r"\)(\d)", r")*\1", s)
+    s = re.sub(r"(\d)/(\d)([xy])", r"((\1)/(\2)*\3)", s)
+    s = re.sub(r"(-?\d+)([xy])", r"\1*\2", s)
+    s = re.sub(r"\bx\b", f"({x_val})", s, flags=re.I)
+    if not re.fullmatch(r"[-+*/().0-9]+", s):
+        raise ValueError(f"Unsupported expression: {expr}")
+    return float(eval(s, {"__builtins__": {}}, {}))
+
+
+def _legacy_holds(equation: str, x_value: str) -> bool:
+    x_val = leqs._parse_x_value(x_value)
+    lhs, rhs = leqs._normalize_math_text(equation).split("=", 1)
+    try:
+        return abs(_legacy_eval(lhs, x_val) - _legacy_eval(rhs, x_val)) < 1e-6
+    except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
+        return False
+
+
+@pytest.mark.parametrize("sid", sorted(leqs.STRATEGIES))
+@pytest.mark.parametrize("lvl", leqs.LEVEL_ORDER)
+def test_compiled_form_matches_legacy_evaluator(sid, lvl):
+    random.seed(sid * 31 + ord(lvl))
+    for _ in range(40):
+        q = leqs.generate_question(sid, lvl)
+        eq = leqs.attach_question_parts(dict(q or {})).get("equation", "")
+        if "=" not in eq:
+            continue
+        lhs, rhs = leqs._normalize_math_text(eq).split("=", 1)
+        form = leqs.compile_equation(eq)
+        try:
+            b = _legacy_eval(lhs, 0) - _legacy_eval(rhs, 0)
+            a = _legacy_eval(lhs, 1) - _legacy_eval(rhs, 1) - b
+        except (ValueError, SyntaxError, ZeroDivisionError, TypeError):
+            assert form is None, eq
+            continue
+        assert form is not None, eq
+        assert float(form.a) == pytest.approx(a, abs=1e-9) and float(form.b) == pytest.approx(b, abs=1e-9), eq
+        for opt in q["options"]:
+            if leqs._parse_x_value(opt) is not None:
+                assert leqs.equation_holds_for_x(eq, opt) == _legacy_holds(eq, opt), (eq, opt)
+
+
+def test_compile_equation_is_exact_and_rejects_non_linear():
+    form = leqs.compile_equation("−2/3(x − 1/2) = 3/4 x + 0.2")
+    assert form == (Fraction(-17, 12), Fraction(2, 15))
+    assert form.root() == Fraction(8, 85)
+    assert leqs.compile_equation("-2/3 (x-1/2)=3/4x+0.2") is form  # cached by normalized text
+    assert leqs.compile_equation("x + 4 = 4 + x").root() is None
+    for bad in ("x(x + 1) = 2", "6/x = 3", "2x + y = 13", "x = 1 = 1", "2(x + 1 = 3", "x/0 = 1"):
+        assert leqs.compile_equation(bad) is None, bad
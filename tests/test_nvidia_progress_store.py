@@ -0,0 +1,90 @@
+"""Tests for the NVIDIA RA Studio progress store."""
+
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+STUDIO_ROOT = Path(__file__).resolve().parents[1] / "network_architecture" / "nvidia_ra_studio"
+if str(STUDIO_ROOT) not in sys.path:
+    sys.path.insert(0, str(STUDIO_ROOT))
+
+from core import progress_store as ps  # noqa: E402
+from core.exporter import export_progress_json  # noqa: E402
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = ps.ProgressStore(tmp_path / "studio.db")
+    yield s
+    s.close()
+
+
+def test_snapshot_matches_individual_queries(store):
+    uid = store.get_or_create_user("rakesh")
+    assert store.get_or_create_user("rakesh") == uid
+    store.set_module_completed(uid, 1, True, "done")
+    store.set_module_completed(uid, 2, False)
+    for i, (score, total) in enumerate([(3, 4), (5, 5), (0, 0), (2, 3), (1, 2), (4, 4), (1, 3)]):
+        store.record_quiz_attempt(uid, f"q{i}", score, total, {})
+    store.set_drill_completed(uid, "d1", True)
+    store.toggle_bookmark(uid, "module", "1")
+    store.save_plan(uid, {"weeks": []}, "# plan")
+
+    snap = store.snapshot(uid, 10)
+    assert snap.modules == store.get_module_progress(uid)
+    assert snap.quizzes == store.quiz_stats(uid)
+    assert snap.quizzes["count"] == 7 and len(snap.quizzes["recent"]) == 5
+    assert snap.quizzes["average_pct"] == round((75 + 100 + 0 + 200 / 3 + 50 + 100 + 100 / 3) / 7, 1)
+    assert snap.drills == store.drill_progress(uid) == {"d1": True}
+    assert snap.bookmarks == store.list_bookmarks(uid)
+    assert snap.latest_plan == store.latest_plan(uid)
+    assert snap.summary == store.dashboard_summary(uid, 10) == {
+        "modules_completed": 1,
+        "modules_total": 10,
+        "progress_pct": 10.0,
+        "quiz_average_pct": snap.quizzes["average_pct"],
+        "quiz_attempts": 7,
+        "drills_completed": 1,
+    }
+    exported = json.loads(export_progress_json(store, uid, "rakesh"))
+    assert exported["quizzes"]["count"] == 7 and exported["latest_plan"]["markdown"] == "# plan"
+
+    empty = store.snapshot(store.get_or_create_user("new"), 10)
+    assert empty.quizzes == {"count": 0, "average_pct": 0.0, "recent": []}
+    assert empty.latest_plan is None
+
+
+def test_schema_checked_once_and_quiz_reads_use_index(tmp_path):
+    db_path = tmp_path / "studio.db"
+    store = ps.get_store(db_path)
+    assert ps.get_store(db_path) is store
+
+    statements: list[str] = []
+    with store._conn() as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == ps.SCHEMA_VERSION
+    again = ps.ProgressStore(db_path)
+    again._connect = lambda: _traced(ps.ProgressStore._connect(again), statements)
+    again.close()
+    again._init_schema()
+    assert any("user_version" in s for s in statements)
+    assert not any("CREATE" in s for s in statements)
+
+    with store._conn() as conn:
+        for sql in (
+            "SELECT COUNT(*) FROM quiz_attempts WHERE user_id = 1",
+            "SELECT quiz_id FROM quiz_attempts WHERE user_id = 1 ORDER BY created_at DESC LIMIT 5",
+        ):
+            plan = " ".join(r["detail"] for r in conn.execute(f"EXPLAIN QUERY PLAN {sql}"))
+            assert "idx_quiz_attempts_user_created" in plan and "TEMP B-TREE" not in plan
+    store.close()
+    again.close()
+    ps._store.cache_clear()
+
+
+def _traced(conn, statements):
+    conn.set_trace_callback(statements.append)
+    return conn
@@ -0,0 +1,57 @@
+"""Tests for the NVIDIA RA Studio quiz bank index and assessment sampler."""
+
+from __future__ import annotations
+
+import sys
+from collections import Counter
+from pathlib import Path
+
+STUDIO_ROOT = Path(__file__).resolve().parents[1] / "network_architecture" / "nvidia_ra_studio"
+if str(STUDIO_ROOT) not in sys.path:
+    sys.path.insert(0, str(STUDIO_ROOT))
+
+from core import quiz_engine as qe  # noqa: E402
+from core.models import QuizQuestion  # noqa: E402
+
+
+def _bank(sizes: dict[int, int]) -> qe.QuizBank:
+    return qe.QuizBank(
+        QuizQuestion(f"m{m}-{i}", m, f"d{m % 3}", "multi" if i % 4 == 0 else "mcq", "?", ["a", "b", "c"], [i % 3], "")
+        for m, size in sizes.items()
+        for i in range(size)
+    )
+
+
+def test_indexes_match_linear_filters():
+    bank = qe.BANK
+    for module_id in {q.module_id for q in qe.QUIZ_BANK}:
+        assert qe.questions_for_module(module_id) == [q for q in qe.QUIZ_BANK if q.module_id == module_id]
+    for domain in {q.domain for q in qe.QUIZ_BANK}:
+        assert qe.questions_for_domain(domain) == [q for q in qe.QUIZ_BANK if q.domain == domain]
+    assert bank.for_qtype("multi") == [q for q in qe.QUIZ_BANK if q.qtype == "multi"]
+    assert qe.questions_for_module(-1) == []
+
+    multi = bank.for_qtype("multi")[0]
+    assert qe.grade_answer(multi, list(reversed(multi.correct)))
+    assert not qe.grade_answer(multi, multi.correct[:1])
+    questions = qe.QUIZ_BANK[:4]
+    answers = {questions[0].id: questions[0].correct, questions[1].id: [9]}
+    assert qe.score_quiz(questions, answers) == (1, 4)
+
+
+def test_assessment_is_seeded_stratified_and_distinct():
+    bank = _bank({1: 40, 2: 10, 3: 2, 4: 1, 5: 47})
+    picked = bank.assessment(20, seed=7)
+    assert picked == bank.assessment(20, seed=7)
+    assert len({q.id for q in picked}) == 20
+    per_module = Counter(q.module_id for q in picked)
+    assert per_module == bank.module_quotas(20, qe.random.Random(0))
+    assert set(per_module) == {1, 2, 3, 4, 5}
+    assert per_module[1] > per_module[2] > per_module[3] >= per_module[4] == 1
+
+    assert len({q.module_id for q in bank.assessment(3, seed=1)}) == 3
+    assert len(bank.assessment(500)) == len(bank)
+    assert bank.assessment(0) == []
+    final = qe.final_assessment_questions(50)
+    assert len({q.id for q in final}) == 50
+    assert {q.module_id for q in final} == set(qe.BANK.by_module)
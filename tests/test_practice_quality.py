@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 from practice_quality.dedup import (
+    FingerprintIndex,
     fingerprints_for_question,
     is_duplicate_of_any,
     linear_equation_signature,
@@ -43,6 +44,19 @@ def test_instruction_suffix_duplicate():
     assert is_duplicate_of_any(b, fingerprints_for_question(a))
 
 
+def test_fingerprint_index_counts_shared_keys():
+    a = fingerprints_for_question(_eq_q("8 - 3(2x - 5) = 11"))
+    b = fingerprints_for_question(_eq_q("8 − 3(2x−5)=11"))
+    c = fingerprints_for_question(_eq_q("4x + 7 = 19"))
+    assert fingerprints_for_question(_eq_q("8 - 3(2x - 5) = 11")) is a  # memoized
+
+    index = FingerprintIndex([a, b, c])
+    assert index.shared(a) and index.shared(b) and not index.shared(c)
+    index.remove(b)
+    assert not index.shared(a)
+    assert index.overlaps(b) and not index.overlaps({"text:unrelated"})
+
+
 def test_report_scores_match_answers():
     questions = [
         {"question": "x+1=2", "category": "s2_A", "category_label": "Inv · A", "options": ["1", "2", "3", "4"], "answer": 0, "explanation": "x=1"},
@@ -0,0 +1,62 @@
+"""Pre-generated question pools: refill, exclusion-filtered take, persistence."""
+
+from __future__ import annotations
+
+import itertools
+
+import pytest
+
+import arjun_linear_equation_practice as lep
+import database as db
+import question_pool
+
+
+@pytest.fixture
+def pool(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "onepercent.db"))
+    db.close_all_connections()
+    db.init_db()
+    monkeypatch.setattr(question_pool, "_enabled", True)
+    monkeypatch.setattr(question_pool, "_producers", dict(question_pool._producers))
+    question_pool.reset_pool_state()
+    yield
+    question_pool.reset_pool_state()
+    db.close_all_connections()
+
+
+def test_refill_take_and_version_bump(pool, monkeypatch):
+    counter = itertools.count()
+
+    def produce(slot: str) -> dict:
+        n = next(counter) % 5  # only five distinct questions per slot
+        return {"id": f"{slot}-{n}", "question": f"{slot} #{n}"}
+
+    question_pool.register("fake", produce, keys=lambda q: [q["question"]])
+    monkeypatch.setattr(question_pool, "TARGET_DEPTH", 8)
+    assert question_pool.take("fake", "a") is None  # empty: caller generates live
+    assert question_pool.refill_once() == 5  # "a" was asked for; stops at 5 distinct
+    assert question_pool.refill_once() == 0
+
+    question_pool.reset_pool_state()  # a restart keeps the SQLite rows
+    q = question_pool.take("fake", "a", used_ids={"a-0"}, used_keys={"a #1"})
+    assert q == {"id": "a-2", "question": "a #2"}
+    stats = question_pool.stats()["fake"]
+    assert stats["depth"] == 4 and stats["hits"] == 1 and stats["misses"] == 0
+    assert stats["take_ms_p50"] is not None
+
+    question_pool.register("fake", produce, keys=lambda q: [q["question"]], version="2")
+    assert question_pool.take("fake", "a") is None
+    question_pool.refill_once()
+    assert db.question_pool_depths() == {("fake", "a", "2"): 5}
+
+
+def test_linear_session_served_from_pool(pool):
+    config = {"strategies": [{"id": 3, "levels": ["A", "B"]}, {"id": 4, "levels": ["A", "C"]}]}
+    for sid, lvl in lep._active_slots(config):
+        question_pool.refill_slot("linear", f"s{sid}_{lvl}")
+    session = lep._build_procedural_session(config, count=12)
+    assert len(session) == 12
+    assert len({q["question"] for q in session}) == 12
+    assert all(q["category"] == f"s{q['strategy']}_{q['level']}" for q in session)
+    stats = question_pool.stats()["linear"]
+    assert stats["hits"] >= 12 and stats["depth"] == 4 * question_pool.TARGET_DEPTH - stats["hits"]
@@ -0,0 +1,54 @@
+"""Story catalog caching in reading_content."""
+
+from __future__ import annotations
+
+import json
+import os
+
+import reading_content as rc
+
+
+def _catalog(tmp_path) -> rc.StoryCatalog:
+    return rc.StoryCatalog(str(tmp_path / "stories"), str(tmp_path / "images"), recheck_seconds=0)
+
+
+def _write_story(tmp_path, story_id: str, pages: int = 2) -> None:
+    (tmp_path / "stories").mkdir(exist_ok=True)
+    story = {"id": story_id, "title": story_id, "pages": [{"text": "Hi."}] * pages}
+    (tmp_path / "stories" / f"{story_id}.json").write_text(json.dumps(story))
+
+
+def test_catalog_loads_once_and_indexes_by_id(tmp_path):
+    _write_story(tmp_path, "gen_a")
+    cat = _catalog(tmp_path)
+    for _ in range(50):
+        assert cat.get("gen_a")["title"] == "gen_a"
+        assert cat.get("b1") is rc.STORIES["b1"]
+    assert cat.loads == 1
+    assert set(rc.STORIES) <= set(cat.stories())
+
+
+def test_catalog_reloads_when_directory_changes(tmp_path):
+    (tmp_path / "stories").mkdir()
+    cat = _catalog(tmp_path)
+    assert cat.get("gen_b") is None
+    _write_story(tmp_path, "gen_b")
+    stories_dir = tmp_path / "stories"
+    st = os.stat(stories_dir)
+    os.utime(stories_dir, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cat.get("gen_b") is not None
+    assert cat.loads == 2
+
+
+def test_image_map_tracks_new_files(tmp_path):
+    _write_story(tmp_path, "gen_c", pages=3)
+    cat = _catalog(tmp_path)
+    story = cat.get("gen_c")
+    assert not cat.image_exists("gen_c", 1)
+    (tmp_path / "images").mkdir()
+    (tmp_path / "images" / "gen_c_1.png").write_bytes(b"x" * rc.MIN_IMAGE_BYTES)
+    (tmp_path / "images" / "gen_c_2.png").write_bytes(b"x" * 10)  # truncated download
+    cat.invalidate()
+    assert cat.image_exists("gen_c", 1)
+    assert not cat.image_exists("gen_c", 2)
+    assert sum(not cat.image_exists(story["id"], i) for i in (1, 2, 3)) == 2
@@ -0,0 +1,127 @@
+"""SharePoint sync against an in-memory Graph server (no network)."""
+
+from __future__ import annotations
+
+import math
+
+import pytest
+
+import database as db
+import sharepoint_sync as sps
+from tests.fake_graph import FakeGraph
+
+
+@pytest.fixture
+def graph(tmp_path, monkeypatch):
+    monkeypatch.setattr(db, "DB_PATH", str(tmp_path / "onepercent.db"))
+    db.close_all_connections()
+    db.init_db()
+    monkeypatch.setenv("SHAREPOINT_ENABLED", "true")
+    monkeypatch.setenv("SHAREPOINT_SITE_URL", "https://contoso.sharepoint.com/sites/OnePercent")
+    monkeypatch.setenv("AZURE_TENANT_ID", "tenant")
+    monkeypatch.setenv("AZURE_CLIENT_ID", "client")
+    monkeypatch.setenv("AZURE_CLIENT_SECRET", "secret")
+    tokens = []
+
+    def _fake_token():
+        tokens.append(1)
+        return "tok", 3600.0
+
+    monkeypatch.setattr(sps, "_acquire_token", _fake_token)
+    fake = FakeGraph()
+    fake.tokens = tokens
+    monkeypatch.setattr(sps, "_transport", fake.transport())
+    sps.reset_caches()
+    yield fake
+    sps.reset_caches()
+    db.close_all_connections()
+
+
+def _login(n: int) -> dict:
+    return sps.daily_login_record(user_name="Arjun", user_id=1, log_date=f"2026-01-{n:02d}")
+
+
+def test_append_records_batches_and_resolves_list_once(graph):
+    records = [_login(n) for n in range(1, 29)] + [
+        {**_login(1), "log_date": "ignored-duplicate"}
+    ]
+    results = sps.append_records(records)
+    assert len(results) == 28 and all(err is None for err in results.values())
+    assert graph.requests["POST /$batch"] == math.ceil(28 / sps.BATCH_LIMIT)
+    assert graph.requests["GET /sites/{site}/lists"] == 1
+    assert len(graph.tokens) == 1
+
+    sps.append_records([_login(29)])
+    assert graph.requests["GET /sites/{site}/lists"] == 1
+    assert graph.requests["GET /sites/{site}/lists/{list}/columns"] == 1
+    assert len(graph.tokens) == 1
+
+
+def test_already_pushed_rows_skip_the_network(graph):
+    assert sps.persist_daily_login(user_name="Arjun", user_id=1, log_date="2026-02-01") == (True, None)
+    before = graph.round_trips
+    assert sps.persist_daily_login(user_name="Arjun", user_id=1, log_date="2026-02-01") == (True, None)
+    assert graph.round_trips == before
+    (list_id,) = graph.items
+    assert len(graph.items[list_id]) == 1
+
+
+def test_persist_batch_reports_per_row_errors(graph):
+    graph.fail_titles = {"login|Arjun|2026-03-02"}
+    events = [
+        ("persist_daily_login", {"user_name": "Arjun", "user_id": 1, "log_date": f"2026-03-0{d}"})
+        for d in (1, 2, 3)
+    ]
+    errors = sps.persist_batch(events)
+    assert errors[0] is None and errors[2] is None
+    assert errors[1].startswith("HTTP 503")
+    assert db.sharepoint_pushed_filter(["login|Arjun|2026-03-02"]) == set()
+
+    graph.fail_titles = set()
+    assert sps.persist_batch(events[1:2]) == [None]
+
+
+def _synthetic_rows(start: int, count: int) -> list[dict]:
+    rows = []
+    for i in range(start, start + count):
+        day = f"20{20 + i % 6:02d}-{1 + i % 12:02d}-{1 + i % 28:02d}"
+        rows.append(
+            {
+                "Title": f"act|{i:06d}",
+                "user_name": ("Arjun", "Krish")[i % 2],
+                "record_type": "activity",
+                "log_date": day,
+                "activity_type": "Math",
+                "activity_name": "Synthetic",
+                "score": i % 100,
+                "max_score": 100,
+                "time_spent_seconds": 60,
+                "completed_at": f"{day} 12:00:00",
+            }
+        )
+    return rows
+
+
+def test_delta_import_only_fetches_changes(graph):
+    graph.page_size = 5000
+    graph.seed_items(sps.DEFAULT_LIST_NAME, _synthetic_rows(0, 50_000))
+
+    assert sps.sync_from_sharepoint_to_db() == 50_000
+    first = graph.requests["GET /sites/{site}/lists/{list}/items/delta"]
+    assert first == 10
+
+    assert sps.sync_from_sharepoint_to_db() == 0
+    assert graph.requests["GET /sites/{site}/lists/{list}/items/delta"] == first + 1
+
+    graph.seed_items(sps.DEFAULT_LIST_NAME, _synthetic_rows(50_000, 3))
+    assert sps.sync_from_sharepoint_to_db() == 3
+    assert graph.requests["GET /sites/{site}/lists/{list}/items/delta"] == first + 2
+    assert db.sharepoint_pushed_filter(["act|050002"]) == {"act|050002"}
+
+
+def test_expired_delta_token_resyncs(graph):
+    graph.seed_items(sps.DEFAULT_LIST_NAME, _synthetic_rows(0, 5))
+    assert sps.sync_from_sharepoint_to_db() == 5
+    graph.seed_items(sps.DEFAULT_LIST_NAME, _synthetic_rows(5, 2))
+    graph.oldest_delta_token = graph.change_seq + 1
+    assert sps.sync_from_sharepoint_to_db() == 2
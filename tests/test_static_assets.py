@@ -0,0 +1,34 @@
+"""Content-hashed static image URLs."""
+
+from __future__ import annotations
+
+import os
+
+import static_assets
+
+
+def test_publish_hashes_content_and_drops_stale_copies(tmp_path, monkeypatch):
+    monkeypatch.setattr(static_assets, "ROOT", tmp_path)
+    monkeypatch.setattr(static_assets, "ASSETS_DIR", tmp_path / "static" / "assets")
+    monkeypatch.setattr(static_assets, "_published", {})
+    src = tmp_path / "maps" / "kerala.png"
+    src.parent.mkdir()
+    src.write_bytes(b"png v1")
+
+    monkeypatch.setattr(static_assets, "_static_serving", True)
+    url = static_assets.image_src(src)
+    assert url.startswith("app/static/assets/maps/kerala.") and url.endswith(".png")
+    assert static_assets.image_src(src) == url
+    published = tmp_path / "static" / url.removeprefix("app/static/")
+    assert published.read_bytes() == b"png v1"
+    assert published.stat().st_mtime_ns == src.stat().st_mtime_ns  # old Last-Modified
+
+    src.write_bytes(b"png v2!")
+    os.utime(src, ns=(1, 2))
+    new_url = static_assets.image_src(src)
+    assert new_url != url
+    assert [p.name for p in published.parent.iterdir()] == [new_url.rsplit("/", 1)[1]]
+
+    monkeypatch.setattr(static_assets, "_static_serving", False)
+    assert static_assets.image_src(src) == "data:image/png;base64,cG5nIHYyIQ=="
+    assert static_assets.image_src(tmp_path / "missing.png") is None
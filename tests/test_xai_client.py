@@ -0,0 +1,108 @@
+"""Shared xAI client: pooling, response cache modes, TTL and LRU eviction."""
+
+from __future__ import annotations
+
+import os
+import time
+
+import pytest
+from openai.types.chat import ChatCompletion
+
+import xai_client as xc
+
+
+class FakeSDK:
+    def __init__(self):
+        self.calls = 0
+        self.closed = False
+        self.chat = self
+        self.completions = self
+
+    def create(self, **request):
+        self.calls += 1
+        return ChatCompletion.model_validate(
+            {
+                "id": f"cmpl-{self.calls}",
+                "object": "chat.completion",
+                "created": 0,
+                "model": request["model"],
+                "choices": [
+                    {
+                        "index": 0,
+                        "finish_reason": "stop",
+                        "message": {"role": "assistant", "content": f"answer {self.calls}"},
+                    }
+                ],
+            }
+        )
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def fake_sdk(tmp_path, monkeypatch):
+    sdk = FakeSDK()
+    monkeypatch.setenv("XAI_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("XAI_RESPONSE_CACHE", raising=False)
+    monkeypatch.setattr(xc, "_new_sdk_client", lambda api_key: sdk)
+    xc.reset_clients()
+    yield sdk
+    xc.reset_clients()
+
+
+def _ask(client, temperature):
+    return client.chat.completions.create(
+        model="grok-3-mini",
+        messages=[{"role": "user", "content": "2+2?"}],
+        temperature=temperature,
+    )
+
+
+def test_deterministic_mode_caches_only_temperature_zero(fake_sdk):
+    client = xc.get_xai_client("key")
+    first = _ask(client, 0)
+    second = _ask(xc.get_xai_client("key", timeout=5), 0)
+    assert fake_sdk.calls == 1
+    assert second.choices[0].message.content == first.choices[0].message.content
+
+    _ask(client, 1.0)
+    _ask(client, 1.0)
+    assert fake_sdk.calls == 3
+    assert xc.cache_stats()["hits"] == 1
+
+
+def test_cache_is_keyed_per_api_key(fake_sdk):
+    _ask(xc.get_xai_client("old-key"), 0)
+    _ask(xc.get_xai_client("old-key"), 0)
+    assert fake_sdk.calls == 1
+    fresh = _ask(xc.get_xai_client("new-key"), 0)
+    assert fake_sdk.calls == 2
+    assert fresh.choices[0].message.content == "answer 2"
+
+
+def test_replay_mode_serves_recorded_and_raises_on_miss(fake_sdk, monkeypatch):
+    monkeypatch.setenv("XAI_RESPONSE_CACHE", "all")
+    _ask(xc.get_xai_client("key"), 0.7)
+    monkeypatch.setenv("XAI_RESPONSE_CACHE", "replay")
+    assert _ask(xc.get_xai_client("key"), 0.7).choices[0].message.content == "answer 1"
+    with pytest.raises(xc.ResponseCacheMiss):
+        _ask(xc.get_xai_client("key"), 0.2)
+    assert fake_sdk.calls == 1
+
+
+def test_prune_expires_and_evicts_least_recently_used(tmp_path):
+    cache = xc.ResponseCache(tmp_path, ttl_seconds=60, max_entries=100)
+    for name in ("a", "b", "c", "old"):
+        cache.put(name * 4, {"v": name})
+    cache.max_entries = 2
+    now = time.time()
+    for age, name in ((30, "a"), (20, "b"), (10, "c"), (120, "old")):
+        os.utime(cache._path(name * 4), (now - age, now - age))
+    cache.get("aaaa")  # touched: now the most recently used
+
+    cache.prune()
+    assert cache.get("oldoldoldold") is None
+    assert cache.get("bbbb") is None
+    assert cache.get("aaaa") == {"v": "a"}
+    assert cache.stats["expired"] == 1 and cache.stats["evicted"] == 1
@@ -7,11 +7,11 @@ Uses REAL geographic data:
   - Lat/lon is converted to image (x%, y%) at render time.
 """
 
-import base64
 import os
 
+from static_assets import image_src
+
 _MAP_PATH = os.path.join(os.path.dirname(__file__), "us_map", "us_map.png")
-_MAP_B64: str | None = None
 
 # Contiguous US map bounds (set in generate_us_maps.py → plot_us)
 _US_LON_MIN = -125
@@ -20,16 +20,8 @@ _US_LAT_MIN = 24
 _US_LAT_MAX = 50
 
 
-def _get_map_b64() -> str | None:
-    global _MAP_B64
-    if _MAP_B64:
-        return _MAP_B64
-    if not os.path.exists(_MAP_PATH):
-        return None
-    with open(_MAP_PATH, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-    _MAP_B64 = f"data:image/png;base64,{encoded}"
-    return _MAP_B64
+def _get_map_src() -> str | None:
+    return image_src(_MAP_PATH)
 
 
 def _latlon_to_us_pct(lat: float, lon: float) -> tuple[float, float]:
@@ -314,8 +306,8 @@ def _render_feature_labels() -> str:
 
 
 def render_map_with_marker(location_name: str, label: str = "") -> str | None:
-    map_b64 = _get_map_b64()
-    if not map_b64:
+    map_src = _get_map_src()
+    if not map_src:
         return None
 
     coords = get_location_coords(location_name)
@@ -328,7 +320,7 @@ def render_map_with_marker(location_name: str, label: str = "") -> str | None:
 
     return f"""
     <div style="position:relative;display:inline-block;width:100%;max-width:480px;margin:0.5rem auto;border-radius:20px;overflow:hidden;box-shadow:0 4px 20px rgba(0,0,0,0.12);background:white;">
-        <img src="{map_b64}" style="width:100%;display:block;border-radius:20px;" />
+        <img src="{map_src}" style="width:100%;display:block;border-radius:20px;" />
         {feature_labels}
         <div style="position:absolute;left:{x}%;top:{y}%;transform:translate(-50%,-50%);z-index:10;">
             <div style="
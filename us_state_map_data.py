@@ -7,13 +7,13 @@ Uses REAL geographic data:
   - Bounding-box data converts lat/lon to image (x%, y%) at render time.
 """
 
-import base64
 import json
 import os
 
+from static_assets import image_src
+
 _US_STATE_MAPS_DIR = os.path.join(os.path.dirname(__file__), "us_state_maps")
 _US_BOUNDS_PATH = os.path.join(os.path.dirname(__file__), "us_state_bounds.json")
-_STATE_B64_CACHE: dict[str, str] = {}
 _BOUNDS: dict[str, dict] = {}
 
 
@@ -27,18 +27,9 @@ def _load_bounds():
             _BOUNDS = json.load(f)
 
 
-def _get_state_b64(state_key: str) -> str | None:
-    """Load a state map as a base64 data URI (cached)."""
-    if state_key in _STATE_B64_CACHE:
-        return _STATE_B64_CACHE[state_key]
-    path = os.path.join(_US_STATE_MAPS_DIR, f"{state_key}.png")
-    if not os.path.exists(path):
-        return None
-    with open(path, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-    uri = f"data:image/png;base64,{encoded}"
-    _STATE_B64_CACHE[state_key] = uri
-    return uri
+def _get_state_src(state_key: str) -> str | None:
+    """URL (or data URI fallback) of a state map image."""
+    return image_src(os.path.join(_US_STATE_MAPS_DIR, f"{state_key}.png"))
 
 
 # ── Map display names of states / territories to file-system keys ──
@@ -614,8 +605,8 @@ def render_state_map_with_marker(
     if not state_key:
         return None
 
-    state_b64 = _get_state_b64(state_key)
-    if not state_b64:
+    state_src = _get_state_src(state_key)
+    if not state_src:
         return None
 
     coords = get_state_location_coords(state_key, location_name)
@@ -630,7 +621,7 @@ def render_state_map_with_marker(
     <div style="position:relative;display:inline-block;width:100%;max-width:380px;
                 margin:0.5rem auto;border-radius:20px;overflow:hidden;
                 box-shadow:0 4px 20px rgba(0,0,0,0.12);background:white;">
-        <img src="{state_b64}" style="width:100%;display:block;border-radius:20px;" />
+        <img src="{state_src}" style="width:100%;display:block;border-radius:20px;" />
         <!-- State name header (US blue theme) -->
         <div style="position:absolute;top:6px;left:50%;transform:translateX(-50%);z-index:12;
                     background:rgba(59,130,246,0.9);color:white;padding:4px 14px;border-radius:12px;
@@ -6,11 +6,11 @@ Locations use real latitude/longitude coordinates converted to image
 percentages at render time using the map's bounding box.
 """
 
-import base64
 import os
 
+from static_assets import image_src
+
 _MAP_PATH = os.path.join(os.path.dirname(__file__), "world_map", "world_map.png")
-_MAP_B64: str | None = None
 
 _LON_MIN = -180
 _LON_MAX = 180
@@ -18,16 +18,8 @@ _LAT_MIN = -90
 _LAT_MAX = 90
 
 
-def _get_map_b64() -> str | None:
-    global _MAP_B64
-    if _MAP_B64:
-        return _MAP_B64
-    if not os.path.exists(_MAP_PATH):
-        return None
-    with open(_MAP_PATH, "rb") as f:
-        encoded = base64.b64encode(f.read()).decode()
-    _MAP_B64 = f"data:image/png;base64,{encoded}"
-    return _MAP_B64
+def _get_map_src() -> str | None:
+    return image_src(_MAP_PATH)
 
 
 def _latlon_to_pct(lat: float, lon: float) -> tuple[float, float]:
@@ -44,8 +36,8 @@ def render_map_with_marker(lat: float, lon: float, label: str = "") -> str | Non
 
     Returns None if the map image doesn't exist.
     """
-    map_b64 = _get_map_b64()
-    if not map_b64:
+    map_src = _get_map_src()
+    if not map_src:
         return None
 
     x, y = _latlon_to_pct(lat, lon)
@@ -55,7 +47,7 @@ def render_map_with_marker(lat: float, lon: float, label: str = "") -> str | Non
         '<div style="position:relative;display:inline-block;width:100%;max-width:700px;'
         'margin:0.5rem auto;border-radius:16px;overflow:hidden;'
         'box-shadow:0 4px 20px rgba(0,0,0,0.12);background:white;">'
-        f'<img src="{map_b64}" style="width:100%;display:block;border-radius:16px;" />'
+        f'<img src="{map_src}" style="width:100%;display:block;border-radius:16px;" />'
         f'<div style="position:absolute;left:{x}%;top:{y}%;'
         'transform:translate(-50%,-50%);z-index:10;">'
         '<div style="width:16px;height:16px;background:#ef4444;'
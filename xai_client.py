@@ -1,4 +1,24 @@
-"""Shared xAI OpenAI-compatible client with reliable TLS on macOS."""
+"""Shared xAI OpenAI-compatible client with reliable TLS on macOS.
+
+``get_xai_client(api_key)`` returns one process-wide client per API key, so
+every call site shares the SDK's keep-alive connection pool instead of doing
+its own TLS handshake.  Chat completions go through a semaphore
+(``XAI_MAX_CONCURRENCY``, default 8 in flight) and a content-addressed
+response cache on disk, keyed on model + messages + sampling params and a
+short hash of the base URL + API key, so a new key never replays answers
+fetched under the old one.
+
+Cache mode (``XAI_RESPONSE_CACHE`` env var / secret):
+
+    deterministic  (default) cache only temperature-0 requests
+    all            cache everything: dev reruns replay instantly
+    replay         offline: serve only recorded responses, a miss raises
+    off            never read or write the cache
+
+Entries live under ``XAI_CACHE_DIR`` (default ``.llm_cache/``), expire after
+``XAI_CACHE_TTL_SECONDS`` and are evicted least-recently-used beyond
+``XAI_CACHE_MAX_ENTRIES``.  ``cache_stats()`` reports hits/misses.
+"""
 
 from __future__ import annotations
 
@@ -9,17 +29,249 @@ try:
 except ImportError:
     pass
 
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
 from openai import OpenAI
+from openai.types.chat import ChatCompletion
 
 XAI_BASE_URL = "https://api.x.ai/v1"
 DEFAULT_TIMEOUT = 120.0
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_CACHE_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_CACHE_MAX_ENTRIES = 5000
+CACHE_MODES = ("deterministic", "all", "replay", "off")
+
+# Request fields that do not change the answer and stay out of the cache key.
+_UNKEYED_PARAMS = {"timeout", "extra_headers", "stream"}
+
+
+class ResponseCacheMiss(RuntimeError):
+    """Raised in ``replay`` mode when a request has no recorded response."""
+
+
+def _setting(key: str, default: str) -> str:
+    val = os.environ.get(key, "").strip()
+    if val:
+        return val
+    try:
+        import streamlit as st
+
+        secret = st.secrets.get(key)
+        if secret is not None and str(secret).strip():
+            return str(secret).strip()
+    except Exception:
+        pass
+    return default
+
+
+def _int_setting(key: str, default: int) -> int:
+    try:
+        return int(_setting(key, str(default)))
+    except ValueError:
+        return default
+
+
+class ResponseCache:
+    """Content-addressed JSON files with TTL expiry and LRU (mtime) eviction."""
+
+    def __init__(self, root: str | Path, *, ttl_seconds: float, max_entries: int):
+        self.root = Path(root)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._writes_since_prune = 0
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "expired": 0, "evicted": 0}
+
+    @staticmethod
+    def key(request: dict[str, Any], account: str = "") -> str:
+        keyed = {k: v for k, v in request.items() if k not in _UNKEYED_PARAMS}
+        if account:
+            keyed["_account"] = account
+        blob = json.dumps(keyed, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> dict | None:
+        path = self._path(key)
+        try:
+            age = time.time() - path.stat().st_mtime
+            if age > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self._count("expired")
+                self._count("misses")
+                return None
+            payload = json.loads(path.read_text(encoding="utf-8"))
+            os.utime(path)  # LRU: a hit makes the entry young again
+        except (OSError, ValueError):
+            self._count("misses")
+            return None
+        self._count("hits")
+        return payload
+
+    def put(self, key: str, payload: dict) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(f".{threading.get_ident()}.tmp")
+        tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        self._count("stores")
+        with self._lock:
+            self._writes_since_prune += 1
+            due = self._writes_since_prune >= max(self.max_entries // 10, 1)
+            if due:
+                self._writes_since_prune = 0
+        if due:
+            self.prune()
+
+    def prune(self) -> None:
+        """Drop expired entries, then the least recently used beyond ``max_entries``."""
+        now = time.time()
+        entries = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                mtime = path.stat().st_mtime
+            except OSError:
+                continue
+            if now - mtime > self.ttl_seconds:
+                path.unlink(missing_ok=True)
+                self._count("expired")
+            else:
+                entries.append((mtime, path))
+        excess = len(entries) - self.max_entries
+        if excess > 0:
+            for _, path in sorted(entries)[:excess]:
+                path.unlink(missing_ok=True)
+                self._count("evicted")
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] += 1
+
+
+class _Completions:
+    def __init__(self, owner: XAIClient):
+        self._owner = owner
+
+    def create(self, **request: Any) -> ChatCompletion:
+        return self._owner._create(request)
+
+
+class _Chat:
+    def __init__(self, owner: XAIClient):
+        self.completions = _Completions(owner)
+
+
+class XAIClient:
+    """``client.chat.completions.create(...)`` over a shared SDK client, cached and throttled."""
+
+    def __init__(self, sdk: OpenAI, *, timeout: float, account: str = ""):
+        self._sdk = sdk
+        self._timeout = timeout
+        self._account = account
+        self.chat = _Chat(self)
+
+    def _cacheable(self, request: dict[str, Any], mode: str) -> bool:
+        if mode == "off" or request.get("stream"):
+            return False
+        if mode in ("all", "replay"):
+            return True
+        return float(request.get("temperature", 1.0) or 0.0) == 0.0
+
+    def _create(self, request: dict[str, Any]) -> ChatCompletion:
+        mode = cache_mode()
+        cache = response_cache() if self._cacheable(request, mode) else None
+        key = ResponseCache.key(request, self._account) if cache else ""
+        if cache:
+            payload = cache.get(key)
+            if payload is not None:
+                return ChatCompletion.model_validate(payload)
+        if mode == "replay":
+            raise ResponseCacheMiss(f"no recorded xAI response for request {key[:12] or '(uncached)'}")
+        request.setdefault("timeout", self._timeout)
+        with _semaphore():
+            response = self._sdk.chat.completions.create(**request)
+        if cache:
+            cache.put(key, response.model_dump(mode="json"))
+        return response
+
+
+_registry_lock = threading.Lock()
+_sdk_clients: dict[str, OpenAI] = {}
+_cache: ResponseCache | None = None
+_sem: threading.BoundedSemaphore | None = None
+
+
+def _new_sdk_client(api_key: str) -> OpenAI:
+    return OpenAI(api_key=api_key, base_url=XAI_BASE_URL, timeout=DEFAULT_TIMEOUT)
+
+
+def _account_id(api_key: str) -> str:
+    """Short, non-reversible id of the account behind ``api_key`` (for cache keys)."""
+    return hashlib.sha256(f"{XAI_BASE_URL}\0{api_key}".encode("utf-8")).hexdigest()[:16]
+
+
+def get_xai_client(api_key: str, *, timeout: float = DEFAULT_TIMEOUT) -> XAIClient:
+    """The process-wide client for ``api_key`` (one connection pool per key)."""
+    with _registry_lock:
+        sdk = _sdk_clients.get(api_key)
+        if sdk is None:
+            sdk = _sdk_clients[api_key] = _new_sdk_client(api_key)
+    return XAIClient(sdk, timeout=timeout, account=_account_id(api_key))
+
+
+def make_xai_client(api_key: str, *, timeout: float = DEFAULT_TIMEOUT) -> XAIClient:
+    """Return the shared client pointed at xAI (kept for older call sites)."""
+    return get_xai_client(api_key, timeout=timeout)
+
+
+def cache_mode() -> str:
+    mode = _setting("XAI_RESPONSE_CACHE", "deterministic").lower()
+    return mode if mode in CACHE_MODES else "deterministic"
+
+
+def response_cache() -> ResponseCache:
+    global _cache
+    with _registry_lock:
+        if _cache is None:
+            root = _setting("XAI_CACHE_DIR", str(Path(__file__).resolve().parent / ".llm_cache"))
+            _cache = ResponseCache(
+                root,
+                ttl_seconds=_int_setting("XAI_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS),
+                max_entries=_int_setting("XAI_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES),
+            )
+        return _cache
+
+
+def _semaphore() -> threading.BoundedSemaphore:
+    global _sem
+    with _registry_lock:
+        if _sem is None:
+            _sem = threading.BoundedSemaphore(
+                max(1, _int_setting("XAI_MAX_CONCURRENCY", DEFAULT_MAX_CONCURRENCY))
+            )
+        return _sem
+
 
+def cache_stats() -> dict[str, int]:
+    """Response cache counters for this process (hits, misses, stores, expired, evicted)."""
+    return dict(response_cache().stats)
 
-def make_xai_client(api_key: str, *, timeout: float = DEFAULT_TIMEOUT) -> OpenAI:
-    """Return an OpenAI SDK client pointed at xAI.
 
-    Uses the SDK default HTTP stack (truststore hooks SSL globally on macOS).
-    Avoid a custom httpx client here — creating many short-lived clients under
-    parallel load can trigger connection pool exhaustion and spurious errors.
-    """
-    return OpenAI(api_key=api_key, base_url=XAI_BASE_URL, timeout=timeout)
+def reset_clients() -> None:
+    """Close pooled SDK clients and forget cache/semaphore settings (tests, key rotation)."""
+    global _cache, _sem
+    with _registry_lock:
+        clients = list(_sdk_clients.values())
+        _sdk_clients.clear()
+        _cache = None
+        _sem = None
+    for sdk in clients:
+        sdk.close()